@@ -0,0 +1,68 @@
+"""CPU cost versus bytes saved when compressing DocumentResponse payloads.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.bench_compression
+"""
+
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from backend.src.core.compression import available_encodings
+
+PAGE_SIZES = (1, 10, 100, 1000)
+ITERATIONS = 200
+CHUNK_SIZE = 4096
+
+
+def _document_payload(count: int) -> bytes:
+    now = datetime.now(timezone.utc)
+    statuses = ("PENDING", "APPROVED", "REJECTED")
+    documents = [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Quarterly compliance report {index:06d}",
+            "status": statuses[index % len(statuses)],
+            "created_at": (now - timedelta(minutes=index)).isoformat(),
+        }
+        for index in range(count)
+    ]
+    return json.dumps(documents, separators=(",", ":")).encode("utf-8")
+
+
+def _compress(factory, payload: bytes, chunked: bool) -> int:
+    compressor = factory()
+    if not chunked:
+        return len(compressor.compress(payload) + compressor.finish())
+    size = 0
+    for offset in range(0, len(payload), CHUNK_SIZE):
+        size += len(compressor.compress(payload[offset : offset + CHUNK_SIZE]))
+    return size + len(compressor.finish())
+
+
+def main() -> None:
+    encodings = available_encodings()
+    header = f"{'docs':>6} {'encoding':>8} {'mode':>8} {'raw B':>9} {'out B':>9} {'saved':>7} {'cpu us':>9} {'MB/s':>8}"
+    print(header)
+    print("-" * len(header))
+    for count in PAGE_SIZES:
+        payload = _document_payload(count)
+        for name, factory in encodings.items():
+            for chunked in (False, True):
+                started = time.process_time()
+                for _ in range(ITERATIONS):
+                    size = _compress(factory, payload, chunked)
+                elapsed = (time.process_time() - started) / ITERATIONS
+                saved = 1 - size / len(payload)
+                throughput = len(payload) / elapsed / 1_000_000 if elapsed else float("inf")
+                mode = "stream" if chunked else "whole"
+                print(
+                    f"{count:>6} {name:>8} {mode:>8} {len(payload):>9} {size:>9} "
+                    f"{saved:>6.1%} {elapsed * 1_000_000:>9.1f} {throughput:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Per-call Python overhead of the hot queries, built per call vs pre-built.
+
+Each variant runs against an in-memory SQLite database in a fresh session
+per call (as a request would), so the numbers are dominated by statement
+construction, cache-key generation and result loading rather than I/O.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.bench_hot_queries
+"""
+
+import time
+import uuid
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from backend.src.db import queries
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.base import Base
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.user import User
+
+CALLS = 3_000
+DOCUMENTS = 50
+STEPS = 5
+
+
+def _seed(engine) -> tuple[uuid.UUID, uuid.UUID, str]:
+    with Session(engine) as session:
+        user = User(email="bench@example.com", hashed_password="x", is_active=True)
+        session.add(user)
+        documents = [
+            Document(title=f"Contract {number}", status=DocumentStatus.PENDING)
+            for number in range(DOCUMENTS)
+        ]
+        session.add_all(documents)
+        session.flush()
+        session.add_all(
+            ApprovalStep(
+                document_id=documents[0].id,
+                approver_id=user.id,
+                step_order=order,
+                status=ApprovalStepStatus.PENDING,
+            )
+            for order in range(1, STEPS + 1)
+        )
+        session.commit()
+        return documents[0].id, user.id, user.email
+
+
+def _time(engine, call) -> float:
+    for _ in range(100):
+        with Session(engine) as session:
+            call(session)
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        with Session(engine) as session:
+            call(session)
+    return (time.perf_counter() - started) / CALLS * 1e6
+
+
+def main() -> None:
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    document_id, user_id, email = _seed(engine)
+
+    cases = (
+        (
+            "steps for document",
+            lambda session: list(
+                session.scalars(
+                    select(ApprovalStep)
+                    .where(ApprovalStep.document_id == document_id)
+                    .order_by(ApprovalStep.step_order)
+                )
+            ),
+            lambda session: list(
+                session.scalars(queries.STEPS_FOR_DOCUMENT, {"document_id": document_id})
+            ),
+        ),
+        (
+            "user by email",
+            lambda session: session.scalars(
+                select(User).where(func.lower(User.email) == email)
+            ).first(),
+            lambda session: session.scalars(queries.USER_BY_EMAIL, {"email": email}).first(),
+        ),
+        (
+            "user by id",
+            lambda session: session.scalars(select(User).where(User.id == user_id)).first(),
+            lambda session: session.scalars(queries.USER_BY_ID, {"user_id": user_id}).first(),
+        ),
+        (
+            f"list {DOCUMENTS} documents",
+            lambda session: session.query(Document)
+            .filter(Document.organization_id.is_not_distinct_from(None))
+            .order_by(Document.created_at.desc())
+            .all(),
+            lambda session: list(
+                session.execute(queries.documents_for_organization(), {"organization_id": None})
+            ),
+        ),
+    )
+
+    header = f"{'query':>20} {'built µs':>10} {'pre-built µs':>13} {'saved':>7}"
+    print(header)
+    print("-" * len(header))
+    for name, built, prebuilt in cases:
+        before = _time(engine, built)
+        after = _time(engine, prebuilt)
+        print(f"{name:>20} {before:>10.1f} {after:>13.1f} {1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Per-request overhead of RequestLoggingMiddleware at different sample rates.
+
+Drives the middleware directly with ASGI messages around a trivial app that
+writes one service-level info record per request, so the numbers are the
+logging cost alone. "direct" logs every request but formats and writes
+each record synchronously on the request path instead of through the
+queue, for comparison.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.bench_request_logging
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from backend.src.core import logs
+
+REQUESTS = 50_000
+SCOPE = {
+    "type": "http",
+    "method": "GET",
+    "path": "/documents",
+    "query_string": b"",
+    "headers": [(b"host", b"bench")],
+}
+_service_logger = logging.getLogger("backend.src.services.bench")
+
+
+async def _endpoint(scope, receive, send) -> None:
+    _service_logger.info("listed documents", extra={"count": 10})
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"[]"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message) -> None:
+    return None
+
+
+def _measure(app) -> float:
+    async def run() -> float:
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            await app(SCOPE, _receive, _send)
+        return time.perf_counter() - started
+
+    return asyncio.run(run()) / REQUESTS * 1e6
+
+
+def _direct_logging(stream) -> logging.Handler:
+    logger = logging.getLogger(logs.APP_LOGGER)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logs.JsonFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return handler
+
+
+def main() -> None:
+    with open(os.devnull, "w") as devnull:
+        listener = logs.configure_logging(stream=devnull)
+        logs.shutdown_logging(listener)
+        baseline = _measure(_endpoint)
+
+        header = f"{'mode':>14} {'us/request':>11} {'overhead us':>12}"
+        print(header)
+        print("-" * len(header))
+        print(f"{'no middleware':>14} {baseline:>11.2f} {0:>12.2f}")
+        for sample_rate in (0.0, 0.01, 0.1, 1.0):
+            listener = logs.configure_logging(stream=devnull)
+            app = logs.RequestLoggingMiddleware(_endpoint, sample_rate=sample_rate, slow_ms=1e9)
+            cost = _measure(app)
+            logs.shutdown_logging(listener)
+            print(f"{f'sample {sample_rate:g}':>14} {cost:>11.2f} {cost - baseline:>12.2f}")
+
+        # Every record formatted and written on the request path.
+        handler = _direct_logging(devnull)
+        cost = _measure(logs.RequestLoggingMiddleware(_endpoint, sample_rate=1.0, slow_ms=1e9))
+        logging.getLogger(logs.APP_LOGGER).removeHandler(handler)
+        print(f"{'direct 1.0':>14} {cost:>11.2f} {cost - baseline:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Write throughput of file-backed SQLite: default setup vs the production profile.
+
+Threads each run small read-then-write transactions (count the audit rows,
+insert one), as concurrent requests would, against a fresh database file:
+
+* ``default``: the engine ``db.session`` creates without the profile
+  (rollback journal, ``synchronous=FULL``, every pooled connection
+  competing for the file lock).
+* ``normal`` / ``full``: ``db.sqlite_profile`` engines with
+  ``synchronous=NORMAL`` or ``FULL``, one transaction per write on the
+  single writer connection.
+* ``... grouped``: the same writes submitted to ``GroupCommitWriter``.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.bench_sqlite_writes
+"""
+
+import tempfile
+import threading
+import time
+import uuid
+from functools import partial
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.db import sqlite_profile
+from backend.src.models.audit_log import AuditLog
+from backend.src.models.base import Base
+
+THREADS = 8
+WRITES_PER_THREAD = 150
+
+
+def _write(session_factory) -> None:
+    with session_factory() as session:
+        session.scalar(select(func.count()).select_from(AuditLog))
+        session.add(AuditLog(document_id=uuid.uuid4(), action="bench", performed_by=uuid.uuid4()))
+        session.commit()
+
+
+def _hammer(write) -> tuple[float, int]:
+    errors = 0
+    lock = threading.Lock()
+
+    def worker() -> None:
+        nonlocal errors
+        for _ in range(WRITES_PER_THREAD):
+            try:
+                write()
+            except Exception:  # noqa: BLE001 - counted, e.g. "database is locked"
+                with lock:
+                    errors += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, errors
+
+
+def _default(url: str) -> tuple[float, int]:
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    try:
+        return _hammer(partial(_write, sessionmaker(bind=engine, autoflush=False)))
+    finally:
+        engine.dispose()
+
+
+def _profile(url: str, *, synchronous: str, grouped: bool) -> tuple[float, int]:
+    writer, reader = sqlite_profile.create_engines(
+        url,
+        readers=THREADS,
+        cache_size_kib=64 * 1024,
+        mmap_size_bytes=256 * 1024 * 1024,
+        writer_timeout=60,
+        synchronous=synchronous,
+    )
+    Base.metadata.create_all(writer)
+    group_commit = sqlite_profile.GroupCommitWriter(writer, window=0.0, max_batch=64)
+    try:
+        if grouped:
+            return _hammer(partial(group_commit.run, _write))
+        return _hammer(partial(_write, sessionmaker(bind=writer, autoflush=False)))
+    finally:
+        group_commit.stop()
+        writer.dispose()
+        reader.dispose()
+
+
+def main() -> None:
+    total = THREADS * WRITES_PER_THREAD
+    header = f"{'setup':>14} {'seconds':>8} {'writes/s':>9} {'errors':>7}"
+    print(header)
+    print("-" * len(header))
+    with tempfile.TemporaryDirectory() as directory:
+        for name, run in (
+            ("default", _default),
+            ("normal", partial(_profile, synchronous="NORMAL", grouped=False)),
+            ("normal grouped", partial(_profile, synchronous="NORMAL", grouped=True)),
+            ("full", partial(_profile, synchronous="FULL", grouped=False)),
+            ("full grouped", partial(_profile, synchronous="FULL", grouped=True)),
+        ):
+            url = f"sqlite+pysqlite:///{Path(directory) / (name.replace(' ', '_') + '.db')}"
+            seconds, errors = run(url)
+            print(f"{name:>14} {seconds:>8.2f} {(total - errors) / seconds:>9.0f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
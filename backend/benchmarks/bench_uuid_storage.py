@@ -0,0 +1,76 @@
+"""Index size and insert throughput for UUID key encodings on SQLite.
+
+Compares the previous 32-character string keys with the 16-byte ``GUID``
+encoding, each with random (v4) and time-ordered (v7) generation, on an
+``audit_logs``-shaped table with a primary key and a secondary index.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.bench_uuid_storage
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+
+from backend.src.models.types import uuid7
+
+ROWS = 200_000
+BATCH = 5_000
+
+VARIANTS = (
+    ("hex v4", "CHAR(32)", lambda: uuid.uuid4().hex),
+    ("hex v7", "CHAR(32)", lambda: uuid7().hex),
+    ("bytes v4", "BINARY(16)", lambda: uuid.uuid4().bytes),
+    ("bytes v7", "BINARY(16)", lambda: uuid7().bytes),
+)
+
+
+def _run(column_type: str, generate) -> tuple[float, int, int]:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(path)
+        connection.execute(
+            f"CREATE TABLE audit_logs (id {column_type} PRIMARY KEY, "
+            f"document_id {column_type} NOT NULL, action VARCHAR(255) NOT NULL, "
+            "timestamp DATETIME NOT NULL)"
+        )
+        connection.execute("CREATE INDEX ix_audit_logs_document ON audit_logs (document_id, timestamp)")
+        documents = [generate() for _ in range(1_000)]
+        started = time.perf_counter()
+        for offset in range(0, ROWS, BATCH):
+            rows = [
+                (generate(), documents[index % len(documents)], "step_approved", "2026-01-01 00:00:00")
+                for index in range(offset, offset + BATCH)
+            ]
+            connection.executemany("INSERT INTO audit_logs VALUES (?, ?, ?, ?)", rows)
+            connection.commit()
+        elapsed = time.perf_counter() - started
+        sizes = dict(
+            connection.execute(
+                "SELECT name, SUM(pgsize) FROM dbstat "
+                "WHERE name IN ('sqlite_autoindex_audit_logs_1', 'ix_audit_logs_document') GROUP BY name"
+            ).fetchall()
+        )
+        connection.close()
+        return ROWS / elapsed, sizes.get("sqlite_autoindex_audit_logs_1", 0), sizes.get(
+            "ix_audit_logs_document", 0
+        )
+    finally:
+        os.unlink(path)
+
+
+def main() -> None:
+    header = f"{'keys':>9} {'rows/s':>10} {'pk index MB':>12} {'fk index MB':>12}"
+    print(header)
+    print("-" * len(header))
+    for name, column_type, generate in VARIANTS:
+        throughput, primary, secondary = _run(column_type, generate)
+        print(f"{name:>9} {throughput:>10.0f} {primary / 1e6:>12.2f} {secondary / 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
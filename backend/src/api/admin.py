@@ -0,0 +1,83 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import Session
+
+from backend.src.api.dependencies import require_admin
+from backend.src.core.tracing import TracedRoute
+from backend.src.db.session import get_session, get_shared_read_session, get_shared_session
+from backend.src.models.user import User
+from backend.src.services import delegation_service
+
+router = APIRouter(prefix="/admin", tags=["admin"], route_class=TracedRoute)
+
+
+class ReassignStepsRequest(BaseModel):
+    from_approver_id: uuid.UUID
+    to_approver_id: uuid.UUID
+
+
+class ReassignStepsResponse(BaseModel):
+    reassigned: int
+
+
+class AdministratorRequest(BaseModel):
+    is_admin: bool
+
+
+class AdministratorResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    email: str
+    is_admin: bool
+
+
+def _map_admin_error(error: Exception) -> HTTPException:
+    if isinstance(error, delegation_service.InvalidDelegationError):
+        return HTTPException(status_code=422, detail=str(error))
+    if isinstance(error, delegation_service.UnknownUserError):
+        return HTTPException(status_code=422, detail=str(error))
+    return HTTPException(status_code=400, detail="Invalid admin request.")
+
+
+@router.post("/approvals/reassign", response_model=ReassignStepsResponse)
+def reassign_pending_steps(
+    payload: ReassignStepsRequest,
+    session: Session = Depends(get_session),
+    users: Session = Depends(get_shared_read_session),
+    current_user: User = Depends(require_admin),
+) -> ReassignStepsResponse:
+    """Move every pending step of one approver to another, e.g. after they leave."""
+    try:
+        reassigned = delegation_service.reassign_pending_steps(
+            session,
+            users=users,
+            organization_id=current_user.organization_id,
+            from_approver_id=payload.from_approver_id,
+            to_approver_id=payload.to_approver_id,
+            performed_by=current_user.id,
+        )
+    except delegation_service.DelegationError as error:
+        raise _map_admin_error(error) from error
+    return ReassignStepsResponse(reassigned=reassigned)
+
+
+@router.put("/users/{user_id}/admin", response_model=AdministratorResponse)
+def set_administrator(
+    user_id: uuid.UUID,
+    payload: AdministratorRequest,
+    session: Session = Depends(get_shared_session),
+    current_user: User = Depends(require_admin),
+) -> AdministratorResponse:
+    """Grant or revoke administrator rights of a user in the caller's organization."""
+    user = session.get(User, user_id)
+    if user is None or user.organization_id != current_user.organization_id:
+        raise HTTPException(status_code=404, detail=f"User {user_id} was not found.")
+    if user.id == current_user.id and not payload.is_admin:
+        raise HTTPException(status_code=422, detail="Administrators cannot revoke their own rights.")
+    user.is_admin = payload.is_admin
+    session.commit()
+    session.refresh(user)
+    return user
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import Session
+
+from backend.src.api.dependencies import get_current_user
+from backend.src.core.tracing import TracedRoute
+from backend.src.db.session import get_read_session
+from backend.src.models.user import User
+from backend.src.services import analytics_service
+
+router = APIRouter(prefix="/analytics", tags=["analytics"], route_class=TracedRoute)
+
+
+class SlaGroupResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    key: str
+    count: int
+    mean_seconds: float
+    p50_seconds: float
+    p90_seconds: float
+    p99_seconds: float
+
+
+class SlaReportResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    group_by: str
+    granularity: str
+    start: datetime
+    end: datetime
+    groups: list[SlaGroupResponse]
+
+
+@router.get("/approvals/sla", response_model=SlaReportResponse)
+def get_approval_sla(
+    group_by: str = Query(default="approver", description="approver, step_order, day or hour"),
+    start: datetime | None = Query(default=None, description="Defaults to 30 days before end."),
+    end: datetime | None = Query(default=None, description="Defaults to now."),
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+) -> SlaReportResponse:
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=30)
+    try:
+        report = analytics_service.sla_report(
+            session,
+            organization_id=current_user.organization_id,
+            group_by=group_by,
+            start=start,
+            end=end,
+        )
+    except analytics_service.AnalyticsError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    return SlaReportResponse.model_validate(report)
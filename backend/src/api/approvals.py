@@ -5,14 +5,19 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import Session
 
-from backend.src.api.dependencies import get_current_user
+from backend.src.api.dependencies import get_current_user, load_document
+from backend.src.core.tracing import TracedRoute
 from backend.src.db.session import get_session
 from backend.src.models.approval_step import ApprovalStepStatus
 from backend.src.models.document import DocumentStatus
 from backend.src.models.user import User
 from backend.src.services import approval_service
 
-router = APIRouter(prefix="/documents/{document_id}/steps", tags=["approvals"])
+router = APIRouter(
+    prefix="/documents/{document_id}/steps",
+    tags=["approvals"],
+    route_class=TracedRoute,
+)
 
 
 class ApprovalDecisionRequest(BaseModel):
@@ -69,6 +74,7 @@ def approve_step(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> ApprovalResponse:
+    load_document(session, document_id, current_user, include_archived=False, fields=())
     try:
         result = approval_service.approve_step(
             session,
@@ -89,6 +95,7 @@ def reject_step(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> ApprovalResponse:
+    load_document(session, document_id, current_user, include_archived=False, fields=())
     try:
         result = approval_service.reject_step(
             session,
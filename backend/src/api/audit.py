@@ -0,0 +1,80 @@
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import Session
+
+from backend.src.api.dependencies import get_current_user, load_document
+from backend.src.core.tracing import TracedRoute
+from backend.src.db.session import get_read_session
+from backend.src.models.user import User
+from backend.src.services import audit_service
+
+router = APIRouter(tags=["audit"], route_class=TracedRoute)
+
+
+class AuditLogResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    document_id: uuid.UUID
+    action: str
+    performed_by: uuid.UUID
+    timestamp: datetime
+
+
+class AuditPageResponse(BaseModel):
+    items: list[AuditLogResponse]
+    next_cursor: str | None
+
+
+def _page_response(page: audit_service.AuditPage) -> AuditPageResponse:
+    return AuditPageResponse(
+        items=[AuditLogResponse.model_validate(entry) for entry in page.entries],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.get("/documents/{document_id}/audit", response_model=AuditPageResponse)
+def list_document_audit(
+    document_id: uuid.UUID,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+) -> AuditPageResponse:
+    load_document(session, document_id, current_user, fields=())
+    try:
+        page = audit_service.list_document_audit(
+            session,
+            document_id=document_id,
+            limit=limit,
+            cursor=cursor,
+        )
+    except audit_service.AuditQueryError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    return _page_response(page)
+
+
+@router.get("/audit", response_model=AuditPageResponse)
+def query_audit(
+    start: datetime,
+    end: datetime,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+) -> AuditPageResponse:
+    try:
+        page = audit_service.query_audit(
+            session,
+            organization_id=current_user.organization_id,
+            start=start,
+            end=end,
+            limit=limit,
+            cursor=cursor,
+        )
+    except audit_service.AuditQueryError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    return _page_response(page)
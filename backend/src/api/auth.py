@@ -2,10 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
-from backend.src.db.session import get_session
+from backend.src.core.tracing import TracedRoute
+from backend.src.db.session import get_shared_session
 from backend.src.services import auth_service
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=TracedRoute)
 
 
 class LoginRequest(BaseModel):
@@ -33,7 +34,7 @@ def _map_auth_error(error: Exception) -> HTTPException:
 @router.post("/login", response_model=TokenResponse, status_code=status.HTTP_200_OK)
 def login(
     payload: LoginRequest,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_shared_session),
 ) -> TokenResponse:
     try:
         result = auth_service.authenticate_user(
@@ -0,0 +1,50 @@
+import uuid
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import Session
+
+from backend.src.api.dependencies import get_current_user
+from backend.src.core.tracing import TracedRoute
+from backend.src.db.session import get_read_session
+from backend.src.models.user import User
+from backend.src.services import change_feed_service
+
+router = APIRouter(prefix="/changes", tags=["changes"], route_class=TracedRoute)
+
+
+class ChangeResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    seq: int
+    entity: str
+    id: uuid.UUID
+    op: str
+    data: dict[str, Any]
+    changed_at: datetime
+
+
+class ChangePageResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    changes: list[ChangeResponse]
+    next_since: int
+    has_more: bool
+
+
+@router.get("", response_model=ChangePageResponse)
+def list_changes(
+    since: int = Query(default=0, ge=0, description="Last seq the client has applied."),
+    limit: int = Query(default=100, ge=1, le=change_feed_service.MAX_LIMIT),
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+) -> ChangePageResponse:
+    page = change_feed_service.list_changes(
+        session,
+        organization_id=current_user.organization_id,
+        since=since,
+        limit=limit,
+    )
+    return ChangePageResponse.model_validate(page)
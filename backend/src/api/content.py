@@ -0,0 +1,157 @@
+import re
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from backend.src.api.dependencies import get_current_user, load_document
+from backend.src.core.settings import load_settings
+from backend.src.core.tracing import TracedRoute
+from backend.src.db.session import get_read_session, get_session
+from backend.src.models.user import User
+from backend.src.services import content_service
+from backend.src.services.blob_storage import (
+    BlobStorageError,
+    BlobStore,
+    BlobTooLargeError,
+    get_blob_store,
+)
+
+router = APIRouter(
+    prefix="/documents/{document_id}/content",
+    tags=["content"],
+    route_class=TracedRoute,
+)
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+_DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+
+class DocumentContentResponse(BaseModel):
+    document_id: uuid.UUID
+    sha256: str
+    size: int
+    content_type: str
+    deduplicated: bool
+
+
+def _map_content_error(error: Exception) -> HTTPException:
+    if isinstance(error, content_service.DocumentNotFoundError):
+        return HTTPException(status_code=404, detail=str(error))
+    if isinstance(error, content_service.ContentNotFoundError):
+        return HTTPException(status_code=404, detail=str(error))
+    if isinstance(error, BlobTooLargeError):
+        return HTTPException(status_code=413, detail=str(error))
+    return HTTPException(status_code=400, detail="Invalid content request.")
+
+
+@router.put("", response_model=DocumentContentResponse)
+async def upload_content(
+    document_id: uuid.UUID,
+    request: Request,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+    store: BlobStore = Depends(get_blob_store),
+) -> DocumentContentResponse:
+    await run_in_threadpool(load_document, session, document_id, current_user, fields=())
+
+    writer = store.open_writer(max_size=load_settings().storage_max_upload_bytes)
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(writer.write, chunk)
+        stored = await run_in_threadpool(writer.commit)
+    except BlobStorageError as error:
+        writer.abort()
+        raise _map_content_error(error) from error
+    except BaseException:
+        writer.abort()
+        raise
+
+    content_type = request.headers.get("content-type") or _DEFAULT_CONTENT_TYPE
+    try:
+        content = await run_in_threadpool(
+            content_service.attach_content,
+            session,
+            document_id=document_id,
+            stored=stored,
+            content_type=content_type,
+        )
+    except content_service.ContentError as error:
+        raise _map_content_error(error) from error
+    return DocumentContentResponse(
+        document_id=content.document.id,
+        sha256=content.blob.sha256,
+        size=content.blob.size,
+        content_type=content_type,
+        deduplicated=stored.deduplicated,
+    )
+
+
+@router.get("")
+def download_content(
+    document_id: uuid.UUID,
+    request: Request,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+    store: BlobStore = Depends(get_blob_store),
+) -> Response:
+    load_document(session, document_id, current_user, fields=())
+    try:
+        content = content_service.get_content(session, document_id=document_id)
+    except content_service.ContentError as error:
+        raise _map_content_error(error) from error
+
+    sha256 = content.blob.sha256
+    media_type = content.document.content_type or _DEFAULT_CONTENT_TYPE
+    headers = {"ETag": f'"{sha256}"', "Cache-Control": "private, max-age=31536000, immutable"}
+
+    path = store.local_path(sha256)
+    if path is not None:
+        # FileResponse handles Range/If-Range and uses http.response.pathsend
+        # (sendfile) when the server supports it.
+        return FileResponse(path, media_type=media_type, headers=headers)
+
+    try:
+        size = store.size(sha256)
+    except BlobStorageError as error:
+        raise HTTPException(status_code=404, detail=str(error)) from error
+    byte_range = _parse_range(request.headers.get("range"), size)
+    headers["Accept-Ranges"] = "bytes"
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(store.iter_range(sha256), media_type=media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    headers["Content-Length"] = str(end - start)
+    return StreamingResponse(
+        store.iter_range(sha256, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+def _parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into a half-open interval."""
+    if not header:
+        return None
+    match = _RANGE_PATTERN.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(size - int(last), 0), size
+    else:
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+    if start >= size or start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
@@ -0,0 +1,108 @@
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import Session
+
+from backend.src.api.dependencies import get_current_user
+from backend.src.core.tracing import TracedRoute
+from backend.src.db.session import get_read_session, get_session, get_shared_read_session
+from backend.src.models.user import User
+from backend.src.services import delegation_service
+
+router = APIRouter(prefix="/delegations", tags=["delegations"], route_class=TracedRoute)
+
+
+class DelegationRequest(BaseModel):
+    delegate_id: uuid.UUID
+    starts_at: datetime
+    ends_at: datetime
+    # Defaults to the caller; only administrators may delegate for others.
+    delegator_id: uuid.UUID | None = None
+
+
+class DelegationResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    delegator_id: uuid.UUID
+    delegate_id: uuid.UUID
+    starts_at: datetime
+    ends_at: datetime
+    created_at: datetime
+
+
+def _map_delegation_error(error: Exception) -> HTTPException:
+    if isinstance(error, delegation_service.DelegationNotFoundError):
+        return HTTPException(status_code=404, detail=str(error))
+    if isinstance(error, delegation_service.InvalidDelegationError):
+        return HTTPException(status_code=422, detail=str(error))
+    if isinstance(error, delegation_service.UnknownUserError):
+        return HTTPException(status_code=422, detail=str(error))
+    return HTTPException(status_code=400, detail="Invalid delegation request.")
+
+
+def _forbidden() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Only administrators may manage other users' delegations.",
+    )
+
+
+@router.post("", response_model=DelegationResponse, status_code=status.HTTP_201_CREATED)
+def create_delegation(
+    payload: DelegationRequest,
+    session: Session = Depends(get_session),
+    users: Session = Depends(get_shared_read_session),
+    current_user: User = Depends(get_current_user),
+) -> DelegationResponse:
+    delegator_id = payload.delegator_id or current_user.id
+    if delegator_id != current_user.id and not current_user.is_admin:
+        raise _forbidden()
+    try:
+        delegation = delegation_service.create_delegation(
+            session,
+            users=users,
+            organization_id=current_user.organization_id,
+            delegator_id=delegator_id,
+            delegate_id=payload.delegate_id,
+            starts_at=payload.starts_at,
+            ends_at=payload.ends_at,
+        )
+    except delegation_service.DelegationError as error:
+        raise _map_delegation_error(error) from error
+    return delegation
+
+
+@router.get("", response_model=list[DelegationResponse])
+def list_delegations(
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+) -> list[DelegationResponse]:
+    """Delegations that have not ended: all of them for administrators, else the caller's."""
+    return delegation_service.list_delegations(
+        session,
+        organization_id=current_user.organization_id,
+        delegator_id=None if current_user.is_admin else current_user.id,
+    )
+
+
+@router.delete("/{delegation_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_delegation(
+    delegation_id: uuid.UUID,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    try:
+        delegation = delegation_service.get_delegation(
+            session,
+            delegation_id=delegation_id,
+            organization_id=current_user.organization_id,
+        )
+    except delegation_service.DelegationError as error:
+        raise _map_delegation_error(error) from error
+    if delegation.delegator_id != current_user.id and not current_user.is_admin:
+        raise _forbidden()
+    delegation_service.delete_delegation(session, delegation)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,14 +1,19 @@
 import uuid
+from collections.abc import Sequence
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from backend.src.core.security import decode_access_token
-from backend.src.db.session import get_session
+from backend.src.core.tracing import traced
+from backend.src.db import queries
+from backend.src.db.session import get_shared_read_session
+from backend.src.models.document import Document
+from backend.src.models.document_archive import ArchivedDocument
 from backend.src.models.user import User
+from backend.src.services import document_service
 
 _bearer_scheme = HTTPBearer(auto_error=False)
 
@@ -21,8 +26,9 @@ def _credentials_exception() -> HTTPException:
     )
 
 
+@traced
 def get_current_user(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_shared_read_session),
     credentials: HTTPAuthorizationCredentials | None = Depends(_bearer_scheme),
 ) -> User:
     if credentials is None or credentials.scheme.lower() != "bearer":
@@ -42,9 +48,43 @@ def get_current_user(
     except ValueError:
         raise _credentials_exception()
 
-    statement = select(User).where(User.id == user_id)
-    user = session.scalars(statement).first()
+    user = session.scalars(queries.USER_BY_ID, {"user_id": user_id}).first()
     if user is None or not user.is_active:
         raise _credentials_exception()
 
     return user
+
+
+def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator privileges are required.",
+        )
+    return current_user
+
+
+def load_document(
+    session: Session,
+    document_id: uuid.UUID,
+    current_user: User,
+    *,
+    include_archived: bool = True,
+    fields: Sequence[str] | None = None,
+    include: Sequence[str] = (),
+) -> Document | ArchivedDocument:
+    """Load a document of the caller's organization, or fail with 404.
+
+    Every document-scoped route goes through here, so a document of another
+    organization is indistinguishable from one that does not exist.
+    """
+    document = document_service.get_document(
+        session,
+        document_id=document_id,
+        include_archived=include_archived,
+        fields=fields,
+        include=include,
+    )
+    if document is None or document.organization_id != current_user.organization_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found.")
+    return document
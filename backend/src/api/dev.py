@@ -1,14 +1,19 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from backend.src.db.session import get_session
+from backend.src.db.session import get_shared_session
 from backend.src.models.user import User
 from backend.src.core.security import get_password_hash
+from backend.src.core.tracing import TracedRoute
 
-router = APIRouter(prefix="/dev", tags=["dev"])
+router = APIRouter(prefix="/dev", tags=["dev"], route_class=TracedRoute)
 
 @router.post("/create-user")
-def create_user(email: str, password: str, session: Session = Depends(get_session)):
+def create_user(
+    email: str,
+    password: str,
+    session: Session = Depends(get_shared_session),
+):
     user = User(
         email=email,
         hashed_password=get_password_hash(password),
@@ -18,3 +23,4 @@ def create_user(email: str, password: str, session: Session = Depends(get_sessio
     session.commit()
     session.refresh(user)
     return {"id": str(user.id), "email": user.email}
+
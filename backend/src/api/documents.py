@@ -1,21 +1,27 @@
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
-from backend.src.api.dependencies import get_current_user
-from backend.src.db.session import get_session
-from backend.src.models.document import DocumentStatus
+from backend.src.api.approvals import ApprovalStepResponse
+from backend.src.api.audit import AuditLogResponse
+from backend.src.api.dependencies import get_current_user, load_document
+from backend.src.core.tracing import TracedRoute
+from backend.src.db.session import get_read_session, get_session, get_shared_read_session
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.document_archive import ArchivedDocument
 from backend.src.models.user import User
-from backend.src.services import document_service
+from backend.src.services import document_service, search_service, workflow_service
 
-router = APIRouter(prefix="/documents", tags=["documents"])
+router = APIRouter(prefix="/documents", tags=["documents"], route_class=TracedRoute)
 
 
 class DocumentCreateRequest(BaseModel):
     title: str = Field(min_length=1, max_length=255)
+    workflow_template_id: uuid.UUID | None = None
 
 
 class DocumentResponse(BaseModel):
@@ -27,6 +33,57 @@ class DocumentResponse(BaseModel):
     created_at: datetime
 
 
+class DocumentViewResponse(BaseModel):
+    """A document with the fields picked by ``fields=`` and the relations in ``include=``."""
+
+    id: uuid.UUID
+    title: str | None = None
+    status: DocumentStatus | None = None
+    created_at: datetime | None = None
+    steps: list[ApprovalStepResponse] | None = None
+    audit: list[AuditLogResponse] | None = None
+
+
+SELECTABLE_FIELDS = ("id", "title", "status", "created_at")
+_FIELDS_QUERY = Query(
+    default=None,
+    description=f"Comma-separated subset of: {', '.join(SELECTABLE_FIELDS)}.",
+)
+_INCLUDE_QUERY = Query(
+    default=None,
+    description=f"Comma-separated relations to embed: {', '.join(document_service.DOCUMENT_RELATIONS)}.",
+)
+
+
+def _parse_names(value: str | None, allowed, parameter: str) -> list[str] | None:
+    """Parse a comma-separated list; an empty value counts as not given."""
+    if value is None:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {parameter}: {', '.join(unknown)}. Choose from {', '.join(allowed)}.",
+        )
+    return names or None
+
+
+def _document_view(
+    document: Document | ArchivedDocument | Row,
+    fields: list[str] | None,
+    include: list[str],
+) -> DocumentViewResponse:
+    names = SELECTABLE_FIELDS if fields is None else fields
+    view = {name: getattr(document, name) for name in names}
+    view["id"] = document.id
+    if "steps" in include:
+        view["steps"] = [ApprovalStepResponse.model_validate(step) for step in document.steps]
+    if "audit" in include:
+        view["audit"] = [AuditLogResponse.model_validate(entry) for entry in document.audit_entries]
+    return DocumentViewResponse(**view)
+
+
 @router.post(
     "",
     response_model=DocumentResponse,
@@ -35,28 +92,133 @@ class DocumentResponse(BaseModel):
 def create_document(
     payload: DocumentCreateRequest,
     session: Session = Depends(get_session),
+    users: Session = Depends(get_shared_read_session),
     current_user: User = Depends(get_current_user),
 ) -> DocumentResponse:
-    document = document_service.create_document(session, title=payload.title)
+    try:
+        document = document_service.create_document(
+            session,
+            title=payload.title,
+            workflow_template_id=payload.workflow_template_id,
+            created_by=current_user.id,
+            organization_id=current_user.organization_id,
+            users=users,
+        )
+    except workflow_service.TemplateNotFoundError as error:
+        raise HTTPException(status_code=404, detail=str(error)) from error
+    except workflow_service.InvalidTemplateError as error:
+        raise HTTPException(status_code=422, detail=str(error)) from error
+    except workflow_service.WorkflowError as error:
+        raise HTTPException(status_code=409, detail=str(error)) from error
     return document
 
 
-@router.get("/{document_id}", response_model=DocumentResponse)
+class DocumentStatsResponse(BaseModel):
+    pending: int
+    approved: int
+    rejected: int
+    total: int
+
+
+@router.get("/stats", response_model=DocumentStatsResponse)
+def get_document_stats(
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+) -> DocumentStatsResponse:
+    counts = document_service.get_status_counts(
+        session, organization_id=current_user.organization_id
+    )
+    return DocumentStatsResponse(
+        pending=counts[DocumentStatus.PENDING],
+        approved=counts[DocumentStatus.APPROVED],
+        rejected=counts[DocumentStatus.REJECTED],
+        total=sum(counts.values()),
+    )
+
+
+class DocumentSearchHit(DocumentResponse):
+    score: float
+
+
+class DocumentSearchResponse(BaseModel):
+    items: list[DocumentSearchHit]
+    next_cursor: str | None
+
+
+@router.get("/search", response_model=DocumentSearchResponse)
+def search_documents(
+    q: str = Query(min_length=1, max_length=255),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = None,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+) -> DocumentSearchResponse:
+    try:
+        page = document_service.search_documents(
+            session,
+            query=q,
+            limit=limit,
+            cursor=cursor,
+            organization_id=current_user.organization_id,
+        )
+    except search_service.SearchError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    items = [
+        DocumentSearchHit(
+            id=hit.document.id,
+            title=hit.document.title,
+            status=hit.document.status,
+            created_at=hit.document.created_at,
+            score=hit.score,
+        )
+        for hit in page.hits
+    ]
+    return DocumentSearchResponse(items=items, next_cursor=page.next_cursor)
+
+
+@router.get(
+    "/{document_id}",
+    response_model=DocumentViewResponse,
+    response_model_exclude_unset=True,
+)
 def get_document(
     document_id: uuid.UUID,
-    session: Session = Depends(get_session),
+    fields: str | None = _FIELDS_QUERY,
+    include: str | None = _INCLUDE_QUERY,
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
-) -> DocumentResponse:
-    document = document_service.get_document(session, document_id=document_id)
-    if document is None:
-        raise HTTPException(status_code=404, detail="Document not found.")
-    return document
+) -> DocumentViewResponse:
+    selected = _parse_names(fields, SELECTABLE_FIELDS, "fields")
+    relations = _parse_names(include, document_service.DOCUMENT_RELATIONS, "include") or []
+    document = load_document(
+        session,
+        document_id,
+        current_user,
+        fields=selected,
+        include=relations,
+    )
+    return _document_view(document, selected, relations)
 
 
-@router.get("", response_model=list[DocumentResponse])
+@router.get(
+    "",
+    response_model=list[DocumentViewResponse],
+    response_model_exclude_unset=True,
+)
 def list_documents(
-    session: Session = Depends(get_session),
+    include_archived: bool = False,
+    fields: str | None = _FIELDS_QUERY,
+    include: str | None = _INCLUDE_QUERY,
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
-) -> list[DocumentResponse]:
-    documents = document_service.list_documents(session)
-    return documents
+) -> list[DocumentViewResponse]:
+    selected = _parse_names(fields, SELECTABLE_FIELDS, "fields")
+    relations = _parse_names(include, document_service.DOCUMENT_RELATIONS, "include") or []
+    documents = document_service.list_documents(
+        session,
+        organization_id=current_user.organization_id,
+        include_archived=include_archived,
+        fields=selected,
+        include=relations,
+    )
+    return [_document_view(document, selected, relations) for document in documents]
@@ -0,0 +1,137 @@
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import Session
+
+from backend.src.api.dependencies import get_current_user, load_document
+from backend.src.core.settings import load_settings
+from backend.src.core.tracing import TracedRoute
+from backend.src.db.session import get_read_session, get_session
+from backend.src.models.document_revision import RevisionStorage
+from backend.src.models.user import User
+from backend.src.services import revision_service
+
+router = APIRouter(
+    prefix="/documents/{document_id}/revisions",
+    tags=["revisions"],
+    route_class=TracedRoute,
+)
+
+DELTA_MEDIA_TYPE = "application/vnd.docengine.delta"
+
+
+class RevisionResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    number: int
+    storage: RevisionStorage
+    size: int
+    stored_size: int
+    sha256: str
+    created_by: uuid.UUID | None
+    created_at: datetime
+
+
+def _map_revision_error(error: Exception) -> HTTPException:
+    if isinstance(error, revision_service.DocumentNotFoundError):
+        return HTTPException(status_code=404, detail=str(error))
+    if isinstance(error, revision_service.RevisionNotFoundError):
+        return HTTPException(status_code=404, detail=str(error))
+    if isinstance(error, revision_service.RevisionStateError):
+        return HTTPException(status_code=409, detail=str(error))
+    return HTTPException(status_code=400, detail="Invalid revision request.")
+
+
+async def _read_upload(request: Request, max_size: int) -> bytes:
+    """Read the request body, refusing it with 413 once it passes ``max_size``."""
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Revision content exceeds {max_size} bytes.",
+    )
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_size:
+        raise too_large
+    content = bytearray()
+    async for chunk in request.stream():
+        if len(content) + len(chunk) > max_size:
+            raise too_large
+        content += chunk
+    return bytes(content)
+
+
+@router.post("", response_model=RevisionResponse, status_code=status.HTTP_201_CREATED)
+async def create_revision(
+    document_id: uuid.UUID,
+    request: Request,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> RevisionResponse:
+    await run_in_threadpool(load_document, session, document_id, current_user, fields=())
+    content = await _read_upload(request, load_settings().storage_max_upload_bytes)
+    try:
+        revision = await run_in_threadpool(
+            revision_service.create_revision,
+            session,
+            document_id=document_id,
+            content=content,
+            created_by=current_user.id,
+        )
+    except revision_service.RevisionError as error:
+        raise _map_revision_error(error) from error
+    return revision
+
+
+@router.get("", response_model=list[RevisionResponse])
+def list_revisions(
+    document_id: uuid.UUID,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+) -> list[RevisionResponse]:
+    load_document(session, document_id, current_user, fields=())
+    return revision_service.list_revisions(session, document_id=document_id)
+
+
+@router.get("/diff")
+def diff_since(
+    document_id: uuid.UUID,
+    since: int = Query(ge=1),
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    load_document(session, document_id, current_user, fields=())
+    try:
+        diff = revision_service.diff_since(session, document_id=document_id, since=since)
+    except revision_service.RevisionError as error:
+        raise _map_revision_error(error) from error
+    return StreamingResponse(
+        diff.chunks,
+        media_type=DELTA_MEDIA_TYPE,
+        headers={
+            "X-Revision-From": str(diff.from_number),
+            "X-Revision-To": str(diff.to_number),
+            "X-Target-Length": str(diff.target_size),
+        },
+    )
+
+
+@router.get("/{number}")
+def get_revision(
+    document_id: uuid.UUID,
+    number: int,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    load_document(session, document_id, current_user, fields=())
+    try:
+        content = revision_service.get_revision_content(
+            session,
+            document_id=document_id,
+            number=number,
+        )
+    except revision_service.RevisionError as error:
+        raise _map_revision_error(error) from error
+    return Response(content, media_type="application/octet-stream")
@@ -0,0 +1,92 @@
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy.orm import Session
+
+from backend.src.api.dependencies import get_current_user, require_admin
+from backend.src.core.tracing import TracedRoute
+from backend.src.db.session import get_read_session, get_session
+from backend.src.models.user import User
+from backend.src.services import webhook_service
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"], route_class=TracedRoute)
+
+
+class WebhookSubscriptionRequest(BaseModel):
+    event_type: str = Field(min_length=1, max_length=100)
+    url: str = Field(min_length=1, max_length=2048)
+    secret: str | None = Field(default=None, min_length=16, max_length=255)
+    max_batch_size: int = Field(default=1, ge=1, le=webhook_service.MAX_BATCH_SIZE)
+
+
+class WebhookSubscriptionResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    event_type: str
+    url: str
+    max_batch_size: int
+    is_active: bool
+    created_at: datetime
+
+
+def _map_webhook_error(error: Exception) -> HTTPException:
+    if isinstance(error, webhook_service.SubscriptionNotFoundError):
+        return HTTPException(status_code=404, detail=str(error))
+    if isinstance(error, webhook_service.InvalidSubscriptionError):
+        return HTTPException(status_code=422, detail=str(error))
+    return HTTPException(status_code=400, detail="Invalid webhook request.")
+
+
+@router.post(
+    "",
+    response_model=WebhookSubscriptionResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_subscription(
+    payload: WebhookSubscriptionRequest,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(require_admin),
+) -> WebhookSubscriptionResponse:
+    try:
+        subscription = webhook_service.create_subscription(
+            session,
+            organization_id=current_user.organization_id,
+            event_type=payload.event_type,
+            url=payload.url,
+            secret=payload.secret,
+            max_batch_size=payload.max_batch_size,
+        )
+    except webhook_service.WebhookError as error:
+        raise _map_webhook_error(error) from error
+    return subscription
+
+
+@router.get("", response_model=list[WebhookSubscriptionResponse])
+def list_subscriptions(
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+) -> list[WebhookSubscriptionResponse]:
+    return webhook_service.list_subscriptions(
+        session,
+        organization_id=current_user.organization_id,
+    )
+
+
+@router.delete("/{subscription_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_subscription(
+    subscription_id: uuid.UUID,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(require_admin),
+) -> Response:
+    try:
+        webhook_service.delete_subscription(
+            session,
+            subscription_id=subscription_id,
+            organization_id=current_user.organization_id,
+        )
+    except webhook_service.WebhookError as error:
+        raise _map_webhook_error(error) from error
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
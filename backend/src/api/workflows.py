@@ -0,0 +1,104 @@
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy.orm import Session
+
+from backend.src.api.approvals import ApprovalStepResponse
+from backend.src.api.dependencies import get_current_user, load_document, require_admin
+from backend.src.core.tracing import TracedRoute
+from backend.src.db.session import get_session, get_shared_read_session
+from backend.src.models.user import User
+from backend.src.services import workflow_service
+
+router = APIRouter(tags=["workflows"], route_class=TracedRoute)
+
+
+class WorkflowStageRequest(BaseModel):
+    mode: workflow_service.StageMode = workflow_service.StageMode.ALL
+    approvers: list[uuid.UUID] = Field(min_length=1)
+    quorum: int | None = Field(default=None, ge=1)
+
+
+class WorkflowTemplateCreateRequest(BaseModel):
+    name: str = Field(min_length=1, max_length=255)
+    stages: list[WorkflowStageRequest] = Field(min_length=1)
+
+
+class WorkflowTemplateResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    name: str
+    version: int
+    definition: dict
+    created_at: datetime
+
+
+class WorkflowStartRequest(BaseModel):
+    template_id: uuid.UUID
+
+
+def _map_workflow_error(error: Exception) -> HTTPException:
+    if isinstance(error, workflow_service.TemplateNotFoundError):
+        return HTTPException(status_code=404, detail=str(error))
+    if isinstance(error, workflow_service.InvalidTemplateError):
+        return HTTPException(status_code=422, detail=str(error))
+    if isinstance(error, workflow_service.WorkflowStateError):
+        return HTTPException(status_code=409, detail=str(error))
+    if isinstance(error, workflow_service.TemplateConflictError):
+        return HTTPException(status_code=409, detail=str(error))
+    return HTTPException(status_code=400, detail="Invalid workflow request.")
+
+
+@router.post(
+    "/workflows",
+    response_model=WorkflowTemplateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_workflow_template(
+    payload: WorkflowTemplateCreateRequest,
+    session: Session = Depends(get_session),
+    users: Session = Depends(get_shared_read_session),
+    current_user: User = Depends(require_admin),
+) -> WorkflowTemplateResponse:
+    definition = payload.model_dump(mode="json", exclude_none=True, include={"stages"})
+    try:
+        template = workflow_service.create_template(
+            session,
+            users=users,
+            name=payload.name,
+            definition=definition,
+            organization_id=current_user.organization_id,
+        )
+    except workflow_service.WorkflowError as error:
+        raise _map_workflow_error(error) from error
+    return template
+
+
+@router.post(
+    "/documents/{document_id}/workflow",
+    response_model=list[ApprovalStepResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def start_document_workflow(
+    document_id: uuid.UUID,
+    payload: WorkflowStartRequest,
+    session: Session = Depends(get_session),
+    users: Session = Depends(get_shared_read_session),
+    current_user: User = Depends(get_current_user),
+) -> list[ApprovalStepResponse]:
+    document = load_document(session, document_id, current_user, include_archived=False)
+    try:
+        steps = workflow_service.start_workflow(
+            session,
+            users=users,
+            document=document,
+            template_id=payload.template_id,
+        )
+    except workflow_service.WorkflowError as error:
+        session.rollback()
+        raise _map_workflow_error(error) from error
+    session.commit()
+    return steps
@@ -0,0 +1,76 @@
+"""Create an organization and choose where its data lives.
+
+Run from the repository root:
+
+    python -m backend.src.cli.create_organization "Acme" --schema acme
+
+Without ``--schema`` or ``--tenant-database-url`` the organization shares
+the primary tables. Placement is an operator decision, so it is not
+exposed over HTTP.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from backend.src.db import session as db_session
+from backend.src.db.tenancy import InvalidPlacementError, validate_schema_name
+from backend.src.models.base import Base
+from backend.src.models.organization import Organization
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("name")
+    placement = parser.add_mutually_exclusive_group()
+    placement.add_argument("--schema", help="Dedicated Postgres schema in the shared database.")
+    placement.add_argument("--tenant-database-url", help="Dedicated database for the organization.")
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        help="Concurrent sessions the organization may hold.",
+    )
+    parser.add_argument(
+        "--database-url",
+        help="Shared database; defaults to DOCENGINE_DATABASE_URL.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.max_connections is not None and args.max_connections < 1:
+        parser.error("--max-connections must be at least 1.")
+    if args.schema is not None:
+        try:
+            validate_schema_name(args.schema)
+        except InvalidPlacementError as error:
+            parser.error(str(error))
+
+    engine = db_session.engine
+    if args.database_url:
+        engine = create_engine(args.database_url)
+        Base.metadata.create_all(engine)
+    try:
+        with Session(engine) as session:
+            if session.scalar(select(Organization.id).where(Organization.name == args.name)):
+                print(f"An organization named {args.name} already exists.", file=sys.stderr)
+                return 1
+            organization = Organization(
+                name=args.name,
+                database_url=args.tenant_database_url,
+                schema_name=args.schema,
+                max_connections=args.max_connections,
+            )
+            session.add(organization)
+            session.commit()
+            print(organization.id)
+    finally:
+        if args.database_url:
+            engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
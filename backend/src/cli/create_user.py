@@ -0,0 +1,75 @@
+"""Create a user, optionally an organization's administrator.
+
+Run from the repository root:
+
+    python -m backend.src.cli.create_user admin@example.com \
+        --organization-id 0b6f... --admin
+
+The password is read from the terminal. This is how the first
+administrator of an organization is created; later ones are granted
+through ``PUT /admin/users/{user_id}/admin``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import getpass
+import sys
+import uuid
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from backend.src.core.security import get_password_hash
+from backend.src.db import session as db_session
+from backend.src.models.base import Base
+from backend.src.models.organization import Organization
+from backend.src.models.user import User
+
+
+def main(argv: list[str] | None = None, *, read_password=getpass.getpass) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("email")
+    parser.add_argument("--organization-id", type=uuid.UUID)
+    parser.add_argument("--admin", action="store_true", help="Grant administrator rights.")
+    parser.add_argument(
+        "--database-url",
+        help="Shared database; defaults to DOCENGINE_DATABASE_URL.",
+    )
+    args = parser.parse_args(argv)
+
+    engine = db_session.engine
+    if args.database_url:
+        engine = create_engine(args.database_url)
+        Base.metadata.create_all(engine)
+    try:
+        with Session(engine) as session:
+            if args.organization_id is not None and session.get(Organization, args.organization_id) is None:
+                print(f"Organization {args.organization_id} was not found.", file=sys.stderr)
+                return 1
+            taken = session.scalar(select(User.id).where(func.lower(User.email) == args.email.lower()))
+            if taken is not None:
+                print(f"A user with email {args.email} already exists.", file=sys.stderr)
+                return 1
+            password = read_password("Password: ")
+            if not password:
+                print("The password must not be empty.", file=sys.stderr)
+                return 1
+            user = User(
+                email=args.email,
+                hashed_password=get_password_hash(password),
+                is_active=True,
+                is_admin=args.admin,
+                organization_id=args.organization_id,
+            )
+            session.add(user)
+            session.commit()
+            print(user.id)
+    finally:
+        if args.database_url:
+            engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""Streaming response compression middleware."""
+
+from __future__ import annotations
+
+import zlib
+from typing import Callable, Iterable, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # pragma: no cover - optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+DEFAULT_CONTENT_TYPES = frozenset(
+    {
+        "application/json",
+        "application/x-ndjson",
+        "text/csv",
+        "text/html",
+        "text/plain",
+    }
+)
+DEFAULT_ENCODINGS = ("zstd", "br", "gzip")
+
+
+class Compressor(Protocol):
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it immediately."""
+
+    def finish(self) -> bytes:
+        """Return the trailing bytes of the compressed stream."""
+
+
+class GzipCompressor:
+    def __init__(self, level: int = 6) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, level: int = 4) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int = 3) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encodings() -> dict[str, Callable[[], Compressor]]:
+    """Return compressor factories for every encoding usable in this process."""
+    factories: dict[str, Callable[[], Compressor]] = {"gzip": GzipCompressor}
+    if brotli is not None:
+        factories["br"] = BrotliCompressor
+    if zstandard is not None:
+        factories["zstd"] = ZstdCompressor
+    return factories
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into a mapping of coding to q-value."""
+    accepted: dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+class CompressionMiddleware:
+    """Compress eligible HTTP responses chunk by chunk.
+
+    The decision to compress is made once at least ``minimum_size`` bytes of
+    body have been seen (or the response ends), so small responses pass
+    through untouched and streaming responses are never buffered beyond the
+    threshold.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 500,
+        content_types: Iterable[str] = DEFAULT_CONTENT_TYPES,
+        encodings: Iterable[str] = DEFAULT_ENCODINGS,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = frozenset(ct.strip().lower() for ct in content_types if ct.strip())
+        factories = available_encodings()
+        names = [name.strip().lower() for name in encodings]
+        self.encodings = {name: factories[name] for name in names if name in factories}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    def _negotiate(self, header: str) -> str | None:
+        if not header:
+            return None
+        accepted = parse_accept_encoding(header)
+        wildcard = accepted.get("*", 0.0)
+        best: str | None = None
+        best_quality = 0.0
+        for name in self.encodings:
+            quality = accepted.get(name, wildcard)
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def is_compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        if content_type not in self.content_types:
+            return False
+        content_length = headers.get("content-length")
+        if content_length is not None and int(content_length) < self.minimum_size:
+            return False
+        return True
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, send: Send, encoding: str) -> None:
+        self.middleware = middleware
+        self.downstream = send
+        self.encoding = encoding
+        self.start_message: Message | None = None
+        self.buffered: list[bytes] = []
+        self.buffered_size = 0
+        self.compressor: Compressor | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            status = message["status"]
+            headers = Headers(raw=message["headers"])
+            if status < 200 or status in (204, 206, 304) or not self.middleware.is_compressible(headers):
+                self.passthrough = True
+                await self.downstream(message)
+            return
+
+        if self.passthrough:
+            await self.downstream(message)
+            return
+        if message_type != "http.response.body":
+            # e.g. http.response.pathsend: the body never passes through us.
+            if self.compressor is None:
+                self.passthrough = True
+                await self.downstream(self.start_message)
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            payload = self.compressor.compress(body) if body else b""
+            if not more_body:
+                payload += self.compressor.finish()
+            if payload or not more_body:
+                await self.downstream(
+                    {"type": "http.response.body", "body": payload, "more_body": more_body}
+                )
+            return
+
+        self.buffered.append(body)
+        self.buffered_size += len(body)
+        if more_body and self.buffered_size < self.middleware.minimum_size:
+            return
+
+        pending = b"".join(self.buffered)
+        self.buffered = []
+        if not more_body and self.buffered_size < self.middleware.minimum_size:
+            self.passthrough = True
+            await self.downstream(self.start_message)
+            await self.downstream({"type": "http.response.body", "body": pending, "more_body": False})
+            return
+
+        self.compressor = self.middleware.encodings[self.encoding]()
+        payload = self.compressor.compress(pending)
+        if not more_body:
+            payload += self.compressor.finish()
+
+        headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(payload))
+        await self.downstream({**self.start_message, "headers": headers.raw})
+        await self.downstream({"type": "http.response.body", "body": payload, "more_body": more_body})
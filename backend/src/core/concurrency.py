@@ -0,0 +1,225 @@
+"""Adaptive concurrency limiting with priority-based load shedding.
+
+The limit on concurrently served requests follows AIMD (additive increase,
+multiplicative decrease), like TCP congestion control: every request that
+finishes within the latency target while the server is busy nudges the
+limit up by ``1/limit`` (about one slot per window), and a slow or timed
+out request cuts it by ``backoff``, at most once per latency target so a
+burst of slow completions counts as one congestion signal.
+
+Routes that are slow by design (password hashing on login, content
+uploads) would read as congestion against a target sized for ordinary
+requests, so they feed the decrease only through 503/504 responses unless
+a per-route target is configured for them.
+
+Requests are admitted per priority class against a share of the limit.
+Critical traffic (auth, approval decisions) may use all of it, sheddable
+traffic (listings, searches and exports) only half, so under pressure the
+cheap-to-retry reads are refused first. Refusals are immediate 503s with
+``Retry-After`` rather than queueing on the threadpool and connection pool.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from typing import Callable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.src.core import metrics
+from backend.src.core.deadline import route_template
+
+CRITICAL = "critical"
+NORMAL = "normal"
+SHEDDABLE = "sheddable"
+# Share of the current limit each priority class may occupy.
+PRIORITY_SHARES = {CRITICAL: 1.0, NORMAL: 0.8, SHEDDABLE: 0.5}
+# Never limited, so probes and scrapes work while the server is shedding.
+EXEMPT_ROUTES = frozenset({"/health", "/metrics"})
+# Statuses that mean the request ran out of time or capacity downstream.
+_OVERLOAD_STATUSES = frozenset({503, 504})
+
+_CRITICAL_ROUTES = frozenset(
+    {
+        ("POST", "/documents/{document_id}/steps/{step_id}/approve"),
+        ("POST", "/documents/{document_id}/steps/{step_id}/reject"),
+    }
+)
+# Slow by design; their latency says nothing about congestion.
+_SLOW_ROUTES = frozenset(
+    {
+        ("POST", "/auth/login"),
+        ("PUT", "/documents/{document_id}/content"),
+        ("POST", "/documents/{document_id}/revisions"),
+    }
+)
+_SHEDDABLE_ROUTES = frozenset(
+    {
+        ("GET", "/documents"),
+        ("GET", "/documents/search"),
+        ("GET", "/documents/{document_id}/audit"),
+        ("GET", "/documents/{document_id}/revisions"),
+        ("GET", "/audit"),
+        ("GET", "/changes"),
+    }
+)
+
+concurrency_limit = metrics.gauge(
+    "docengine_concurrency_limit",
+    "Current adaptive limit on concurrently served requests.",
+)
+concurrency_in_flight = metrics.gauge(
+    "docengine_concurrency_in_flight",
+    "Requests being served, by priority class.",
+    ("priority",),
+)
+requests_shed = metrics.counter(
+    "docengine_requests_shed_total",
+    "Requests refused by the concurrency limiter, by priority class.",
+    ("priority",),
+)
+
+
+def route_priority(method: str, route: str) -> str:
+    """Return the priority class of a route template."""
+    if route.startswith("/auth/") or (method, route) in _CRITICAL_ROUTES:
+        return CRITICAL
+    if (method, route) in _SHEDDABLE_ROUTES:
+        return SHEDDABLE
+    return NORMAL
+
+
+class AIMDLimiter:
+    """Concurrency limit that grows additively and shrinks multiplicatively."""
+
+    def __init__(
+        self,
+        *,
+        initial_limit: float,
+        min_limit: float,
+        max_limit: float,
+        latency_target: float,
+        backoff: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 0 < min_limit <= initial_limit <= max_limit.")
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.in_flight = 0
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        concurrency_limit.set(self.limit)
+
+    def try_acquire(self, priority: str) -> bool:
+        # Every class keeps at least one slot so it is never starved outright.
+        allowed = max(1.0, self.limit * PRIORITY_SHARES[priority])
+        if self.in_flight >= allowed:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(
+        self,
+        latency: float,
+        *,
+        overloaded: bool = False,
+        latency_target: float | None = None,
+    ) -> None:
+        """Record a finished request.
+
+        ``latency_target`` overrides the limiter's target for this request;
+        ``math.inf`` leaves only ``overloaded`` as a congestion signal.
+        """
+        busy = self.in_flight >= self.limit / 2
+        self.in_flight -= 1
+        now = self._clock()
+        target = self.latency_target if latency_target is None else latency_target
+        if overloaded or latency > target:
+            if now - self._last_decrease >= self.latency_target:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        elif busy:
+            # Only grow while the limit is actually being used; an idle
+            # server says nothing about how much load it can take.
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        concurrency_limit.set(self.limit)
+
+
+class ConcurrencyLimitMiddleware:
+    """Admit requests through an :class:`AIMDLimiter` by priority class.
+
+    Runs on the event loop, before a request takes a threadpool worker or a
+    database connection, so the limiter's state needs no locking.
+    ``route_latency_targets`` (seconds, keyed by method and route template)
+    replaces the limiter's target for those routes, including slow ones.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        limiter: AIMDLimiter,
+        retry_after_seconds: int = 1,
+        route_latency_targets: dict[tuple[str, str], float] | None = None,
+    ) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.retry_after_seconds = retry_after_seconds
+        self.route_latency_targets = route_latency_targets or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route = route_template(scope)
+        if route in EXEMPT_ROUTES:
+            await self.app(scope, receive, send)
+            return
+        priority = route_priority(scope["method"], route)
+        if not self.limiter.try_acquire(priority):
+            requests_shed.inc(priority=priority)
+            await _send_overloaded(send, self.retry_after_seconds)
+            return
+
+        status_code = 500
+        started = time.monotonic()
+
+        async def track(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        concurrency_in_flight.inc(priority=priority)
+        try:
+            await self.app(scope, receive, track)
+        finally:
+            concurrency_in_flight.dec(priority=priority)
+            self.limiter.release(
+                time.monotonic() - started,
+                overloaded=status_code in _OVERLOAD_STATUSES,
+                latency_target=self._latency_target(scope["method"], route),
+            )
+
+    def _latency_target(self, method: str, route: str) -> float | None:
+        target = self.route_latency_targets.get((method, route))
+        if target is None and (method, route) in _SLOW_ROUTES:
+            return math.inf
+        return target
+
+
+async def _send_overloaded(send: Send, retry_after_seconds: int) -> None:
+    body = json.dumps({"detail": "Server is overloaded; retry later."}).encode("utf-8")
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("ascii")),
+        (b"retry-after", str(retry_after_seconds).encode("ascii")),
+    ]
+    await send({"type": "http.response.start", "status": 503, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,182 @@
+"""Per-request deadlines and the database timeouts derived from them."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from contextvars import ContextVar
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.src.core import metrics
+
+# Postgres SQLSTATEs raised by statement_timeout and lock_timeout.
+_QUERY_CANCELED = "57014"
+_LOCK_NOT_AVAILABLE = "55P03"
+
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+deadline_exceeded = metrics.counter(
+    "docengine_deadline_exceeded_total",
+    "Requests that ran out of their deadline, by route and cause.",
+    ("route", "cause"),
+)
+
+
+class DeadlineExceededError(RuntimeError):
+    """Raised when a request's deadline passes before database work starts."""
+
+
+def remaining() -> float | None:
+    """Seconds left for the current request, or ``None`` outside a deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def parse_route_deadlines(value: str) -> dict[tuple[str, str], float]:
+    """Parse ``"GET /documents=3,POST /documents/{document_id}/...=5"``.
+
+    Keys are the method and the route template as declared on the router.
+    """
+    deadlines: dict[tuple[str, str], float] = {}
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        route, _, seconds = entry.rpartition("=")
+        method, _, path = route.strip().partition(" ")
+        if not method or not path.strip() or not seconds:
+            raise ValueError(f"Invalid route deadline {entry!r}; expected 'METHOD /path=seconds'.")
+        deadlines[(method.upper(), path.strip())] = float(seconds)
+    return deadlines
+
+
+def classify(error: BaseException) -> str | None:
+    """Return the deadline cause behind a database error, if it is one.
+
+    ``statement_timeout`` covers Postgres statement cancellation and SQLite
+    interrupts; ``lock_timeout`` covers Postgres lock waits and SQLite busy
+    timeouts; ``pool_timeout`` is a wait for a pooled connection, such as
+    the single SQLite writer, that ran out.
+    """
+    if isinstance(error, DeadlineExceededError):
+        return "budget_exhausted"
+    if isinstance(error, PoolTimeoutError):
+        return "pool_timeout"
+    if not isinstance(error, OperationalError):
+        return None
+    original = error.orig
+    code = getattr(original, "sqlstate", None) or getattr(original, "pgcode", None)
+    if code == _QUERY_CANCELED:
+        return "statement_timeout"
+    if code == _LOCK_NOT_AVAILABLE:
+        return "lock_timeout"
+    if isinstance(original, sqlite3.OperationalError):
+        message = str(original)
+        if message == "interrupted":
+            return "statement_timeout"
+        if message.startswith("database is locked"):
+            return "lock_timeout"
+    return None
+
+
+class DeadlineMiddleware:
+    """Give each request a deadline and turn overruns into 503/504 responses.
+
+    The deadline is the route's entry in ``route_deadlines`` (keyed by
+    method and route template) or ``default_seconds``. Database sessions
+    read the remaining budget when a transaction begins (see
+    ``db.session``), so a slow query or lock wait fails once the budget is
+    spent instead of pinning a worker and a pooled connection. Lock and
+    connection-pool waits answer 503 with ``Retry-After``; exhausted budgets
+    and cancelled statements answer 504. Routes without a deadline still get
+    the 503 for lock and pool waits.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        default_seconds: float,
+        route_deadlines: dict[tuple[str, str], float] | None = None,
+    ) -> None:
+        self.app = app
+        self.default_seconds = default_seconds
+        self.route_deadlines = route_deadlines or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route = route_template(scope)
+        seconds = self.route_deadlines.get((scope["method"], route), self.default_seconds)
+
+        started = False
+
+        async def track(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        token = _deadline.set(time.monotonic() + seconds) if seconds > 0 else None
+        try:
+            await self.app(scope, receive, track)
+        except Exception as error:
+            cause = classify(error)
+            if cause is None or started:
+                raise
+            deadline_exceeded.inc(route=route, cause=cause)
+            if cause == "lock_timeout":
+                await _send_error(send, 503, "Timed out waiting for a database lock.", retry_after=True)
+            elif cause == "pool_timeout":
+                await _send_error(send, 503, "Timed out waiting for a database connection.", retry_after=True)
+            else:
+                await _send_error(send, 504, "Request deadline exceeded.")
+        finally:
+            if token is not None:
+                _deadline.reset(token)
+
+
+def route_template(scope: Scope) -> str:
+    """Return the template of the route that will serve ``scope``."""
+    return _match_template(getattr(scope.get("app"), "routes", ()), scope) or "unmatched"
+
+
+def _match_template(routes, scope: Scope) -> str | None:
+    for route in routes:
+        # FastAPI wraps included routers; their routes already carry the
+        # router prefix (the app includes them without an extra prefix).
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            template = _match_template(included.routes, scope)
+            if template is not None:
+                return template
+            continue
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", None)
+    return None
+
+
+async def _send_error(send: Send, status_code: int, detail: str, *, retry_after: bool = False) -> None:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("ascii")),
+    ]
+    if retry_after:
+        headers.append((b"retry-after", b"1"))
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
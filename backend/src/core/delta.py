@@ -0,0 +1,143 @@
+"""Binary delta encoding between two byte strings.
+
+A delta is a header followed by a sequence of operations:
+
+* ``C <offset> <length>`` copies ``length`` bytes from the source at ``offset``.
+* ``I <length> <bytes>`` inserts literal bytes.
+
+Integers are unsigned LEB128 varints. Matches are found with a block index
+over the source (rsync/xdelta style), so unchanged regions cost a few bytes
+regardless of their size.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator
+
+MAGIC = b"DDL1"
+BLOCK_SIZE = 16
+
+_COPY = b"C"
+_INSERT = b"I"
+
+
+class DeltaError(ValueError):
+    """Raised when a delta cannot be decoded or applied."""
+
+
+@dataclass(frozen=True)
+class Copy:
+    offset: int
+    length: int
+
+
+@dataclass(frozen=True)
+class Insert:
+    data: bytes
+
+
+def compute_ops(source: bytes, target: bytes, *, block_size: int = BLOCK_SIZE) -> Iterator[Copy | Insert]:
+    """Yield the operations that rebuild ``target`` from ``source``."""
+    index: dict[bytes, int] = {}
+    for offset in range(0, len(source) - block_size + 1, block_size):
+        index.setdefault(source[offset : offset + block_size], offset)
+
+    literal_start = 0
+    position = 0
+    limit = len(target) - block_size
+    while position <= limit:
+        offset = index.get(target[position : position + block_size])
+        if offset is None:
+            position += 1
+            continue
+
+        # Grow the match backwards into the pending literal, then forwards.
+        while position > literal_start and offset > 0 and source[offset - 1] == target[position - 1]:
+            offset -= 1
+            position -= 1
+        length = block_size
+        while (
+            offset + length < len(source)
+            and position + length < len(target)
+            and source[offset + length] == target[position + length]
+        ):
+            length += 1
+
+        if position > literal_start:
+            yield Insert(target[literal_start:position])
+        yield Copy(offset, length)
+        position += length
+        literal_start = position
+
+    if literal_start < len(target):
+        yield Insert(target[literal_start:])
+
+
+def iter_encode(source: bytes, target: bytes) -> Iterator[bytes]:
+    """Yield an encoded delta piece by piece, suitable for streaming."""
+    yield MAGIC + _varint(len(target))
+    for op in compute_ops(source, target):
+        if isinstance(op, Copy):
+            yield _COPY + _varint(op.offset) + _varint(op.length)
+        else:
+            yield _INSERT + _varint(len(op.data)) + op.data
+
+
+def encode(source: bytes, target: bytes) -> bytes:
+    return b"".join(iter_encode(source, target))
+
+
+def apply(source: bytes, delta: bytes) -> bytes:
+    """Rebuild the target from ``source`` and an encoded delta."""
+    if not delta.startswith(MAGIC):
+        raise DeltaError("Not a delta payload.")
+    view = memoryview(delta)
+    expected, position = _read_varint(view, len(MAGIC))
+    output = bytearray()
+    while position < len(view):
+        opcode = bytes(view[position : position + 1])
+        position += 1
+        if opcode == _COPY:
+            offset, position = _read_varint(view, position)
+            length, position = _read_varint(view, position)
+            if offset + length > len(source):
+                raise DeltaError("Copy reaches past the end of the source.")
+            output += source[offset : offset + length]
+        elif opcode == _INSERT:
+            length, position = _read_varint(view, position)
+            if position + length > len(view):
+                raise DeltaError("Truncated insert.")
+            output += view[position : position + length]
+            position += length
+        else:
+            raise DeltaError(f"Unknown delta opcode {opcode!r}.")
+    if len(output) != expected:
+        raise DeltaError("Delta produced a result of the wrong length.")
+    return bytes(output)
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _read_varint(view: memoryview, position: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if position >= len(view):
+            raise DeltaError("Truncated varint.")
+        byte = view[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, position
+        shift += 7
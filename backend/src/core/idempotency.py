@@ -0,0 +1,257 @@
+"""``Idempotency-Key`` support for mutating requests."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from typing import Callable
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.src.core.security import caller_identity
+from backend.src.services import idempotency_service
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+MAX_KEY_LENGTH = 255
+DEFAULT_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+# Headers that describe a single transmission rather than the response itself.
+_UNSTORED_HEADERS = frozenset({"date", "server", "content-length"})
+
+
+class IdempotencyMiddleware:
+    """Replay the first response to retries that carry the same key.
+
+    Keys are scoped to the caller (token subject) and route. Concurrent
+    duplicates in this process wait for the first request instead of
+    running it again; duplicates in other processes get a 409. Server
+    errors are not stored, so the client can retry them. Requests whose
+    body exceeds ``max_body_bytes`` are passed through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        session_factory: Callable[[], Session],
+        max_body_bytes: int = 1024 * 1024,
+        methods: frozenset[str] = DEFAULT_METHODS,
+    ) -> None:
+        self.app = app
+        self.session_factory = session_factory
+        self.max_body_bytes = max_body_bytes
+        self.methods = methods
+        self._in_flight: dict[str, asyncio.Future[None]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        key = headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key.strip() or len(key) > MAX_KEY_LENGTH:
+            await _send_error(send, 400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters.")
+            return
+        content_length = headers.get("content-length")
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > self.max_body_bytes:
+                await self.app(scope, receive, send)
+                return
+
+        body, complete = await _read_body(receive, self.max_body_bytes)
+        replay_receive = _replay_body(body, complete, receive)
+        if not complete:
+            await self.app(scope, replay_receive, send)
+            return
+
+        scope_hash = _scope_hash(scope, headers, key)
+        request_hash = _request_hash(scope, body)
+        while (waiter := self._in_flight.get(scope_hash)) is not None:
+            await asyncio.shield(waiter)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[scope_hash] = future
+        try:
+            try:
+                stored = await run_in_threadpool(
+                    self._call_service,
+                    idempotency_service.claim,
+                    scope_hash=scope_hash,
+                    request_hash=request_hash,
+                )
+            except idempotency_service.KeyMismatchError as error:
+                await _send_error(send, 422, str(error))
+                return
+            except idempotency_service.KeyInProgressError as error:
+                await _send_error(send, 409, str(error), retry_after=True)
+                return
+            if stored is not None:
+                await _send_stored(send, stored)
+                return
+            await self._run_and_store(scope, replay_receive, send, scope_hash, request_hash)
+        finally:
+            del self._in_flight[scope_hash]
+            future.set_result(None)
+
+    async def _run_and_store(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        scope_hash: str,
+        request_hash: str,
+    ) -> None:
+        start: Message | None = None
+        chunks: list[bytes] = []
+        size = 0
+        streaming = False
+        buffered = False
+
+        async def capture(message: Message) -> None:
+            nonlocal start, size, streaming, buffered
+            if streaming:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                # pathsend and other extensions cannot be replayed from memory.
+                streaming = True
+                await send(start)
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if size > self.max_body_bytes:
+                streaming = True
+                await send(start)
+                await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": True})
+                if not message.get("more_body", False):
+                    await send({"type": "http.response.body", "body": b""})
+                return
+            if not message.get("more_body", False):
+                buffered = True
+
+        try:
+            await self.app(scope, receive, capture)
+        except Exception:
+            await run_in_threadpool(self._release, scope_hash)
+            raise
+        if not buffered:
+            await run_in_threadpool(self._release, scope_hash)
+            return
+
+        # The response is stored only now that the app has returned and
+        # closed its sessions. Storing it from inside ``send`` would need a
+        # second connection while the request's session may still hold one,
+        # which deadlocks a single-connection writer pool.
+        body = b"".join(chunks)
+        if start["status"] < 500:
+            headers = [
+                (name.decode("latin-1"), value.decode("latin-1"))
+                for name, value in start.get("headers", [])
+                if name.decode("latin-1").lower() not in _UNSTORED_HEADERS
+            ]
+            await run_in_threadpool(
+                self._call_service,
+                idempotency_service.complete,
+                scope_hash=scope_hash,
+                request_hash=request_hash,
+                status_code=start["status"],
+                headers=headers,
+                body=body,
+            )
+        else:
+            await run_in_threadpool(self._release, scope_hash)
+        await send(start)
+        await send({"type": "http.response.body", "body": body})
+
+    def _call_service(self, function, **kwargs):
+        with self.session_factory() as session:
+            return function(session, **kwargs)
+
+    def _release(self, scope_hash: str) -> None:
+        self._call_service(idempotency_service.release, scope_hash=scope_hash)
+
+
+async def _read_body(receive: Receive, limit: int) -> tuple[bytes, bool]:
+    """Read the request body, stopping early once it exceeds ``limit``."""
+    chunks: list[bytes] = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            return b"".join(chunks), False
+        chunk = message.get("body", b"")
+        chunks.append(chunk)
+        size += len(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks), True
+        if size > limit:
+            return b"".join(chunks), False
+
+
+def _replay_body(body: bytes, complete: bool, receive: Receive) -> Receive:
+    """Return a receive callable that yields the buffered body, then the rest."""
+    pending = True
+
+    async def replay() -> Message:
+        nonlocal pending
+        if pending:
+            pending = False
+            # After a partial read the remaining chunks still come from ``receive``.
+            return {"type": "http.request", "body": body, "more_body": not complete}
+        return await receive()
+
+    return replay
+
+
+def _scope_hash(scope: Scope, headers: Headers, key: str) -> str:
+    hasher = hashlib.sha256()
+    identity = caller_identity(headers.get("authorization"))
+    for part in (identity, scope["method"], scope["path"], key):
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def _request_hash(scope: Scope, body: bytes) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(scope["method"].encode("ascii"))
+    hasher.update(b"\0")
+    hasher.update(scope["path"].encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(scope.get("query_string", b""))
+    hasher.update(b"\0")
+    hasher.update(body)
+    return hasher.hexdigest()
+
+
+async def _send_stored(send: Send, stored: idempotency_service.StoredResponse) -> None:
+    headers = [
+        (name.encode("latin-1"), value.encode("latin-1")) for name, value in stored.headers
+    ]
+    headers.append((b"content-length", str(len(stored.body)).encode("ascii")))
+    headers.append((REPLAYED_HEADER.encode("ascii"), b"true"))
+    await send({"type": "http.response.start", "status": stored.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+async def _send_error(send: Send, status_code: int, detail: str, *, retry_after: bool = False) -> None:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("ascii")),
+    ]
+    if retry_after:
+        headers.append((b"retry-after", b"1"))
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,219 @@
+"""Structured JSON logging with request IDs and tail-based request sampling.
+
+Application loggers live under ``backend.src`` (services use
+``logging.getLogger(__name__)``). Records go through a queue to a
+background thread, so a request never waits on the output stream.
+
+Inside a request, debug and info records are held back until the request
+finishes. They are written, together with one access line, only when the
+request is kept: it failed, it was slow, it logged a warning or worse, or
+it was picked by the sample rate. Everything else is discarded without
+being formatted.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import re
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+APP_LOGGER = "backend.src"
+REQUEST_ID_HEADER = "x-request-id"
+# Incoming request IDs are reused only when they look like an ID.
+_REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+# LogRecord attributes that are not caller-supplied ``extra`` fields.
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None)).keys()
+    | {"message", "asctime", "request_id"}
+)
+
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+class _RequestLog:
+    __slots__ = ("records", "keep")
+
+    def __init__(self) -> None:
+        self.records: list[logging.LogRecord] = []
+        self.keep = False
+
+
+_request_log: ContextVar[_RequestLog | None] = ContextVar("request_log", default=None)
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None) is not None:
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class SamplingQueueHandler(QueueHandler):
+    """Queue records for the listener, holding request-scoped chatter back.
+
+    The request ID is captured here, in the logging thread, because the
+    listener thread does not share the request's context.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        record.request_id = request_id.get()
+        log = _request_log.get()
+        if log is not None:
+            if record.levelno < logging.WARNING:
+                log.records.append(record)
+                return
+            log.keep = True
+        super().emit(record)
+
+    def release_request(self, log: _RequestLog) -> None:
+        for record in log.records:
+            super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike the base class, keep the traceback out of ``message`` so the
+        # formatter can emit it as its own field.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(*, level: str = "INFO", stream: IO[str] | None = None) -> QueueListener:
+    """Route the application loggers through a queue to ``stream`` (stderr).
+
+    Calling it again replaces the previous configuration. Pass the returned
+    listener to :func:`shutdown_logging` to flush and stop it.
+    """
+    logger = logging.getLogger(APP_LOGGER)
+    for handler in list(logger.handlers):
+        if isinstance(handler, SamplingQueueHandler):
+            logger.removeHandler(handler)
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter())
+    listener = QueueListener(records, output)
+    logger.addHandler(SamplingQueueHandler(records))
+    logger.setLevel(level.upper())
+    logger.propagate = False
+    listener.start()
+    return listener
+
+
+def shutdown_logging(listener: QueueListener) -> None:
+    """Detach the listener's handler and write out anything still queued."""
+    logger = logging.getLogger(APP_LOGGER)
+    for handler in list(logger.handlers):
+        if isinstance(handler, SamplingQueueHandler) and handler.queue is listener.queue:
+            logger.removeHandler(handler)
+    listener.stop()
+
+
+class RequestLoggingMiddleware:
+    """Assign request IDs and write sampled JSON access logs.
+
+    The ID comes from a well-formed ``X-Request-ID`` header or is generated,
+    and is echoed on the response. Server errors and requests slower than
+    ``slow_ms`` are always logged; others with probability ``sample_rate``.
+    """
+
+    def __init__(self, app: ASGIApp, *, sample_rate: float = 0.01, slow_ms: float = 500.0) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.logger = logging.getLogger(f"{APP_LOGGER}.access")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        incoming = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        if incoming is not None and _REQUEST_ID_PATTERN.fullmatch(incoming):
+            current_id = incoming
+        else:
+            current_id = os.urandom(8).hex()
+        status_code = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, current_id)
+            await send(message)
+
+        log = _RequestLog()
+        id_token = request_id.set(current_id)
+        log_token = _request_log.set(log)
+        started = time.perf_counter()
+        error: Exception | None = None
+        try:
+            await self.app(scope, receive, send_with_id)
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            _request_log.reset(log_token)
+            duration_ms = (time.perf_counter() - started) * 1000
+            failed = error is not None or status_code >= 500
+            slow = duration_ms >= self.slow_ms
+            if failed or slow or log.keep or random.random() < self.sample_rate:
+                self._write(scope, log, status_code, duration_ms, failed, slow, error)
+            request_id.reset(id_token)
+
+    def _write(
+        self,
+        scope: Scope,
+        log: _RequestLog,
+        status_code: int,
+        duration_ms: float,
+        failed: bool,
+        slow: bool,
+        error: Exception | None,
+    ) -> None:
+        for handler in logging.getLogger(APP_LOGGER).handlers:
+            if isinstance(handler, SamplingQueueHandler):
+                handler.release_request(log)
+        level = logging.ERROR if failed else logging.WARNING if slow else logging.INFO
+        self.logger.log(
+            level,
+            "%s %s %s",
+            scope["method"],
+            scope["path"],
+            status_code,
+            exc_info=error,
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": round(duration_ms, 3),
+            },
+        )
@@ -0,0 +1,28 @@
+"""Opaque keyset-pagination cursors."""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(**fields: Any) -> str:
+    """Encode JSON-serializable keyset values as a URL-safe token."""
+    raw = json.dumps(fields, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decode a token produced by :func:`encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor.") from exc
+    if not isinstance(data, dict):
+        raise InvalidCursorError("Invalid pagination cursor.")
+    return data
@@ -4,9 +4,10 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 import bcrypt
-from jose import jwt
+from jose import JWTError, jwt
 
 from backend.src.core.settings import load_settings
+from backend.src.core.tracing import traced
 
 
 def _get_settings() -> tuple[str, str, int]:
@@ -19,6 +20,7 @@ def _get_settings() -> tuple[str, str, int]:
     )
 
 
+@traced
 def get_password_hash(password: str) -> str:
     """Hash a plaintext password using bcrypt."""
     if not isinstance(password, str) or not password:
@@ -27,6 +29,7 @@ def get_password_hash(password: str) -> str:
     return hashed.decode("utf-8")
 
 
+@traced
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plaintext password against a bcrypt hash."""
     if not plain_password or not hashed_password:
@@ -59,6 +62,7 @@ def create_access_token(
     return jwt.encode(to_encode, secret_key, algorithm=algorithm)
 
 
+@traced
 def decode_access_token(token: str) -> Dict[str, Any]:
     """Decode and validate a JWT access token."""
     if not token:
@@ -68,3 +72,26 @@ def decode_access_token(token: str) -> Dict[str, Any]:
 
     payload = jwt.decode(token, secret_key, algorithms=[algorithm])
     return dict(payload)
+
+
+def bearer_claims(authorization: str | None) -> Optional[Dict[str, Any]]:
+    """Return the claims of a valid bearer token, or None."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_access_token(token)
+    except (JWTError, ValueError):
+        return None
+
+
+def caller_identity(authorization: str | None) -> str:
+    """Return a stable identity for the caller behind an Authorization header.
+
+    Valid bearer tokens map to their subject so a user keeps the same
+    identity across token refreshes; anything else maps to the raw header.
+    """
+    claims = bearer_claims(authorization)
+    if claims and claims.get("sub"):
+        return f"sub:{claims['sub']}"
+    return f"raw:{authorization or ''}"
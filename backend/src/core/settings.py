@@ -2,6 +2,7 @@
 
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import AliasChoices, Field, ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -32,6 +33,69 @@ class Settings(BaseSettings):
             "docengine_database_url",
         ),
     )
+    database_replica_urls: str = Field(
+        default="",
+        validation_alias=AliasChoices(
+            "DOCENGINE_DATABASE_REPLICA_URLS",
+            "docengine_database_replica_urls",
+        ),
+    )
+    replica_max_lag_seconds: float = Field(
+        default=5.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_REPLICA_MAX_LAG_SECONDS",
+            "docengine_replica_max_lag_seconds",
+        ),
+    )
+    read_your_writes_seconds: float = Field(
+        default=5.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_READ_YOUR_WRITES_SECONDS",
+            "docengine_read_your_writes_seconds",
+        ),
+    )
+    tenant_max_connections: int = Field(
+        default=10,
+        validation_alias=AliasChoices(
+            "DOCENGINE_TENANT_MAX_CONNECTIONS",
+            "docengine_tenant_max_connections",
+        ),
+    )
+    tenant_acquire_timeout_seconds: float = Field(
+        default=5.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_TENANT_ACQUIRE_TIMEOUT_SECONDS",
+            "docengine_tenant_acquire_timeout_seconds",
+        ),
+    )
+    archive_after_days: int = Field(
+        default=90,
+        validation_alias=AliasChoices(
+            "DOCENGINE_ARCHIVE_AFTER_DAYS",
+            "docengine_archive_after_days",
+        ),
+    )
+    archive_batch_size: int = Field(
+        default=500,
+        validation_alias=AliasChoices(
+            "DOCENGINE_ARCHIVE_BATCH_SIZE",
+            "docengine_archive_batch_size",
+        ),
+    )
+    request_deadline_seconds: float = Field(
+        default=10.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_REQUEST_DEADLINE_SECONDS",
+            "docengine_request_deadline_seconds",
+        ),
+    )
+    request_deadlines: str = Field(
+        default="",
+        validation_alias=AliasChoices(
+            "DOCENGINE_REQUEST_DEADLINES",
+            "docengine_request_deadlines",
+        ),
+    )
     secret_key: str = Field(
         default="change-me",
         validation_alias=AliasChoices(
@@ -53,6 +117,335 @@ class Settings(BaseSettings):
             "docengine_access_token_expire_minutes",
         ),
     )
+    compression_minimum_size: int = Field(
+        default=500,
+        validation_alias=AliasChoices(
+            "DOCENGINE_COMPRESSION_MINIMUM_SIZE",
+            "docengine_compression_minimum_size",
+        ),
+    )
+    compression_content_types: str = Field(
+        default="application/json,text/plain,text/html,text/csv,application/x-ndjson",
+        validation_alias=AliasChoices(
+            "DOCENGINE_COMPRESSION_CONTENT_TYPES",
+            "docengine_compression_content_types",
+        ),
+    )
+    compression_encodings: str = Field(
+        default="zstd,br,gzip",
+        validation_alias=AliasChoices(
+            "DOCENGINE_COMPRESSION_ENCODINGS",
+            "docengine_compression_encodings",
+        ),
+    )
+    job_worker_enabled: bool = Field(
+        default=False,
+        validation_alias=AliasChoices(
+            "DOCENGINE_JOB_WORKER_ENABLED",
+            "docengine_job_worker_enabled",
+        ),
+    )
+    job_worker_threads: int = Field(
+        default=2,
+        validation_alias=AliasChoices(
+            "DOCENGINE_JOB_WORKER_THREADS",
+            "docengine_job_worker_threads",
+        ),
+    )
+    job_batch_size: int = Field(
+        default=10,
+        validation_alias=AliasChoices(
+            "DOCENGINE_JOB_BATCH_SIZE",
+            "docengine_job_batch_size",
+        ),
+    )
+    job_poll_interval_seconds: float = Field(
+        default=1.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_JOB_POLL_INTERVAL_SECONDS",
+            "docengine_job_poll_interval_seconds",
+        ),
+    )
+    approval_escalation_hours: float = Field(
+        default=48.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_APPROVAL_ESCALATION_HOURS",
+            "docengine_approval_escalation_hours",
+        ),
+    )
+    search_in_memory_index: bool = Field(
+        default=False,
+        validation_alias=AliasChoices(
+            "DOCENGINE_SEARCH_IN_MEMORY_INDEX",
+            "docengine_search_in_memory_index",
+        ),
+    )
+    storage_root: str = Field(
+        default="./data/blobs",
+        validation_alias=AliasChoices(
+            "DOCENGINE_STORAGE_ROOT",
+            "docengine_storage_root",
+        ),
+    )
+    storage_max_upload_bytes: int = Field(
+        default=512 * 1024 * 1024,
+        validation_alias=AliasChoices(
+            "DOCENGINE_STORAGE_MAX_UPLOAD_BYTES",
+            "docengine_storage_max_upload_bytes",
+        ),
+    )
+    revision_snapshot_interval: int = Field(
+        default=10,
+        validation_alias=AliasChoices(
+            "DOCENGINE_REVISION_SNAPSHOT_INTERVAL",
+            "docengine_revision_snapshot_interval",
+        ),
+    )
+    revision_cache_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        validation_alias=AliasChoices(
+            "DOCENGINE_REVISION_CACHE_BYTES",
+            "docengine_revision_cache_bytes",
+        ),
+    )
+    audit_retention_months: int = Field(
+        default=24,
+        validation_alias=AliasChoices(
+            "DOCENGINE_AUDIT_RETENTION_MONTHS",
+            "docengine_audit_retention_months",
+        ),
+    )
+    audit_retention_mode: Literal["drop", "detach"] = Field(
+        default="drop",
+        validation_alias=AliasChoices(
+            "DOCENGINE_AUDIT_RETENTION_MODE",
+            "docengine_audit_retention_mode",
+        ),
+    )
+    idempotency_ttl_seconds: int = Field(
+        default=24 * 60 * 60,
+        validation_alias=AliasChoices(
+            "DOCENGINE_IDEMPOTENCY_TTL_SECONDS",
+            "docengine_idempotency_ttl_seconds",
+        ),
+    )
+    idempotency_cache_entries: int = Field(
+        default=1024,
+        validation_alias=AliasChoices(
+            "DOCENGINE_IDEMPOTENCY_CACHE_ENTRIES",
+            "docengine_idempotency_cache_entries",
+        ),
+    )
+    idempotency_max_body_bytes: int = Field(
+        default=1024 * 1024,
+        validation_alias=AliasChoices(
+            "DOCENGINE_IDEMPOTENCY_MAX_BODY_BYTES",
+            "docengine_idempotency_max_body_bytes",
+        ),
+    )
+    log_level: str = Field(
+        default="INFO",
+        validation_alias=AliasChoices(
+            "DOCENGINE_LOG_LEVEL",
+            "docengine_log_level",
+        ),
+    )
+    log_sample_rate: float = Field(
+        default=0.01,
+        validation_alias=AliasChoices(
+            "DOCENGINE_LOG_SAMPLE_RATE",
+            "docengine_log_sample_rate",
+        ),
+    )
+    log_slow_request_ms: float = Field(
+        default=500.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_LOG_SLOW_REQUEST_MS",
+            "docengine_log_slow_request_ms",
+        ),
+    )
+    tracing_exporter: Literal["none", "console", "file"] = Field(
+        default="none",
+        validation_alias=AliasChoices(
+            "DOCENGINE_TRACING_EXPORTER",
+            "docengine_tracing_exporter",
+        ),
+    )
+    tracing_file_path: str = Field(
+        default="./data/traces.jsonl",
+        validation_alias=AliasChoices(
+            "DOCENGINE_TRACING_FILE_PATH",
+            "docengine_tracing_file_path",
+        ),
+    )
+    tracing_sample_ratio: float = Field(
+        default=0.1,
+        validation_alias=AliasChoices(
+            "DOCENGINE_TRACING_SAMPLE_RATIO",
+            "docengine_tracing_sample_ratio",
+        ),
+    )
+    concurrency_limit_enabled: bool = Field(
+        default=True,
+        validation_alias=AliasChoices(
+            "DOCENGINE_CONCURRENCY_LIMIT_ENABLED",
+            "docengine_concurrency_limit_enabled",
+        ),
+    )
+    concurrency_initial_limit: int = Field(
+        default=20,
+        validation_alias=AliasChoices(
+            "DOCENGINE_CONCURRENCY_INITIAL_LIMIT",
+            "docengine_concurrency_initial_limit",
+        ),
+    )
+    concurrency_min_limit: int = Field(
+        default=4,
+        validation_alias=AliasChoices(
+            "DOCENGINE_CONCURRENCY_MIN_LIMIT",
+            "docengine_concurrency_min_limit",
+        ),
+    )
+    concurrency_max_limit: int = Field(
+        default=100,
+        validation_alias=AliasChoices(
+            "DOCENGINE_CONCURRENCY_MAX_LIMIT",
+            "docengine_concurrency_max_limit",
+        ),
+    )
+    concurrency_latency_target_ms: int = Field(
+        default=250,
+        validation_alias=AliasChoices(
+            "DOCENGINE_CONCURRENCY_LATENCY_TARGET_MS",
+            "docengine_concurrency_latency_target_ms",
+        ),
+    )
+    concurrency_route_latency_targets_ms: str = Field(
+        default="",
+        validation_alias=AliasChoices(
+            "DOCENGINE_CONCURRENCY_ROUTE_LATENCY_TARGETS_MS",
+            "docengine_concurrency_route_latency_targets_ms",
+        ),
+    )
+    webhook_timeout_seconds: float = Field(
+        default=5.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_WEBHOOK_TIMEOUT_SECONDS",
+            "docengine_webhook_timeout_seconds",
+        ),
+    )
+    webhook_max_attempts: int = Field(
+        default=8,
+        validation_alias=AliasChoices(
+            "DOCENGINE_WEBHOOK_MAX_ATTEMPTS",
+            "docengine_webhook_max_attempts",
+        ),
+    )
+    webhook_poll_interval_seconds: float = Field(
+        default=5.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_WEBHOOK_POLL_INTERVAL_SECONDS",
+            "docengine_webhook_poll_interval_seconds",
+        ),
+    )
+    webhook_breaker_threshold: int = Field(
+        default=5,
+        validation_alias=AliasChoices(
+            "DOCENGINE_WEBHOOK_BREAKER_THRESHOLD",
+            "docengine_webhook_breaker_threshold",
+        ),
+    )
+    webhook_breaker_cooldown_seconds: float = Field(
+        default=60.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_WEBHOOK_BREAKER_COOLDOWN_SECONDS",
+            "docengine_webhook_breaker_cooldown_seconds",
+        ),
+    )
+    webhook_allow_private_destinations: bool = Field(
+        default=False,
+        validation_alias=AliasChoices(
+            "DOCENGINE_WEBHOOK_ALLOW_PRIVATE_DESTINATIONS",
+            "docengine_webhook_allow_private_destinations",
+        ),
+    )
+    delegation_cache_ttl_seconds: float = Field(
+        default=30.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_DELEGATION_CACHE_TTL_SECONDS",
+            "docengine_delegation_cache_ttl_seconds",
+        ),
+    )
+    sqlite_production_mode: bool = Field(
+        default=False,
+        validation_alias=AliasChoices(
+            "DOCENGINE_SQLITE_PRODUCTION_MODE",
+            "docengine_sqlite_production_mode",
+        ),
+    )
+    sqlite_synchronous: str = Field(
+        default="NORMAL",
+        validation_alias=AliasChoices(
+            "DOCENGINE_SQLITE_SYNCHRONOUS",
+            "docengine_sqlite_synchronous",
+        ),
+    )
+    sqlite_reader_pool_size: int = Field(
+        default=8,
+        validation_alias=AliasChoices(
+            "DOCENGINE_SQLITE_READER_POOL_SIZE",
+            "docengine_sqlite_reader_pool_size",
+        ),
+    )
+    sqlite_cache_size_mb: int = Field(
+        default=64,
+        validation_alias=AliasChoices(
+            "DOCENGINE_SQLITE_CACHE_SIZE_MB",
+            "docengine_sqlite_cache_size_mb",
+        ),
+    )
+    sqlite_mmap_size_mb: int = Field(
+        default=256,
+        validation_alias=AliasChoices(
+            "DOCENGINE_SQLITE_MMAP_SIZE_MB",
+            "docengine_sqlite_mmap_size_mb",
+        ),
+    )
+    sqlite_writer_timeout_seconds: float = Field(
+        default=30.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_SQLITE_WRITER_TIMEOUT_SECONDS",
+            "docengine_sqlite_writer_timeout_seconds",
+        ),
+    )
+    sqlite_group_commit: bool = Field(
+        default=False,
+        validation_alias=AliasChoices(
+            "DOCENGINE_SQLITE_GROUP_COMMIT",
+            "docengine_sqlite_group_commit",
+        ),
+    )
+    sqlite_group_commit_window_ms: float = Field(
+        default=0.0,
+        validation_alias=AliasChoices(
+            "DOCENGINE_SQLITE_GROUP_COMMIT_WINDOW_MS",
+            "docengine_sqlite_group_commit_window_ms",
+        ),
+    )
+    sqlite_group_commit_max_batch: int = Field(
+        default=64,
+        validation_alias=AliasChoices(
+            "DOCENGINE_SQLITE_GROUP_COMMIT_MAX_BATCH",
+            "docengine_sqlite_group_commit_max_batch",
+        ),
+    )
+    change_retention_hours: int = Field(
+        default=168,
+        validation_alias=AliasChoices(
+            "DOCENGINE_CHANGE_RETENTION_HOURS",
+            "docengine_change_retention_hours",
+        ),
+    )
 
     model_config = SettingsConfigDict(
         env_file=str(_ENV_PATH),
@@ -0,0 +1,457 @@
+"""Lightweight request tracing with OpenTelemetry-compatible identifiers.
+
+Spans carry W3C trace context (``traceparent``), so traces join up with
+upstream proxies and downstream services that speak it, and are exported
+as JSON lines shaped like OTLP spans. Tracing is off until
+:func:`configure_tracing` installs a tracer; until then every hook is a
+single ``None`` check.
+
+Only sampled traces record anything. Spans under an unsampled parent are
+never created, so a low sample ratio keeps the per-request cost close to
+zero.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import IO, Any, Callable, Iterator, Protocol, TypeVar
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.src.core.deadline import route_template
+
+TRACEPARENT_HEADER = "traceparent"
+# Spans held in memory waiting for export; newer spans are dropped beyond this.
+MAX_QUEUE_SIZE = 8192
+EXPORT_BATCH_SIZE = 512
+EXPORT_INTERVAL = 2.0
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "sampled",
+        "attributes",
+        "events",
+        "status",
+        "status_message",
+        "start_ns",
+        "end_ns",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        trace_id: str,
+        parent_span_id: str | None,
+        sampled: bool,
+        kind: str = "INTERNAL",
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.sampled = sampled
+        self.attributes = attributes or {}
+        self.events: list[dict[str, Any]] = []
+        self.status = "UNSET"
+        self.status_message: str | None = None
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, error: BaseException) -> None:
+        self.status = "ERROR"
+        self.status_message = str(error)
+        self.events.append(
+            {
+                "name": "exception",
+                "time_unix_nano": time.time_ns(),
+                "attributes": {
+                    "exception.type": type(error).__qualname__,
+                    "exception.message": str(error),
+                },
+            }
+        )
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        tracer = _tracer
+        if self.sampled and tracer is not None:
+            tracer.processor.on_end(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": {"code": self.status, "message": self.status_message},
+        }
+
+
+class ParentBasedRatioSampler:
+    """Follow the parent's decision; sample new traces by trace ID ratio.
+
+    The decision is a pure function of the trace ID, so every service using
+    the same ratio keeps or drops the same traces.
+    """
+
+    def __init__(self, ratio: float) -> None:
+        self.ratio = min(max(ratio, 0.0), 1.0)
+        self._bound = int(self.ratio * (1 << 64))
+
+    def should_sample(self, trace_id: str, parent_sampled: bool | None) -> bool:
+        if parent_sampled is not None:
+            return parent_sampled
+        return int(trace_id[16:], 16) < self._bound
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: list[dict[str, Any]]) -> None:
+        """Write a batch of finished spans."""
+
+    def shutdown(self) -> None:
+        """Release any resources held by the exporter."""
+
+
+class ConsoleSpanExporter:
+    """Write spans as JSON lines to a stream (stderr by default)."""
+
+    def __init__(self, stream: IO[str] | None = None) -> None:
+        self.stream = stream or sys.stderr
+
+    def export(self, spans: list[dict[str, Any]]) -> None:
+        self.stream.write("".join(json.dumps(span, default=str) + "\n" for span in spans))
+        self.stream.flush()
+
+    def shutdown(self) -> None:
+        return None
+
+
+class FileSpanExporter(ConsoleSpanExporter):
+    """Append spans as JSON lines to a local file; works without a collector."""
+
+    def __init__(self, path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(open(path, "a", encoding="utf-8"))
+
+    def shutdown(self) -> None:
+        self.stream.close()
+
+
+class BatchSpanProcessor:
+    """Buffer finished spans and export them in batches from a background thread.
+
+    Request threads only append to a deque. When the buffer is full new
+    spans are dropped and counted rather than blocking the request.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        *,
+        max_queue_size: int = MAX_QUEUE_SIZE,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        interval: float = EXPORT_INTERVAL,
+    ) -> None:
+        self.exporter = exporter
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._queue: deque[Span] = deque()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        if len(self._queue) >= self.max_queue_size:
+            self.dropped += 1
+            return
+        self._queue.append(span)
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+
+    def force_flush(self) -> None:
+        while self._queue:
+            self._export_batch()
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
+        self.force_flush()
+        self.exporter.shutdown()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.force_flush()
+
+    def _export_batch(self) -> None:
+        batch: list[dict[str, Any]] = []
+        while self._queue and len(batch) < self.batch_size:
+            batch.append(self._queue.popleft().to_dict())
+        if batch:
+            try:
+                self.exporter.export(batch)
+            except Exception:  # noqa: BLE001 - tracing must never break requests
+                self.dropped += len(batch)
+
+
+class Tracer:
+    def __init__(self, sampler: ParentBasedRatioSampler, processor: BatchSpanProcessor) -> None:
+        self.sampler = sampler
+        self.processor = processor
+
+
+_tracer: Tracer | None = None
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def configure_tracing(
+    *,
+    exporter: SpanExporter,
+    sample_ratio: float,
+) -> BatchSpanProcessor:
+    """Install the process-wide tracer. Returns its processor for shutdown."""
+    global _tracer
+    processor = BatchSpanProcessor(exporter)
+    _tracer = Tracer(ParentBasedRatioSampler(sample_ratio), processor)
+    return processor
+
+
+def shutdown_tracing(processor: BatchSpanProcessor) -> None:
+    """Uninstall the tracer if it owns ``processor`` and flush pending spans."""
+    global _tracer
+    if _tracer is not None and _tracer.processor is processor:
+        _tracer = None
+    processor.shutdown()
+
+
+def create_exporter(kind: str, *, path: str) -> SpanExporter | None:
+    """Build the exporter named by the ``tracing_exporter`` setting."""
+    if kind == "console":
+        return ConsoleSpanExporter()
+    if kind == "file":
+        return FileSpanExporter(path)
+    return None
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def start_span(
+    name: str,
+    *,
+    kind: str = "INTERNAL",
+    attributes: dict[str, Any] | None = None,
+) -> Span | None:
+    """Start a child of the current span without making it current.
+
+    Returns ``None`` when tracing is off or the current trace is not
+    sampled. Used for leaf operations such as SQL statements.
+    """
+    parent = _current_span.get()
+    if _tracer is None or parent is None or not parent.sampled:
+        return None
+    return Span(
+        name,
+        trace_id=parent.trace_id,
+        parent_span_id=parent.span_id,
+        sampled=True,
+        kind=kind,
+        attributes=attributes,
+    )
+
+
+@contextmanager
+def span(
+    name: str,
+    *,
+    kind: str = "INTERNAL",
+    attributes: dict[str, Any] | None = None,
+    remote_parent: tuple[str, str, bool] | None = None,
+) -> Iterator[Span | None]:
+    """Run the block in a new current span.
+
+    Starts a new trace when there is no parent. ``remote_parent`` is a
+    ``(trace_id, span_id, sampled)`` tuple taken from an incoming
+    ``traceparent`` header.
+    """
+    tracer = _tracer
+    parent = _current_span.get()
+    if tracer is None or (parent is not None and not parent.sampled):
+        yield None
+        return
+    if parent is not None:
+        new = Span(
+            name,
+            trace_id=parent.trace_id,
+            parent_span_id=parent.span_id,
+            sampled=True,
+            kind=kind,
+            attributes=attributes,
+        )
+    elif remote_parent is not None:
+        trace_id, parent_span_id, parent_sampled = remote_parent
+        new = Span(
+            name,
+            trace_id=trace_id,
+            parent_span_id=parent_span_id,
+            sampled=tracer.sampler.should_sample(trace_id, parent_sampled),
+            kind=kind,
+            attributes=attributes,
+        )
+    else:
+        trace_id = os.urandom(16).hex()
+        new = Span(
+            name,
+            trace_id=trace_id,
+            parent_span_id=None,
+            sampled=tracer.sampler.should_sample(trace_id, None),
+            kind=kind,
+            attributes=attributes,
+        )
+    token = _current_span.set(new)
+    try:
+        yield new
+    except BaseException as error:
+        new.record_exception(error)
+        raise
+    finally:
+        _current_span.reset(token)
+        new.end()
+
+
+def traced(function: F | None = None, *, name: str | None = None) -> F:
+    """Decorate a function (sync or async) to run inside its own span.
+
+    The span is named ``<module>.<function>`` unless ``name`` is given.
+    """
+
+    def decorate(function: F) -> F:
+        span_name = name or f"{function.__module__.rsplit('.', 1)[-1]}.{function.__qualname__}"
+
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _tracer is None:
+                    return await function(*args, **kwargs)
+                with span(span_name):
+                    return await function(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return function(*args, **kwargs)
+            with span(span_name):
+                return function(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    if function is not None:
+        return decorate(function)
+    return decorate  # type: ignore[return-value]
+
+
+class TracedRoute(APIRoute):
+    """Route class that wraps each endpoint in a span named after the handler."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, traced(endpoint), **kwargs)
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    """Parse a W3C ``traceparent`` header into ``(trace_id, span_id, sampled)``."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    version, trace_id, span_id, flags = parts[:4]
+    try:
+        int(trace_id, 16), int(span_id, 16)
+        sampled = bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+    if version == "ff" or trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return trace_id, span_id, sampled
+
+
+def format_traceparent(current: Span) -> str:
+    return f"00-{current.trace_id}-{current.span_id}-{'01' if current.sampled else '00'}"
+
+
+class TracingMiddleware:
+    """Open a server span per request, continuing an incoming ``traceparent``."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _tracer is None:
+            await self.app(scope, receive, send)
+            return
+        route = route_template(scope)
+        remote_parent = parse_traceparent(Headers(scope=scope).get(TRACEPARENT_HEADER))
+        with span(
+            f"{scope['method']} {route}",
+            kind="SERVER",
+            attributes={
+                "http.request.method": scope["method"],
+                "http.route": route,
+                "url.path": scope["path"],
+            },
+            remote_parent=remote_parent,
+        ) as server_span:
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start" and server_span is not None:
+                    server_span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        server_span.status = "ERROR"
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
+
@@ -0,0 +1,59 @@
+"""Pre-built statements for the hottest queries.
+
+Building a ``select()`` on every call costs Python time twice: once to
+construct the statement and once to compute its cache key before the
+compiled-SQL cache can be consulted. Statements here are built once at
+import with ``bindparam`` placeholders, so each call only binds values and
+reuses the memoized cache key. Where callers only read a few columns,
+the statements select plain rows instead of ORM entities, which also
+skips identity-map and attribute bookkeeping.
+
+Execute them with a parameter dict, e.g.
+``session.scalars(queries.STEPS_FOR_DOCUMENT, {"document_id": ...})``.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from sqlalchemy import Select, bindparam, func, select
+
+from backend.src.models.approval_step import ApprovalStep
+from backend.src.models.document import Document
+from backend.src.models.user import User
+
+# Approval steps of a document in chain order (ORM entities; callers update them).
+STEPS_FOR_DOCUMENT = (
+    select(ApprovalStep)
+    .where(ApprovalStep.document_id == bindparam("document_id"))
+    .order_by(ApprovalStep.step_order)
+)
+
+# Steps of one workflow stage (ORM entities; callers schedule follow-ups).
+STEPS_FOR_STAGE = select(ApprovalStep).where(
+    ApprovalStep.document_id == bindparam("document_id"),
+    ApprovalStep.step_order == bindparam("step_order"),
+)
+
+# Login lookup; ``email`` must already be lower-cased.
+USER_BY_EMAIL = select(User).where(func.lower(User.email) == bindparam("email")).limit(1)
+
+# Token subject lookup for every authenticated request.
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+
+# Columns a document listing can return; see api.documents.SELECTABLE_FIELDS.
+DOCUMENT_LIST_COLUMNS = ("id", "title", "status", "created_at", "organization_id")
+
+
+@lru_cache(maxsize=None)
+def documents_for_organization(columns: tuple[str, ...] = DOCUMENT_LIST_COLUMNS) -> Select:
+    """Newest-first rows of an organization's live documents with ``columns``.
+
+    One statement is built per distinct column set (there are only a
+    handful) and bound with ``organization_id``.
+    """
+    return (
+        select(*(Document.__table__.c[name] for name in columns))
+        .where(Document.organization_id.is_not_distinct_from(bindparam("organization_id")))
+        .order_by(Document.created_at.desc())
+    )
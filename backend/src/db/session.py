@@ -1,23 +1,96 @@
 """Database session configuration and dependency helpers."""
 
+import itertools
+import sqlite3
+import threading
+import time
+import uuid
 from typing import Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine, event, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
 
+from backend.src.core import deadline, tracing
+from backend.src.core.security import bearer_claims, caller_identity
 from backend.src.core.settings import load_settings
+from backend.src.db import sqlite_profile
+from backend.src.db.tenancy import (
+    TenantBusyError,
+    TenantNotFoundError,
+    TenantPlacement,
+    TenantRouter,
+)
 from backend.src.models.base import Base
 # Ensure model metadata is registered before creating tables.
-from backend.src.models import approval_step, audit_log, document, user  # pylint: disable=unused-import
+from backend.src.models import (  # pylint: disable=unused-import
+    approval_step,
+    audit_log,
+    blob,
+    change_feed,
+    delegation,
+    document,
+    document_archive,
+    document_revision,
+    document_search,
+    document_status_count,
+    idempotency_key,
+    import_checkpoint,
+    job,
+    organization,
+    sla_rollup,
+    user,
+    webhook,
+    workflow_template,
+)
 
 settings = load_settings()
 DATABASE_URL = settings.database_url
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}
-    if DATABASE_URL.startswith("sqlite")
-    else {},
-)
+
+# The sqlite3 driver's own default, restored for work outside a request.
+SQLITE_BUSY_TIMEOUT_MS = 5000
+# Virtual machine instructions between deadline checks on SQLite.
+SQLITE_PROGRESS_STEPS = 10_000
+# Longest SQL text recorded on a trace span.
+MAX_TRACED_STATEMENT = 2000
+
+
+@event.listens_for(Engine, "connect")
+def _install_interrupt(dbapi_connection, connection_record) -> None:
+    # SQLite has no statement timeout; the progress handler aborts a running
+    # statement with "interrupted" once the request's deadline has passed.
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.set_progress_handler(deadline.expired, SQLITE_PROGRESS_STEPS)
+
+
+def _create_engine(url: str) -> Engine:
+    return create_engine(
+        url,
+        connect_args={"check_same_thread": False} if url.startswith("sqlite") else {},
+    )
+
+
+# Set when the SQLite production profile is on; see db.sqlite_profile.
+sqlite_reader: Engine | None = None
+group_commit: sqlite_profile.GroupCommitWriter | None = None
+if settings.sqlite_production_mode and DATABASE_URL.startswith("sqlite"):
+    engine, sqlite_reader = sqlite_profile.create_engines(
+        DATABASE_URL,
+        readers=settings.sqlite_reader_pool_size,
+        cache_size_kib=settings.sqlite_cache_size_mb * 1024,
+        mmap_size_bytes=settings.sqlite_mmap_size_mb * 1024 * 1024,
+        writer_timeout=settings.sqlite_writer_timeout_seconds,
+        synchronous=settings.sqlite_synchronous,
+    )
+    if settings.sqlite_group_commit:
+        group_commit = sqlite_profile.GroupCommitWriter(
+            engine,
+            window=settings.sqlite_group_commit_window_ms / 1000,
+            max_batch=settings.sqlite_group_commit_max_batch,
+        )
+else:
+    engine = _create_engine(DATABASE_URL)
 Base.metadata.create_all(engine)
 
 SessionLocal = sessionmaker(
@@ -26,9 +99,316 @@ SessionLocal = sessionmaker(
     autocommit=False,
 )
 
-def get_session() -> Generator[Session, None, None]:
-    """Yield a SQLAlchemy session and close it after use."""
+# How often a replica's replication lag is measured.
+LAG_CHECK_INTERVAL = 1.0
+_POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaRouter:
+    """Pick a read replica, skipping any that lag too far behind the primary.
+
+    Lag is measured at most once per ``LAG_CHECK_INTERVAL`` per replica.
+    Replicas that cannot be measured are treated as unavailable until the
+    next check. Returns ``None`` (use the primary) when no replica qualifies.
+    """
+
+    def __init__(self, replicas: list[Engine], *, max_lag: float) -> None:
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self._cycle = itertools.cycle(range(len(replicas))) if replicas else None
+        self._healthy: dict[int, tuple[float, bool]] = {}
+        self._lock = threading.Lock()
+
+    def choose(self) -> Engine | None:
+        if self._cycle is None:
+            return None
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                index = next(self._cycle)
+            if self._is_healthy(index):
+                return self.replicas[index]
+        return None
+
+    def _is_healthy(self, index: int) -> bool:
+        now = time.monotonic()
+        checked_at, healthy = self._healthy.get(index, (float("-inf"), False))
+        if now - checked_at < LAG_CHECK_INTERVAL:
+            return healthy
+        healthy = self._measure_lag(self.replicas[index]) <= self.max_lag
+        self._healthy[index] = (now, healthy)
+        return healthy
+
+    @staticmethod
+    def _measure_lag(replica: Engine) -> float:
+        if replica.dialect.name != "postgresql":
+            return 0.0
+        try:
+            with replica.connect() as connection:
+                return float(connection.scalar(_POSTGRES_LAG_SQL) or 0.0)
+        except Exception:  # noqa: BLE001 - an unreachable replica is just skipped
+            return float("inf")
+
+
+class WriteTracker:
+    """Remember which callers wrote recently so their reads stay on the primary."""
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self._writes: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, caller: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._writes[caller] = now
+            if len(self._writes) > 10_000:
+                cutoff = now - self.window
+                self._writes = {key: at for key, at in self._writes.items() if at > cutoff}
+
+    def is_recent(self, caller: str) -> bool:
+        with self._lock:
+            written_at = self._writes.get(caller)
+        return written_at is not None and time.monotonic() - written_at < self.window
+
+
+replica_engines = [
+    _create_engine(url.strip())
+    for url in settings.database_replica_urls.split(",")
+    if url.strip()
+]
+replica_router = ReplicaRouter(
+    replica_engines,
+    max_lag=settings.replica_max_lag_seconds,
+)
+write_tracker = WriteTracker(settings.read_your_writes_seconds)
+
+
+def _read_bind(caller: str) -> Engine | None:
+    """Engine for a shared-database read, or ``None`` for the primary."""
+    if sqlite_reader is not None:
+        # WAL readers see every commit at once, so there are no writes to
+        # wait for, and the single writer connection stays free.
+        return sqlite_reader
+    if write_tracker.is_recent(caller):
+        return None
+    return replica_router.choose()
+
+
+@event.listens_for(Session, "after_flush")
+def _flag_flush(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_bulk_write(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _track_write(session: Session) -> None:
+    caller = session.info.get("caller")
+    if session.info.pop("wrote", False) and caller is not None:
+        write_tracker.mark(caller)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_write_flag(session: Session, previous_transaction) -> None:
+    session.info.pop("wrote", None)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_deadline(session: Session, transaction, connection) -> None:
+    """Cap each transaction's statements and lock waits at the request's remaining budget."""
+    left = deadline.remaining()
+    if left is not None and left <= 0:
+        raise deadline.DeadlineExceededError("Request deadline passed before the transaction began.")
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        if left is not None:
+            milliseconds = max(1, int(left * 1000))
+            # SET LOCAL lasts until the end of this transaction only.
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {milliseconds}")
+            connection.exec_driver_sql(f"SET LOCAL lock_timeout = {milliseconds}")
+    elif dialect == "sqlite":
+        milliseconds = SQLITE_BUSY_TIMEOUT_MS if left is None else max(1, int(left * 1000))
+        if connection.info.get("busy_timeout") != milliseconds:
+            connection.exec_driver_sql(f"PRAGMA busy_timeout = {milliseconds}")
+            connection.info["busy_timeout"] = milliseconds
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_span(connection, cursor, statement, parameters, context, executemany) -> None:
+    statement_span = tracing.start_span(
+        statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL",
+        kind="CLIENT",
+        attributes={
+            "db.system": connection.dialect.name,
+            "db.statement": statement[:MAX_TRACED_STATEMENT],
+        },
+    )
+    if statement_span is not None and context is not None:
+        context.trace_span = statement_span
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement_span(connection, cursor, statement, parameters, context, executemany) -> None:
+    statement_span = getattr(context, "trace_span", None)
+    if statement_span is not None:
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            statement_span.set_attribute("db.response.rows", cursor.rowcount)
+        statement_span.end()
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_statement_span(exception_context) -> None:
+    statement_span = getattr(exception_context.execution_context, "trace_span", None)
+    if statement_span is not None:
+        statement_span.record_exception(exception_context.original_exception)
+        statement_span.end()
+
+
+@event.listens_for(Session, "before_commit")
+def _start_commit_span(session: Session) -> None:
+    commit_span = tracing.start_span("session.commit")
+    if commit_span is not None:
+        session.info["commit_span"] = commit_span
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _end_commit_span(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        commit_span = session.info.pop("commit_span", None)
+        if commit_span is not None:
+            commit_span.end()
+
+
+def _load_placement(organization_id: uuid.UUID) -> TenantPlacement | None:
+    with SessionLocal() as session:
+        record = session.get(organization.Organization, organization_id)
+        if record is None:
+            return None
+        return TenantPlacement(
+            organization_id=record.id,
+            database_url=record.database_url,
+            schema_name=record.schema_name,
+            max_connections=record.max_connections or settings.tenant_max_connections,
+        )
+
+
+tenant_router = TenantRouter(
+    _load_placement,
+    acquire_timeout=settings.tenant_acquire_timeout_seconds,
+)
+_tenant_factories: dict[int, sessionmaker] = {}
+
+
+def tenant_session_factories() -> list[sessionmaker]:
+    """Session factories for the tenants that do not live in the shared tables.
+
+    One factory per distinct database or schema, so background workers can
+    run the jobs queued there.
+    """
+    with SessionLocal() as session:
+        organization_ids = session.scalars(
+            select(organization.Organization.id).where(
+                or_(
+                    organization.Organization.database_url.is_not(None),
+                    organization.Organization.schema_name.is_not(None),
+                )
+            )
+        ).all()
+    primary = SessionLocal.kw["bind"]
+    factories: dict[int, sessionmaker] = {}
+    for organization_id in organization_ids:
+        try:
+            placement = tenant_router.placement(organization_id)
+        except TenantNotFoundError:
+            continue
+        tenant_engine = tenant_router.engine_for(placement, primary)
+        if tenant_engine is None or id(tenant_engine) in factories:
+            continue
+        factory = _tenant_factories.get(id(tenant_engine))
+        if factory is None:
+            factory = sessionmaker(bind=tenant_engine, autoflush=False, autocommit=False)
+            _tenant_factories[id(tenant_engine)] = factory
+        factories[id(tenant_engine)] = factory
+    return list(factories.values())
+
+
+def _request_placement(request: Request) -> TenantPlacement | None:
+    claims = bearer_claims(request.headers.get("authorization")) or {}
+    if not claims.get("org"):
+        return None
+    try:
+        return tenant_router.placement(uuid.UUID(str(claims["org"])))
+    except (TenantNotFoundError, ValueError) as error:
+        raise HTTPException(status_code=403, detail="Unknown organization.") from error
+
+
+def _open_session(request: Request, *, read: bool) -> Generator[Session, None, None]:
+    caller = caller_identity(request.headers.get("authorization"))
+    placement = _request_placement(request)
+    if placement is not None:
+        try:
+            tenant_router.acquire(placement)
+        except TenantBusyError as error:
+            raise HTTPException(
+                status_code=503,
+                detail=str(error),
+                headers={"Retry-After": "1"},
+            ) from error
+    try:
+        bind = None
+        if placement is not None:
+            bind = tenant_router.engine_for(placement, SessionLocal.kw["bind"])
+        if bind is None and read:
+            bind = _read_bind(caller)
+        session = SessionLocal() if bind is None else SessionLocal(bind=bind)
+        session.info["caller"] = caller
+        try:
+            yield session
+        finally:
+            session.close()
+    finally:
+        if placement is not None:
+            tenant_router.release(placement)
+
+
+def get_session(request: Request) -> Generator[Session, None, None]:
+    """Yield a primary session for the caller's organization."""
+    yield from _open_session(request, read=False)
+
+
+def get_read_session(request: Request) -> Generator[Session, None, None]:
+    """Yield a session for read-only endpoints.
+
+    Shared-tenant reads go to a replica unless the caller wrote within the
+    read-your-writes window, in which case they stay on the primary.
+    Tenants with their own database or schema always read from it.
+    """
+    yield from _open_session(request, read=True)
+
+
+def get_shared_session(request: Request) -> Generator[Session, None, None]:
+    """Yield a primary session on the shared database (users, organizations)."""
     session = SessionLocal()
+    session.info["caller"] = caller_identity(request.headers.get("authorization"))
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def get_shared_read_session(request: Request) -> Generator[Session, None, None]:
+    """Like :func:`get_shared_session`, but may be served by a replica."""
+    caller = caller_identity(request.headers.get("authorization"))
+    replica = _read_bind(caller)
+    session = SessionLocal() if replica is None else SessionLocal(bind=replica)
+    session.info["caller"] = caller
     try:
         yield session
     finally:
@@ -0,0 +1,252 @@
+"""Production profile for file-backed SQLite deployments.
+
+SQLite allows one writer at a time. Left to its defaults, every pooled
+connection races for the write lock, so threadpool writers fail with
+"database is locked" or deadlock when two read transactions try to
+upgrade at once. This profile sets things up the way SQLite is meant to be
+run behind a threaded server:
+
+* WAL journaling with ``synchronous=NORMAL`` by default (commits no longer
+  fsync; a power loss can lose the last transactions but never corrupts
+  the file), a larger page cache and memory-mapped reads, applied on
+  every connect.
+* A reader engine with its own pool whose connections are ``query_only``.
+  WAL readers never block the writer and always see committed data, so
+  read-only sessions use it through the replica router.
+* A writer engine with exactly one connection. Writers queue for it in the
+  pool instead of spinning on the file lock, for no longer than their
+  request's deadline, and its transactions start with ``BEGIN IMMEDIATE``
+  so a transaction never fails halfway when it needs to upgrade from
+  reading to writing.
+* Optionally, :class:`GroupCommitWriter`, which runs independent units of
+  work on that connection, each in its own savepoint, and commits up to
+  ``max_batch`` of them at once. It only pays off with
+  ``synchronous=FULL``, where it shares one fsync between the units; with
+  NORMAL a commit is cheap and the hand-off to the writer thread costs
+  more than it saves (see benchmarks/bench_sqlite_writes.py).
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from backend.src.core import deadline, metrics
+
+# Matches the default restored by db.session for work outside a request.
+BUSY_TIMEOUT_MS = 5000
+# NORMAL skips the fsync on commit; FULL makes every commit durable.
+SYNCHRONOUS_MODES = ("NORMAL", "FULL")
+
+WriteUnit = Callable[[sessionmaker], Any]
+
+group_commits = metrics.counter(
+    "docengine_sqlite_group_commits_total",
+    "Transactions committed by the SQLite group-commit writer.",
+)
+group_commit_units = metrics.counter(
+    "docengine_sqlite_group_commit_units_total",
+    "Units of work run by the SQLite group-commit writer, by outcome.",
+    ("outcome",),
+)
+
+
+def create_engines(
+    url: str,
+    *,
+    readers: int,
+    cache_size_kib: int,
+    mmap_size_bytes: int,
+    writer_timeout: float,
+    synchronous: str = "NORMAL",
+) -> tuple[Engine, Engine]:
+    """Return the ``(writer, reader)`` engines for a SQLite database file."""
+    if ":memory:" in url or "mode=memory" in url:
+        raise ValueError("The SQLite production profile needs a database file, not :memory:.")
+    if synchronous.upper() not in SYNCHRONOUS_MODES:
+        raise ValueError(f"synchronous must be one of {', '.join(SYNCHRONOUS_MODES)}.")
+
+    writer = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=DeadlineQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=writer_timeout,
+    )
+    reader = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_size=readers,
+        max_overflow=0,
+    )
+    pragmas = _pragmas(
+        synchronous=synchronous.upper(),
+        cache_size_kib=cache_size_kib,
+        mmap_size_bytes=mmap_size_bytes,
+    )
+    _install(writer, pragmas, begin="BEGIN IMMEDIATE")
+    _install(reader, [*pragmas, "PRAGMA query_only = ON"], begin="BEGIN")
+    return writer, reader
+
+
+class DeadlineQueuePool(QueuePool):
+    """A QueuePool whose checkout wait ends with the request's deadline.
+
+    ``pool_timeout`` still bounds the wait outside requests. A timed-out
+    checkout raises ``sqlalchemy.exc.TimeoutError``, which the deadline
+    middleware answers with 503.
+    """
+
+    @property
+    def _timeout(self) -> float:
+        left = deadline.remaining()
+        if left is None:
+            return self._configured_timeout
+        return max(min(self._configured_timeout, left), 0.0)
+
+    @_timeout.setter
+    def _timeout(self, value: float) -> None:
+        self._configured_timeout = value
+
+
+def _pragmas(*, synchronous: str, cache_size_kib: int, mmap_size_bytes: int) -> list[str]:
+    return [
+        "PRAGMA journal_mode = WAL",
+        f"PRAGMA synchronous = {synchronous}",
+        f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+        # A negative cache_size is in KiB rather than pages.
+        f"PRAGMA cache_size = {-int(cache_size_kib)}",
+        f"PRAGMA mmap_size = {int(mmap_size_bytes)}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+
+
+def _install(engine: Engine, pragmas: list[str], *, begin: str) -> None:
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record) -> None:
+        # Transactions are started explicitly (see _begin) instead of by the
+        # driver, which also makes SAVEPOINTs behave.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+        # Tells db.session's per-transaction busy_timeout hook what is set.
+        connection_record.info["busy_timeout"] = BUSY_TIMEOUT_MS
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection) -> None:
+        connection.exec_driver_sql(begin)
+
+
+class GroupCommitWriter:
+    """Run write units on the single writer connection and commit them in groups.
+
+    A unit is called with a session factory whose sessions join the group's
+    transaction: their ``commit()`` only releases a savepoint, and the data
+    becomes durable when the group commits. A unit that raises is rolled
+    back on its own; the rest of the group is unaffected. The thread starts
+    on first use and waits ``window`` seconds for more units after the first
+    one of a group arrives.
+    """
+
+    def __init__(self, engine: Engine, *, window: float, max_batch: int) -> None:
+        self.engine = engine
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: queue.Queue[tuple[WriteUnit, Future] | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, unit: WriteUnit) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="docengine-sqlite-writer",
+                    daemon=True,
+                )
+                self._thread.start()
+            self._queue.put((unit, future))
+        return future
+
+    def run(self, unit: WriteUnit, timeout: float | None = None) -> Any:
+        """Submit ``unit`` and wait until its group has committed."""
+        return self.submit(unit).result(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Commit what is queued, then stop the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(None)
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                return
+            group = [item]
+            closes_at = time.monotonic() + self.window
+            while len(group) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(closes_at - time.monotonic(), 0.0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                group.append(item)
+            self._commit_group(group)
+
+    def _commit_group(self, group: list[tuple[WriteUnit, Future]]) -> None:
+        outcomes: list[tuple[Future, BaseException | None, Any]] = []
+        try:
+            with self.engine.connect() as connection, connection.begin():
+                factory = sessionmaker(
+                    bind=connection,
+                    autoflush=False,
+                    join_transaction_mode="create_savepoint",
+                )
+                for unit, future in group:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    savepoint = connection.begin_nested()
+                    try:
+                        result = unit(factory)
+                    except Exception as error:  # noqa: BLE001 - reported to the submitter
+                        savepoint.rollback()
+                        outcomes.append((future, error, None))
+                        continue
+                    savepoint.commit()
+                    outcomes.append((future, None, result))
+        except Exception as error:  # noqa: BLE001 - the whole group failed to commit
+            group_commit_units.inc(len(group), outcome="lost")
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        group_commits.inc()
+        for future, error, result in outcomes:
+            if error is None:
+                group_commit_units.inc(outcome="committed")
+                future.set_result(result)
+            else:
+                group_commit_units.inc(outcome="failed")
+                future.set_exception(error)
@@ -0,0 +1,156 @@
+"""Per-organization database placement and connection limits."""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from backend.src.models.base import Base
+
+# How long a loaded placement is trusted before it is read again.
+PLACEMENT_TTL = 60.0
+# Unquoted Postgres identifiers, so a schema name never needs escaping.
+SCHEMA_NAME_PATTERN = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+
+
+class TenantError(RuntimeError):
+    """Base class for tenant routing failures."""
+
+
+class TenantNotFoundError(TenantError):
+    """Raised when a token names an organization that does not exist."""
+
+
+class TenantBusyError(TenantError):
+    """Raised when a tenant has used all of its connection slots."""
+
+
+class InvalidPlacementError(TenantError):
+    """Raised when an organization's placement cannot be used safely."""
+
+
+def validate_schema_name(schema_name: str) -> str:
+    if not SCHEMA_NAME_PATTERN.fullmatch(schema_name):
+        raise InvalidPlacementError(
+            f"Invalid schema name {schema_name!r}; use lowercase letters, digits and "
+            "underscores, starting with a letter or underscore (at most 63)."
+        )
+    return schema_name
+
+
+@dataclass(frozen=True)
+class TenantPlacement:
+    organization_id: uuid.UUID
+    database_url: str | None
+    schema_name: str | None
+    max_connections: int
+
+
+class TenantRouter:
+    """Resolve organizations to engines and bound their concurrent sessions.
+
+    Shared tenants use the primary engine and are isolated by the
+    tenant-leading ``organization_id`` indexes. Schema tenants reuse the
+    primary pool with a schema translate map (Postgres only). Database
+    tenants get their own engine whose pool is capped at the tenant's
+    connection limit. Every tenant also holds a slot (see :meth:`acquire`)
+    for the lifetime of a session, so a noisy tenant waits on its own
+    limit instead of draining a shared pool.
+    """
+
+    def __init__(
+        self,
+        load_placement: Callable[[uuid.UUID], TenantPlacement | None],
+        *,
+        acquire_timeout: float,
+    ) -> None:
+        self._load_placement = load_placement
+        self.acquire_timeout = acquire_timeout
+        self._placements: dict[uuid.UUID, tuple[float, TenantPlacement]] = {}
+        self._engines: dict[tuple[str, str], Engine] = {}
+        self._slots: dict[uuid.UUID, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def placement(self, organization_id: uuid.UUID) -> TenantPlacement:
+        now = time.monotonic()
+        cached = self._placements.get(organization_id)
+        if cached is not None and now - cached[0] < PLACEMENT_TTL:
+            return cached[1]
+        placement = self._load_placement(organization_id)
+        if placement is None:
+            raise TenantNotFoundError(f"Organization {organization_id} was not found.")
+        self._placements[organization_id] = (now, placement)
+        return placement
+
+    def invalidate(self, organization_id: uuid.UUID) -> None:
+        self._placements.pop(organization_id, None)
+
+    def engine_for(self, placement: TenantPlacement, primary: Engine) -> Engine | None:
+        """Return the tenant's engine, or ``None`` when it lives in shared tables."""
+        if placement.database_url is not None:
+            return self._cached_engine(
+                ("database", placement.database_url),
+                lambda: _create_tenant_engine(placement),
+            )
+        if placement.schema_name is not None and primary.dialect.name == "postgresql":
+            return self._cached_engine(
+                ("schema", placement.schema_name),
+                lambda: _create_schema_engine(primary, placement.schema_name),
+            )
+        return None
+
+    def acquire(self, placement: TenantPlacement) -> None:
+        """Take one of the tenant's connection slots, waiting up to the timeout."""
+        if not self._semaphore(placement).acquire(timeout=self.acquire_timeout):
+            raise TenantBusyError(
+                f"Organization {placement.organization_id} has no free connections."
+            )
+
+    def release(self, placement: TenantPlacement) -> None:
+        self._semaphore(placement).release()
+
+    def _semaphore(self, placement: TenantPlacement) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._slots.get(placement.organization_id)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(placement.max_connections)
+                self._slots[placement.organization_id] = semaphore
+            return semaphore
+
+    def _cached_engine(self, key: tuple[str, str], factory: Callable[[], Engine]) -> Engine:
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = factory()
+                self._engines[key] = engine
+            return engine
+
+
+def _create_tenant_engine(placement: TenantPlacement) -> Engine:
+    url = placement.database_url
+    if url.startswith("sqlite"):
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(
+            url,
+            pool_size=placement.max_connections,
+            max_overflow=0,
+        )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _create_schema_engine(primary: Engine, schema_name: str) -> Engine:
+    quoted = primary.dialect.identifier_preparer.quote_schema(validate_schema_name(schema_name))
+    with primary.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {quoted}"))
+    engine = primary.execution_options(schema_translate_map={None: schema_name})
+    Base.metadata.create_all(engine)
+    return engine
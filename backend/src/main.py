@@ -1,29 +1,150 @@
 import backend.src.models  # noqa: F401
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
 
-from backend.src.core.settings import validate_settings
+from backend.src.core import logs, metrics, tracing
+from backend.src.core.compression import CompressionMiddleware
+from backend.src.core.concurrency import AIMDLimiter, ConcurrencyLimitMiddleware
+from backend.src.core.deadline import DeadlineMiddleware, parse_route_deadlines
+from backend.src.core.idempotency import IdempotencyMiddleware
+from backend.src.core.settings import load_settings, validate_settings
+from backend.src.api.admin import router as admin_router
+from backend.src.api.analytics import router as analytics_router
 from backend.src.api.approvals import router as approvals_router
+from backend.src.api.audit import router as audit_router
 from backend.src.api.auth import router as auth_router
+from backend.src.api.changes import router as changes_router
+from backend.src.api.content import router as content_router
+from backend.src.api.delegations import router as delegations_router
 from backend.src.api.documents import router as documents_router
+from backend.src.api.revisions import router as revisions_router
+from backend.src.api.webhooks import router as webhooks_router
+from backend.src.api.workflows import router as workflows_router
 from backend.src.db.base import Base
-from backend.src.db.session import engine
+from backend.src.db.session import (
+    SessionLocal,
+    engine,
+    group_commit,
+    tenant_session_factories,
+)
+from backend.src.services import (
+    analytics_service,
+    archive_service,
+    audit_service,
+    change_feed_service,
+    idempotency_service,
+    job_service,
+    notification_service,
+    search_service,
+    stats_service,
+    webhook_service,
+)
 from backend.src.api.dev import router as dev_router
 
 
+def _prepare_database(session: Session) -> None:
+    """Bring a database's derived state up to date and schedule its periodic jobs.
+
+    Runs on the shared database at startup and, from the job worker, on each
+    tenant database or schema.
+    """
+    stats_service.rebuild_counters(session)
+    # Seeded up front so concurrent first writes never race to create it.
+    change_feed_service.ensure_sequence(session)
+    # Partitions must exist before the first audit row is written.
+    audit_service.maintain_storage(session)
+    job_service.ensure_scheduled(
+        session,
+        kind=stats_service.RECONCILE_COUNTERS,
+        run_at=datetime.now(timezone.utc) + stats_service.RECONCILE_INTERVAL,
+    )
+    job_service.ensure_scheduled(session, kind=audit_service.MAINTAIN_AUDIT_STORAGE)
+    job_service.ensure_scheduled(session, kind=idempotency_service.PURGE_EXPIRED_KEYS)
+    job_service.ensure_scheduled(session, kind=archive_service.ARCHIVE_FINALIZED)
+    job_service.ensure_scheduled(session, kind=webhook_service.DELIVER_WEBHOOKS)
+    job_service.ensure_scheduled(session, kind=analytics_service.ROLLUP_APPROVAL_SLA)
+    job_service.ensure_scheduled(session, kind=change_feed_service.COMPACT_CHANGES)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     settings = validate_settings()
     app.state.settings = settings
+    log_listener = logs.configure_logging(level=settings.log_level)
+    span_exporter = tracing.create_exporter(
+        settings.tracing_exporter,
+        path=settings.tracing_file_path,
+    )
+    span_processor = None
+    if span_exporter is not None:
+        span_processor = tracing.configure_tracing(
+            exporter=span_exporter,
+            sample_ratio=settings.tracing_sample_ratio,
+        )
     app.title = settings.app_name
     Base.metadata.create_all(bind=engine)
+    search_service.ensure_search_index(engine)
+    with SessionLocal() as session:
+        if settings.search_in_memory_index:
+            search_service.enable_memory_index(session)
+        _prepare_database(session)
+        session.commit()
+    worker = None
+    if settings.job_worker_enabled:
+        worker = job_service.JobWorker(
+            SessionLocal,
+            threads=settings.job_worker_threads,
+            batch_size=settings.job_batch_size,
+            poll_interval=settings.job_poll_interval_seconds,
+            writer=group_commit,
+            tenants=tenant_session_factories,
+            prepare=_prepare_database,
+        )
+        worker.start()
     yield
+    if worker is not None:
+        worker.stop()
+    if group_commit is not None:
+        group_commit.stop()
+    webhook_service.close_client()
+    if span_processor is not None:
+        tracing.shutdown_tracing(span_processor)
+    logs.shutdown_logging(log_listener)
 
 
 app = FastAPI(lifespan=lifespan)
 
+_settings = load_settings()
+# Innermost, so deadline responses still pass through CORS and compression.
+app.add_middleware(
+    DeadlineMiddleware,
+    default_seconds=_settings.request_deadline_seconds,
+    route_deadlines=parse_route_deadlines(_settings.request_deadlines),
+)
+# Wraps the deadline middleware so its 503/504s count as congestion, and sits
+# inside CORS so refusals stay readable by the browser.
+if _settings.concurrency_limit_enabled:
+    app.add_middleware(
+        ConcurrencyLimitMiddleware,
+        limiter=AIMDLimiter(
+            initial_limit=_settings.concurrency_initial_limit,
+            min_limit=_settings.concurrency_min_limit,
+            max_limit=_settings.concurrency_max_limit,
+            latency_target=_settings.concurrency_latency_target_ms / 1000,
+        ),
+        route_latency_targets={
+            route: milliseconds / 1000
+            for route, milliseconds in parse_route_deadlines(
+                _settings.concurrency_route_latency_targets_ms
+            ).items()
+        },
+    )
+
 # Add CORS middleware for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -33,8 +154,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added before compression so stored responses are uncompressed and replays
+# are compressed per request like any other response.
+app.add_middleware(
+    IdempotencyMiddleware,
+    session_factory=SessionLocal,
+    max_body_bytes=_settings.idempotency_max_body_bytes,
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=_settings.compression_minimum_size,
+    content_types=_settings.compression_content_types.split(","),
+    encodings=_settings.compression_encodings.split(","),
+)
+app.add_middleware(tracing.TracingMiddleware)
+# Outermost, so the request ID covers every other middleware and the access
+# log measures the whole request.
+app.add_middleware(
+    logs.RequestLoggingMiddleware,
+    sample_rate=_settings.log_sample_rate,
+    slow_ms=_settings.log_slow_request_ms,
+)
+
 app.include_router(documents_router)
 app.include_router(approvals_router)
+app.include_router(audit_router)
+app.include_router(content_router)
+app.include_router(revisions_router)
+app.include_router(workflows_router)
+app.include_router(webhooks_router)
+app.include_router(analytics_router)
+app.include_router(delegations_router)
+app.include_router(admin_router)
+app.include_router(changes_router)
 app.include_router(auth_router)
 app.include_router(dev_router)
 
@@ -42,3 +194,8 @@ app.include_router(dev_router)
 @app.get("/health")
 def health() -> dict[str, str]:
     return {"status": "OK"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint() -> PlainTextResponse:
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -1,4 +1,18 @@
+from backend.src.models.organization import Organization
 from backend.src.models.user import User
 from backend.src.models.document import Document
 from backend.src.models.approval_step import ApprovalStep
-from backend.src.models.audit_log import AuditLog
\ No newline at end of file
+from backend.src.models.audit_log import AuditLog
+from backend.src.models.job import Job
+from backend.src.models.workflow_template import WorkflowTemplate
+from backend.src.models.document_status_count import DocumentStatusCount
+from backend.src.models.blob import Blob
+from backend.src.models.document_revision import DocumentRevision
+from backend.src.models.document_archive import ArchivedApprovalStep, ArchivedDocument
+from backend.src.models.idempotency_key import IdempotencyKey
+from backend.src.models.import_checkpoint import ImportCheckpoint
+from backend.src.models.webhook import WebhookDelivery, WebhookSubscription
+from backend.src.models.sla_rollup import ApprovalSlaRollup, SlaRollupWatermark
+from backend.src.models.delegation import Delegation
+from backend.src.models.change_feed import ChangeRecord, ChangeSequence
+from backend.src.models import document_search  # noqa: F401  (registers search DDL)
@@ -1,32 +1,71 @@
+from __future__ import annotations
+
 import uuid
+from datetime import datetime, timezone
 from enum import Enum
+from typing import TYPE_CHECKING
 
-from sqlalchemy import Enum as SqlEnum, Integer
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Enum as SqlEnum, Index, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.src.models.base import Base
+from backend.src.models.types import GUID, uuid7
+
+if TYPE_CHECKING:
+    from backend.src.models.document import Document
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
 
 
 class ApprovalStepStatus(str, Enum):
     PENDING = "pending"
     APPROVED = "approved"
     REJECTED = "rejected"
+    SKIPPED = "skipped"
 
 
 class ApprovalStep(Base):
     __tablename__ = "approval_steps"
+    __table_args__ = (
+        Index("ix_approval_steps_organization_document", "organization_id", "document_id"),
+        # Chain lookups (a document's steps in order) and the SLA rollup's
+        # "previous step decided at" probe.
+        Index("ix_approval_steps_document_order", "document_id", "step_order"),
+        Index("ix_approval_steps_decided_at", "decided_at", "id"),
+        # Bulk reassignment of an approver's pending steps.
+        Index("ix_approval_steps_approver_status", "approver_id", "status"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
-    document_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
-    approver_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    document_id: Mapped[uuid.UUID] = mapped_column(GUID(), nullable=False)
+    approver_id: Mapped[uuid.UUID] = mapped_column(GUID(), nullable=False)
     step_order: Mapped[int] = mapped_column(Integer, nullable=False)
     status: Mapped[ApprovalStepStatus] = mapped_column(
         SqlEnum(ApprovalStepStatus, name="approval_step_status"),
         nullable=False,
         default=ApprovalStepStatus.PENDING,
     )
+    organization_id: Mapped[uuid.UUID | None] = mapped_column(
+        GUID(),
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
+    # Set when the approver approves or rejects; skipped steps stay NULL.
+    decided_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    document: Mapped[Document | None] = relationship(
+        primaryjoin="foreign(ApprovalStep.document_id) == Document.id",
+        back_populates="steps",
+        viewonly=True,
+    )
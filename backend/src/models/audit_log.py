@@ -1,26 +1,41 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, String, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DateTime, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.src.models.base import Base
+from backend.src.models.types import GUID, uuid7
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
 
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    # On Postgres the table is range-partitioned by month, which requires the
+    # partition key in the primary key. See services.audit_service.
+    __table_args__ = (
+        Index("ix_audit_logs_document_timestamp", "document_id", "timestamp", "id"),
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_audit_logs_organization_timestamp", "organization_id", "timestamp", "id"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
-    document_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    document_id: Mapped[uuid.UUID] = mapped_column(GUID(), nullable=False)
+    organization_id: Mapped[uuid.UUID | None] = mapped_column(GUID(), nullable=True)
     action: Mapped[str] = mapped_column(String(255), nullable=False)
-    performed_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    performed_by: Mapped[uuid.UUID] = mapped_column(GUID(), nullable=False)
     timestamp: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
+        default=_utcnow,
         server_default=func.now(),
         nullable=False,
     )
@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, BigInteger, DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.src.models.base import Base
+from backend.src.models.types import GUID
+
+
+class ChangeRecord(Base):
+    """One entry of the change feed: an entity's state after a committed change."""
+
+    __tablename__ = "changes"
+    __table_args__ = (
+        Index("ix_changes_organization_seq", "organization_id", "seq"),
+        # Compaction looks for a newer change of the same entity.
+        Index("ix_changes_entity_seq", "entity_id", "seq"),
+        Index("ix_changes_changed_at", "changed_at"),
+    )
+
+    # Assigned from change_sequences in commit order; never reused.
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    organization_id: Mapped[uuid.UUID | None] = mapped_column(
+        GUID(),
+        nullable=True,
+    )
+    entity: Mapped[str] = mapped_column(String(20), nullable=False)
+    entity_id: Mapped[uuid.UUID] = mapped_column(GUID(), nullable=False)
+    op: Mapped[str] = mapped_column(String(20), nullable=False)
+    data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class ChangeSequence(Base):
+    __tablename__ = "change_sequences"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.src.models.base import Base
+from backend.src.models.types import GUID, uuid7
+
+
+class Delegation(Base):
+    """Lets ``delegate_id`` decide ``delegator_id``'s steps during a time window."""
+
+    __tablename__ = "delegations"
+    __table_args__ = (
+        Index("ix_delegations_organization_ends_at", "organization_id", "ends_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        GUID(),
+        primary_key=True,
+        default=uuid7,
+    )
+    organization_id: Mapped[uuid.UUID | None] = mapped_column(
+        GUID(),
+        nullable=True,
+    )
+    delegator_id: Mapped[uuid.UUID] = mapped_column(GUID(), nullable=False)
+    delegate_id: Mapped[uuid.UUID] = mapped_column(GUID(), nullable=False)
+    starts_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    ends_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -1,12 +1,19 @@
+from __future__ import annotations
+
 import uuid
 from datetime import datetime
 from enum import Enum
+from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Enum as SqlEnum, String, func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Enum as SqlEnum, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.src.models.base import Base
+from backend.src.models.types import GUID, uuid7
+
+if TYPE_CHECKING:
+    from backend.src.models.approval_step import ApprovalStep
+    from backend.src.models.audit_log import AuditLog
 
 
 class DocumentStatus(str, Enum):
@@ -17,11 +24,18 @@ class DocumentStatus(str, Enum):
 
 class Document(Base):
     __tablename__ = "documents"
+    # Tenant-leading so each organization's listings stay index range scans.
+    __table_args__ = (
+        Index("ix_documents_organization_created", "organization_id", "created_at"),
+        Index("ix_documents_organization_status", "organization_id", "status"),
+        # Archival scans finalized documents by when they were decided.
+        Index("ix_documents_status_finalized", "status", "finalized_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     status: Mapped[DocumentStatus] = mapped_column(
@@ -34,3 +48,36 @@ class Document(Base):
         server_default=func.now(),
         nullable=False,
     )
+    # Set when the document is approved or rejected; cleared on reopen.
+    finalized_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    workflow_template_id: Mapped[uuid.UUID | None] = mapped_column(
+        GUID(),
+        nullable=True,
+    )
+    current_stage: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    stage_approvals: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    stage_rejections: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    blob_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    content_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    organization_id: Mapped[uuid.UUID | None] = mapped_column(
+        GUID(),
+        nullable=True,
+    )
+
+    # There are no foreign keys between these tables (documents move to the
+    # archive independently of their audit trail), so the joins are declared
+    # explicitly and the collections are read-only.
+    steps: Mapped[list[ApprovalStep]] = relationship(
+        primaryjoin="Document.id == foreign(ApprovalStep.document_id)",
+        order_by="ApprovalStep.step_order",
+        back_populates="document",
+        viewonly=True,
+    )
+    audit_entries: Mapped[list[AuditLog]] = relationship(
+        primaryjoin="Document.id == foreign(AuditLog.document_id)",
+        order_by="(AuditLog.timestamp, AuditLog.id)",
+        viewonly=True,
+    )
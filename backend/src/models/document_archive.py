@@ -0,0 +1,60 @@
+"""Cold storage for finalized documents and their approval steps.
+
+The archive tables mirror the live tables column for column (plus
+``archived_at``), so rows move with a plain ``INSERT ... SELECT``.
+"""
+
+from sqlalchemy import Column, DateTime, Index, Table, func
+from sqlalchemy.orm import relationship
+
+from backend.src.models.approval_step import ApprovalStep
+from backend.src.models.base import Base
+from backend.src.models.document import Document
+
+
+def _archive_table(name: str, source: Table, *indexes: tuple[str, ...]) -> Table:
+    columns = [column._copy() for column in source.columns]
+    table = Table(
+        name,
+        Base.metadata,
+        *columns,
+        Column("archived_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    )
+    for index_columns in indexes:
+        Index(f"ix_{name}_{'_'.join(index_columns)}", *(table.c[c] for c in index_columns))
+    return table
+
+
+documents_archive = _archive_table(
+    "documents_archive",
+    Document.__table__,
+    ("organization_id", "created_at"),
+)
+approval_steps_archive = _archive_table(
+    "approval_steps_archive",
+    ApprovalStep.__table__,
+    ("document_id", "step_order"),
+)
+
+
+class ArchivedDocument(Base):
+    __table__ = documents_archive
+
+    # Same shape as ``Document.steps`` and ``Document.audit_entries``; the
+    # audit trail stays in the live table when a document is archived.
+    steps = relationship(
+        "ArchivedApprovalStep",
+        primaryjoin="ArchivedDocument.id == foreign(ArchivedApprovalStep.document_id)",
+        order_by="ArchivedApprovalStep.step_order",
+        viewonly=True,
+    )
+    audit_entries = relationship(
+        "AuditLog",
+        primaryjoin="ArchivedDocument.id == foreign(AuditLog.document_id)",
+        order_by="(AuditLog.timestamp, AuditLog.id)",
+        viewonly=True,
+    )
+
+
+class ArchivedApprovalStep(Base):
+    __table__ = approval_steps_archive
@@ -0,0 +1,54 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Enum as SqlEnum,
+    Integer,
+    LargeBinary,
+    String,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.src.models.base import Base
+from backend.src.models.types import GUID, uuid7
+
+
+class RevisionStorage(str, Enum):
+    SNAPSHOT = "snapshot"
+    DELTA = "delta"
+
+
+class DocumentRevision(Base):
+    __tablename__ = "document_revisions"
+    __table_args__ = (
+        UniqueConstraint("document_id", "number", name="uq_document_revisions_document_number"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        GUID(),
+        primary_key=True,
+        default=uuid7,
+    )
+    document_id: Mapped[uuid.UUID] = mapped_column(GUID(), nullable=False)
+    number: Mapped[int] = mapped_column(Integer, nullable=False)
+    storage: Mapped[RevisionStorage] = mapped_column(
+        SqlEnum(RevisionStorage, name="revision_storage"),
+        nullable=False,
+    )
+    # zlib-compressed full content for snapshots, or a zlib-compressed
+    # core.delta payload against revision ``number - 1``.
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    stored_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_by: Mapped[uuid.UUID | None] = mapped_column(GUID(), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
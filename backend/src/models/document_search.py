@@ -0,0 +1,32 @@
+"""Full-text search structures attached to the documents table.
+
+These are not mapped columns: Postgres gets a generated ``tsvector`` column
+with a GIN index, SQLite gets an FTS5 shadow table keyed by document id.
+"""
+
+from sqlalchemy import DDL, event
+
+from backend.src.models.document import Document
+
+POSTGRES_SEARCH_DDL = (
+    "ALTER TABLE documents ADD COLUMN IF NOT EXISTS title_tsv tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(title, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_documents_title_tsv ON documents USING GIN (title_tsv)",
+)
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts "
+    "USING fts5(title, document_id UNINDEXED, tokenize = 'unicode61')",
+)
+
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(
+        Document.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        Document.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
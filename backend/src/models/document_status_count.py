@@ -0,0 +1,18 @@
+from sqlalchemy import Enum as SqlEnum, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.src.models.base import Base
+from backend.src.models.document import DocumentStatus
+
+
+class DocumentStatusCount(Base):
+    __tablename__ = "document_status_counts"
+
+    # str(organization_id), or "" for documents without an organization.
+    organization_key: Mapped[str] = mapped_column(String(36), primary_key=True, default="")
+    status: Mapped[DocumentStatus] = mapped_column(
+        SqlEnum(DocumentStatus, name="document_status"),
+        primary_key=True,
+    )
+    shard: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
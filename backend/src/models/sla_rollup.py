@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.src.models.base import Base
+from backend.src.models.types import GUID
+
+
+class ApprovalSlaRollup(Base):
+    """Time-in-step histogram bin for one bucket and dimension.
+
+    The primary key leads with what dashboards filter on, so a report is a
+    range scan over ``bucket_start`` within one tenant and dimension.
+    """
+
+    __tablename__ = "approval_sla_rollups"
+
+    granularity: Mapped[str] = mapped_column(String(8), primary_key=True)
+    # str(organization_id), or "" for documents without an organization.
+    organization_key: Mapped[str] = mapped_column(String(36), primary_key=True)
+    dimension: Mapped[str] = mapped_column(String(16), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    dimension_value: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # Index into analytics_service's log-scale bin bounds.
+    bin: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+class SlaRollupWatermark(Base):
+    """How far the rollup has read decided steps, as (decided_at, id)."""
+
+    __tablename__ = "sla_rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    decided_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    step_id: Mapped[uuid.UUID | None] = mapped_column(GUID(), nullable=True)
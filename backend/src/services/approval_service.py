@@ -1,14 +1,29 @@
 from __future__ import annotations
 
+import logging
 import uuid
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import select
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from backend.src.core.tracing import traced
+from backend.src.db import queries
 from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
 from backend.src.models.document import Document, DocumentStatus
+from backend.src.services import (
+    audit_service,
+    change_feed_service,
+    delegation_service,
+    notification_service,
+    stats_service,
+    webhook_service,
+    workflow_service,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class ApprovalWorkflowError(RuntimeError):
@@ -54,6 +69,7 @@ class ApprovalResult:
     step: ApprovalStep
 
 
+@traced
 def decide_step(
     session: Session,
     *,
@@ -69,6 +85,9 @@ def decide_step(
         )
 
     step = _load_step(session, step_id, document_id, approver_id)
+    if document.workflow_template_id is not None:
+        return _decide_with_workflow(session, document, step, decision, approver_id)
+
     steps = _load_steps(session, document_id)
     _ensure_step_order(steps, step)
     _ensure_step_pending(step)
@@ -77,12 +96,27 @@ def decide_step(
         step.status = ApprovalStepStatus.APPROVED
         if _all_steps_approved(steps, step):
             document.status = DocumentStatus.APPROVED
+        else:
+            next_step = _next_pending_step(steps, step)
+            if next_step is not None:
+                notification_service.schedule_step_followups(session, next_step)
     elif decision == Decision.REJECT:
         step.status = ApprovalStepStatus.REJECTED
         document.status = DocumentStatus.REJECTED
     else:
         raise InvalidStepTransitionError(f"Unsupported decision: {decision}")
 
+    _record_decision(session, step, decision, approver_id)
+    if document.status != DocumentStatus.PENDING:
+        document.finalized_at = datetime.now(timezone.utc)
+        change_feed_service.record_document(session, document.id)
+    _publish_outcome(session, document, step, approver_id)
+    stats_service.record_transition(
+        session,
+        DocumentStatus.PENDING,
+        document.status,
+        organization_id=document.organization_id,
+    )
     session.commit()
     session.refresh(step)
     session.refresh(document)
@@ -90,6 +124,7 @@ def decide_step(
     return ApprovalResult(document=document, step=step)
 
 
+@traced
 def approve_step(
     session: Session,
     *,
@@ -106,6 +141,7 @@ def approve_step(
     )
 
 
+@traced
 def reject_step(
     session: Session,
     *,
@@ -122,8 +158,200 @@ def reject_step(
     )
 
 
+@traced
+def reopen_document(session: Session, document: Document) -> None:
+    """Restart the approval chain of a rejected document after resubmission.
+
+    Every step goes back to pending and the first stage is notified again.
+    The caller owns the transaction.
+    """
+    if document.status != DocumentStatus.REJECTED:
+        raise DocumentStateError(
+            f"Document {document.id} is {document.status} and cannot be reopened."
+        )
+    session.flush()
+    reopened = session.scalars(
+        update(ApprovalStep)
+        .where(ApprovalStep.document_id == document.id)
+        # The chain starts over, so time in step does too.
+        .values(
+            status=ApprovalStepStatus.PENDING,
+            created_at=datetime.now(timezone.utc),
+            decided_at=None,
+        )
+        .returning(ApprovalStep.id)
+    ).all()
+    change_feed_service.record_steps(session, reopened)
+    change_feed_service.record_document(session, document.id)
+    stats_service.record_transition(
+        session,
+        document.status,
+        DocumentStatus.PENDING,
+        organization_id=document.organization_id,
+    )
+    document.status = DocumentStatus.PENDING
+    document.finalized_at = None
+    if document.workflow_template_id is not None:
+        document.current_stage = 1
+        document.stage_approvals = 0
+        document.stage_rejections = 0
+
+    steps = _load_steps(session, document.id)
+    if steps:
+        first_order = steps[0].step_order
+        for step in steps:
+            if step.step_order == first_order:
+                notification_service.schedule_step_followups(session, step)
+
+
+def _decide_with_workflow(
+    session: Session,
+    document: Document,
+    step: ApprovalStep,
+    decision: Decision,
+    approver_id: uuid.UUID,
+) -> ApprovalResult:
+    _ensure_step_pending(step)
+    if step.step_order != document.current_stage:
+        raise StepOutOfOrderError(
+            f"Step {step.id} belongs to stage {step.step_order}, "
+            f"but stage {document.current_stage} is active."
+        )
+
+    workflow = workflow_service.get_compiled(
+        session, document.workflow_template_id, organization_id=document.organization_id
+    )
+    if decision not in (Decision.APPROVE, Decision.REJECT):
+        raise InvalidStepTransitionError(f"Unsupported decision: {decision}")
+    transition = workflow.transition(
+        step.step_order,
+        approvals=document.stage_approvals,
+        rejections=document.stage_rejections,
+        approve=decision == Decision.APPROVE,
+    )
+
+    if decision == Decision.APPROVE:
+        step.status = ApprovalStepStatus.APPROVED
+        document.stage_approvals += 1
+    else:
+        step.status = ApprovalStepStatus.REJECTED
+        document.stage_rejections += 1
+
+    if transition == workflow_service.Transition.ADVANCE:
+        _skip_pending_steps(session, document.id, step_order=step.step_order)
+        document.current_stage = step.step_order + 1
+        document.stage_approvals = 0
+        document.stage_rejections = 0
+        for next_step in _load_stage_steps(session, document.id, document.current_stage):
+            notification_service.schedule_step_followups(session, next_step)
+    elif transition == workflow_service.Transition.COMPLETE:
+        _skip_pending_steps(session, document.id)
+        document.status = DocumentStatus.APPROVED
+    elif transition == workflow_service.Transition.REJECT:
+        _skip_pending_steps(session, document.id)
+        document.status = DocumentStatus.REJECTED
+
+    _record_decision(session, step, decision, approver_id)
+    if document.status != DocumentStatus.PENDING:
+        document.finalized_at = datetime.now(timezone.utc)
+    if transition != workflow_service.Transition.STAY:
+        change_feed_service.record_document(session, document.id)
+    _publish_outcome(session, document, step, approver_id)
+    stats_service.record_transition(
+        session,
+        DocumentStatus.PENDING,
+        document.status,
+        organization_id=document.organization_id,
+    )
+    session.commit()
+    session.refresh(step)
+    session.refresh(document)
+
+    return ApprovalResult(document=document, step=step)
+
+
+def _record_decision(
+    session: Session,
+    step: ApprovalStep,
+    decision: Decision,
+    decided_by: uuid.UUID,
+) -> None:
+    step.decided_at = datetime.now(timezone.utc)
+    logger.info(
+        "step decided",
+        extra={
+            "document_id": step.document_id,
+            "step_id": step.id,
+            "decision": decision.value,
+        },
+    )
+    audit_service.record(
+        session,
+        document_id=step.document_id,
+        action="step_approved" if decision == Decision.APPROVE else "step_rejected",
+        # The delegate when the decision was made under a delegation.
+        performed_by=decided_by,
+        organization_id=step.organization_id,
+    )
+    change_feed_service.record_steps(session, [step.id])
+
+
+def _publish_outcome(
+    session: Session,
+    document: Document,
+    step: ApprovalStep,
+    decided_by: uuid.UUID,
+) -> None:
+    """Queue webhooks for a finalized document in the decision's transaction."""
+    if document.status == DocumentStatus.PENDING:
+        return
+    event_type = (
+        webhook_service.DOCUMENT_APPROVED
+        if document.status == DocumentStatus.APPROVED
+        else webhook_service.DOCUMENT_REJECTED
+    )
+    webhook_service.publish(
+        session,
+        event_type=event_type,
+        organization_id=document.organization_id,
+        data={
+            "document_id": str(document.id),
+            "title": document.title,
+            "status": document.status.value,
+            "step_id": str(step.id),
+            "decided_by": str(decided_by),
+        },
+    )
+
+
+def _skip_pending_steps(
+    session: Session,
+    document_id: uuid.UUID,
+    *,
+    step_order: int | None = None,
+) -> None:
+    session.flush()
+    statement = update(ApprovalStep).where(
+        ApprovalStep.document_id == document_id,
+        ApprovalStep.status == ApprovalStepStatus.PENDING,
+    )
+    if step_order is not None:
+        statement = statement.where(ApprovalStep.step_order == step_order)
+    skipped = session.scalars(
+        statement.values(status=ApprovalStepStatus.SKIPPED).returning(ApprovalStep.id)
+    ).all()
+    change_feed_service.record_steps(session, skipped)
+
+
+def _load_stage_steps(
+    session: Session, document_id: uuid.UUID, step_order: int
+) -> list[ApprovalStep]:
+    parameters = {"document_id": document_id, "step_order": step_order}
+    return list(session.scalars(queries.STEPS_FOR_STAGE, parameters))
+
+
 def _load_document(session: Session, document_id: uuid.UUID) -> Document:
-    document = session.get(Document, document_id)
+    document = session.get(Document, document_id, with_for_update=True)
     if document is None:
         raise DocumentNotFoundError(f"Document {document_id} was not found.")
     return document
@@ -140,7 +368,12 @@ def _load_step(
         raise StepNotFoundError(
             f"Step {step_id} does not belong to document {document_id}."
         )
-    if step.approver_id != approver_id:
+    if not delegation_service.can_act_for(
+        session,
+        organization_id=step.organization_id,
+        approver_id=step.approver_id,
+        actor_id=approver_id,
+    ):
         raise ApproverMismatchError(
             f"Step {step_id} cannot be updated by approver {approver_id}."
         )
@@ -148,12 +381,7 @@ def _load_step(
 
 
 def _load_steps(session: Session, document_id: uuid.UUID) -> list[ApprovalStep]:
-    statement = (
-        select(ApprovalStep)
-        .where(ApprovalStep.document_id == document_id)
-        .order_by(ApprovalStep.step_order)
-    )
-    return list(session.scalars(statement))
+    return list(session.scalars(queries.STEPS_FOR_DOCUMENT, {"document_id": document_id}))
 
 
 def _ensure_step_pending(step: ApprovalStep) -> None:
@@ -185,6 +413,15 @@ def _ensure_step_order(steps: list[ApprovalStep], target: ApprovalStep) -> None:
         )
 
 
+def _next_pending_step(
+    steps: list[ApprovalStep], target: ApprovalStep
+) -> ApprovalStep | None:
+    for step in steps:
+        if step.id != target.id and step.status == ApprovalStepStatus.PENDING:
+            return step
+    return None
+
+
 def _all_steps_approved(steps: list[ApprovalStep], target: ApprovalStep) -> bool:
     for step in steps:
         if step.id == target.id:
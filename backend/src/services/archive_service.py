@@ -0,0 +1,165 @@
+"""Hot/cold archival of finalized documents.
+
+Approved and rejected documents finalized more than ``archive_after_days``
+ago move, together with their approval steps, into the ``*_archive``
+tables and leave the search index. Each batch is its own transaction, so
+an interrupted run simply resumes with the next one.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.interfaces import ORMOption
+
+from backend.src.core.settings import load_settings
+from backend.src.models.approval_step import ApprovalStep
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.document_archive import (
+    ArchivedDocument,
+    approval_steps_archive,
+    documents_archive,
+)
+from backend.src.services import change_feed_service, job_service, search_service
+
+ARCHIVE_FINALIZED = "archive.move_finalized"
+ARCHIVE_INTERVAL = timedelta(days=1)
+# Batches per job run; a backlog continues in an immediately re-enqueued job.
+MAX_BATCHES_PER_RUN = 20
+FINAL_STATUSES = (DocumentStatus.APPROVED, DocumentStatus.REJECTED)
+
+
+def archive_batch(session: Session, *, older_than: datetime, batch_size: int) -> int:
+    """Move one batch of finalized documents to the archive and commit.
+
+    Returns the number of documents moved.
+    """
+    statement = (
+        select(Document.id)
+        .where(Document.status.in_(FINAL_STATUSES), Document.finalized_at < older_than)
+        .order_by(Document.finalized_at)
+        .limit(batch_size)
+    )
+    if session.get_bind().dialect.name == "postgresql":
+        # Concurrent runs take disjoint batches instead of blocking.
+        statement = statement.with_for_update(skip_locked=True)
+    document_ids = list(session.scalars(statement))
+    if not document_ids:
+        return 0
+    step_ids = list(
+        session.scalars(select(ApprovalStep.id).where(ApprovalStep.document_id.in_(document_ids)))
+    )
+
+    _move(
+        session,
+        ApprovalStep.__table__,
+        approval_steps_archive,
+        ApprovalStep.document_id.in_(document_ids),
+    )
+    _move(session, Document.__table__, documents_archive, Document.id.in_(document_ids))
+    search_service.unindex_documents(session, document_ids)
+    change_feed_service.record_archived(session, document_ids=document_ids, step_ids=step_ids)
+    session.commit()
+    return len(document_ids)
+
+
+def archive_finalized(
+    session: Session,
+    *,
+    now: datetime | None = None,
+    max_batches: int | None = None,
+) -> tuple[int, bool]:
+    """Archive eligible documents batch by batch.
+
+    Returns the number moved and whether eligible documents remain.
+    """
+    settings = load_settings()
+    now = now or datetime.now(timezone.utc)
+    older_than = now - timedelta(days=settings.archive_after_days)
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(session, older_than=older_than, batch_size=settings.archive_batch_size)
+        total += moved
+        batches += 1
+        if moved < settings.archive_batch_size:
+            return total, False
+    return total, True
+
+
+@job_service.register_handler(ARCHIVE_FINALIZED)
+def _archive_finalized_job(session: Session, payload: dict[str, Any]) -> None:
+    _, remaining = archive_finalized(session, max_batches=MAX_BATCHES_PER_RUN)
+    delay = timedelta(0) if remaining else ARCHIVE_INTERVAL
+    job_service.enqueue(
+        session,
+        kind=ARCHIVE_FINALIZED,
+        run_at=datetime.now(timezone.utc) + delay,
+    )
+
+
+def find_document(
+    session: Session,
+    document_id: uuid.UUID,
+    *,
+    include_archived: bool = True,
+    live_options: Sequence[ORMOption] = (),
+    archived_options: Sequence[ORMOption] = (),
+) -> Document | ArchivedDocument | None:
+    document = session.get(Document, document_id, options=live_options)
+    if document is None and include_archived:
+        return session.get(ArchivedDocument, document_id, options=archived_options)
+    return document
+
+
+def list_archived(
+    session: Session,
+    *,
+    organization_id: uuid.UUID | None = None,
+    options: Sequence[ORMOption] = (),
+) -> list[ArchivedDocument]:
+    statement = (
+        select(ArchivedDocument)
+        .options(*options)
+        .where(ArchivedDocument.organization_id.is_not_distinct_from(organization_id))
+        .order_by(ArchivedDocument.created_at.desc())
+    )
+    return list(session.scalars(statement))
+
+
+def restore_document(session: Session, document_id: uuid.UUID) -> Document | None:
+    """Move an archived document and its steps back into the hot tables.
+
+    Used when a rejected document is resubmitted. The caller owns the
+    transaction.
+    """
+    if session.get(ArchivedDocument, document_id) is None:
+        return None
+    _move(
+        session,
+        documents_archive,
+        Document.__table__,
+        documents_archive.c.id == document_id,
+    )
+    _move(
+        session,
+        approval_steps_archive,
+        ApprovalStep.__table__,
+        approval_steps_archive.c.document_id == document_id,
+    )
+    session.expire_all()
+    document = session.get(Document, document_id, with_for_update=True)
+    search_service.index_document(session, document)
+    return document
+
+
+def _move(session: Session, source, target, condition) -> None:
+    columns = [column.name for column in target.columns if column.name in source.columns]
+    rows = select(*(source.c[name] for name in columns)).where(condition)
+    session.execute(insert(target).from_select(columns, rows))
+    session.execute(delete(source).where(condition))
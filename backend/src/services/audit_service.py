@@ -0,0 +1,393 @@
+"""Audit trail recording, querying and time-based retention.
+
+Storage is split by month so retention never has to DELETE rows:
+
+* Postgres: ``audit_logs`` is range-partitioned on ``timestamp`` with one
+  ``audit_logs_pYYYYMM`` partition per month (plus a default partition).
+  Expired partitions are dropped or detached.
+* SQLite: ``audit_logs`` is the active table. At the start of a month it is
+  renamed to ``audit_logs_YYYYMM`` (the last month it covers) and a fresh
+  active table is created. Queries union the tables overlapping the range,
+  and expired tables are dropped.
+"""
+
+from __future__ import annotations
+
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import MetaData, Table, func, or_, select, text, union_all
+from sqlalchemy.orm import Session
+
+from backend.src.core.pagination import decode_cursor, encode_cursor
+from backend.src.core.settings import load_settings
+from backend.src.models.audit_log import AuditLog
+from backend.src.services import job_service
+
+MAINTAIN_AUDIT_STORAGE = "audit.maintain_storage"
+MAINTENANCE_INTERVAL = timedelta(hours=6)
+PARTITIONS_AHEAD = 2
+
+_ACTIVE_TABLE = AuditLog.__table__.name
+_ARCHIVE_PATTERN = re.compile(rf"^{_ACTIVE_TABLE}_(\d{{6}})$")
+_PARTITION_PATTERN = re.compile(rf"^{_ACTIVE_TABLE}_p(\d{{6}})$")
+_archive_tables: dict[str, Table] = {}
+
+
+class AuditQueryError(RuntimeError):
+    """Raised when an audit query is invalid."""
+
+
+@dataclass(frozen=True)
+class AuditEntry:
+    id: uuid.UUID
+    document_id: uuid.UUID
+    action: str
+    performed_by: uuid.UUID
+    timestamp: datetime
+
+
+@dataclass(frozen=True)
+class AuditPage:
+    entries: list[AuditEntry]
+    next_cursor: str | None
+
+
+@dataclass(frozen=True)
+class RetentionResult:
+    removed: list[str]
+    created: list[str]
+
+
+def record(
+    session: Session,
+    *,
+    document_id: uuid.UUID,
+    action: str,
+    performed_by: uuid.UUID,
+    organization_id: uuid.UUID | None = None,
+) -> AuditLog:
+    """Add an audit entry to the caller's transaction."""
+    entry = AuditLog(
+        document_id=document_id,
+        action=action,
+        performed_by=performed_by,
+        organization_id=organization_id,
+    )
+    session.add(entry)
+    return entry
+
+
+def list_document_audit(
+    session: Session,
+    *,
+    document_id: uuid.UUID,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> AuditPage:
+    return _query(session, document_id=document_id, limit=limit, cursor=cursor)
+
+
+def query_audit(
+    session: Session,
+    *,
+    organization_id: uuid.UUID | None,
+    start: datetime,
+    end: datetime,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> AuditPage:
+    if end <= start:
+        raise AuditQueryError("The end of the range must be after its start.")
+    return _query(
+        session,
+        organization_id=organization_id,
+        start=start,
+        end=end,
+        limit=limit,
+        cursor=cursor,
+    )
+
+
+def maintain_storage(session: Session, *, now: datetime | None = None) -> RetentionResult:
+    """Create upcoming partitions, rotate tables and apply retention. Commits."""
+    now = now or datetime.now(timezone.utc)
+    settings = load_settings()
+    cutoff = _add_months(_month_start(now), -settings.audit_retention_months)
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        result = _maintain_postgres(session, now, cutoff, settings.audit_retention_mode)
+    elif dialect == "sqlite":
+        result = _maintain_sqlite(session, now, cutoff)
+    else:
+        result = RetentionResult(removed=[], created=[])
+    session.commit()
+    return result
+
+
+@job_service.register_handler(MAINTAIN_AUDIT_STORAGE)
+def _maintain_storage_job(session: Session, payload: dict[str, Any]) -> None:
+    maintain_storage(session)
+    job_service.enqueue(
+        session,
+        kind=MAINTAIN_AUDIT_STORAGE,
+        run_at=datetime.now(timezone.utc) + MAINTENANCE_INTERVAL,
+    )
+
+
+def _query(
+    session: Session,
+    *,
+    limit: int,
+    cursor: str | None,
+    document_id: uuid.UUID | None = None,
+    organization_id: uuid.UUID | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> AuditPage:
+    """Page through audit entries; range queries are always scoped to one organization."""
+    after = _decode_cursor(cursor) if cursor else None
+    tables = _tables_for_range(session, start)
+
+    selects = []
+    for table in tables:
+        statement = select(
+            table.c.id,
+            table.c.document_id,
+            table.c.action,
+            table.c.performed_by,
+            table.c.timestamp,
+        )
+        if document_id is not None:
+            statement = statement.where(table.c.document_id == document_id)
+        else:
+            statement = statement.where(
+                table.c.organization_id.is_not_distinct_from(organization_id)
+            )
+        if start is not None:
+            statement = statement.where(table.c.timestamp >= start)
+        if end is not None:
+            statement = statement.where(table.c.timestamp < end)
+        if after is not None:
+            after_timestamp, after_id = after
+            statement = statement.where(
+                or_(
+                    table.c.timestamp > after_timestamp,
+                    (table.c.timestamp == after_timestamp) & (table.c.id > after_id),
+                )
+            )
+        selects.append(statement.order_by(table.c.timestamp, table.c.id).limit(limit + 1))
+
+    if len(selects) == 1:
+        statement = selects[0]
+    else:
+        combined = union_all(*(part.subquery().select() for part in selects)).subquery()
+        statement = (
+            select(combined)
+            .order_by(combined.c.timestamp, combined.c.id)
+            .limit(limit + 1)
+        )
+
+    rows = session.execute(statement).all()
+    entries = [
+        AuditEntry(
+            id=row.id,
+            document_id=row.document_id,
+            action=row.action,
+            performed_by=row.performed_by,
+            timestamp=row.timestamp,
+        )
+        for row in rows[:limit]
+    ]
+    next_cursor = None
+    if len(rows) > limit and entries:
+        last = entries[-1]
+        next_cursor = encode_cursor(t=last.timestamp.isoformat(), id=str(last.id))
+    return AuditPage(entries=entries, next_cursor=next_cursor)
+
+
+def _tables_for_range(session: Session, start: datetime | None) -> list[Table]:
+    """Return the tables that may hold rows at or after ``start``."""
+    active = AuditLog.__table__
+    if session.get_bind().dialect.name != "sqlite":
+        # Postgres prunes partitions itself.
+        return [active]
+    start_key = start.strftime("%Y%m") if start is not None else None
+    tables = [active]
+    for name, month in _sqlite_archives(session):
+        # An archive named YYYYMM only holds rows from before the end of YYYYMM.
+        if start_key is None or month >= start_key:
+            tables.append(_archive_table(name))
+    return tables
+
+
+def _archive_table(name: str) -> Table:
+    table = _archive_tables.get(name)
+    if table is None:
+        table = Table(
+            name,
+            MetaData(),
+            *(column._copy() for column in AuditLog.__table__.columns),
+        )
+        _archive_tables[name] = table
+    return table
+
+
+def _sqlite_archives(session: Session) -> list[tuple[str, str]]:
+    names = session.scalars(
+        text("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE :prefix"),
+        {"prefix": f"{_ACTIVE_TABLE}_%"},
+    )
+    archives = []
+    for name in names:
+        match = _ARCHIVE_PATTERN.match(name)
+        if match is not None:
+            archives.append((name, match.group(1)))
+    return sorted(archives, key=lambda item: item[1])
+
+
+def _maintain_sqlite(session: Session, now: datetime, cutoff: datetime) -> RetentionResult:
+    created: list[str] = []
+    removed: list[str] = []
+    month_start = _month_start(now)
+    oldest = session.scalar(select(func.min(AuditLog.timestamp)))
+    if oldest is not None and _as_utc(oldest) < month_start:
+        archive = f"{_ACTIVE_TABLE}_{_add_months(month_start, -1):%Y%m}"
+        if any(name == archive for name, _ in _sqlite_archives(session)):
+            # Already rotated this month; fold stragglers into the archive.
+            session.execute(
+                text(
+                    f"INSERT INTO {archive} SELECT * FROM {_ACTIVE_TABLE} "
+                    "WHERE timestamp < :month_start"
+                ),
+                {"month_start": _sqlite_timestamp(month_start)},
+            )
+            session.execute(
+                text(f"DELETE FROM {_ACTIVE_TABLE} WHERE timestamp < :month_start"),
+                {"month_start": _sqlite_timestamp(month_start)},
+            )
+        else:
+            session.execute(text(f"ALTER TABLE {_ACTIVE_TABLE} RENAME TO {archive}"))
+            # SQLite index names are database-wide; give the archive its own.
+            for index in AuditLog.__table__.indexes:
+                columns = ", ".join(column.name for column in index.columns)
+                session.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+                session.execute(
+                    text(f"CREATE INDEX {index.name}_{archive[-6:]} ON {archive} ({columns})")
+                )
+            AuditLog.__table__.create(session.connection())
+            # Rows already written this month belong in the new active table.
+            session.execute(
+                text(
+                    f"INSERT INTO {_ACTIVE_TABLE} SELECT * FROM {archive} "
+                    "WHERE timestamp >= :month_start"
+                ),
+                {"month_start": _sqlite_timestamp(month_start)},
+            )
+            session.execute(
+                text(f"DELETE FROM {archive} WHERE timestamp >= :month_start"),
+                {"month_start": _sqlite_timestamp(month_start)},
+            )
+            created.append(archive)
+
+    cutoff_key = f"{cutoff:%Y%m}"
+    for name, month in _sqlite_archives(session):
+        if month < cutoff_key:
+            session.execute(text(f"DROP TABLE {name}"))
+            _archive_tables.pop(name, None)
+            removed.append(name)
+    return RetentionResult(removed=removed, created=created)
+
+
+def _maintain_postgres(
+    session: Session,
+    now: datetime,
+    cutoff: datetime,
+    mode: str,
+) -> RetentionResult:
+    partitioned = session.scalar(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :table"
+        ),
+        {"table": _ACTIVE_TABLE},
+    )
+    if not partitioned:
+        return RetentionResult(removed=[], created=[])
+
+    existing = {
+        name
+        for name in session.scalars(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = :table"
+            ),
+            {"table": _ACTIVE_TABLE},
+        )
+    }
+    created: list[str] = []
+    if f"{_ACTIVE_TABLE}_default" not in existing:
+        session.execute(
+            text(f"CREATE TABLE {_ACTIVE_TABLE}_default PARTITION OF {_ACTIVE_TABLE} DEFAULT")
+        )
+        created.append(f"{_ACTIVE_TABLE}_default")
+    month = _month_start(now)
+    for offset in range(PARTITIONS_AHEAD + 1):
+        lower = _add_months(month, offset)
+        upper = _add_months(lower, 1)
+        name = f"{_ACTIVE_TABLE}_p{lower:%Y%m}"
+        if name in existing:
+            continue
+        session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {_ACTIVE_TABLE} "
+                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        )
+        created.append(name)
+
+    removed: list[str] = []
+    cutoff_key = f"{cutoff:%Y%m}"
+    for name in sorted(existing):
+        match = _PARTITION_PATTERN.match(name)
+        if match is None or match.group(1) >= cutoff_key:
+            continue
+        session.execute(text(f"ALTER TABLE {_ACTIVE_TABLE} DETACH PARTITION {name}"))
+        if mode == "detach":
+            session.execute(text(f"ALTER TABLE {name} RENAME TO {_ACTIVE_TABLE}_archive_{match.group(1)}"))
+        else:
+            session.execute(text(f"DROP TABLE {name}"))
+        removed.append(name)
+    return RetentionResult(removed=removed, created=created)
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        data = decode_cursor(cursor)
+        return datetime.fromisoformat(data["t"]), uuid.UUID(data["id"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise AuditQueryError("Invalid audit cursor.") from exc
+
+
+def _month_start(value: datetime) -> datetime:
+    return _as_utc(value).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _sqlite_timestamp(value: datetime) -> str:
+    # Matches SQLAlchemy's SQLite DATETIME storage format.
+    return _as_utc(value).strftime("%Y-%m-%d %H:%M:%S.%f")
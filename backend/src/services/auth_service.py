@@ -1,14 +1,18 @@
 """Authentication domain logic and JWT issuance."""
 
+import logging
 from dataclasses import dataclass
 from datetime import timedelta
 
-from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from backend.src.core.security import create_access_token, verify_password
+from backend.src.core.tracing import traced
+from backend.src.db import queries
 from backend.src.models.user import User
 
+logger = logging.getLogger(__name__)
+
 
 class AuthenticationError(RuntimeError):
     """Base class for authentication failures."""
@@ -38,6 +42,7 @@ class AuthResult:
     token_type: str = "bearer"
 
 
+@traced
 def authenticate_user(
     session: Session,
     *,
@@ -50,12 +55,18 @@ def authenticate_user(
     user = _load_user_by_email(session, normalized_email)
 
     if not user.is_active:
+        logger.warning("login refused", extra={"user_id": user.id, "reason": "inactive"})
         raise InactiveUserError(f"User {user.email} is inactive.")
     if not verify_password(password, user.hashed_password):
+        logger.warning("login refused", extra={"user_id": user.id, "reason": "bad_password"})
         raise InvalidCredentialsError("Invalid email or password.")
 
     token_payload = {"sub": str(user.id), "email": user.email}
+    if user.organization_id is not None:
+        # Lets the session layer route to the tenant without a user lookup.
+        token_payload["org"] = str(user.organization_id)
     access_token = create_access_token(token_payload, expires_delta=expires_delta)
+    logger.info("login succeeded", extra={"user_id": user.id})
     return AuthResult(user=user, access_token=access_token)
 
 
@@ -69,8 +80,8 @@ def _normalize_email(email: str) -> str:
 
 
 def _load_user_by_email(session: Session, email: str) -> User:
-    statement = select(User).where(func.lower(User.email) == email)
-    user = session.scalars(statement).first()
+    user = session.scalars(queries.USER_BY_EMAIL, {"email": email}).first()
     if user is None:
+        logger.warning("login refused", extra={"reason": "unknown_email"})
         raise UserNotFoundError(f"No user found for email {email}.")
     return user
@@ -0,0 +1,201 @@
+"""Content-addressed blob storage backends."""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+from backend.src.core.settings import load_settings
+
+CHUNK_SIZE = 64 * 1024
+# Below this size a plain read() beats setting up a memory map.
+MMAP_THRESHOLD = 1024 * 1024
+
+
+class BlobStorageError(RuntimeError):
+    """Base class for blob storage failures."""
+
+
+class BlobNotFoundError(BlobStorageError):
+    """Raised when no blob exists for a digest."""
+
+
+class BlobTooLargeError(BlobStorageError):
+    """Raised when an upload exceeds the configured maximum size."""
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    sha256: str
+    size: int
+    deduplicated: bool
+
+
+class BlobWriter(ABC):
+    """Incremental writer that hashes content as it is streamed in."""
+
+    @abstractmethod
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk to the pending blob."""
+
+    @abstractmethod
+    def commit(self) -> StoredBlob:
+        """Finalize the blob under its SHA-256 digest."""
+
+    @abstractmethod
+    def abort(self) -> None:
+        """Discard everything written so far."""
+
+
+class BlobStore(ABC):
+    """Interface implemented by local and object-store backends."""
+
+    @abstractmethod
+    def open_writer(self, *, max_size: int | None = None) -> BlobWriter:
+        """Start a streaming upload."""
+
+    @abstractmethod
+    def exists(self, sha256: str) -> bool:
+        """Return whether a blob with this digest is stored."""
+
+    @abstractmethod
+    def size(self, sha256: str) -> int:
+        """Return the blob size in bytes."""
+
+    @abstractmethod
+    def iter_range(
+        self,
+        sha256: str,
+        start: int = 0,
+        end: int | None = None,
+        *,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Yield bytes ``[start, end)`` of a blob in chunks."""
+
+    def local_path(self, sha256: str) -> Path | None:
+        """Return a filesystem path for zero-copy serving, if the backend has one."""
+        return None
+
+
+class _LocalBlobWriter(BlobWriter):
+    def __init__(self, store: LocalFilesystemBlobStore, max_size: int | None) -> None:
+        self._store = store
+        self._max_size = max_size
+        self._hasher = hashlib.sha256()
+        self._size = 0
+        fd, path = tempfile.mkstemp(dir=store.temp_dir, prefix="upload-")
+        self._path = Path(path)
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self._size += len(chunk)
+        if self._max_size is not None and self._size > self._max_size:
+            self.abort()
+            raise BlobTooLargeError(f"Upload exceeds the {self._max_size} byte limit.")
+        self._hasher.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self) -> StoredBlob:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        sha256 = self._hasher.hexdigest()
+        target = self._store.path_for(sha256)
+        if target.exists():
+            self._path.unlink(missing_ok=True)
+            return StoredBlob(sha256=sha256, size=self._size, deduplicated=True)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._path, target)
+        return StoredBlob(sha256=sha256, size=self._size, deduplicated=False)
+
+    def abort(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        self._path.unlink(missing_ok=True)
+
+
+class LocalFilesystemBlobStore(BlobStore):
+    """Store blobs as ``<root>/<aa>/<bb>/<sha256>`` files."""
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root)
+        self.temp_dir = self.root / "tmp"
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, sha256: str) -> Path:
+        if len(sha256) != 64 or any(char not in "0123456789abcdef" for char in sha256):
+            raise BlobNotFoundError(f"Invalid blob digest {sha256!r}.")
+        return self.root / sha256[:2] / sha256[2:4] / sha256
+
+    def open_writer(self, *, max_size: int | None = None) -> BlobWriter:
+        return _LocalBlobWriter(self, max_size)
+
+    def exists(self, sha256: str) -> bool:
+        return self.path_for(sha256).is_file()
+
+    def size(self, sha256: str) -> int:
+        try:
+            return self.path_for(sha256).stat().st_size
+        except FileNotFoundError as exc:
+            raise BlobNotFoundError(f"Blob {sha256} was not found.") from exc
+
+    def local_path(self, sha256: str) -> Path | None:
+        path = self.path_for(sha256)
+        return path if path.is_file() else None
+
+    def iter_range(
+        self,
+        sha256: str,
+        start: int = 0,
+        end: int | None = None,
+        *,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        path = self.path_for(sha256)
+        try:
+            handle = path.open("rb")
+        except FileNotFoundError as exc:
+            raise BlobNotFoundError(f"Blob {sha256} was not found.") from exc
+        return self._iter_file(handle, start, end, chunk_size)
+
+    @staticmethod
+    def _iter_file(handle, start: int, end: int | None, chunk_size: int) -> Iterator[bytes]:
+        with handle:
+            total = os.fstat(handle.fileno()).st_size
+            end = total if end is None else min(end, total)
+            if start >= end:
+                return
+            if total >= MMAP_THRESHOLD:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(start, end, chunk_size):
+                            yield bytes(view[offset : min(offset + chunk_size, end)])
+                    finally:
+                        view.release()
+                return
+            handle.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = handle.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+
+@lru_cache
+def get_blob_store() -> BlobStore:
+    """Return the configured blob store."""
+    settings = load_settings()
+    return LocalFilesystemBlobStore(settings.storage_root)
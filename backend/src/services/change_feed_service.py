@@ -0,0 +1,295 @@
+"""Incremental change feed of documents and approval steps.
+
+Services call :func:`record_document` / :func:`record_steps` for what a
+transaction changes. Just before the commit, each changed entity gets one
+``changes`` row holding its state after the transaction, numbered from a
+counter row that is bumped in the same transaction. The counter's row
+lock is held until the commit, so sequence numbers are handed out in
+commit order, and a client that has applied everything up to ``seq`` N
+can ask for ``since=N`` without missing a change committed later with a
+smaller number.
+
+Documents and steps moved to cold storage get an ``archived`` change whose
+snapshot is read from the archive tables; they are still readable there.
+
+Each row is a full snapshot of the entity's synced fields, not a diff.
+That is what lets compaction drop every change older than the retention
+window that a newer change of the same entity supersedes: replaying the
+feed from any point still ends at the current state.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import delete, event, exists, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from backend.src.core.settings import load_settings
+from backend.src.models.approval_step import ApprovalStep
+from backend.src.models.change_feed import ChangeRecord, ChangeSequence
+from backend.src.models.document import Document
+from backend.src.models.document_archive import approval_steps_archive, documents_archive
+from backend.src.services import job_service
+
+COMPACT_CHANGES = "changes.compact"
+COMPACT_INTERVAL = timedelta(hours=1)
+SEQUENCE = "changes"
+MAX_LIMIT = 1000
+
+DOCUMENT = "document"
+STEP = "step"
+CREATED = "created"
+UPDATED = "updated"
+ARCHIVED = "archived"
+# When an entity is noted more than once in a transaction the later op in
+# this order wins: created and then updated is still a creation.
+_OP_PRECEDENCE = (UPDATED, CREATED, ARCHIVED)
+
+# Columns copied into each change, per entity.
+DOCUMENT_FIELDS = ("title", "status", "workflow_template_id", "current_stage", "created_at")
+STEP_FIELDS = ("document_id", "approver_id", "step_order", "status", "decided_at")
+# Entity ids per snapshot query.
+_SNAPSHOT_CHUNK = 500
+_PENDING = "change_feed"
+
+
+@dataclass(frozen=True)
+class Change:
+    seq: int
+    entity: str
+    id: uuid.UUID
+    op: str
+    data: dict[str, Any]
+    changed_at: datetime
+
+
+@dataclass(frozen=True)
+class ChangePage:
+    changes: list[Change]
+    # Pass back as ``since`` to continue; unchanged when nothing is new.
+    next_since: int
+    has_more: bool
+
+
+def record_document(session: Session, document_id: uuid.UUID, *, created: bool = False) -> None:
+    """Note that a document changed in the session's current transaction."""
+    _record(session, DOCUMENT, [document_id], CREATED if created else UPDATED)
+
+
+def record_steps(
+    session: Session,
+    step_ids: Iterable[uuid.UUID],
+    *,
+    created: bool = False,
+) -> None:
+    """Note that approval steps changed in the session's current transaction."""
+    _record(session, STEP, step_ids, CREATED if created else UPDATED)
+
+
+def record_archived(
+    session: Session,
+    *,
+    document_ids: Iterable[uuid.UUID],
+    step_ids: Iterable[uuid.UUID],
+) -> None:
+    """Note that documents and their steps moved to the archive tables."""
+    _record(session, DOCUMENT, document_ids, ARCHIVED)
+    _record(session, STEP, step_ids, ARCHIVED)
+
+
+def list_changes(
+    session: Session,
+    *,
+    organization_id: uuid.UUID | None,
+    since: int = 0,
+    limit: int = 100,
+) -> ChangePage:
+    """Changes after ``since`` in sequence order, at most ``limit`` of them."""
+    limit = max(1, min(limit, MAX_LIMIT))
+    rows = session.scalars(
+        select(ChangeRecord)
+        .where(
+            ChangeRecord.organization_id.is_not_distinct_from(organization_id),
+            ChangeRecord.seq > since,
+        )
+        .order_by(ChangeRecord.seq)
+        .limit(limit + 1)
+    ).all()
+    changes = [
+        Change(
+            seq=row.seq,
+            entity=row.entity,
+            id=row.entity_id,
+            op=row.op,
+            data=row.data,
+            changed_at=row.changed_at,
+        )
+        for row in rows[:limit]
+    ]
+    return ChangePage(
+        changes=changes,
+        next_since=changes[-1].seq if changes else since,
+        has_more=len(rows) > limit,
+    )
+
+
+def compact(session: Session, *, now: datetime | None = None) -> int:
+    """Delete superseded changes older than the retention window and commit."""
+    retention = timedelta(hours=load_settings().change_retention_hours)
+    cutoff = (now or _utcnow()) - retention
+    newer = aliased(ChangeRecord)
+    result = session.execute(
+        delete(ChangeRecord)
+        .where(
+            ChangeRecord.changed_at < cutoff,
+            exists().where(
+                newer.entity_id == ChangeRecord.entity_id,
+                newer.entity == ChangeRecord.entity,
+                newer.seq > ChangeRecord.seq,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    return result.rowcount
+
+
+@job_service.register_handler(COMPACT_CHANGES)
+def _compact_changes_job(session: Session, payload: dict[str, Any]) -> None:
+    compact(session)
+    job_service.enqueue(session, kind=COMPACT_CHANGES, run_at=_utcnow() + COMPACT_INTERVAL)
+
+
+def _record(session: Session, entity: str, entity_ids: Iterable[uuid.UUID], op: str) -> None:
+    pending: dict[tuple[str, uuid.UUID], str] = session.info.setdefault(_PENDING, {})
+    for entity_id in entity_ids:
+        key = (entity, entity_id)
+        previous = pending.get(key, op)
+        pending[key] = max(previous, op, key=_OP_PRECEDENCE.index)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    # Snapshots must see this transaction's pending ORM changes.
+    session.flush()
+    rows: list[dict[str, Any]] = []
+    for entity, live, archive, fields in (
+        (DOCUMENT, Document.__table__, documents_archive, DOCUMENT_FIELDS),
+        (STEP, ApprovalStep.__table__, approval_steps_archive, STEP_FIELDS),
+    ):
+        for table, archived in ((live, False), (archive, True)):
+            ids = [
+                entity_id
+                for (kind, entity_id), op in pending.items()
+                if kind == entity and (op == ARCHIVED) == archived
+            ]
+            for snapshot in _snapshots(session, table, fields, ids):
+                entity_id = snapshot.pop("id")
+                rows.append(
+                    {
+                        "organization_id": snapshot.pop("organization_id"),
+                        "entity": entity,
+                        "entity_id": entity_id,
+                        "op": pending[(entity, entity_id)],
+                        "data": snapshot,
+                    }
+                )
+    if not rows:
+        return
+    first = _allocate(session, len(rows))
+    changed_at = _utcnow()
+    for offset, row in enumerate(rows):
+        row["seq"] = first + offset
+        row["changed_at"] = changed_at
+    session.execute(insert(ChangeRecord.__table__), rows)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING, None)
+
+
+def _snapshots(session: Session, table, fields: tuple[str, ...], ids: list[uuid.UUID]):
+    columns = [table.c.id, table.c.organization_id, *(table.c[name] for name in fields)]
+    for start in range(0, len(ids), _SNAPSHOT_CHUNK):
+        chunk = ids[start : start + _SNAPSHOT_CHUNK]
+        for row in session.execute(select(*columns).where(table.c.id.in_(chunk))):
+            values = row._asdict()
+            yield {
+                "id": values.pop("id"),
+                "organization_id": values.pop("organization_id"),
+                **{name: _jsonable(value) for name, value in values.items()},
+            }
+
+
+def ensure_sequence(session: Session) -> None:
+    """Create the counter row if it is missing. Commits.
+
+    Run at startup so the first writes only ever update the row.
+    """
+    if _seed_sequence(session):
+        session.commit()
+
+
+def _allocate(session: Session, count: int) -> int:
+    """Reserve ``count`` sequence numbers and return the first.
+
+    The UPDATE locks the counter row until the caller commits, which is
+    what keeps sequence order equal to commit order.
+    """
+    statement = (
+        update(ChangeSequence)
+        .where(ChangeSequence.name == SEQUENCE)
+        .values(value=ChangeSequence.value + count)
+        .returning(ChangeSequence.value)
+        .execution_options(synchronize_session=False)
+    )
+    value = session.execute(statement).scalar()
+    if value is None:
+        # Not seeded yet (a database that skipped startup): seed, then bump.
+        _seed_sequence(session)
+        value = session.execute(statement).scalar()
+    return value - count + 1
+
+
+def _seed_sequence(session: Session) -> bool:
+    """Insert the counter row unless it exists; return whether it was inserted."""
+    seeded = session.scalar(select(ChangeSequence.name).where(ChangeSequence.name == SEQUENCE))
+    if seeded is not None:
+        return False
+    # Continue after any changes already recorded, should the row have been lost.
+    last = session.scalar(select(func.coalesce(func.max(ChangeRecord.seq), 0)))
+    try:
+        with session.begin_nested():
+            session.execute(insert(ChangeSequence).values(name=SEQUENCE, value=last))
+    except IntegrityError:
+        # Another transaction seeded it first; its row is now visible to the UPDATE.
+        return False
+    return True
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            # SQLite hands back naive datetimes; everything stored is UTC.
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    return value
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
@@ -0,0 +1,76 @@
+"""Document content attached through the blob store."""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.src.models.blob import Blob
+from backend.src.models.document import Document
+from backend.src.models.document_archive import ArchivedDocument
+from backend.src.services import archive_service
+from backend.src.services.blob_storage import StoredBlob
+
+
+class ContentError(RuntimeError):
+    """Base class for document content failures."""
+
+
+class DocumentNotFoundError(ContentError):
+    """Raised when the target document does not exist."""
+
+
+class ContentNotFoundError(ContentError):
+    """Raised when a document has no stored content."""
+
+
+@dataclass(frozen=True)
+class DocumentContent:
+    document: Document | ArchivedDocument
+    blob: Blob
+
+
+def attach_content(
+    session: Session,
+    *,
+    document_id: uuid.UUID,
+    stored: StoredBlob,
+    content_type: str,
+) -> DocumentContent:
+    """Point a document at a stored blob, registering the blob once."""
+    document = session.get(Document, document_id)
+    if document is None:
+        raise DocumentNotFoundError(f"Document {document_id} was not found.")
+
+    blob = session.get(Blob, stored.sha256)
+    if blob is None:
+        blob = Blob(sha256=stored.sha256, size=stored.size)
+        session.add(blob)
+        try:
+            session.flush()
+        except IntegrityError:
+            # A concurrent upload of the same bytes registered it first.
+            session.rollback()
+            document = session.get(Document, document_id)
+            blob = session.get(Blob, stored.sha256)
+
+    document.blob_sha256 = stored.sha256
+    document.content_type = content_type
+    session.commit()
+    session.refresh(document)
+    return DocumentContent(document=document, blob=blob)
+
+
+def get_content(session: Session, *, document_id: uuid.UUID) -> DocumentContent:
+    document = archive_service.find_document(session, document_id)
+    if document is None:
+        raise DocumentNotFoundError(f"Document {document_id} was not found.")
+    if document.blob_sha256 is None:
+        raise ContentNotFoundError(f"Document {document_id} has no content.")
+    blob = session.get(Blob, document.blob_sha256)
+    if blob is None:
+        raise ContentNotFoundError(f"Content for document {document_id} is missing.")
+    return DocumentContent(document=document, blob=blob)
@@ -0,0 +1,260 @@
+"""Approver delegation and bulk reassignment of pending steps.
+
+A delegation lets one user decide another's steps for a time window, e.g.
+while they are on vacation. Decisions check it through a per-organization
+map of current and future delegations that is cached in process for
+``delegation_cache_ttl_seconds``: writes made by this process invalidate it
+at once, revocations made by another process take effect within the TTL.
+Delegations do not chain; a delegate's own delegate cannot act.
+
+When an approver leaves for good, :func:`reassign_pending_steps` moves all
+of their pending steps to someone else with one set-based UPDATE.
+
+Users live in the shared database while delegations and steps live in the
+tenant's, so these functions take a second ``users`` session for
+membership checks.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from backend.src.core.settings import load_settings
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.audit_log import AuditLog
+from backend.src.models.delegation import Delegation
+from backend.src.models.types import uuid7
+from backend.src.models.user import User
+from backend.src.services import change_feed_service
+
+
+class DelegationError(RuntimeError):
+    """Base class for delegation and reassignment failures."""
+
+
+class DelegationNotFoundError(DelegationError):
+    """Raised when a delegation cannot be found."""
+
+
+class InvalidDelegationError(DelegationError):
+    """Raised when a delegation or reassignment request is malformed."""
+
+
+class UnknownUserError(DelegationError):
+    """Raised when a user is not an active member of the organization."""
+
+
+@dataclass(frozen=True)
+class DelegationWindow:
+    delegate_id: uuid.UUID
+    starts_at: datetime
+    ends_at: datetime
+
+    def covers(self, moment: datetime) -> bool:
+        return self.starts_at <= moment < self.ends_at
+
+
+DelegationMap = dict[uuid.UUID, tuple[DelegationWindow, ...]]
+
+_MAPS: dict[uuid.UUID | None, tuple[float, DelegationMap]] = {}
+_MAPS_LOCK = threading.Lock()
+
+
+def create_delegation(
+    session: Session,
+    *,
+    users: Session,
+    organization_id: uuid.UUID | None,
+    delegator_id: uuid.UUID,
+    delegate_id: uuid.UUID,
+    starts_at: datetime,
+    ends_at: datetime,
+) -> Delegation:
+    starts_at, ends_at = _as_utc(starts_at), _as_utc(ends_at)
+    if ends_at <= starts_at:
+        raise InvalidDelegationError("ends_at must be after starts_at.")
+    if delegate_id == delegator_id:
+        raise InvalidDelegationError("A user cannot delegate to themselves.")
+    _ensure_member(users, delegator_id, organization_id)
+    _ensure_member(users, delegate_id, organization_id)
+    delegation = Delegation(
+        organization_id=organization_id,
+        delegator_id=delegator_id,
+        delegate_id=delegate_id,
+        starts_at=starts_at,
+        ends_at=ends_at,
+    )
+    session.add(delegation)
+    session.commit()
+    session.refresh(delegation)
+    invalidate(organization_id)
+    return delegation
+
+
+def list_delegations(
+    session: Session,
+    *,
+    organization_id: uuid.UUID | None,
+    delegator_id: uuid.UUID | None = None,
+) -> list[Delegation]:
+    """Delegations that have not ended yet, optionally of one delegator."""
+    statement = (
+        select(Delegation)
+        .where(
+            Delegation.organization_id.is_not_distinct_from(organization_id),
+            Delegation.ends_at > _utcnow(),
+        )
+        .order_by(Delegation.starts_at, Delegation.id)
+    )
+    if delegator_id is not None:
+        statement = statement.where(Delegation.delegator_id == delegator_id)
+    return list(session.scalars(statement))
+
+
+def get_delegation(
+    session: Session,
+    *,
+    delegation_id: uuid.UUID,
+    organization_id: uuid.UUID | None,
+) -> Delegation:
+    delegation = session.get(Delegation, delegation_id)
+    if delegation is None or delegation.organization_id != organization_id:
+        raise DelegationNotFoundError(f"Delegation {delegation_id} was not found.")
+    return delegation
+
+
+def delete_delegation(session: Session, delegation: Delegation) -> None:
+    organization_id = delegation.organization_id
+    session.delete(delegation)
+    session.commit()
+    invalidate(organization_id)
+
+
+def delegation_map(session: Session, organization_id: uuid.UUID | None) -> DelegationMap:
+    """Current and future delegation windows by delegator, cached per organization."""
+    ttl = load_settings().delegation_cache_ttl_seconds
+    with _MAPS_LOCK:
+        cached = _MAPS.get(organization_id)
+    if cached is not None and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    loaded_at = time.monotonic()
+    windows: dict[uuid.UUID, list[DelegationWindow]] = {}
+    statement = select(
+        Delegation.delegator_id,
+        Delegation.delegate_id,
+        Delegation.starts_at,
+        Delegation.ends_at,
+    ).where(
+        Delegation.organization_id.is_not_distinct_from(organization_id),
+        Delegation.ends_at > _utcnow(),
+    )
+    for delegator_id, delegate_id, starts_at, ends_at in session.execute(statement):
+        windows.setdefault(delegator_id, []).append(
+            DelegationWindow(delegate_id, _as_utc(starts_at), _as_utc(ends_at))
+        )
+    mapping = {delegator_id: tuple(entries) for delegator_id, entries in windows.items()}
+    with _MAPS_LOCK:
+        _MAPS[organization_id] = (loaded_at, mapping)
+    return mapping
+
+
+def can_act_for(
+    session: Session,
+    *,
+    organization_id: uuid.UUID | None,
+    approver_id: uuid.UUID,
+    actor_id: uuid.UUID,
+    at: datetime | None = None,
+) -> bool:
+    """Whether ``actor_id`` may decide a step assigned to ``approver_id``."""
+    if actor_id == approver_id:
+        return True
+    moment = _as_utc(at) if at is not None else _utcnow()
+    windows = delegation_map(session, organization_id).get(approver_id, ())
+    return any(window.delegate_id == actor_id and window.covers(moment) for window in windows)
+
+
+def invalidate(organization_id: uuid.UUID | None) -> None:
+    with _MAPS_LOCK:
+        _MAPS.pop(organization_id, None)
+
+
+def reassign_pending_steps(
+    session: Session,
+    *,
+    users: Session,
+    organization_id: uuid.UUID | None,
+    from_approver_id: uuid.UUID,
+    to_approver_id: uuid.UUID,
+    performed_by: uuid.UUID,
+) -> int:
+    """Move every pending step of one approver to another and commit.
+
+    One UPDATE ... RETURNING changes the steps and one batched INSERT
+    audits them, so no statement is issued per step.
+    Queued notifications and escalations read the step's approver when they
+    run, so they follow the step to its new approver.
+    """
+    if from_approver_id == to_approver_id:
+        raise InvalidDelegationError("Steps cannot be reassigned to the same approver.")
+    _ensure_member(users, to_approver_id, organization_id)
+    # Core statements on the tables: the ORM's per-row bookkeeping costs
+    # more than the SQL itself at tens of thousands of rows. Stale steps in
+    # the session are expired by the commit below.
+    steps = ApprovalStep.__table__
+    reassigned = session.execute(
+        update(steps)
+        .where(
+            steps.c.organization_id.is_not_distinct_from(organization_id),
+            steps.c.approver_id == from_approver_id,
+            steps.c.status == ApprovalStepStatus.PENDING,
+        )
+        .values(approver_id=to_approver_id)
+        .returning(steps.c.id, steps.c.document_id)
+    ).all()
+    change_feed_service.record_steps(session, [step_id for step_id, _ in reassigned])
+    if reassigned:
+        timestamp = _utcnow()
+        session.execute(
+            insert(AuditLog.__table__),
+            [
+                {
+                    "id": uuid7(),
+                    "document_id": document_id,
+                    "organization_id": organization_id,
+                    "action": "step_reassigned",
+                    "performed_by": performed_by,
+                    "timestamp": timestamp,
+                }
+                for _, document_id in reassigned
+            ],
+        )
+    session.commit()
+    return len(reassigned)
+
+
+def _ensure_member(
+    users: Session, user_id: uuid.UUID, organization_id: uuid.UUID | None
+) -> None:
+    user = users.get(User, user_id)
+    if user is None or not user.is_active or user.organization_id != organization_id:
+        raise UnknownUserError(f"User {user_id} is not an active member of the organization.")
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything stored is UTC.
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
@@ -1,21 +1,185 @@
+import heapq
 import uuid
+from collections.abc import Sequence
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
 
-from backend.src.models.document import Document
+from backend.src.core.tracing import traced
+from backend.src.db import queries
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.document_archive import ArchivedDocument
+from backend.src.services import (
+    archive_service,
+    audit_service,
+    change_feed_service,
+    search_service,
+    stats_service,
+    workflow_service,
+)
 
+# Relations a document read can embed, keyed by their ``include=`` name.
+DOCUMENT_RELATIONS = {"steps": "steps", "audit": "audit_entries"}
+# Columns selected for embedded rows; everything the responses show.
+RELATION_COLUMNS = {
+    "steps": ("id", "document_id", "approver_id", "step_order", "status"),
+    "audit": ("id", "document_id", "action", "performed_by", "timestamp"),
+}
 
-def create_document(session: Session, *, title: str) -> Document:
-    document = Document(title=title)
+
+@traced
+def create_document(
+    session: Session,
+    *,
+    title: str,
+    workflow_template_id: uuid.UUID | None = None,
+    created_by: uuid.UUID | None = None,
+    organization_id: uuid.UUID | None = None,
+    users: Session | None = None,
+) -> Document:
+    """Create a pending document, starting ``workflow_template_id`` if given.
+
+    ``users`` is the shared-database session used to check the workflow's
+    approvers; it is required together with ``workflow_template_id``.
+    """
+    document = Document(
+        title=title,
+        status=DocumentStatus.PENDING,
+        organization_id=organization_id,
+    )
     session.add(document)
+    stats_service.record_created(session, document.status, organization_id=organization_id)
+    search_service.index_document(session, document)
+    if created_by is not None:
+        session.flush()
+        audit_service.record(
+            session,
+            document_id=document.id,
+            action="document_created",
+            performed_by=created_by,
+            organization_id=organization_id,
+        )
+    if workflow_template_id is not None:
+        workflow_service.start_workflow(
+            session,
+            users=users,
+            document=document,
+            template_id=workflow_template_id,
+        )
+    session.flush()
+    change_feed_service.record_document(session, document.id, created=True)
     session.commit()
     session.refresh(document)
     return document
 
 
-def get_document(session: Session, *, document_id: uuid.UUID) -> Document | None:
-    return session.get(Document, document_id)
+@traced
+def get_document(
+    session: Session,
+    *,
+    document_id: uuid.UUID,
+    include_archived: bool = True,
+    fields: Sequence[str] | None = None,
+    include: Sequence[str] = (),
+) -> Document | ArchivedDocument | None:
+    return archive_service.find_document(
+        session,
+        document_id,
+        include_archived=include_archived,
+        live_options=load_options(Document, fields=fields, include=include),
+        archived_options=load_options(ArchivedDocument, fields=fields, include=include),
+    )
+
+
+@traced
+def list_documents(
+    session: Session,
+    *,
+    organization_id: uuid.UUID | None = None,
+    include_archived: bool = False,
+    fields: Sequence[str] | None = None,
+    include: Sequence[str] = (),
+) -> list[Document | ArchivedDocument | Row]:
+    """Newest-first documents of an organization.
+
+    Without ``include`` the live documents come back as plain rows from a
+    pre-built statement; listings never modify them, so ORM entities would
+    only add per-row overhead.
+    """
+    if fields is not None and "created_at" not in fields:
+        # Listings are ordered (and merged with the archive) by creation time.
+        fields = [*fields, "created_at"]
+    documents: list[Document | ArchivedDocument | Row]
+    if include:
+        documents = list(
+            session.query(Document)
+            .options(*load_options(Document, fields=fields, include=include))
+            .filter(Document.organization_id.is_not_distinct_from(organization_id))
+            .order_by(Document.created_at.desc())
+            .all()
+        )
+    else:
+        wanted = {"id", "organization_id", *(fields or queries.DOCUMENT_LIST_COLUMNS)}
+        columns = tuple(name for name in queries.DOCUMENT_LIST_COLUMNS if name in wanted)
+        statement = queries.documents_for_organization(columns)
+        documents = list(session.execute(statement, {"organization_id": organization_id}))
+    if include_archived:
+        archived = archive_service.list_archived(
+            session,
+            organization_id=organization_id,
+            options=load_options(ArchivedDocument, fields=fields, include=include),
+        )
+        documents = list(
+            heapq.merge(documents, archived, key=lambda document: document.created_at, reverse=True)
+        )
+    return documents
+
+
+def load_options(
+    entity: type[Document] | type[ArchivedDocument],
+    *,
+    fields: Sequence[str] | None = None,
+    include: Sequence[str] = (),
+) -> list[ORMOption]:
+    """Select only ``fields`` of ``entity`` and eager-load the ``include`` relations.
+
+    Each relation is loaded with one ``SELECT ... WHERE document_id IN (...)``
+    for the whole result, so the query count does not grow with the page.
+    """
+    options: list[ORMOption] = []
+    if fields is not None:
+        # The primary key is always loaded; the tenant is needed for access checks.
+        names = dict.fromkeys([*fields, "organization_id"])
+        options.append(load_only(*(getattr(entity, name) for name in names)))
+    for name in include:
+        relation = getattr(entity, DOCUMENT_RELATIONS[name])
+        target = relation.property.mapper.class_
+        columns = (getattr(target, column) for column in RELATION_COLUMNS[name])
+        options.append(selectinload(relation).load_only(*columns))
+    return options
+
+
+@traced
+def get_status_counts(
+    session: Session, *, organization_id: uuid.UUID | None
+) -> dict[DocumentStatus, int]:
+    return stats_service.get_counts(session, organization_id=organization_id)
 
 
-def list_documents(session: Session) -> list[Document]:
-    return list(session.query(Document).order_by(Document.created_at.desc()).all())
+@traced
+def search_documents(
+    session: Session,
+    *,
+    query: str,
+    limit: int,
+    cursor: str | None = None,
+    organization_id: uuid.UUID | None = None,
+) -> search_service.SearchPage:
+    return search_service.search_documents(
+        session,
+        query=query,
+        limit=limit,
+        cursor=cursor,
+        organization_id=organization_id,
+    )
@@ -0,0 +1,221 @@
+"""Stored responses for requests carrying an ``Idempotency-Key`` header.
+
+A key is claimed by inserting a row with no response; the row is completed
+with the first response and served to every retry until it expires. Completed
+responses are also kept in a bounded in-memory LRU so hot retries skip the
+database.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.src.core.settings import load_settings
+from backend.src.models.idempotency_key import IdempotencyKey
+from backend.src.services import job_service
+
+PURGE_EXPIRED_KEYS = "idempotency.purge_expired"
+PURGE_INTERVAL = timedelta(hours=1)
+# How long a claim survives a crashed worker before another request may take it.
+IN_FLIGHT_LEASE = timedelta(minutes=5)
+
+
+class IdempotencyError(RuntimeError):
+    """Base class for idempotency key failures."""
+
+
+class KeyInProgressError(IdempotencyError):
+    """Raised when another process is still handling the first request."""
+
+
+class KeyMismatchError(IdempotencyError):
+    """Raised when a key is reused for a different request."""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+    expires_at: datetime
+
+
+class ResponseCache:
+    """Entry-bounded LRU of completed responses with per-entry expiry."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, StoredResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, scope_hash: str, *, now: datetime) -> StoredResponse | None:
+        with self._lock:
+            response = self._entries.get(scope_hash)
+            if response is None:
+                return None
+            if response.expires_at <= now:
+                del self._entries[scope_hash]
+                return None
+            self._entries.move_to_end(scope_hash)
+            return response
+
+    def put(self, scope_hash: str, response: StoredResponse) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[scope_hash] = response
+            self._entries.move_to_end(scope_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: ResponseCache | None = None
+
+
+def get_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache(load_settings().idempotency_cache_entries)
+    return _cache
+
+
+def claim(
+    session: Session,
+    *,
+    scope_hash: str,
+    request_hash: str,
+    now: datetime | None = None,
+) -> StoredResponse | None:
+    """Claim a key for the current request or return its stored response.
+
+    Returns ``None`` when the caller now owns the key and must either
+    :func:`complete` or :func:`release` it. Commits.
+    """
+    now = now or datetime.now(timezone.utc)
+    cached = get_cache().get(scope_hash, now=now)
+    if cached is not None:
+        _ensure_same_request(cached.request_hash, request_hash)
+        return cached
+
+    record = session.get(IdempotencyKey, scope_hash)
+    if record is not None and _as_utc(record.expires_at) <= now:
+        session.delete(record)
+        session.flush()
+        record = None
+    if record is None:
+        session.add(
+            IdempotencyKey(
+                scope_hash=scope_hash,
+                request_hash=request_hash,
+                expires_at=now + IN_FLIGHT_LEASE,
+            )
+        )
+        try:
+            session.commit()
+            return None
+        except IntegrityError:
+            session.rollback()
+            record = session.get(IdempotencyKey, scope_hash)
+            if record is None:
+                raise KeyInProgressError("The request is already being processed.")
+
+    _ensure_same_request(record.request_hash, request_hash)
+    if record.status_code is None:
+        raise KeyInProgressError("The request is already being processed.")
+    stored = _to_stored(record)
+    get_cache().put(scope_hash, stored)
+    return stored
+
+
+def complete(
+    session: Session,
+    *,
+    scope_hash: str,
+    request_hash: str,
+    status_code: int,
+    headers: list[tuple[str, str]],
+    body: bytes,
+    now: datetime | None = None,
+) -> StoredResponse:
+    """Store the first response for a claimed key. Commits."""
+    now = now or datetime.now(timezone.utc)
+    stored = StoredResponse(
+        request_hash=request_hash,
+        status_code=status_code,
+        headers=headers,
+        body=body,
+        expires_at=now + timedelta(seconds=load_settings().idempotency_ttl_seconds),
+    )
+    record = session.get(IdempotencyKey, scope_hash)
+    if record is None:
+        record = IdempotencyKey(scope_hash=scope_hash, request_hash=request_hash)
+        session.add(record)
+    record.status_code = status_code
+    record.response_headers = [list(header) for header in headers]
+    record.response_body = body
+    record.expires_at = stored.expires_at
+    session.commit()
+    get_cache().put(scope_hash, stored)
+    return stored
+
+
+def release(session: Session, *, scope_hash: str) -> None:
+    """Drop an unfinished claim so the client can retry. Commits."""
+    session.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.scope_hash == scope_hash,
+            IdempotencyKey.status_code.is_(None),
+        )
+    )
+    session.commit()
+
+
+def purge_expired(session: Session, *, now: datetime | None = None) -> int:
+    now = now or datetime.now(timezone.utc)
+    result = session.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+    session.commit()
+    return result.rowcount or 0
+
+
+@job_service.register_handler(PURGE_EXPIRED_KEYS)
+def _purge_expired_job(session: Session, payload: dict[str, Any]) -> None:
+    purge_expired(session)
+    job_service.enqueue(
+        session,
+        kind=PURGE_EXPIRED_KEYS,
+        run_at=datetime.now(timezone.utc) + PURGE_INTERVAL,
+    )
+
+
+def _ensure_same_request(stored_hash: str, request_hash: str) -> None:
+    if stored_hash != request_hash:
+        raise KeyMismatchError("The Idempotency-Key was already used for a different request.")
+
+
+def _to_stored(record: IdempotencyKey) -> StoredResponse:
+    return StoredResponse(
+        request_hash=record.request_hash,
+        status_code=record.status_code,
+        headers=[(name, value) for name, value in record.response_headers or []],
+        body=record.response_body or b"",
+        expires_at=_as_utc(record.expires_at),
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
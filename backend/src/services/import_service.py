@@ -0,0 +1,527 @@
+"""Offline bulk import of users, documents and approval chains.
+
+Sources (CSV or NDJSON) are streamed twice. The first pass validates every
+row and every reference between rows in memory, and checks new ids and
+emails against the rows already in the database; nothing is written unless
+the whole import is valid. The second pass writes fixed-size batches with
+the fastest path the dialect offers (``COPY`` on Postgres, a single
+``executemany`` on SQLite). Each batch commits together with its
+checkpoint row, so rerunning the same import after a failure resumes at
+the first unwritten batch.
+
+Ids may be UUIDs or identifiers from the old system; the latter are mapped
+to stable UUIDv5 values so references between files resolve the same way
+on every run. Imported rows are history, not user actions, so no audit
+entries or notifications are produced; imported documents and steps are
+added to the change feed as creations so synced clients pick them up.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import os
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator
+
+from sqlalchemy import Table, bindparam, func, insert, select, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.src.core.security import get_password_hash
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.import_checkpoint import ImportCheckpoint
+from backend.src.models.organization import Organization
+from backend.src.models.types import uuid7
+from backend.src.models.user import User
+from backend.src.services import change_feed_service, stats_service
+
+# Namespace for UUIDv5 ids derived from identifiers in the old system.
+IMPORT_NAMESPACE = uuid.UUID("6f0b8a53-8f7e-4c1e-9b0a-2d4d0c8e5a71")
+KINDS = ("users", "documents", "steps")
+DEFAULT_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 50
+# Ids looked up per query when checking references against existing rows.
+LOOKUP_CHUNK = 500
+_FINGERPRINT_BYTES = 64 * 1024
+_TRUE = {"1", "true", "t", "yes", "y"}
+_FALSE = {"0", "false", "f", "no", "n", ""}
+
+
+class BulkImportError(RuntimeError):
+    """Base class for bulk import failures."""
+
+
+class ImportFormatError(BulkImportError):
+    """Raised when a source file cannot be read as CSV or NDJSON."""
+
+
+class ImportValidationError(BulkImportError):
+    """Raised when rows are invalid or reference missing rows; nothing is written."""
+
+    def __init__(self, errors: list[str]) -> None:
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid row(s); first: {errors[0]}")
+
+
+@dataclass(frozen=True)
+class ImportSource:
+    kind: str
+    path: str
+    format: str | None = None
+
+
+@dataclass(frozen=True)
+class ImportResult:
+    kind: str
+    written: int
+    resumed_from: int
+
+
+@dataclass
+class _Plan:
+    """What validation learned that the write pass needs."""
+
+    document_organizations: dict[uuid.UUID, uuid.UUID | None] = field(default_factory=dict)
+
+
+def read_records(path: str, fmt: str | None = None) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield ``(line number, record)`` pairs from a CSV or NDJSON file."""
+    fmt = fmt or _detect_format(path)
+    with open(path, newline="", encoding="utf-8") as handle:
+        if fmt == "csv":
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, record
+            return
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                raise ImportFormatError(f"{path}:{number}: invalid JSON ({error}).") from error
+            if not isinstance(record, dict):
+                raise ImportFormatError(f"{path}:{number}: expected a JSON object.")
+            yield number, record
+
+
+def source_fingerprint(path: str) -> str:
+    """Identify a source file by its size and its first and last 64 KiB."""
+    hasher = hashlib.sha256()
+    size = os.path.getsize(path)
+    hasher.update(str(size).encode("ascii"))
+    with open(path, "rb") as handle:
+        hasher.update(handle.read(_FINGERPRINT_BYTES))
+        if size > _FINGERPRINT_BYTES:
+            handle.seek(max(size - _FINGERPRINT_BYTES, _FINGERPRINT_BYTES))
+            hasher.update(handle.read())
+    return hasher.hexdigest()[:32]
+
+
+def run_import(
+    session_factory: sessionmaker,
+    sources: Iterable[ImportSource],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int | None = None,
+    progress: Callable[[str, int], None] | None = None,
+) -> list[ImportResult]:
+    """Validate and then write ``sources`` (users, then documents, then steps)."""
+    ordered = sorted(sources, key=lambda source: KINDS.index(source.kind))
+    with session_factory() as session:
+        plan = validate(session, ordered)
+
+    executor: Executor | None = None
+    if workers != 1 and any(source.kind == "users" for source in ordered):
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        results = [
+            _write_source(
+                session_factory,
+                source,
+                plan,
+                batch_size=batch_size,
+                executor=executor,
+                progress=progress,
+            )
+            for source in ordered
+        ]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if any(result.kind == "documents" and result.written for result in results):
+        with session_factory() as session:
+            stats_service.rebuild_counters(session)
+    return results
+
+
+def validate(session: Session, sources: list[ImportSource]) -> _Plan:
+    """Check every row and reference, raising :class:`ImportValidationError`."""
+    errors: list[str] = []
+    plan = _Plan()
+    user_ids: set[uuid.UUID] = set()
+    emails: set[str] = set()
+    organization_refs: dict[uuid.UUID, str] = {}
+    step_refs: list[tuple[str, uuid.UUID, uuid.UUID]] = []
+    step_ids: set[uuid.UUID] = set()
+    # Rows not yet written by an earlier run of the same import must not
+    # collide with rows already in the database.
+    unwritten: dict[str, dict[Any, str]] = {kind: {} for kind in (*KINDS, "emails")}
+
+    for source in sources:
+        checkpoint = session.get(ImportCheckpoint, f"{source.kind}:{source_fingerprint(source.path)}")
+        rows_done = checkpoint.rows_done if checkpoint is not None else 0
+        for index, (number, record) in enumerate(read_records(source.path, source.format)):
+            where = f"{source.path}:{number}"
+            try:
+                row = _ROW_BUILDERS[source.kind](record)
+            except ValueError as error:
+                errors.append(f"{where}: {error}")
+                continue
+            if index >= rows_done:
+                unwritten[source.kind].setdefault(row["id"], where)
+                if source.kind == "users":
+                    unwritten["emails"].setdefault(row["email"], where)
+            if row.get("organization_id") is not None:
+                organization_refs.setdefault(row["organization_id"], where)
+            if source.kind == "users":
+                if row["id"] in user_ids:
+                    errors.append(f"{where}: duplicate user id {row['id']}.")
+                if row["email"] in emails:
+                    errors.append(f"{where}: duplicate email {row['email']}.")
+                user_ids.add(row["id"])
+                emails.add(row["email"])
+            elif source.kind == "documents":
+                if row["id"] in plan.document_organizations:
+                    errors.append(f"{where}: duplicate document id {row['id']}.")
+                plan.document_organizations[row["id"]] = row["organization_id"]
+            else:
+                if row["id"] in step_ids:
+                    errors.append(f"{where}: duplicate step id {row['id']}.")
+                step_ids.add(row["id"])
+                step_refs.append((where, row["document_id"], row["approver_id"]))
+            if len(errors) >= MAX_REPORTED_ERRORS:
+                raise ImportValidationError(errors)
+
+    for kind, label, column in (
+        ("users", "user id", User.id),
+        ("emails", "email", func.lower(User.email)),
+        ("documents", "document id", Document.id),
+        ("steps", "step id", ApprovalStep.id),
+    ):
+        pending = unwritten[kind]
+        for (value,) in _existing(session, select(column), column, set(pending)):
+            errors.append(f"{pending[value]}: {label} {value} already exists in the database.")
+    if len(errors) >= MAX_REPORTED_ERRORS:
+        raise ImportValidationError(errors[:MAX_REPORTED_ERRORS])
+
+    missing_documents = {document_id for _, document_id, _ in step_refs} - plan.document_organizations.keys()
+    for document_id, organization_id in _existing(
+        session, select(Document.id, Document.organization_id), Document.id, missing_documents
+    ):
+        plan.document_organizations[document_id] = organization_id
+    missing_users = {approver_id for _, _, approver_id in step_refs} - user_ids
+    user_ids.update(row[0] for row in _existing(session, select(User.id), User.id, missing_users))
+    known_organizations = {
+        row[0]
+        for row in _existing(session, select(Organization.id), Organization.id, set(organization_refs))
+    }
+
+    for organization_id, where in organization_refs.items():
+        if organization_id not in known_organizations:
+            errors.append(f"{where}: organization {organization_id} does not exist.")
+    for where, document_id, approver_id in step_refs:
+        if document_id not in plan.document_organizations:
+            errors.append(f"{where}: document {document_id} is not in the import or the database.")
+        if approver_id not in user_ids:
+            errors.append(f"{where}: approver {approver_id} is not in the import or the database.")
+        if len(errors) >= MAX_REPORTED_ERRORS:
+            break
+    if errors:
+        raise ImportValidationError(errors[:MAX_REPORTED_ERRORS])
+    return plan
+
+
+def _write_source(
+    session_factory: sessionmaker,
+    source: ImportSource,
+    plan: _Plan,
+    *,
+    batch_size: int,
+    executor: Executor | None,
+    progress: Callable[[str, int], None] | None,
+) -> ImportResult:
+    key = f"{source.kind}:{source_fingerprint(source.path)}"
+    table = _TABLES[source.kind]
+    with session_factory() as session:
+        checkpoint = session.get(ImportCheckpoint, key)
+        if checkpoint is None:
+            checkpoint = ImportCheckpoint(source=key, rows_done=0)
+            session.add(checkpoint)
+            session.commit()
+        resumed_from = checkpoint.rows_done
+
+        written = 0
+        batch: list[dict[str, Any]] = []
+        records = read_records(source.path, source.format)
+        for index, (_, record) in enumerate(records):
+            if index < resumed_from:
+                continue
+            row = _ROW_BUILDERS[source.kind](record)
+            if source.kind == "steps" and row["organization_id"] is None:
+                row["organization_id"] = plan.document_organizations[row["document_id"]]
+            batch.append(row)
+            if len(batch) >= batch_size:
+                written += _write_batch(session, table, batch, checkpoint, executor)
+                if progress is not None:
+                    progress(source.kind, checkpoint.rows_done)
+                batch = []
+        if batch:
+            written += _write_batch(session, table, batch, checkpoint, executor)
+            if progress is not None:
+                progress(source.kind, checkpoint.rows_done)
+    return ImportResult(kind=source.kind, written=written, resumed_from=resumed_from)
+
+
+def _write_batch(
+    session: Session,
+    table: Table,
+    rows: list[dict[str, Any]],
+    checkpoint: ImportCheckpoint,
+    executor: Executor | None,
+) -> int:
+    if table is User.__table__:
+        _hash_passwords(rows, executor)
+    if session.get_bind().dialect.name == "postgresql":
+        _copy_rows(session, table, rows)
+    else:
+        session.execute(insert(table), rows)
+        if table is Document.__table__:
+            # Postgres derives its search vector from the row; SQLite keeps a
+            # separate FTS table.
+            session.execute(
+                text(
+                    "INSERT INTO documents_fts (title, document_id) VALUES (:title, :document_id)"
+                ).bindparams(bindparam("document_id", type_=Document.__table__.c.id.type)),
+                [{"title": row["title"], "document_id": row["id"]} for row in rows],
+            )
+    if table is Document.__table__:
+        for row in rows:
+            change_feed_service.record_document(session, row["id"], created=True)
+    elif table is ApprovalStep.__table__:
+        change_feed_service.record_steps(session, [row["id"] for row in rows], created=True)
+    checkpoint.rows_done += len(rows)
+    session.commit()
+    return len(rows)
+
+
+def _hash_passwords(rows: list[dict[str, Any]], executor: Executor | None) -> None:
+    pending = [row for row in rows if row["hashed_password"] is None]
+    passwords = [row.pop("password") for row in pending]
+    for row in rows:
+        row.pop("password", None)
+    if not pending:
+        return
+    if executor is None:
+        hashes = map(get_password_hash, passwords)
+    else:
+        workers = getattr(executor, "_max_workers", 1)
+        hashes = executor.map(get_password_hash, passwords, chunksize=max(1, len(passwords) // (workers * 4)))
+    for row, hashed in zip(pending, hashes):
+        row["hashed_password"] = hashed
+
+
+def _copy_rows(session: Session, table: Table, rows: list[dict[str, Any]]) -> None:
+    """Stream rows into ``table`` with ``COPY`` inside the session's transaction."""
+    columns = list(rows[0])
+    statement = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+    dbapi_connection = session.connection().connection.dbapi_connection
+    cursor = dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(statement) as copy:
+                for row in rows:
+                    copy.write_row([_copy_value(row[column]) for column in columns])
+        else:  # psycopg2
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow([_copy_value(row[column]) for column in columns])
+            buffer.seek(0)
+            cursor.copy_expert(f"{statement} WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def _copy_value(value: Any) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, Enum):
+        # SQLAlchemy's Enum type stores member names.
+        return value.name
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _existing(session: Session, statement, column, ids: set[uuid.UUID]) -> Iterator[tuple]:
+    pending = list(ids)
+    for start in range(0, len(pending), LOOKUP_CHUNK):
+        yield from session.execute(statement.where(column.in_(pending[start : start + LOOKUP_CHUNK])))
+
+
+def _user_row(record: dict[str, Any]) -> dict[str, Any]:
+    email = _text(record, "email", required=True).lower()
+    if "@" not in email or len(email) > 320:
+        raise ValueError(f"invalid email {email!r}.")
+    password = _text(record, "password")
+    hashed_password = _text(record, "hashed_password")
+    if not password and not hashed_password:
+        raise ValueError("password or hashed_password is required.")
+    return {
+        "id": _identifier(record.get("id"), "users"),
+        "email": email,
+        "password": password,
+        "hashed_password": hashed_password,
+        "is_active": _boolean(record.get("is_active"), default=True),
+        "organization_id": _optional_uuid(record.get("organization_id"), "organization_id"),
+    }
+
+
+def _document_row(record: dict[str, Any]) -> dict[str, Any]:
+    title = _text(record, "title", required=True)
+    if len(title) > 255:
+        raise ValueError("title is longer than 255 characters.")
+    status = _enum(DocumentStatus, record.get("status"), DocumentStatus.PENDING)
+    created_at = _timestamp(record.get("created_at"))
+    finalized_at = None
+    if status != DocumentStatus.PENDING:
+        # Without a decision time, history is assumed decided when created.
+        finalized_at = (
+            _timestamp(record["finalized_at"]) if record.get("finalized_at") else created_at
+        )
+    return {
+        "id": _identifier(record.get("id"), "documents"),
+        "title": title,
+        "status": status,
+        "created_at": created_at,
+        "finalized_at": finalized_at,
+        "organization_id": _optional_uuid(record.get("organization_id"), "organization_id"),
+        "stage_approvals": 0,
+        "stage_rejections": 0,
+    }
+
+
+def _step_row(record: dict[str, Any]) -> dict[str, Any]:
+    document_id = _identifier(record.get("document_id"), "documents", required=True)
+    approver_id = _identifier(record.get("approver_id"), "users", required=True)
+    try:
+        step_order = int(record.get("step_order"))
+    except (TypeError, ValueError):
+        raise ValueError("step_order must be an integer.") from None
+    if step_order < 1:
+        raise ValueError("step_order must be at least 1.")
+    return {
+        "id": _identifier(record.get("id"), "steps"),
+        "document_id": document_id,
+        "approver_id": approver_id,
+        "step_order": step_order,
+        "status": _enum(ApprovalStepStatus, record.get("status"), ApprovalStepStatus.PENDING),
+        "organization_id": _optional_uuid(record.get("organization_id"), "organization_id"),
+    }
+
+
+_ROW_BUILDERS: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+    "users": _user_row,
+    "documents": _document_row,
+    "steps": _step_row,
+}
+_TABLES: dict[str, Table] = {
+    "users": User.__table__,
+    "documents": Document.__table__,
+    "steps": ApprovalStep.__table__,
+}
+
+
+def _identifier(value: Any, kind: str, *, required: bool = False) -> uuid.UUID:
+    """Return a UUID as-is, map a legacy id to UUIDv5, or mint a UUIDv7."""
+    if value is None or str(value).strip() == "":
+        if required:
+            raise ValueError(f"a {kind} reference is required.")
+        return uuid7()
+    value = str(value).strip()
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        return uuid.uuid5(IMPORT_NAMESPACE, f"{kind}:{value}")
+
+
+def _optional_uuid(value: Any, name: str) -> uuid.UUID | None:
+    if value is None or str(value).strip() == "":
+        return None
+    try:
+        return uuid.UUID(str(value).strip())
+    except ValueError:
+        raise ValueError(f"{name} must be a UUID.") from None
+
+
+def _text(record: dict[str, Any], name: str, *, required: bool = False) -> str | None:
+    value = record.get(name)
+    value = "" if value is None else str(value).strip()
+    if not value:
+        if required:
+            raise ValueError(f"{name} is required.")
+        return None
+    return value
+
+
+def _boolean(value: Any, *, default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower()
+    if normalized in _TRUE:
+        return True
+    if normalized in _FALSE:
+        return default if normalized == "" else False
+    raise ValueError(f"invalid boolean {value!r}.")
+
+
+def _enum(enum: type[Enum], value: Any, default: Enum) -> Enum:
+    if value is None or str(value).strip() == "":
+        return default
+    normalized = str(value).strip().lower()
+    for member in enum:
+        if normalized in (member.name.lower(), str(member.value).lower()):
+            return member
+    raise ValueError(f"invalid {enum.__name__} {value!r}.")
+
+
+def _timestamp(value: Any) -> datetime:
+    if value is None or str(value).strip() == "":
+        return datetime.now(timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"invalid timestamp {value!r}.") from None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _detect_format(path: str) -> str:
+    lowered = path.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    raise ImportFormatError(f"Cannot tell the format of {path}; pass csv or ndjson explicitly.")
@@ -0,0 +1,409 @@
+"""Database-backed job queue for deferred workflow work."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.src.models.job import Job, JobStatus
+
+if TYPE_CHECKING:
+    from backend.src.db.sqlite_profile import GroupCommitWriter
+
+JobHandler = Callable[[Session, dict[str, Any]], None]
+
+_HANDLERS: dict[str, JobHandler] = {}
+# Kinds that must not run inside a group commit, e.g. because they wait on
+# the network while their transaction is open.
+_SOLO_KINDS: set[str] = set()
+
+BACKOFF_BASE = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(hours=1)
+LEASE_TIMEOUT = timedelta(minutes=10)
+# How often a worker looks for tenant databases added since it started.
+TENANT_REFRESH_SECONDS = 60.0
+# Longest pause between polls while polling itself keeps failing.
+POLL_BACKOFF_MAX_SECONDS = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+class JobError(RuntimeError):
+    """Base class for job queue failures."""
+
+
+class UnknownJobKindError(JobError):
+    """Raised when no handler is registered for a job kind."""
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    """Snapshot of a job row taken at claim time."""
+    id: uuid.UUID
+    kind: str
+    payload: dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+@dataclass(frozen=True)
+class JobRunSummary:
+    """Outcome counts for a batch of executed jobs."""
+    succeeded: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.retried + self.failed
+
+
+def register_handler(
+    kind: str,
+    *,
+    group_commit: bool = True,
+) -> Callable[[JobHandler], JobHandler]:
+    """Register the function that executes jobs of the given kind.
+
+    ``group_commit=False`` keeps the kind out of the SQLite group-commit
+    writer, which would otherwise be held for as long as the handler runs.
+    """
+
+    def decorator(handler: JobHandler) -> JobHandler:
+        _HANDLERS[kind] = handler
+        if not group_commit:
+            _SOLO_KINDS.add(kind)
+        return handler
+
+    return decorator
+
+
+def enqueue(
+    session: Session,
+    *,
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    run_at: datetime | None = None,
+    max_attempts: int = 5,
+) -> Job:
+    """Add a job to the caller's transaction; it becomes visible on commit."""
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        status=JobStatus.PENDING,
+        attempts=0,
+        max_attempts=max_attempts,
+        run_at=run_at or _utcnow(),
+    )
+    session.add(job)
+    return job
+
+
+def ensure_scheduled(
+    session: Session,
+    *,
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    run_at: datetime | None = None,
+) -> Job | None:
+    """Enqueue a job of ``kind`` unless one is already pending or running.
+
+    Periodic jobs use this at startup and re-enqueue themselves from their
+    handler, so a single chain exists per kind.
+    """
+    existing = session.scalar(
+        select(Job.id)
+        .where(
+            Job.kind == kind,
+            Job.status.in_((JobStatus.PENDING, JobStatus.RUNNING)),
+        )
+        .limit(1)
+    )
+    if existing is not None:
+        return None
+    return enqueue(session, kind=kind, payload=payload, run_at=run_at)
+
+
+def claim_batch(session: Session, *, worker_id: str, limit: int = 10) -> list[ClaimedJob]:
+    """Lock up to ``limit`` due jobs for ``worker_id`` and commit the claim.
+
+    Postgres uses ``FOR UPDATE SKIP LOCKED`` so concurrent workers never
+    block on each other; SQLite serializes writers anyway, so a single
+    ``UPDATE ... WHERE id IN (subquery)`` tagged with a claim token is used.
+    """
+    now = _utcnow()
+    due = or_(
+        (Job.status == JobStatus.PENDING) & (Job.run_at <= now),
+        (Job.status == JobStatus.RUNNING) & (Job.locked_at < now - LEASE_TIMEOUT),
+    )
+    claim_token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+
+    if session.get_bind().dialect.name == "postgresql":
+        statement = (
+            select(Job)
+            .where(due)
+            .order_by(Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = list(session.scalars(statement))
+        for job in jobs:
+            job.status = JobStatus.RUNNING
+            job.locked_by = claim_token
+            job.locked_at = now
+            job.attempts += 1
+    else:
+        candidates = select(Job.id).where(due).order_by(Job.run_at).limit(limit)
+        session.execute(
+            update(Job)
+            .where(Job.id.in_(candidates.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING,
+                locked_by=claim_token,
+                locked_at=now,
+                attempts=Job.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        jobs = list(
+            session.scalars(
+                select(Job).where(Job.locked_by == claim_token).order_by(Job.run_at)
+            )
+        )
+
+    claimed = [
+        ClaimedJob(
+            id=job.id,
+            kind=job.kind,
+            payload=dict(job.payload),
+            attempts=job.attempts,
+            max_attempts=job.max_attempts,
+        )
+        for job in jobs
+    ]
+    session.commit()
+    return claimed
+
+
+def run_job(session_factory: sessionmaker, job: ClaimedJob) -> JobStatus:
+    """Execute a claimed job and record its outcome."""
+    handler = _HANDLERS.get(job.kind)
+    session = session_factory()
+    try:
+        try:
+            if handler is None:
+                raise UnknownJobKindError(f"No handler registered for job kind {job.kind}.")
+            handler(session, job.payload)
+        except Exception:  # noqa: BLE001 - handler failures are recorded, not raised
+            session.rollback()
+            return _record_failure(session, job, traceback.format_exc(limit=5))
+
+        _finish(session, job.id, status=JobStatus.SUCCEEDED)
+        session.commit()
+        return JobStatus.SUCCEEDED
+    finally:
+        session.close()
+
+
+def run_pending(
+    session_factory: sessionmaker,
+    *,
+    worker_id: str = "inline",
+    batch_size: int = 100,
+) -> JobRunSummary:
+    """Drain all currently due jobs in the calling thread.
+
+    Used by tests and by deployments that run without a worker thread.
+    """
+    succeeded = retried = failed = 0
+    while True:
+        session = session_factory()
+        try:
+            jobs = claim_batch(session, worker_id=worker_id, limit=batch_size)
+        finally:
+            session.close()
+        if not jobs:
+            break
+        for job in jobs:
+            outcome = run_job(session_factory, job)
+            if outcome == JobStatus.SUCCEEDED:
+                succeeded += 1
+            elif outcome == JobStatus.PENDING:
+                retried += 1
+            else:
+                failed += 1
+    return JobRunSummary(succeeded=succeeded, retried=retried, failed=failed)
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the given number of failed attempts."""
+    delay = BACKOFF_BASE * (2 ** max(attempts - 1, 0))
+    return min(delay, BACKOFF_MAX)
+
+
+class JobWorker:
+    """Poll the job table from background threads.
+
+    With a group-commit ``writer`` (the SQLite production profile), a
+    claimed batch runs on the writer thread and commits together instead
+    of one transaction per job.
+
+    ``tenants`` returns session factories for tenant databases and schemas,
+    whose job tables are polled after the shared one. ``prepare`` runs once
+    per tenant the worker has not seen yet, e.g. to schedule periodic jobs.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        *,
+        threads: int = 2,
+        batch_size: int = 10,
+        poll_interval: float = 1.0,
+        writer: GroupCommitWriter | None = None,
+        tenants: Callable[[], list[sessionmaker]] | None = None,
+        prepare: Callable[[Session], None] | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._writer = writer
+        self._threads = threads
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._tenants = tenants
+        self._prepare = prepare
+        self._tenant_factories: list[sessionmaker] = []
+        self._tenants_loaded_at = float("-inf")
+        self._tenants_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._workers: list[threading.Thread] = []
+
+    def start(self) -> None:
+        self._stop.clear()
+        for index in range(self._threads):
+            thread = threading.Thread(
+                target=self._run,
+                args=(f"worker-{index}",),
+                name=f"docengine-job-worker-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._workers.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._workers:
+            thread.join(timeout)
+        self._workers.clear()
+
+    def poll_once(self, worker_id: str = "inline") -> int:
+        """Claim and run one batch from every database; return the job count."""
+        processed = self._poll(self._session_factory, worker_id, writer=self._writer)
+        for factory in self._tenant_sources():
+            processed += self._poll(factory, worker_id, writer=None)
+        return processed
+
+    def _run(self, worker_id: str) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                processed = self.poll_once(worker_id)
+            except Exception:  # noqa: BLE001 - keep the worker alive across DB hiccups
+                failures += 1
+                logger.exception(
+                    "job poll failed", extra={"worker_id": worker_id, "failures": failures}
+                )
+                self._stop.wait(self._poll_delay(failures))
+                continue
+            failures = 0
+            if not processed:
+                self._stop.wait(self._poll_interval)
+
+    def _poll_delay(self, failures: int) -> float:
+        """Back off exponentially while polling keeps failing."""
+        return min(self._poll_interval * 2 ** (failures - 1), POLL_BACKOFF_MAX_SECONDS)
+
+    def _poll(
+        self,
+        session_factory: sessionmaker,
+        worker_id: str,
+        *,
+        writer: GroupCommitWriter | None,
+    ) -> int:
+        session = session_factory()
+        try:
+            jobs = claim_batch(session, worker_id=worker_id, limit=self._batch_size)
+        finally:
+            session.close()
+        futures = []
+        for job in jobs:
+            if writer is None or job.kind in _SOLO_KINDS:
+                run_job(session_factory, job)
+            else:
+                futures.append(writer.submit(partial(run_job, job=job)))
+        wait(futures)
+        return len(jobs)
+
+    def _tenant_sources(self) -> list[sessionmaker]:
+        if self._tenants is None:
+            return []
+        with self._tenants_lock:
+            if time.monotonic() - self._tenants_loaded_at >= TENANT_REFRESH_SECONDS:
+                factories = self._tenants()
+                for factory in factories:
+                    if factory not in self._tenant_factories and self._prepare is not None:
+                        with factory() as session:
+                            self._prepare(session)
+                            session.commit()
+                self._tenant_factories = factories
+                self._tenants_loaded_at = time.monotonic()
+            return list(self._tenant_factories)
+
+
+def _record_failure(session: Session, job: ClaimedJob, error: str) -> JobStatus:
+    if job.attempts >= job.max_attempts:
+        _finish(session, job.id, status=JobStatus.FAILED, last_error=error)
+        outcome = JobStatus.FAILED
+    else:
+        session.execute(
+            update(Job)
+            .where(Job.id == job.id)
+            .values(
+                status=JobStatus.PENDING,
+                run_at=_utcnow() + backoff_delay(job.attempts),
+                locked_by=None,
+                locked_at=None,
+                last_error=error,
+            )
+        )
+        outcome = JobStatus.PENDING
+    session.commit()
+    return outcome
+
+
+def _finish(
+    session: Session,
+    job_id: uuid.UUID,
+    *,
+    status: JobStatus,
+    last_error: str | None = None,
+) -> None:
+    session.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(status=status, locked_by=None, locked_at=None, last_error=last_error)
+    )
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
@@ -0,0 +1,79 @@
+"""Deferred approver notifications and escalations."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from backend.src.core.settings import load_settings
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.services import audit_service, job_service
+
+NOTIFY_APPROVER = "approval.notify_approver"
+ESCALATE_STEP = "approval.escalate_step"
+
+
+def schedule_step_followups(
+    session: Session,
+    step: ApprovalStep,
+    *,
+    escalation_delay: timedelta | None = None,
+) -> None:
+    """Enqueue the notification and escalation jobs for a newly active step."""
+    if escalation_delay is None:
+        escalation_delay = timedelta(hours=load_settings().approval_escalation_hours)
+    payload = {
+        "document_id": str(step.document_id),
+        "step_id": str(step.id),
+        "approver_id": str(step.approver_id),
+    }
+    job_service.enqueue(session, kind=NOTIFY_APPROVER, payload=payload)
+    job_service.enqueue(
+        session,
+        kind=ESCALATE_STEP,
+        payload=payload,
+        run_at=datetime.now(timezone.utc) + escalation_delay,
+    )
+
+
+@job_service.register_handler(NOTIFY_APPROVER)
+def notify_approver(session: Session, payload: dict[str, Any]) -> None:
+    step = _load_active_step(session, payload)
+    if step is None:
+        return
+    audit_service.record(
+        session,
+        document_id=step.document_id,
+        action="approver_notified",
+        performed_by=step.approver_id,
+        organization_id=step.organization_id,
+    )
+
+
+@job_service.register_handler(ESCALATE_STEP)
+def escalate_step(session: Session, payload: dict[str, Any]) -> None:
+    step = _load_active_step(session, payload)
+    if step is None:
+        return
+    audit_service.record(
+        session,
+        document_id=step.document_id,
+        action="step_escalated",
+        performed_by=step.approver_id,
+        organization_id=step.organization_id,
+    )
+
+
+def _load_active_step(session: Session, payload: dict[str, Any]) -> ApprovalStep | None:
+    """Return the step if it is still awaiting a decision, else None."""
+    step = session.get(ApprovalStep, uuid.UUID(payload["step_id"]))
+    if step is None or step.status != ApprovalStepStatus.PENDING:
+        return None
+    document = session.get(Document, step.document_id)
+    if document is None or document.status != DocumentStatus.PENDING:
+        return None
+    return step
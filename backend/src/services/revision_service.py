@@ -0,0 +1,242 @@
+"""Document revisions stored as deltas with periodic snapshots."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterator
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.src.core import delta
+from backend.src.core.settings import load_settings
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.document_revision import DocumentRevision, RevisionStorage
+from backend.src.services import approval_service, archive_service
+
+
+class RevisionError(RuntimeError):
+    """Base class for revision failures."""
+
+
+class DocumentNotFoundError(RevisionError):
+    """Raised when the target document does not exist."""
+
+
+class RevisionNotFoundError(RevisionError):
+    """Raised when a revision number does not exist for a document."""
+
+
+class RevisionStateError(RevisionError):
+    """Raised when the document status blocks a new revision."""
+
+
+@dataclass(frozen=True)
+class RevisionDiff:
+    from_number: int
+    to_number: int
+    target_size: int
+    chunks: Iterator[bytes]
+
+
+class RevisionCache:
+    """Byte-bounded LRU of reconstructed revision contents.
+
+    Revisions are immutable, so entries never need invalidation.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[uuid.UUID, int], bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[uuid.UUID, int]) -> bytes | None:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: tuple[uuid.UUID, int], content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = content
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_cache: RevisionCache | None = None
+
+
+def get_cache() -> RevisionCache:
+    global _cache
+    if _cache is None:
+        _cache = RevisionCache(load_settings().revision_cache_bytes)
+    return _cache
+
+
+def create_revision(
+    session: Session,
+    *,
+    document_id: uuid.UUID,
+    content: bytes,
+    created_by: uuid.UUID | None = None,
+) -> DocumentRevision:
+    """Store ``content`` as the next revision of a document.
+
+    Resubmitting a rejected document reopens its approval chain instead of
+    requiring a new document.
+    """
+    document = session.get(Document, document_id, with_for_update=True)
+    if document is None:
+        # Rejected documents may have been archived; resubmission revives them.
+        document = archive_service.restore_document(session, document_id)
+    if document is None:
+        raise DocumentNotFoundError(f"Document {document_id} was not found.")
+    if document.status == DocumentStatus.APPROVED:
+        raise RevisionStateError(f"Document {document_id} is approved and cannot be revised.")
+    if document.status == DocumentStatus.PENDING and _has_decisions(session, document_id):
+        # Approvers already decided on the current content.
+        raise RevisionStateError(
+            f"Document {document_id} is under review and cannot be revised until it is decided."
+        )
+
+    latest = _latest_number(session, document_id)
+    number = latest + 1
+    interval = max(load_settings().revision_snapshot_interval, 1)
+    if latest == 0 or (number - 1) % interval == 0:
+        storage = RevisionStorage.SNAPSHOT
+        payload = zlib.compress(content)
+    else:
+        previous = get_revision_content(session, document_id=document_id, number=latest)
+        storage = RevisionStorage.DELTA
+        payload = zlib.compress(delta.encode(previous, content))
+
+    revision = DocumentRevision(
+        document_id=document_id,
+        number=number,
+        storage=storage,
+        data=payload,
+        size=len(content),
+        stored_size=len(payload),
+        sha256=hashlib.sha256(content).hexdigest(),
+        created_by=created_by,
+    )
+    session.add(revision)
+    if document.status == DocumentStatus.REJECTED:
+        approval_service.reopen_document(session, document)
+    session.commit()
+    session.refresh(revision)
+    get_cache().put((document_id, number), content)
+    return revision
+
+
+def list_revisions(session: Session, *, document_id: uuid.UUID) -> list[DocumentRevision]:
+    statement = (
+        select(DocumentRevision)
+        .where(DocumentRevision.document_id == document_id)
+        .order_by(DocumentRevision.number)
+    )
+    return list(session.scalars(statement))
+
+
+def get_revision_content(session: Session, *, document_id: uuid.UUID, number: int) -> bytes:
+    """Reconstruct a revision from its nearest snapshot, using the cache."""
+    cache = get_cache()
+    cached = cache.get((document_id, number))
+    if cached is not None:
+        return cached
+
+    snapshot_number = session.scalar(
+        select(func.max(DocumentRevision.number)).where(
+            DocumentRevision.document_id == document_id,
+            DocumentRevision.storage == RevisionStorage.SNAPSHOT,
+            DocumentRevision.number <= number,
+        )
+    )
+    if snapshot_number is None:
+        raise RevisionNotFoundError(f"Revision {number} of document {document_id} was not found.")
+
+    # Start from the newest cached revision in the chain, if any.
+    start = snapshot_number
+    content: bytes | None = None
+    for candidate in range(number - 1, snapshot_number - 1, -1):
+        content = cache.get((document_id, candidate))
+        if content is not None:
+            start = candidate + 1
+            break
+
+    rows = session.execute(
+        select(DocumentRevision.number, DocumentRevision.storage, DocumentRevision.data)
+        .where(
+            DocumentRevision.document_id == document_id,
+            DocumentRevision.number >= start,
+            DocumentRevision.number <= number,
+        )
+        .order_by(DocumentRevision.number)
+    ).all()
+    if not rows or rows[-1].number != number:
+        raise RevisionNotFoundError(f"Revision {number} of document {document_id} was not found.")
+
+    for row in rows:
+        raw = zlib.decompress(row.data)
+        if row.storage == RevisionStorage.SNAPSHOT:
+            content = raw
+        else:
+            content = delta.apply(content, raw)
+        cache.put((document_id, row.number), content)
+    return content
+
+
+def diff_since(session: Session, *, document_id: uuid.UUID, since: int) -> RevisionDiff:
+    """Return a streamed delta that turns revision ``since`` into the latest one."""
+    latest = _latest_number(session, document_id)
+    if latest == 0 or not 1 <= since <= latest:
+        raise RevisionNotFoundError(f"Revision {since} of document {document_id} was not found.")
+    source = get_revision_content(session, document_id=document_id, number=since)
+    target = get_revision_content(session, document_id=document_id, number=latest)
+    return RevisionDiff(
+        from_number=since,
+        to_number=latest,
+        target_size=len(target),
+        chunks=delta.iter_encode(source, target),
+    )
+
+
+def _has_decisions(session: Session, document_id: uuid.UUID) -> bool:
+    decided = session.scalar(
+        select(ApprovalStep.id)
+        .where(
+            ApprovalStep.document_id == document_id,
+            ApprovalStep.status != ApprovalStepStatus.PENDING,
+        )
+        .limit(1)
+    )
+    return decided is not None
+
+
+def _latest_number(session: Session, document_id: uuid.UUID) -> int:
+    latest = session.scalar(
+        select(func.max(DocumentRevision.number)).where(
+            DocumentRevision.document_id == document_id
+        )
+    )
+    return latest or 0
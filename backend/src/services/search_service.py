@@ -0,0 +1,394 @@
+"""Ranked, cursor-paginated title search over documents."""
+
+from __future__ import annotations
+
+import bisect
+import math
+import re
+import threading
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Float, bindparam, event, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, SessionTransaction
+
+from backend.src.core.pagination import decode_cursor, encode_cursor
+from backend.src.models.document import Document
+from backend.src.models.document_search import POSTGRES_SEARCH_DDL, SQLITE_SEARCH_DDL
+
+MAX_QUERY_TERMS = 8
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchError(RuntimeError):
+    """Base class for search failures."""
+
+
+class InvalidQueryError(SearchError):
+    """Raised when a search query has no searchable terms."""
+
+
+class InvalidCursorError(SearchError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    document: Document
+    score: float
+
+
+@dataclass(frozen=True)
+class SearchPage:
+    hits: list[SearchHit]
+    next_cursor: str | None
+
+
+def tokenize(value: str) -> list[str]:
+    return [token.lower() for token in _TOKEN_PATTERN.findall(value)]
+
+
+class InvertedIndex:
+    """In-process BM25 index over document titles.
+
+    Optional accelerator for SQLite deployments: postings live in memory so a
+    query touches only the documents containing its terms.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[uuid.UUID, int]] = defaultdict(dict)
+        self._vocabulary: list[str] = []
+        self._lengths: dict[uuid.UUID, int] = {}
+        self._organizations: dict[uuid.UUID, uuid.UUID | None] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(
+        self,
+        document_id: uuid.UUID,
+        title: str,
+        organization_id: uuid.UUID | None = None,
+    ) -> None:
+        tokens = tokenize(title)
+        with self._lock:
+            if document_id in self._lengths:
+                return
+            for token in tokens:
+                if token not in self._postings:
+                    bisect.insort(self._vocabulary, token)
+                postings = self._postings[token]
+                postings[document_id] = postings.get(document_id, 0) + 1
+            self._lengths[document_id] = len(tokens)
+            self._organizations[document_id] = organization_id
+            self._total_length += len(tokens)
+
+    def remove(self, document_ids: Iterable[uuid.UUID]) -> None:
+        """Drop documents from the index in one pass over the postings."""
+        with self._lock:
+            removed = {
+                document_id for document_id in document_ids if document_id in self._lengths
+            }
+            if not removed:
+                return
+            for document_id in removed:
+                self._total_length -= self._lengths.pop(document_id)
+                del self._organizations[document_id]
+            for token in list(self._postings):
+                postings = self._postings[token]
+                for document_id in removed.intersection(postings):
+                    del postings[document_id]
+                if not postings:
+                    del self._postings[token]
+                    self._vocabulary.pop(bisect.bisect_left(self._vocabulary, token))
+
+    def search(
+        self,
+        terms: list[str],
+        organization_id: uuid.UUID | None = None,
+    ) -> list[tuple[float, uuid.UUID]]:
+        """Return ``(score, id)`` pairs for documents matching every term prefix.
+
+        Document statistics span all organizations; only the results are
+        restricted to ``organization_id``.
+        """
+        with self._lock:
+            if not self._lengths:
+                return []
+            doc_count = len(self._lengths)
+            average_length = self._total_length / doc_count
+            scores: dict[uuid.UUID, float] | None = None
+            for term in terms:
+                term_scores: dict[uuid.UUID, float] = {}
+                start = bisect.bisect_left(self._vocabulary, term)
+                for token in self._vocabulary[start:]:
+                    if not token.startswith(term):
+                        break
+                    postings = self._postings[token]
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for document_id, frequency in postings.items():
+                        length = self._lengths[document_id]
+                        norm = frequency + self.k1 * (1 - self.b + self.b * length / average_length)
+                        term_scores[document_id] = term_scores.get(document_id, 0.0) + (
+                            idf * frequency * (self.k1 + 1) / norm
+                        )
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        document_id: score + term_scores[document_id]
+                        for document_id, score in scores.items()
+                        if document_id in term_scores
+                    }
+                if not scores:
+                    return []
+            organizations = self._organizations
+        return sorted(
+            (
+                (score, document_id)
+                for document_id, score in (scores or {}).items()
+                if organizations[document_id] == organization_id
+            ),
+            key=lambda item: (-item[0], str(item[1])),
+        )
+
+
+_memory_index: InvertedIndex | None = None
+
+
+def enable_memory_index(session: Session) -> InvertedIndex:
+    """Build the in-process index from the documents table and start using it."""
+    global _memory_index
+    index = InvertedIndex()
+    for document_id, title, organization_id in session.execute(
+        select(Document.id, Document.title, Document.organization_id)
+    ):
+        index.add(document_id, title, organization_id)
+    _memory_index = index
+    return index
+
+
+def disable_memory_index() -> None:
+    global _memory_index
+    _memory_index = None
+
+
+# Changes to the in-process index wait in ``session.info`` until the
+# transaction commits, so a rollback never leaves phantom entries behind.
+_PENDING_MEMORY_CHANGES = "search_memory_index_changes"
+
+
+def _defer_memory_change(session: Session, method: str, *args: Any) -> None:
+    session.info.setdefault(_PENDING_MEMORY_CHANGES, []).append((method, args))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_memory_changes(session: Session) -> None:
+    changes = session.info.pop(_PENDING_MEMORY_CHANGES, [])
+    if _memory_index is not None:
+        for method, args in changes:
+            getattr(_memory_index, method)(*args)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_memory_changes(session: Session, transaction: SessionTransaction) -> None:
+    # Runs after ``after_commit`` too, when the changes are already applied.
+    if transaction.parent is None:
+        session.info.pop(_PENDING_MEMORY_CHANGES, None)
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create search structures on existing databases and backfill SQLite FTS."""
+    dialect = engine.dialect.name
+    with engine.begin() as connection:
+        if dialect == "postgresql":
+            for statement in POSTGRES_SEARCH_DDL:
+                connection.execute(text(statement))
+        elif dialect == "sqlite":
+            for statement in SQLITE_SEARCH_DDL:
+                connection.execute(text(statement))
+            indexed = connection.execute(text("SELECT count(*) FROM documents_fts")).scalar()
+            if not indexed:
+                connection.execute(
+                    text(
+                        "INSERT INTO documents_fts (title, document_id) "
+                        "SELECT title, id FROM documents"
+                    )
+                )
+
+
+def index_document(session: Session, document: Document) -> None:
+    """Index a new document inside the caller's transaction."""
+    if session.get_bind().dialect.name == "sqlite":
+        session.flush()
+        session.execute(
+            text(
+                "INSERT INTO documents_fts (title, document_id) VALUES (:title, :document_id)"
+            ).bindparams(bindparam("document_id", type_=Document.__table__.c.id.type)),
+            {"title": document.title, "document_id": document.id},
+        )
+    if _memory_index is not None:
+        session.flush()
+        _defer_memory_change(session, "add", document.id, document.title, document.organization_id)
+
+
+def unindex_documents(session: Session, document_ids: list[uuid.UUID]) -> None:
+    """Remove documents from the search index inside the caller's transaction.
+
+    Postgres indexes the row itself, so there is nothing to delete there.
+    The in-process index drops the documents once the transaction commits.
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        session.execute(
+            text("DELETE FROM documents_fts WHERE document_id IN :document_ids").bindparams(
+                bindparam(
+                    "document_ids",
+                    type_=Document.__table__.c.id.type,
+                    expanding=True,
+                )
+            ),
+            {"document_ids": document_ids},
+        )
+    if _memory_index is not None:
+        _defer_memory_change(session, "remove", list(document_ids))
+
+
+def search_documents(
+    session: Session,
+    *,
+    query: str,
+    limit: int = 20,
+    cursor: str | None = None,
+    organization_id: uuid.UUID | None = None,
+) -> SearchPage:
+    """Rank the organization's documents whose titles match ``query``."""
+    terms = tokenize(query)[:MAX_QUERY_TERMS]
+    if not terms:
+        raise InvalidQueryError("Search query must contain at least one word.")
+    after = _decode_cursor(cursor) if cursor else None
+
+    dialect = session.get_bind().dialect.name
+    if _memory_index is not None:
+        ranked = _search_memory(terms, limit + 1, after, organization_id)
+    elif dialect == "postgresql":
+        ranked = _search_postgres(session, terms, limit + 1, after, organization_id)
+    elif dialect == "sqlite":
+        ranked = _search_sqlite(session, terms, limit + 1, after, organization_id)
+    else:
+        raise SearchError(f"Search is not supported on {dialect}.")
+
+    page, more = ranked[:limit], len(ranked) > limit
+    documents = {
+        document.id: document
+        for document in session.scalars(
+            select(Document).where(Document.id.in_([document_id for _, document_id in page]))
+        )
+    }
+    hits = [
+        SearchHit(document=documents[document_id], score=score)
+        for score, document_id in page
+        if document_id in documents
+    ]
+    next_cursor = _encode_cursor(*page[-1]) if more and page else None
+    return SearchPage(hits=hits, next_cursor=next_cursor)
+
+
+def _search_postgres(
+    session: Session,
+    terms: list[str],
+    limit: int,
+    after: tuple[float, uuid.UUID] | None,
+    organization_id: uuid.UUID | None,
+) -> list[tuple[float, uuid.UUID]]:
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    keyset = ""
+    params: dict[str, object] = {
+        "tsquery": tsquery,
+        "limit": limit,
+        "organization_id": organization_id,
+    }
+    if after is not None:
+        keyset = "WHERE score < :after_score OR (score = :after_score AND id > :after_id)"
+        params.update(after_score=after[0], after_id=after[1])
+    statement = text(
+        "SELECT score, id FROM ("
+        "  SELECT id, ts_rank_cd(title_tsv, to_tsquery('simple', :tsquery))::float8 AS score"
+        "  FROM documents WHERE title_tsv @@ to_tsquery('simple', :tsquery)"
+        "  AND organization_id IS NOT DISTINCT FROM :organization_id"
+        f") ranked {keyset} ORDER BY score DESC, id LIMIT :limit"
+    ).bindparams(
+        bindparam("organization_id", type_=Document.__table__.c.organization_id.type)
+    )
+    return [(row.score, row.id) for row in session.execute(statement, params)]
+
+
+def _search_sqlite(
+    session: Session,
+    terms: list[str],
+    limit: int,
+    after: tuple[float, uuid.UUID] | None,
+    organization_id: uuid.UUID | None,
+) -> list[tuple[float, uuid.UUID]]:
+    id_type = Document.__table__.c.id.type
+    match = " ".join(f'"{term}"*' for term in terms)
+    keyset = ""
+    params: dict[str, object] = {
+        "match": match,
+        "limit": limit,
+        "organization_id": organization_id,
+    }
+    if after is not None:
+        keyset = "WHERE score < :after_score OR (score = :after_score AND document_id > :after_id)"
+        params.update(after_score=after[0], after_id=after[1])
+    statement = text(
+        "SELECT score, document_id FROM ("
+        "  SELECT documents_fts.document_id, -bm25(documents_fts) AS score"
+        "  FROM documents_fts JOIN documents ON documents.id = documents_fts.document_id"
+        "  WHERE documents_fts MATCH :match AND documents.organization_id IS :organization_id"
+        f") ranked {keyset} ORDER BY score DESC, document_id LIMIT :limit"
+    ).columns(score=Float, document_id=id_type)
+    statement = statement.bindparams(bindparam("organization_id", type_=id_type))
+    if after is not None:
+        statement = statement.bindparams(bindparam("after_id", type_=id_type))
+    return [(row.score, row.document_id) for row in session.execute(statement, params)]
+
+
+def _search_memory(
+    terms: list[str],
+    limit: int,
+    after: tuple[float, uuid.UUID] | None,
+    organization_id: uuid.UUID | None,
+) -> list[tuple[float, uuid.UUID]]:
+    if _memory_index is None:
+        return []
+    ranked = _memory_index.search(terms, organization_id)
+    if after is not None:
+        after_score, after_id = after
+        ranked = [
+            (score, document_id)
+            for score, document_id in ranked
+            if score < after_score or (score == after_score and str(document_id) > str(after_id))
+        ]
+    return ranked[:limit]
+
+
+def _encode_cursor(score: float, document_id: uuid.UUID) -> str:
+    return encode_cursor(s=score, id=str(document_id))
+
+
+def _decode_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    try:
+        data = decode_cursor(cursor)
+        return float(data["s"]), uuid.UUID(data["id"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid search cursor.") from exc
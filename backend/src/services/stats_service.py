@@ -0,0 +1,146 @@
+"""Incrementally maintained document status counters, per organization.
+
+Counter rows are upserted, so the first transitions of a new organization
+(or status, or shard) cannot race each other into a duplicate key.
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.document_archive import documents_archive
+from backend.src.models.document_status_count import DocumentStatusCount
+from backend.src.services import job_service
+
+# Increments land on a random shard so concurrent writers on Postgres do not
+# all queue behind a single hot counter row; reads sum at most
+# len(DocumentStatus) * COUNTER_SHARDS rows.
+COUNTER_SHARDS = 8
+
+RECONCILE_COUNTERS = "stats.reconcile_counters"
+RECONCILE_INTERVAL = timedelta(hours=1)
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+OrganizationCounts = dict[uuid.UUID | None, dict[DocumentStatus, int]]
+
+
+def record_created(
+    session: Session,
+    status: DocumentStatus = DocumentStatus.PENDING,
+    *,
+    organization_id: uuid.UUID | None,
+) -> None:
+    """Count a new document in the caller's transaction."""
+    _adjust(session, organization_id, status, 1)
+
+
+def record_transition(
+    session: Session,
+    old_status: DocumentStatus,
+    new_status: DocumentStatus,
+    *,
+    organization_id: uuid.UUID | None,
+) -> None:
+    """Move one document between status counters in the caller's transaction."""
+    if old_status == new_status:
+        return
+    _adjust(session, organization_id, old_status, -1)
+    _adjust(session, organization_id, new_status, 1)
+
+
+def get_counts(session: Session, *, organization_id: uuid.UUID | None) -> dict[DocumentStatus, int]:
+    statement = (
+        select(DocumentStatusCount.status, func.sum(DocumentStatusCount.count))
+        .where(DocumentStatusCount.organization_key == _organization_key(organization_id))
+        .group_by(DocumentStatusCount.status)
+    )
+    counts = {status: 0 for status in DocumentStatus}
+    for status, count in session.execute(statement):
+        counts[status] = int(count or 0)
+    return counts
+
+
+def rebuild_counters(session: Session) -> OrganizationCounts:
+    """Recompute the counters from the live and archived documents and commit."""
+    if session.get_bind().dialect.name == "postgresql":
+        # Hold off concurrent increments while the snapshot is taken.
+        session.execute(text("LOCK TABLE document_status_counts IN EXCLUSIVE MODE"))
+    counts: OrganizationCounts = {}
+    for table in (Document.__table__, documents_archive):
+        statement = select(table.c.organization_id, table.c.status, func.count()).group_by(
+            table.c.organization_id, table.c.status
+        )
+        for organization_id, status, count in session.execute(statement):
+            per_status = counts.setdefault(organization_id, {status: 0 for status in DocumentStatus})
+            per_status[status] += count
+
+    session.execute(delete(DocumentStatusCount))
+    rows = [
+        {
+            "organization_key": _organization_key(organization_id),
+            "status": status,
+            "shard": 0,
+            "count": count,
+        }
+        for organization_id, per_status in counts.items()
+        for status, count in per_status.items()
+    ]
+    if rows:
+        session.execute(insert(DocumentStatusCount), rows)
+    session.commit()
+    return counts
+
+
+@job_service.register_handler(RECONCILE_COUNTERS)
+def reconcile_counters(session: Session, payload: dict[str, Any]) -> None:
+    rebuild_counters(session)
+    job_service.enqueue(
+        session,
+        kind=RECONCILE_COUNTERS,
+        run_at=datetime.now(timezone.utc) + RECONCILE_INTERVAL,
+    )
+
+
+def _adjust(
+    session: Session,
+    organization_id: uuid.UUID | None,
+    status: DocumentStatus,
+    delta: int,
+) -> None:
+    key = _organization_key(organization_id)
+    shard = random.randrange(COUNTER_SHARDS)
+    upsert = _UPSERTS.get(session.get_bind().dialect.name)
+    if upsert is not None:
+        statement = upsert(DocumentStatusCount).values(
+            organization_key=key, status=status, shard=shard, count=delta
+        )
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["organization_key", "status", "shard"],
+                set_={"count": DocumentStatusCount.count + statement.excluded.count},
+            )
+        )
+        return
+    result = session.execute(
+        update(DocumentStatusCount)
+        .where(
+            DocumentStatusCount.organization_key == key,
+            DocumentStatusCount.status == status,
+            DocumentStatusCount.shard == shard,
+        )
+        .values(count=DocumentStatusCount.count + delta)
+    )
+    if result.rowcount == 0:
+        session.add(DocumentStatusCount(organization_key=key, status=status, shard=shard, count=delta))
+
+
+def _organization_key(organization_id: uuid.UUID | None) -> str:
+    return str(organization_id) if organization_id else ""
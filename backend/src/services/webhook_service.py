@@ -0,0 +1,541 @@
+"""Outbound webhooks delivered from a transactional outbox.
+
+State changes call :func:`publish` inside their own transaction, which
+writes one ``webhook_deliveries`` row per matching subscription; the event
+exists exactly when the change it describes was committed. A periodic job
+then POSTs due rows over a shared keep-alive connection pool, several
+events per request when the subscription allows it, and retries failures
+with exponential backoff. A circuit breaker per endpoint stops hammering a
+receiver that keeps failing; its deliveries wait (without using attempts)
+until the breaker lets a trial request through.
+
+Receivers get ``{"events": [...]}`` and, for subscriptions with a secret,
+an ``X-Docengine-Signature: sha256=<hex HMAC of the body>`` header. Each
+event carries a stable ``id`` so receivers can drop the duplicates that
+at-least-once delivery implies.
+
+Destinations that resolve to private, loopback, link-local or reserved
+addresses are refused when a subscription is created and again before
+each delivery, since DNS may change in between. Set
+``webhook_allow_private_destinations`` to deliver inside a private network.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import ipaddress
+import json
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from backend.src.core import metrics
+from backend.src.core.settings import load_settings
+from backend.src.models.webhook import (
+    WebhookDelivery,
+    WebhookDeliveryStatus,
+    WebhookSubscription,
+)
+from backend.src.services import job_service
+
+DELIVER_WEBHOOKS = "webhooks.deliver"
+DOCUMENT_APPROVED = "document.approved"
+DOCUMENT_REJECTED = "document.rejected"
+EVENT_TYPES = (DOCUMENT_APPROVED, DOCUMENT_REJECTED)
+SIGNATURE_HEADER = "X-Docengine-Signature"
+
+BACKOFF_BASE = timedelta(seconds=10)
+BACKOFF_MAX = timedelta(hours=1)
+# Due deliveries handled per job run; a backlog continues immediately.
+DELIVERY_BATCH = 500
+MAX_BATCH_SIZE = 100
+# Slack added to a claim beyond the time its requests may take.
+CLAIM_MARGIN = timedelta(minutes=1)
+
+webhook_deliveries = metrics.counter(
+    "docengine_webhook_deliveries_total",
+    "Webhook events by outcome (delivered, retried, failed, deferred).",
+    ("outcome",),
+)
+
+
+class WebhookError(RuntimeError):
+    """Base class for webhook failures."""
+
+
+class InvalidSubscriptionError(WebhookError):
+    """Raised when a subscription's URL, event type or batch size is invalid."""
+
+
+class SubscriptionNotFoundError(WebhookError):
+    """Raised when a subscription does not exist in the caller's organization."""
+
+
+class DestinationNotAllowedError(InvalidSubscriptionError):
+    """Raised when a webhook URL resolves to a private or reserved address."""
+
+
+@dataclass(frozen=True)
+class _Target:
+    """The parts of a subscription needed to deliver to it."""
+
+    url: str
+    secret: str | None
+    max_batch_size: int
+
+
+@dataclass(frozen=True)
+class _Event:
+    """A claimed delivery, detached from the session while it is sent."""
+
+    id: uuid.UUID
+    event_type: str
+    created_at: datetime | None
+    payload: dict[str, Any]
+    attempts: int
+
+
+@dataclass(frozen=True)
+class DeliveryRunSummary:
+    delivered: int = 0
+    retried: int = 0
+    failed: int = 0
+    deferred: int = 0
+    requests: int = 0
+
+
+class CircuitBreaker:
+    """Closed until ``threshold`` consecutive failures, then open for ``cooldown``.
+
+    Once the cooldown has passed the breaker is half-open: one request is let
+    through, and its outcome closes the breaker or opens it again.
+    """
+
+    def __init__(self, *, threshold: int = 5, cooldown: float = 60.0) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def breaker_for(url: str) -> CircuitBreaker:
+    """Return the circuit breaker of the endpoint (scheme, host and port) of ``url``."""
+    parts = urlsplit(url)
+    endpoint = f"{parts.scheme}://{parts.netloc}"
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            settings = load_settings()
+            breaker = CircuitBreaker(
+                threshold=settings.webhook_breaker_threshold,
+                cooldown=settings.webhook_breaker_cooldown_seconds,
+            )
+            _breakers[endpoint] = breaker
+        return breaker
+
+
+def get_client() -> httpx.Client:
+    """The process-wide HTTP client; its pool keeps connections to receivers alive."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            settings = load_settings()
+            _client = httpx.Client(
+                timeout=settings.webhook_timeout_seconds,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+                headers={"User-Agent": "docengine-webhooks"},
+            )
+        return _client
+
+
+def close_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def create_subscription(
+    session: Session,
+    *,
+    organization_id: uuid.UUID | None,
+    event_type: str,
+    url: str,
+    secret: str | None = None,
+    max_batch_size: int = 1,
+) -> WebhookSubscription:
+    if event_type not in EVENT_TYPES:
+        raise InvalidSubscriptionError(
+            f"Unknown event type {event_type!r}; expected one of {', '.join(EVENT_TYPES)}."
+        )
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise InvalidSubscriptionError("Webhook URL must be an absolute http(s) URL.")
+    check_destination(url)
+    if not 1 <= max_batch_size <= MAX_BATCH_SIZE:
+        raise InvalidSubscriptionError(f"max_batch_size must be between 1 and {MAX_BATCH_SIZE}.")
+    subscription = WebhookSubscription(
+        organization_id=organization_id,
+        event_type=event_type,
+        url=url,
+        secret=secret,
+        max_batch_size=max_batch_size,
+        is_active=True,
+    )
+    session.add(subscription)
+    session.commit()
+    session.refresh(subscription)
+    return subscription
+
+
+def check_destination(url: str) -> None:
+    """Refuse URLs whose host resolves to a non-public address.
+
+    Every resolved address must be public, so a name with one private record
+    cannot be used to reach an internal service.
+    """
+    if load_settings().webhook_allow_private_destinations:
+        return
+    parts = urlsplit(url)
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        addresses = socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)
+    except (OSError, ValueError) as error:
+        raise DestinationNotAllowedError(
+            f"Webhook host {parts.hostname!r} could not be resolved."
+        ) from error
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0].split("%", 1)[0])
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise DestinationNotAllowedError(
+                "Webhook URL must not point to a private, loopback, link-local or reserved address."
+            )
+
+
+def list_subscriptions(
+    session: Session,
+    *,
+    organization_id: uuid.UUID | None,
+) -> list[WebhookSubscription]:
+    statement = (
+        select(WebhookSubscription)
+        .where(WebhookSubscription.organization_id.is_not_distinct_from(organization_id))
+        .order_by(WebhookSubscription.created_at)
+    )
+    return list(session.scalars(statement))
+
+
+def delete_subscription(
+    session: Session,
+    *,
+    subscription_id: uuid.UUID,
+    organization_id: uuid.UUID | None,
+) -> None:
+    """Remove a subscription and drop its undelivered events."""
+    subscription = session.get(WebhookSubscription, subscription_id)
+    if subscription is None or subscription.organization_id != organization_id:
+        raise SubscriptionNotFoundError(f"Webhook subscription {subscription_id} was not found.")
+    session.execute(
+        delete(WebhookDelivery).where(
+            WebhookDelivery.subscription_id == subscription_id,
+            WebhookDelivery.status == WebhookDeliveryStatus.PENDING,
+        )
+    )
+    session.delete(subscription)
+    session.commit()
+
+
+def publish(
+    session: Session,
+    *,
+    event_type: str,
+    organization_id: uuid.UUID | None,
+    data: dict[str, Any],
+) -> int:
+    """Add one outbox row per matching subscription to the caller's transaction."""
+    subscription_ids = list(
+        session.scalars(
+            select(WebhookSubscription.id).where(
+                WebhookSubscription.organization_id.is_not_distinct_from(organization_id),
+                WebhookSubscription.event_type == event_type,
+                WebhookSubscription.is_active.is_(True),
+            )
+        )
+    )
+    now = _utcnow()
+    for subscription_id in subscription_ids:
+        session.add(
+            WebhookDelivery(
+                subscription_id=subscription_id,
+                event_type=event_type,
+                payload=data,
+                status=WebhookDeliveryStatus.PENDING,
+                attempts=0,
+                next_attempt_at=now,
+            )
+        )
+    return len(subscription_ids)
+
+
+def deliver_due(
+    session: Session,
+    *,
+    client: httpx.Client | None = None,
+    limit: int = DELIVERY_BATCH,
+) -> DeliveryRunSummary:
+    """POST due outbox rows, grouped per subscription, and record the outcomes.
+
+    Due rows are claimed first: their ``next_attempt_at`` moves past the end
+    of this run and the claim is committed, so other workers skip them
+    without a lock being held. The HTTP requests run outside any
+    transaction, and each subscription's results are committed once its
+    batches are sent, so a crash repeats at most one subscription's batches
+    after the claim runs out.
+    """
+    client = client or get_client()
+    now = _utcnow()
+    statement = (
+        select(WebhookDelivery, WebhookSubscription)
+        .join(WebhookSubscription, WebhookSubscription.id == WebhookDelivery.subscription_id)
+        .where(
+            WebhookDelivery.status == WebhookDeliveryStatus.PENDING,
+            WebhookDelivery.next_attempt_at <= now,
+            WebhookSubscription.is_active.is_(True),
+        )
+        .order_by(WebhookDelivery.next_attempt_at, WebhookDelivery.id)
+        .limit(limit)
+    )
+    if session.get_bind().dialect.name == "postgresql":
+        statement = statement.with_for_update(of=WebhookDelivery, skip_locked=True)
+    grouped: dict[uuid.UUID, tuple[_Target, list[_Event]]] = {}
+    for delivery, subscription in session.execute(statement):
+        target = _Target(
+            url=subscription.url,
+            secret=subscription.secret,
+            max_batch_size=subscription.max_batch_size,
+        )
+        grouped.setdefault(subscription.id, (target, []))[1].append(
+            _Event(
+                id=delivery.id,
+                event_type=delivery.event_type,
+                created_at=delivery.created_at,
+                payload=delivery.payload,
+                attempts=delivery.attempts,
+            )
+        )
+    if not grouped:
+        session.commit()
+        return DeliveryRunSummary()
+
+    settings = load_settings()
+    requests = sum(
+        -(-len(events) // target.max_batch_size) for target, events in grouped.values()
+    )
+    # Long enough for every request of this run to time out.
+    claimed_until = now + CLAIM_MARGIN + requests * timedelta(
+        seconds=settings.webhook_timeout_seconds
+    )
+    session.execute(
+        update(WebhookDelivery),
+        [
+            {"id": event.id, "next_attempt_at": claimed_until}
+            for _, events in grouped.values()
+            for event in events
+        ],
+    )
+    session.commit()
+
+    counts = {"delivered": 0, "retried": 0, "failed": 0, "deferred": 0, "requests": 0}
+    for target, events in grouped.values():
+        results = _deliver_subscription(
+            client, target, events, max_attempts=settings.webhook_max_attempts, counts=counts
+        )
+        session.execute(update(WebhookDelivery), results)
+        session.commit()
+
+    for outcome in ("delivered", "retried", "failed", "deferred"):
+        if counts[outcome]:
+            webhook_deliveries.inc(counts[outcome], outcome=outcome)
+    return DeliveryRunSummary(**counts)
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the given number of failed attempts."""
+    delay = BACKOFF_BASE * (2 ** max(attempts - 1, 0))
+    return min(delay, BACKOFF_MAX)
+
+
+def sign(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+# Runs for as long as its HTTP requests take.
+@job_service.register_handler(DELIVER_WEBHOOKS, group_commit=False)
+def _deliver_webhooks_job(session: Session, payload: dict[str, Any]) -> None:
+    summary = deliver_due(session)
+    handled = summary.delivered + summary.retried + summary.failed + summary.deferred
+    # A full run means more rows are due; continue without waiting.
+    delay = timedelta(0) if handled >= DELIVERY_BATCH else timedelta(
+        seconds=load_settings().webhook_poll_interval_seconds
+    )
+    job_service.enqueue(session, kind=DELIVER_WEBHOOKS, run_at=_utcnow() + delay)
+
+
+def _deliver_subscription(
+    client: httpx.Client,
+    target: _Target,
+    events: list[_Event],
+    *,
+    max_attempts: int,
+    counts: dict[str, int],
+) -> list[dict[str, Any]]:
+    """Send one subscription's claimed events; return the row updates to record."""
+    try:
+        check_destination(target.url)
+    except DestinationNotAllowedError as error:
+        # A refused destination is a configuration problem, not an outage.
+        counts["failed"] += len(events)
+        return [
+            _result(event, status=WebhookDeliveryStatus.FAILED, last_error=str(error))
+            for event in events
+        ]
+    breaker = breaker_for(target.url)
+    results: list[dict[str, Any]] = []
+    size = target.max_batch_size
+    for start in range(0, len(events), size):
+        batch = events[start : start + size]
+        if not breaker.allow():
+            # Not an attempt: wait out the cooldown without using retries.
+            retry_at = _utcnow() + timedelta(seconds=breaker.cooldown)
+            results.extend(_result(event, next_attempt_at=retry_at) for event in batch)
+            counts["deferred"] += len(batch)
+            continue
+        counts["requests"] += 1
+        error = _post(client, target, batch)
+        if error is None:
+            breaker.record_success()
+            delivered_at = _utcnow()
+            results.extend(
+                _result(
+                    event,
+                    status=WebhookDeliveryStatus.DELIVERED,
+                    attempts=event.attempts + 1,
+                    delivered_at=delivered_at,
+                    last_error=None,
+                )
+                for event in batch
+            )
+            counts["delivered"] += len(batch)
+            continue
+        breaker.record_failure()
+        for event in batch:
+            attempts = event.attempts + 1
+            if attempts >= max_attempts:
+                results.append(
+                    _result(
+                        event,
+                        status=WebhookDeliveryStatus.FAILED,
+                        attempts=attempts,
+                        last_error=error,
+                    )
+                )
+                counts["failed"] += 1
+            else:
+                results.append(
+                    _result(
+                        event,
+                        attempts=attempts,
+                        next_attempt_at=_utcnow() + backoff_delay(attempts),
+                        last_error=error,
+                    )
+                )
+                counts["retried"] += 1
+    return results
+
+
+def _result(event: _Event, **values: Any) -> dict[str, Any]:
+    return {"id": event.id, **values}
+
+
+def _post(
+    client: httpx.Client,
+    subscription: _Target,
+    deliveries: list[_Event],
+) -> str | None:
+    """Send one batch; return ``None`` on a 2xx response, else the error."""
+    events = [
+        {
+            "id": str(delivery.id),
+            "type": delivery.event_type,
+            "created_at": delivery.created_at.isoformat() if delivery.created_at else None,
+            "data": delivery.payload,
+        }
+        for delivery in deliveries
+    ]
+    body = json.dumps({"events": events}, separators=(",", ":")).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if subscription.secret:
+        headers[SIGNATURE_HEADER] = sign(subscription.secret, body)
+    try:
+        response = client.post(subscription.url, content=body, headers=headers)
+    except httpx.HTTPError as error:
+        return f"{type(error).__name__}: {error}"
+    if 200 <= response.status_code < 300:
+        return None
+    return f"HTTP {response.status_code}"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
@@ -0,0 +1,291 @@
+"""Workflow templates compiled into immutable stage graphs."""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.document import Document
+from backend.src.models.types import uuid7
+from backend.src.models.user import User
+from backend.src.models.workflow_template import WorkflowTemplate
+from backend.src.services import change_feed_service, notification_service
+
+
+class WorkflowError(RuntimeError):
+    """Base class for workflow template failures."""
+
+
+class TemplateNotFoundError(WorkflowError):
+    """Raised when a workflow template cannot be found."""
+
+
+class InvalidTemplateError(WorkflowError):
+    """Raised when a workflow definition is malformed."""
+
+
+class InvalidApproverError(InvalidTemplateError):
+    """Raised when an approver is not an active member of the organization."""
+
+
+class TemplateConflictError(WorkflowError):
+    """Raised when concurrent edits keep taking the next template version."""
+
+
+class WorkflowStateError(WorkflowError):
+    """Raised when a document cannot start the requested workflow."""
+
+
+class StageMode(str, Enum):
+    ALL = "all"
+    ANY = "any"
+    QUORUM = "quorum"
+
+
+class Transition(str, Enum):
+    STAY = "stay"
+    ADVANCE = "advance"
+    COMPLETE = "complete"
+    REJECT = "reject"
+
+
+@dataclass(frozen=True)
+class CompiledStage:
+    order: int
+    mode: StageMode
+    approvers: tuple[uuid.UUID, ...]
+    required: int
+
+    @property
+    def size(self) -> int:
+        return len(self.approvers)
+
+    @property
+    def tolerated_rejections(self) -> int:
+        return self.size - self.required
+
+
+@dataclass(frozen=True)
+class CompiledWorkflow:
+    template_id: uuid.UUID
+    name: str
+    version: int
+    stages: tuple[CompiledStage, ...]
+    organization_id: uuid.UUID | None = None
+
+    def stage(self, order: int) -> CompiledStage:
+        return self.stages[order - 1]
+
+    def transition(
+        self,
+        order: int,
+        *,
+        approvals: int,
+        rejections: int,
+        approve: bool,
+    ) -> Transition:
+        """Return the transition caused by one more decision at ``order``.
+
+        ``approvals`` and ``rejections`` are the stage counters *before* the
+        decision, so evaluation is constant time regardless of step count.
+        """
+        stage = self.stage(order)
+        if approve:
+            if approvals + 1 < stage.required:
+                return Transition.STAY
+            return Transition.COMPLETE if order == len(self.stages) else Transition.ADVANCE
+        if rejections + 1 > stage.tolerated_rejections:
+            return Transition.REJECT
+        return Transition.STAY
+
+
+_COMPILED: dict[uuid.UUID, CompiledWorkflow] = {}
+# Tries at the next version number before a create gives up with a conflict.
+MAX_VERSION_ATTEMPTS = 3
+
+
+def compile_definition(definition: dict[str, Any]) -> tuple[CompiledStage, ...]:
+    """Validate a template definition and turn it into stage descriptors."""
+    raw_stages = definition.get("stages") if isinstance(definition, dict) else None
+    if not isinstance(raw_stages, list) or not raw_stages:
+        raise InvalidTemplateError("A workflow needs at least one stage.")
+
+    stages: list[CompiledStage] = []
+    for index, raw in enumerate(raw_stages, start=1):
+        try:
+            mode = StageMode(raw.get("mode", StageMode.ALL.value))
+            approvers = tuple(uuid.UUID(str(value)) for value in raw["approvers"])
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            raise InvalidTemplateError(f"Stage {index} is malformed.") from exc
+        if not approvers:
+            raise InvalidTemplateError(f"Stage {index} has no approvers.")
+        if len(set(approvers)) != len(approvers):
+            raise InvalidTemplateError(f"Stage {index} lists an approver twice.")
+
+        if mode == StageMode.ALL:
+            required = len(approvers)
+        elif mode == StageMode.ANY:
+            required = 1
+        else:
+            required = raw.get("quorum")
+            if not isinstance(required, int) or not 1 <= required <= len(approvers):
+                raise InvalidTemplateError(
+                    f"Stage {index} quorum must be between 1 and {len(approvers)}."
+                )
+        stages.append(
+            CompiledStage(order=index, mode=mode, approvers=approvers, required=required)
+        )
+    return tuple(stages)
+
+
+def create_template(
+    session: Session,
+    *,
+    users: Session,
+    name: str,
+    definition: dict[str, Any],
+    organization_id: uuid.UUID | None = None,
+) -> WorkflowTemplate:
+    """Store ``definition`` as the organization's next version of ``name``.
+
+    Every approver must be an active member of the organization; ``users``
+    is the session on the shared database that holds them.
+    """
+    _ensure_approvers(users, compile_definition(definition), organization_id)
+    for _ in range(MAX_VERSION_ATTEMPTS):
+        latest = session.scalar(
+            select(func.max(WorkflowTemplate.version)).where(
+                WorkflowTemplate.organization_id.is_not_distinct_from(organization_id),
+                WorkflowTemplate.name == name,
+            )
+        )
+        template = WorkflowTemplate(
+            name=name,
+            version=(latest or 0) + 1,
+            definition=definition,
+            organization_id=organization_id,
+        )
+        try:
+            with session.begin_nested():
+                session.add(template)
+        except IntegrityError:
+            # A concurrent create took this version; read the new latest.
+            continue
+        session.commit()
+        session.refresh(template)
+        return template
+    session.rollback()
+    raise TemplateConflictError(
+        f"Workflow template {name!r} is being changed concurrently; retry the request."
+    )
+
+
+def get_compiled(
+    session: Session,
+    template_id: uuid.UUID,
+    *,
+    organization_id: uuid.UUID | None,
+) -> CompiledWorkflow:
+    """Return the compiled graph for one of the organization's templates.
+
+    Template rows are never updated (edits create a new version with a new
+    id), so the id alone is a safe cache key. Another organization's
+    template is reported as not found.
+    """
+    compiled = _COMPILED.get(template_id)
+    if compiled is None:
+        template = session.get(WorkflowTemplate, template_id)
+        if template is not None:
+            compiled = CompiledWorkflow(
+                template_id=template.id,
+                name=template.name,
+                version=template.version,
+                stages=compile_definition(template.definition),
+                organization_id=template.organization_id,
+            )
+            _COMPILED[template_id] = compiled
+    if compiled is None or compiled.organization_id != organization_id:
+        raise TemplateNotFoundError(f"Workflow template {template_id} was not found.")
+    return compiled
+
+
+def start_workflow(
+    session: Session,
+    *,
+    users: Session,
+    document: Document,
+    template_id: uuid.UUID,
+) -> list[ApprovalStep]:
+    """Attach a workflow to ``document`` with one bulk insert of its steps.
+
+    The template must belong to the document's organization and its
+    approvers must still be members of it. The caller owns the
+    transaction; the new steps and the document are recorded for the
+    change feed when it commits.
+    """
+    if document.workflow_template_id is not None:
+        raise WorkflowStateError(f"Document {document.id} already has a workflow.")
+    session.flush()
+    existing = session.scalar(
+        select(ApprovalStep.id).where(ApprovalStep.document_id == document.id).limit(1)
+    )
+    if existing is not None:
+        raise WorkflowStateError(f"Document {document.id} already has approval steps.")
+
+    compiled = get_compiled(session, template_id, organization_id=document.organization_id)
+    _ensure_approvers(users, compiled.stages, document.organization_id)
+    rows = [
+        {
+            "id": uuid7(),
+            "document_id": document.id,
+            "approver_id": approver_id,
+            "step_order": stage.order,
+            "status": ApprovalStepStatus.PENDING,
+            "organization_id": document.organization_id,
+        }
+        for stage in compiled.stages
+        for approver_id in stage.approvers
+    ]
+    session.execute(insert(ApprovalStep), rows)
+
+    document.workflow_template_id = compiled.template_id
+    document.current_stage = 1
+    document.stage_approvals = 0
+    document.stage_rejections = 0
+
+    steps = [ApprovalStep(**row) for row in rows]
+    for step in steps:
+        if step.step_order == 1:
+            notification_service.schedule_step_followups(session, step)
+    change_feed_service.record_steps(session, [step.id for step in steps], created=True)
+    change_feed_service.record_document(session, document.id)
+    return steps
+
+
+def _ensure_approvers(
+    users: Session,
+    stages: tuple[CompiledStage, ...],
+    organization_id: uuid.UUID | None,
+) -> None:
+    approvers = {approver for stage in stages for approver in stage.approvers}
+    members = set(
+        users.scalars(
+            select(User.id).where(
+                User.id.in_(approvers),
+                User.is_active.is_(True),
+                User.organization_id.is_not_distinct_from(organization_id),
+            )
+        )
+    )
+    missing = sorted(approvers - members, key=str)
+    if missing:
+        raise InvalidApproverError(
+            f"Approver {missing[0]} is not an active member of the organization."
+        )
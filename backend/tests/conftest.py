@@ -1,8 +1,10 @@
 import os
+import tempfile
 
 # Ensure tests use an in-memory database before importing app modules.
 os.environ.setdefault("DOCENGINE_ENVIRONMENT", "test")
 os.environ.setdefault("DOCENGINE_DATABASE_URL", "sqlite+pysqlite:///:memory:")
+os.environ.setdefault("DOCENGINE_STORAGE_ROOT", tempfile.mkdtemp(prefix="docengine-blobs-"))
 
 import backend.src.models  # noqa: E402,F401
 import backend.src.main as main_app  # noqa: E402
@@ -13,7 +15,13 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from backend.src.models.base import Base  # noqa: E402
-from backend.src.db.session import get_session  # noqa: E402
+from backend.src.db.session import (  # noqa: E402
+    SessionLocal,
+    get_read_session,
+    get_session,
+    get_shared_read_session,
+    get_shared_session,
+)
 from backend.src.main import app  # noqa: E402
 
 
@@ -28,6 +36,8 @@ def engine():
     Base.metadata.create_all(bind=test_engine)
     # Ensure startup events use the test engine, not the default one.
     main_app.engine = test_engine
+    # Background workers open their own sessions outside request scope.
+    SessionLocal.configure(bind=test_engine)
     yield test_engine
     test_engine.dispose()
 
@@ -56,6 +66,9 @@ def client(session_factory):
             session.close()
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
+    app.dependency_overrides[get_shared_session] = override_get_session
+    app.dependency_overrides[get_shared_read_session] = override_get_session
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
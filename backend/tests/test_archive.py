@@ -0,0 +1,199 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from sqlalchemy import select, text
+
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.core.settings import load_settings
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.document_archive import ArchivedApprovalStep, ArchivedDocument
+from backend.src.models.user import User
+from backend.src.services import archive_service, search_service, stats_service
+
+
+def _create_user(session, *, email: str, password: str, is_active: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_old_document(
+    session,
+    *,
+    title: str,
+    status: DocumentStatus,
+    finalized_at: datetime = datetime(2020, 1, 2, tzinfo=timezone.utc),
+) -> Document:
+    document = Document(
+        title=title,
+        status=status,
+        created_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        finalized_at=None if status == DocumentStatus.PENDING else finalized_at,
+    )
+    session.add(document)
+    session.flush()
+    search_service.index_document(session, document)
+    step_status = {
+        DocumentStatus.APPROVED: ApprovalStepStatus.APPROVED,
+        DocumentStatus.REJECTED: ApprovalStepStatus.REJECTED,
+        DocumentStatus.PENDING: ApprovalStepStatus.PENDING,
+    }[status]
+    session.add(
+        ApprovalStep(
+            document_id=document.id,
+            approver_id=uuid.uuid4(),
+            step_order=1,
+            status=step_status,
+        )
+    )
+    session.commit()
+    return document
+
+
+def test_finalized_documents_move_to_archive_in_batches(db_session, monkeypatch):
+    monkeypatch.setattr(load_settings(), "archive_batch_size", 1)
+    approved = _create_old_document(db_session, title="Archive Approved", status=DocumentStatus.APPROVED)
+    rejected = _create_old_document(db_session, title="Archive Rejected", status=DocumentStatus.REJECTED)
+    pending = _create_old_document(db_session, title="Archive Pending", status=DocumentStatus.PENDING)
+    archived_ids = {approved.id, rejected.id}
+
+    moved, remaining = archive_service.archive_finalized(db_session, max_batches=1)
+    assert (moved, remaining) == (1, True)
+    moved, remaining = archive_service.archive_finalized(db_session)
+    assert moved == 1 and not remaining
+
+    db_session.expire_all()
+    hot_ids = set(db_session.scalars(select(Document.id).where(Document.id.in_(archived_ids | {pending.id}))))
+    assert hot_ids == {pending.id}
+    assert set(db_session.scalars(select(ArchivedDocument.id))) >= archived_ids
+    archived_steps = db_session.scalars(
+        select(ArchivedApprovalStep.document_id).where(ArchivedApprovalStep.document_id.in_(archived_ids))
+    )
+    assert set(archived_steps) == archived_ids
+    assert not db_session.scalars(
+        select(ApprovalStep.id).where(ApprovalStep.document_id.in_(archived_ids))
+    ).all()
+
+    counts = stats_service.rebuild_counters(db_session)[None]
+    assert counts[DocumentStatus.APPROVED] >= 1
+    assert counts[DocumentStatus.REJECTED] >= 1
+
+
+def test_documents_are_archived_by_when_they_were_finalized(db_session):
+    recent_id = _create_old_document(
+        db_session,
+        title="Decided Recently",
+        status=DocumentStatus.APPROVED,
+        finalized_at=datetime.now(timezone.utc) - timedelta(days=1),
+    ).id
+    settled_id = _create_old_document(
+        db_session, title="Decided Long Ago", status=DocumentStatus.APPROVED
+    ).id
+
+    archive_service.archive_finalized(db_session)
+
+    db_session.expire_all()
+    assert db_session.get(Document, recent_id) is not None
+    assert db_session.get(ArchivedDocument, settled_id) is not None
+
+
+def test_archived_documents_leave_the_search_index(client, db_session):
+    user = _create_user(db_session, email="archive-search@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    document_id = _create_old_document(
+        db_session, title="Zanzibar Charter", status=DocumentStatus.REJECTED
+    ).id
+    search_service.enable_memory_index(db_session)
+    try:
+        archive_service.archive_finalized(db_session)
+        assert search_service._memory_index.search(["zanzibar"]) == []
+    finally:
+        search_service.disable_memory_index()
+
+    indexed = db_session.execute(
+        text("SELECT count(*) FROM documents_fts WHERE title = 'Zanzibar Charter'")
+    ).scalar()
+    assert indexed == 0
+
+    client.post(f"/documents/{document_id}/revisions", content=b"again", headers=headers)
+    found = client.get("/documents/search", params={"q": "zanzibar"}, headers=headers).json()
+    assert [item["id"] for item in found["items"]] == [str(document_id)]
+
+
+def test_memory_index_changes_wait_for_commit(client, db_session):
+    user = _create_user(db_session, email="archive-phantom@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    approved_id = _create_old_document(
+        db_session, title="Quetzal Treaty", status=DocumentStatus.APPROVED
+    ).id
+    rejected_id = _create_old_document(
+        db_session, title="Quetzal Appeal", status=DocumentStatus.REJECTED
+    ).id
+    archive_service.archive_finalized(db_session)
+    index = search_service.enable_memory_index(db_session)
+    try:
+        # Restoring the approved document is rolled back when the revision is refused.
+        refused = client.post(f"/documents/{approved_id}/revisions", content=b"v2", headers=headers)
+        accepted = client.post(f"/documents/{rejected_id}/revisions", content=b"v2", headers=headers)
+
+        assert refused.status_code == status.HTTP_409_CONFLICT
+        assert accepted.status_code == status.HTTP_201_CREATED
+        assert [document_id for _, document_id in index.search(["quetzal"])] == [rejected_id]
+    finally:
+        search_service.disable_memory_index()
+
+
+def test_archived_documents_stay_readable(client, db_session):
+    user = _create_user(db_session, email="archive-reader@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    document_id = _create_old_document(
+        db_session, title="Archived Contract", status=DocumentStatus.APPROVED
+    ).id
+    archive_service.archive_finalized(db_session)
+
+    fetched = client.get(f"/documents/{document_id}", headers=headers)
+    assert fetched.status_code == status.HTTP_200_OK
+    assert fetched.json()["title"] == "Archived Contract"
+
+    hot_listing = client.get("/documents", headers=headers).json()
+    assert str(document_id) not in {item["id"] for item in hot_listing}
+    full_listing = client.get("/documents", params={"include_archived": True}, headers=headers).json()
+    assert str(document_id) in {item["id"] for item in full_listing}
+    created_at = [item["created_at"] for item in full_listing]
+    assert created_at == sorted(created_at, reverse=True)
+
+
+def test_resubmitting_archived_rejection_restores_document(client, db_session):
+    user = _create_user(db_session, email="archive-resubmit@example.com", password="P@ssw0rd!")
+    document_id = _create_old_document(
+        db_session, title="Archived Rejection", status=DocumentStatus.REJECTED
+    ).id
+    archive_service.archive_finalized(db_session)
+    assert db_session.get(ArchivedDocument, document_id) is not None
+
+    response = client.post(
+        f"/documents/{document_id}/revisions",
+        content=b"second attempt",
+        headers=_auth_headers_for(user),
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    db_session.expire_all()
+    assert db_session.get(ArchivedDocument, document_id) is None
+    restored = db_session.get(Document, document_id)
+    assert restored.status == DocumentStatus.PENDING
+    steps = db_session.scalars(select(ApprovalStep).where(ApprovalStep.document_id == document_id)).all()
+    assert [step.status for step in steps] == [ApprovalStepStatus.PENDING]
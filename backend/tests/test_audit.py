@@ -0,0 +1,151 @@
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import status
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.models.audit_log import AuditLog
+from backend.src.models.base import Base
+from backend.src.models.user import User
+from backend.src.services import audit_service
+
+
+def _create_user(session, *, email: str, password: str, is_active: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_document_audit_is_paginated_in_time_order(client, db_session):
+    user = _create_user(db_session, email="audit@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    created = client.post("/documents", json={"title": "Audit Policy"}, headers=headers)
+    assert created.status_code == status.HTTP_201_CREATED
+    document_id = uuid.UUID(created.json()["id"])
+    for index in range(4):
+        audit_service.record(
+            db_session,
+            document_id=document_id,
+            action=f"reviewed_{index}",
+            performed_by=user.id,
+        )
+    db_session.commit()
+
+    actions: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/documents/{document_id}/audit", params=params, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert len(page["items"]) <= 2
+        actions.extend(item["action"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert actions == ["document_created", "reviewed_0", "reviewed_1", "reviewed_2", "reviewed_3"]
+
+
+def test_audit_range_query_validates_input(client, db_session):
+    user = _create_user(db_session, email="audit-range@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+
+    inverted = client.get(
+        "/audit",
+        params={"start": "2026-02-01T00:00:00Z", "end": "2026-01-01T00:00:00Z"},
+        headers=headers,
+    )
+    assert inverted.status_code == status.HTTP_400_BAD_REQUEST
+
+    bad_cursor = client.get(
+        "/audit",
+        params={
+            "start": "2026-01-01T00:00:00Z",
+            "end": "2026-02-01T00:00:00Z",
+            "cursor": "not-a-cursor",
+        },
+        headers=headers,
+    )
+    assert bad_cursor.status_code == status.HTTP_400_BAD_REQUEST
+
+    missing = client.get(f"/documents/{uuid.uuid4()}/audit", headers=headers)
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_sqlite_rotation_and_retention():
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    document_id, actor = uuid.uuid4(), uuid.uuid4()
+    timestamps = [
+        datetime(2023, 6, 10, tzinfo=timezone.utc),
+        datetime(2026, 8, 15, tzinfo=timezone.utc),
+        datetime(2026, 9, 20, tzinfo=timezone.utc),
+        datetime(2026, 10, 2, tzinfo=timezone.utc),
+    ]
+    with Session(engine) as session:
+        session.add_all(
+            AuditLog(document_id=document_id, action=f"a{index}", performed_by=actor, timestamp=value)
+            for index, value in enumerate(timestamps)
+        )
+        session.commit()
+
+        result = audit_service.maintain_storage(
+            session, now=datetime(2026, 10, 19, tzinfo=timezone.utc)
+        )
+        assert result.created == ["audit_logs_202609"]
+        assert result.removed == []
+
+        # Everything before October moved to the archive table.
+        active = session.query(AuditLog).all()
+        assert [entry.action for entry in active] == ["a3"]
+        page = audit_service.list_document_audit(session, document_id=document_id, limit=10)
+        assert [entry.action for entry in page.entries] == ["a0", "a1", "a2", "a3"]
+
+        # A range query only touches tables that can hold matching rows.
+        recent = audit_service.query_audit(
+            session,
+            organization_id=None,
+            start=datetime(2026, 9, 1, tzinfo=timezone.utc),
+            end=datetime(2026, 11, 1, tzinfo=timezone.utc),
+            limit=1,
+        )
+        assert [entry.action for entry in recent.entries] == ["a2"]
+        following = audit_service.query_audit(
+            session,
+            organization_id=None,
+            start=datetime(2026, 9, 1, tzinfo=timezone.utc),
+            end=datetime(2026, 11, 1, tzinfo=timezone.utc),
+            limit=1,
+            cursor=recent.next_cursor,
+        )
+        assert [entry.action for entry in following.entries] == ["a3"]
+        assert following.next_cursor is None
+
+        # Two years on, the archive falls outside the retention window.
+        later = audit_service.maintain_storage(
+            session, now=datetime(2028, 11, 3, tzinfo=timezone.utc)
+        )
+        assert "audit_logs_202609" in later.removed
+        assert "audit_logs_202609" not in inspect(engine).get_table_names()
+    engine.dispose()
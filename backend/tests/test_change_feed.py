@@ -0,0 +1,268 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from sqlalchemy import delete, select
+
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.change_feed import ChangeRecord, ChangeSequence
+from backend.src.models.document import DocumentStatus
+from backend.src.models.organization import Organization
+from backend.src.models.user import User
+from backend.src.services import archive_service, change_feed_service, document_service
+
+
+def _create_user(session, *, email: str, organization_id, is_admin: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash("P@ssw0rd!"),
+        is_active=True,
+        is_admin=is_admin,
+        organization_id=organization_id,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _organization(session) -> uuid.UUID:
+    organization = Organization(name=f"Changes {uuid.uuid4().hex[:8]}")
+    session.add(organization)
+    session.commit()
+    return organization.id
+
+
+def _approvers(session, organization_id) -> list[str]:
+    return [
+        str(
+            _create_user(
+                session,
+                email=f"approver-{uuid.uuid4().hex[:8]}@example.com",
+                organization_id=organization_id,
+                is_admin=False,
+            ).id
+        )
+        for _ in range(3)
+    ]
+
+
+def _two_stage_document(client, headers, approvers) -> str:
+    first, second, third = approvers
+    template = client.post(
+        "/workflows",
+        json={
+            "name": "review-then-signoff",
+            "stages": [
+                {"mode": "any", "approvers": [first, second]},
+                {"mode": "all", "approvers": [third]},
+            ],
+        },
+        headers=headers,
+    ).json()
+    document = client.post(
+        "/documents",
+        json={"title": "Budget", "workflow_template_id": template["id"]},
+        headers=headers,
+    ).json()
+    return document["id"]
+
+
+def _steps_by_approver(session, document_id: str) -> dict[str, ApprovalStep]:
+    steps = session.scalars(
+        select(ApprovalStep).where(ApprovalStep.document_id == uuid.UUID(document_id))
+    )
+    return {str(step.approver_id): step for step in steps}
+
+
+def _approve(client, headers, document_id, step: ApprovalStep):
+    return client.post(
+        f"/documents/{document_id}/steps/{step.id}/approve",
+        json={"approver_id": str(step.approver_id)},
+        headers=headers,
+    )
+
+
+def test_feed_returns_creations_and_decisions_in_order(client, db_session):
+    organization_id = _organization(db_session)
+    user = _create_user(db_session, email="feed@example.com", organization_id=organization_id)
+    headers = _auth_headers_for(user)
+    approvers = _approvers(db_session, organization_id)
+    document_id = _two_stage_document(client, headers, approvers)
+    steps = _steps_by_approver(db_session, document_id)
+
+    created = client.get("/changes", headers=headers).json()
+    assert created["has_more"] is False
+    assert {(change["entity"], change["op"]) for change in created["changes"]} == {
+        ("document", "created"),
+        ("step", "created"),
+    }
+    assert len(created["changes"]) == 4
+    document_change = next(c for c in created["changes"] if c["entity"] == "document")
+    assert document_change["id"] == document_id
+    assert document_change["data"]["status"] == DocumentStatus.PENDING.value
+    assert document_change["data"]["current_stage"] == 1
+
+    assert _approve(client, headers, document_id, steps[approvers[1]]).status_code == (
+        status.HTTP_200_OK
+    )
+    since = created["next_since"]
+    delta = client.get("/changes", params={"since": since}, headers=headers).json()
+    updated = {change["id"]: change for change in delta["changes"]}
+    assert [change["seq"] for change in delta["changes"]] == sorted(
+        change["seq"] for change in delta["changes"]
+    )
+    assert min(updated[key]["seq"] for key in updated) > since
+    skipped, decided = (str(steps[approver].id) for approver in approvers[:2])
+    assert set(updated) == {document_id, skipped, decided}
+    assert updated[decided]["data"]["status"] == ApprovalStepStatus.APPROVED.value
+    assert updated[decided]["data"]["decided_at"] is not None
+    assert updated[skipped]["data"]["status"] == ApprovalStepStatus.SKIPPED.value
+    assert updated[document_id]["data"]["current_stage"] == 2
+    assert all(change["op"] == "updated" for change in delta["changes"])
+
+    caught_up = client.get("/changes", params={"since": delta["next_since"]}, headers=headers)
+    assert caught_up.json() == {"changes": [], "next_since": delta["next_since"], "has_more": False}
+
+
+def test_feed_pages_and_is_scoped_to_the_organization(client, db_session):
+    organization_id = _organization(db_session)
+    user = _create_user(db_session, email="pages@example.com", organization_id=organization_id)
+    outsider = _create_user(
+        db_session, email="outsider@example.com", organization_id=_organization(db_session)
+    )
+    headers = _auth_headers_for(user)
+    _two_stage_document(client, headers, _approvers(db_session, organization_id))
+
+    first = client.get("/changes", params={"limit": 3}, headers=headers).json()
+    assert len(first["changes"]) == 3
+    assert first["has_more"] is True
+    rest = client.get(
+        "/changes", params={"since": first["next_since"], "limit": 3}, headers=headers
+    ).json()
+    assert len(rest["changes"]) == 1
+    assert rest["has_more"] is False
+
+    assert client.get("/changes", headers=_auth_headers_for(outsider)).json()["changes"] == []
+    invalid = client.get("/changes", params={"since": -1}, headers=headers)
+    assert invalid.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_rolled_back_changes_are_not_recorded(db_session):
+    organization_id = _organization(db_session)
+    document = document_service.create_document(
+        db_session, title="Draft", organization_id=organization_id
+    )
+    before = change_feed_service.list_changes(db_session, organization_id=organization_id)
+
+    change_feed_service.record_document(db_session, document.id)
+    db_session.rollback()
+    db_session.commit()
+
+    after = change_feed_service.list_changes(db_session, organization_id=organization_id)
+    assert after == before
+    assert [change.op for change in after.changes] == ["created"]
+
+
+def test_compaction_keeps_the_latest_change_per_entity(client, db_session):
+    organization_id = _organization(db_session)
+    user = _create_user(db_session, email="compact@example.com", organization_id=organization_id)
+    headers = _auth_headers_for(user)
+    approvers = _approvers(db_session, organization_id)
+    document_id = _two_stage_document(client, headers, approvers)
+    steps = _steps_by_approver(db_session, document_id)
+    _approve(client, headers, document_id, steps[approvers[0]])
+    _approve(client, headers, document_id, steps[approvers[2]])
+    before = client.get("/changes", headers=headers).json()["changes"]
+
+    # Nothing is old enough yet.
+    change_feed_service.compact(db_session)
+    assert client.get("/changes", headers=headers).json()["changes"] == before
+
+    change_feed_service.compact(db_session, now=datetime.now(timezone.utc) + timedelta(days=30))
+    after = client.get("/changes", headers=headers).json()["changes"]
+
+    latest = {}
+    for change in before:
+        latest[change["id"]] = change
+    assert after == sorted(latest.values(), key=lambda change: change["seq"])
+    assert latest[document_id]["data"]["status"] == DocumentStatus.APPROVED.value
+    remaining = db_session.scalars(
+        select(ChangeRecord.entity_id).where(ChangeRecord.organization_id == organization_id)
+    ).all()
+    assert len(remaining) == len(set(remaining)) == 4
+
+
+def test_starting_a_workflow_later_is_recorded(client, db_session):
+    organization_id = _organization(db_session)
+    user = _create_user(db_session, email="later@example.com", organization_id=organization_id)
+    headers = _auth_headers_for(user)
+    template = client.post(
+        "/workflows",
+        json={"name": "single", "stages": [{"mode": "all", "approvers": [str(user.id)]}]},
+        headers=headers,
+    ).json()
+    document_id = client.post("/documents", json={"title": "Later"}, headers=headers).json()["id"]
+    since = client.get("/changes", headers=headers).json()["next_since"]
+
+    started = client.post(
+        f"/documents/{document_id}/workflow",
+        json={"template_id": template["id"]},
+        headers=headers,
+    )
+
+    assert started.status_code == status.HTTP_201_CREATED
+    changes = client.get("/changes", params={"since": since}, headers=headers).json()["changes"]
+    assert {(change["entity"], change["id"], change["op"]) for change in changes} == {
+        ("document", document_id, "updated"),
+        ("step", started.json()[0]["id"], "created"),
+    }
+    document_change = next(change for change in changes if change["entity"] == "document")
+    assert document_change["data"]["workflow_template_id"] == template["id"]
+
+
+def test_archiving_is_recorded(client, db_session):
+    organization_id = _organization(db_session)
+    user = _create_user(db_session, email="archived@example.com", organization_id=organization_id)
+    headers = _auth_headers_for(user)
+    approvers = _approvers(db_session, organization_id)
+    document_id = _two_stage_document(client, headers, approvers)
+    steps = _steps_by_approver(db_session, document_id)
+    step_ids = {str(step.id) for step in steps.values()}
+    _approve(client, headers, document_id, steps[approvers[0]])
+    _approve(client, headers, document_id, steps[approvers[2]])
+    since = client.get("/changes", headers=headers).json()["next_since"]
+
+    later = datetime.now(timezone.utc) + timedelta(days=3650)
+    archive_service.archive_finalized(db_session, now=later)
+
+    changes = client.get("/changes", params={"since": since}, headers=headers).json()["changes"]
+    assert {change["id"] for change in changes} == {document_id, *step_ids}
+    assert all(change["op"] == "archived" for change in changes)
+    document_change = next(change for change in changes if change["entity"] == "document")
+    assert document_change["data"]["status"] == DocumentStatus.APPROVED.value
+
+
+def test_sequence_is_seeded_once_and_reseeded_if_missing(db_session):
+    organization_id = _organization(db_session)
+    db_session.execute(delete(ChangeRecord))
+    db_session.execute(delete(ChangeSequence))
+    db_session.commit()
+
+    change_feed_service.ensure_sequence(db_session)
+    change_feed_service.ensure_sequence(db_session)
+    assert db_session.scalars(select(ChangeSequence.value)).all() == [0]
+
+    document_service.create_document(db_session, title="Seeded", organization_id=organization_id)
+    db_session.execute(delete(ChangeSequence))
+    db_session.commit()
+    document_service.create_document(db_session, title="Reseeded", organization_id=organization_id)
+
+    changes = change_feed_service.list_changes(db_session, organization_id=organization_id).changes
+    assert [change.seq for change in changes] == [1, 2]
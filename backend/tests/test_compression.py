@@ -0,0 +1,82 @@
+import gzip
+import json
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.src.core.compression import CompressionMiddleware
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100, encodings=["gzip"])
+
+    @app.get("/small")
+    def small() -> dict[str, str]:
+        return {"status": "OK"}
+
+    @app.get("/large")
+    def large() -> list[dict[str, str]]:
+        return [{"title": f"Document {index}"} for index in range(50)]
+
+    @app.get("/binary")
+    def binary() -> PlainTextResponse:
+        return PlainTextResponse("x" * 1000, media_type="application/octet-stream")
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        def chunks():
+            for index in range(20):
+                yield json.dumps({"index": index, "padding": "y" * 40}).encode() + b"\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    return app
+
+
+def test_large_json_response_is_gzipped():
+    client = TestClient(_build_app())
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()) == 50
+
+
+def test_response_below_threshold_is_not_compressed():
+    client = TestClient(_build_app())
+
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"status": "OK"}
+
+
+def test_content_type_outside_allowlist_is_not_compressed():
+    client = TestClient(_build_app())
+
+    response = client.get("/binary", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_streaming_response_is_compressed_without_content_length():
+    client = TestClient(_build_app())
+
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    lines = gzip.decompress(raw).splitlines()
+    assert len(lines) == 20
+
+
+def test_identity_requested_skips_compression():
+    client = TestClient(_build_app())
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip;q=0, identity"})
+
+    assert "content-encoding" not in response.headers
@@ -0,0 +1,187 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI, status
+
+from backend.src.core.concurrency import (
+    CRITICAL,
+    NORMAL,
+    SHEDDABLE,
+    AIMDLimiter,
+    ConcurrencyLimitMiddleware,
+    concurrency_limit,
+    requests_shed,
+    route_priority,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(clock: _Clock, **options) -> AIMDLimiter:
+    return AIMDLimiter(
+        initial_limit=options.pop("initial_limit", 10),
+        min_limit=options.pop("min_limit", 2),
+        max_limit=options.pop("max_limit", 20),
+        latency_target=0.25,
+        clock=clock,
+        **options,
+    )
+
+
+def test_limit_grows_while_busy_and_fast():
+    limiter = _limiter(_Clock())
+    for _ in range(8):
+        assert limiter.try_acquire(CRITICAL)
+
+    for _ in range(8):
+        limiter.release(0.01)
+
+    assert limiter.in_flight == 0
+    # Only the releases at 8, 7 and 6 in flight used half the limit.
+    assert 10.25 < limiter.limit < 10.35
+    limiter.try_acquire(CRITICAL)
+    limiter.release(0.01)
+    assert 10.25 < limiter.limit < 10.35
+
+
+def test_slow_requests_cut_the_limit_once_per_window():
+    clock = _Clock()
+    limiter = _limiter(clock)
+    for _ in range(3):
+        limiter.try_acquire(CRITICAL)
+
+    limiter.release(1.0)
+    limiter.release(1.0)
+    assert limiter.limit == 9.0
+
+    clock.now = 0.3
+    limiter.release(0.01, overloaded=True)
+    assert limiter.limit == 8.1
+    assert concurrency_limit.value() == 8.1
+
+    for _ in range(40):
+        clock.now += 1
+        limiter.try_acquire(CRITICAL)
+        limiter.release(2.0)
+    assert limiter.limit == 2.0
+
+
+def test_sheddable_traffic_gets_a_smaller_share():
+    limiter = _limiter(_Clock())
+
+    admitted = {
+        priority: sum(limiter.try_acquire(priority) for _ in range(10))
+        for priority in (SHEDDABLE, NORMAL, CRITICAL)
+    }
+
+    assert admitted == {SHEDDABLE: 5, NORMAL: 3, CRITICAL: 2}
+    assert limiter.in_flight == 10
+
+
+def test_route_priorities():
+    assert route_priority("POST", "/auth/login") == CRITICAL
+    assert route_priority("POST", "/documents/{document_id}/steps/{step_id}/approve") == CRITICAL
+    assert route_priority("GET", "/documents") == SHEDDABLE
+    assert route_priority("GET", "/audit") == SHEDDABLE
+    assert route_priority("POST", "/documents") == NORMAL
+
+
+def test_overload_sheds_listings_but_admits_logins():
+    app = FastAPI()
+    release = asyncio.Event()
+    app.add_middleware(
+        ConcurrencyLimitMiddleware,
+        limiter=AIMDLimiter(initial_limit=2, min_limit=2, max_limit=2, latency_target=10),
+    )
+
+    @app.get("/documents")
+    async def list_documents() -> list[str]:
+        await release.wait()
+        return []
+
+    @app.post("/auth/login")
+    async def login() -> dict[str, str]:
+        return {"access_token": "token"}
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "OK"}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            held = asyncio.create_task(client.get("/documents"))
+            await asyncio.sleep(0.05)
+            shed = await client.get("/documents")
+            login = await client.post("/auth/login")
+            health = await client.get("/health")
+            release.set()
+            return await held, shed, login, health
+
+    before = requests_shed.value(priority=SHEDDABLE)
+    held, shed, login, health = asyncio.run(scenario())
+
+    assert held.status_code == status.HTTP_200_OK
+    assert shed.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert shed.headers["retry-after"] == "1"
+    assert login.status_code == status.HTTP_200_OK
+    assert health.status_code == status.HTTP_200_OK
+    assert requests_shed.value(priority=SHEDDABLE) == before + 1
+
+
+def test_metrics_expose_limiter_state(client):
+    client.get("/health")
+
+    body = client.get("/metrics").text
+
+    assert "# TYPE docengine_concurrency_limit gauge" in body
+    assert "# TYPE docengine_requests_shed_total counter" in body
+
+
+def _login_and_read(limiter: AIMDLimiter, **options) -> None:
+    """Send rounds of one slow login alongside fast reads through the limiter."""
+    app = FastAPI()
+    app.add_middleware(ConcurrencyLimitMiddleware, limiter=limiter, **options)
+
+    @app.get("/documents")
+    async def list_documents() -> list[str]:
+        return []
+
+    @app.post("/auth/login")
+    async def login() -> dict[str, str]:
+        # Stands in for the bcrypt check.
+        await asyncio.sleep(0.05)
+        return {"access_token": "token"}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(3):
+                responses = await asyncio.gather(
+                    client.post("/auth/login"), *(client.get("/documents") for _ in range(3))
+                )
+                assert all(response.status_code == status.HTTP_200_OK for response in responses)
+
+    asyncio.run(scenario())
+
+
+def test_slow_logins_do_not_shrink_the_limit_for_fast_reads():
+    limiter = AIMDLimiter(initial_limit=10, min_limit=2, max_limit=20, latency_target=0.02)
+
+    _login_and_read(limiter)
+
+    assert limiter.limit >= 10
+
+
+def test_route_latency_targets_apply_to_slow_routes():
+    limiter = AIMDLimiter(initial_limit=10, min_limit=2, max_limit=20, latency_target=0.02)
+
+    _login_and_read(limiter, route_latency_targets={("POST", "/auth/login"): 0.01})
+
+    assert limiter.limit < 10
@@ -0,0 +1,92 @@
+import hashlib
+
+from fastapi import status
+
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.models.user import User
+from backend.src.services.blob_storage import LocalFilesystemBlobStore
+
+
+def _create_user(session, *, email: str, password: str, is_active: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_document(client, headers, title: str) -> str:
+    return client.post("/documents", json={"title": title}, headers=headers).json()["id"]
+
+
+def test_upload_and_download_round_trip_with_range(client, db_session):
+    user = _create_user(db_session, email="content@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    document_id = _create_document(client, headers, "Signed contract")
+    payload = bytes(range(256)) * 1024
+
+    upload = client.put(
+        f"/documents/{document_id}/content",
+        content=iter([payload[:100_000], payload[100_000:]]),
+        headers={**headers, "Content-Type": "application/pdf"},
+    )
+    assert upload.status_code == status.HTTP_200_OK
+    assert upload.json()["sha256"] == hashlib.sha256(payload).hexdigest()
+    assert upload.json()["size"] == len(payload)
+
+    download = client.get(f"/documents/{document_id}/content", headers=headers)
+    assert download.status_code == status.HTTP_200_OK
+    assert download.headers["content-type"] == "application/pdf"
+    assert download.content == payload
+
+    partial = client.get(
+        f"/documents/{document_id}/content",
+        headers={**headers, "Range": "bytes=1000-1999"},
+    )
+    assert partial.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert partial.content == payload[1000:2000]
+
+
+def test_identical_uploads_are_stored_once(client, db_session):
+    user = _create_user(db_session, email="content@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    first = _create_document(client, headers, "Attachment A")
+    second = _create_document(client, headers, "Attachment B")
+
+    body = b"same attachment bytes"
+    response_a = client.put(f"/documents/{first}/content", content=body, headers=headers)
+    response_b = client.put(f"/documents/{second}/content", content=body, headers=headers)
+
+    assert response_a.json()["sha256"] == response_b.json()["sha256"]
+    assert response_b.json()["deduplicated"] is True
+
+
+def test_download_without_content_returns_404(client, db_session):
+    user = _create_user(db_session, email="content@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    document_id = _create_document(client, headers, "Empty")
+
+    response = client.get(f"/documents/{document_id}/content", headers=headers)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_local_store_iter_range_reads_slices_of_large_blobs(tmp_path):
+    store = LocalFilesystemBlobStore(tmp_path)
+    writer = store.open_writer()
+    data = b"0123456789" * 200_000
+    writer.write(data)
+    stored = writer.commit()
+
+    chunks = list(store.iter_range(stored.sha256, 5, 1_500_005, chunk_size=65536))
+
+    assert b"".join(chunks) == data[5:1_500_005]
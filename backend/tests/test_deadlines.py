@@ -0,0 +1,133 @@
+import os
+import sqlite3
+import tempfile
+import time
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from backend.src.core.deadline import (
+    DeadlineMiddleware,
+    deadline_exceeded,
+    parse_route_deadlines,
+    route_template,
+)
+from backend.src.main import app as main_app
+
+_COUNT_FOREVER = text(
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000000) "
+    "SELECT count(*) FROM n"
+)
+
+
+def _deadline_app(factory, **options) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware, **options)
+
+    @app.get("/slow")
+    def slow() -> dict[str, int]:
+        with factory() as session:
+            return {"count": session.scalar(_COUNT_FOREVER)}
+
+    @app.get("/late")
+    def late() -> dict[str, int]:
+        time.sleep(0.1)
+        with factory() as session:
+            return {"one": session.scalar(text("SELECT 1"))}
+
+    @app.post("/write")
+    def write() -> dict[str, str]:
+        with factory() as session:
+            session.execute(text("INSERT INTO notes (body) VALUES ('x')"))
+            session.commit()
+        return {"status": "ok"}
+
+    return app
+
+
+def test_parse_route_deadlines():
+    parsed = parse_route_deadlines(
+        "GET /documents=3, post /documents/{document_id}/steps/{step_id}/approve=5"
+    )
+
+    assert parsed == {
+        ("GET", "/documents"): 3.0,
+        ("POST", "/documents/{document_id}/steps/{step_id}/approve"): 5.0,
+    }
+    assert parse_route_deadlines("") == {}
+    with pytest.raises(ValueError):
+        parse_route_deadlines("/documents=3")
+
+
+def test_slow_statement_is_interrupted(session_factory):
+    app = _deadline_app(
+        session_factory,
+        default_seconds=0,
+        route_deadlines={("GET", "/slow"): 0.2},
+    )
+    before = deadline_exceeded.value(route="/slow", cause="statement_timeout")
+
+    started = time.monotonic()
+    response = TestClient(app).get("/slow")
+
+    assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+    assert time.monotonic() - started < 5
+    assert deadline_exceeded.value(route="/slow", cause="statement_timeout") == before + 1
+    with session_factory() as session:
+        # The connection is usable again once the request has ended.
+        assert session.scalar(text("SELECT 1")) == 1
+
+
+def test_exhausted_budget_fails_before_the_transaction(session_factory):
+    app = _deadline_app(session_factory, default_seconds=0.05)
+
+    response = TestClient(app).get("/late")
+
+    assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+    assert deadline_exceeded.value(route="/late", cause="budget_exhausted") >= 1
+
+
+def test_lock_wait_returns_503():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite+pysqlite:///{path}", connect_args={"check_same_thread": False})
+    holder = sqlite3.connect(path, isolation_level=None)
+    try:
+        holder.execute("CREATE TABLE notes (body TEXT)")
+        holder.execute("BEGIN IMMEDIATE")
+        app = _deadline_app(lambda: Session(engine), default_seconds=0.2)
+
+        started = time.monotonic()
+        response = TestClient(app).post("/write")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["retry-after"] == "1"
+        assert time.monotonic() - started < 3
+    finally:
+        holder.close()
+        engine.dispose()
+        os.unlink(path)
+
+
+def test_metrics_endpoint_lists_deadline_counter(client):
+    response = client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "# TYPE docengine_deadline_exceeded_total counter" in response.text
+
+
+def test_route_template_resolves_included_routers():
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/documents/4f1c/steps/9a2b/approve",
+        "root_path": "",
+        "headers": [],
+        "app": main_app,
+    }
+
+    assert route_template(scope) == "/documents/{document_id}/steps/{step_id}/approve"
+    assert route_template({**scope, "path": "/nowhere"}) == "unmatched"
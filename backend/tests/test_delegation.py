@@ -0,0 +1,289 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from backend.src.cli import create_user
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.audit_log import AuditLog
+from backend.src.models.base import Base
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.organization import Organization
+from backend.src.models.user import User
+
+
+def _create_user(session, *, email: str, organization_id, is_admin: bool = False) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash("P@ssw0rd!"),
+        is_active=True,
+        is_admin=is_admin,
+        organization_id=organization_id,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _organization(session) -> uuid.UUID:
+    organization = Organization(name=f"Delegation {uuid.uuid4().hex[:8]}")
+    session.add(organization)
+    session.commit()
+    return organization.id
+
+
+def _pending_step(session, *, approver_id, organization_id) -> ApprovalStep:
+    document = Document(
+        title="Vacation cover",
+        status=DocumentStatus.PENDING,
+        organization_id=organization_id,
+    )
+    session.add(document)
+    session.flush()
+    step = ApprovalStep(
+        document_id=document.id,
+        approver_id=approver_id,
+        step_order=1,
+        status=ApprovalStepStatus.PENDING,
+        organization_id=organization_id,
+    )
+    session.add(step)
+    session.commit()
+    return step
+
+
+def _window(start_hours: float, end_hours: float) -> dict[str, str]:
+    now = datetime.now(timezone.utc)
+    return {
+        "starts_at": (now + timedelta(hours=start_hours)).isoformat(),
+        "ends_at": (now + timedelta(hours=end_hours)).isoformat(),
+    }
+
+
+def test_delegate_decides_within_the_window(client, db_session):
+    organization_id = _organization(db_session)
+    owner = _create_user(db_session, email="owner@example.com", organization_id=organization_id)
+    cover = _create_user(db_session, email="cover@example.com", organization_id=organization_id)
+    step = _pending_step(db_session, approver_id=owner.id, organization_id=organization_id)
+    approve_url = f"/documents/{step.document_id}/steps/{step.id}/approve"
+
+    future = client.post(
+        "/delegations",
+        json={"delegate_id": str(cover.id), **_window(24, 48)},
+        headers=_auth_headers_for(owner),
+    )
+    assert future.status_code == status.HTTP_201_CREATED
+    early = client.post(
+        approve_url, json={"approver_id": str(cover.id)}, headers=_auth_headers_for(cover)
+    )
+    assert early.status_code == status.HTTP_403_FORBIDDEN
+
+    current = client.post(
+        "/delegations",
+        json={"delegate_id": str(cover.id), **_window(-1, 1)},
+        headers=_auth_headers_for(owner),
+    )
+    assert current.status_code == status.HTTP_201_CREATED
+    response = client.post(
+        approve_url, json={"approver_id": str(cover.id)}, headers=_auth_headers_for(cover)
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["step"]["approver_id"] == str(owner.id)
+    audit = db_session.scalars(
+        select(AuditLog).where(
+            AuditLog.document_id == step.document_id,
+            AuditLog.action == "step_approved",
+        )
+    ).one()
+    assert audit.performed_by == cover.id
+
+
+def test_revoked_delegation_stops_applying(client, db_session):
+    organization_id = _organization(db_session)
+    owner = _create_user(db_session, email="revoker@example.com", organization_id=organization_id)
+    cover = _create_user(db_session, email="revoked@example.com", organization_id=organization_id)
+    step = _pending_step(db_session, approver_id=owner.id, organization_id=organization_id)
+    created = client.post(
+        "/delegations",
+        json={"delegate_id": str(cover.id), **_window(-1, 1)},
+        headers=_auth_headers_for(owner),
+    )
+    listed = client.get("/delegations", headers=_auth_headers_for(owner))
+    assert [item["id"] for item in listed.json()] == [created.json()["id"]]
+
+    forbidden = client.delete(
+        f"/delegations/{created.json()['id']}", headers=_auth_headers_for(cover)
+    )
+    deleted = client.delete(
+        f"/delegations/{created.json()['id']}", headers=_auth_headers_for(owner)
+    )
+    response = client.post(
+        f"/documents/{step.document_id}/steps/{step.id}/approve",
+        json={"approver_id": str(cover.id)},
+        headers=_auth_headers_for(cover),
+    )
+
+    assert forbidden.status_code == status.HTTP_403_FORBIDDEN
+    assert deleted.status_code == status.HTTP_204_NO_CONTENT
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_delegation_validation_and_permissions(client, db_session):
+    organization_id = _organization(db_session)
+    owner = _create_user(db_session, email="rules@example.com", organization_id=organization_id)
+    other = _create_user(db_session, email="rules-other@example.com", organization_id=organization_id)
+    admin = _create_user(
+        db_session, email="rules-admin@example.com", organization_id=organization_id, is_admin=True
+    )
+    outsider = _create_user(db_session, email="outsider@example.com", organization_id=None)
+
+    backwards = client.post(
+        "/delegations",
+        json={"delegate_id": str(other.id), **_window(2, 1)},
+        headers=_auth_headers_for(owner),
+    )
+    foreign = client.post(
+        "/delegations",
+        json={"delegate_id": str(outsider.id), **_window(0, 1)},
+        headers=_auth_headers_for(owner),
+    )
+    for_someone_else = {"delegator_id": str(other.id), "delegate_id": str(owner.id), **_window(0, 1)}
+    not_admin = client.post("/delegations", json=for_someone_else, headers=_auth_headers_for(owner))
+    as_admin = client.post("/delegations", json=for_someone_else, headers=_auth_headers_for(admin))
+    for_outsider = client.post(
+        "/delegations",
+        json={"delegator_id": str(outsider.id), "delegate_id": str(owner.id), **_window(0, 1)},
+        headers=_auth_headers_for(admin),
+    )
+
+    assert backwards.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    assert foreign.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    assert for_outsider.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    assert not_admin.status_code == status.HTTP_403_FORBIDDEN
+    assert as_admin.status_code == status.HTTP_201_CREATED
+    assert as_admin.json()["delegator_id"] == str(other.id)
+
+
+def test_admin_reassigns_pending_steps_in_bulk(client, db_session):
+    organization_id = _organization(db_session)
+    leaver = _create_user(db_session, email="leaver@example.com", organization_id=organization_id)
+    successor = _create_user(db_session, email="successor@example.com", organization_id=organization_id)
+    admin = _create_user(
+        db_session, email="reassign-admin@example.com", organization_id=organization_id, is_admin=True
+    )
+    pending = [
+        _pending_step(db_session, approver_id=leaver.id, organization_id=organization_id)
+        for _ in range(3)
+    ]
+    decided = _pending_step(db_session, approver_id=leaver.id, organization_id=organization_id)
+    decided.status = ApprovalStepStatus.APPROVED
+    elsewhere = _pending_step(db_session, approver_id=leaver.id, organization_id=None)
+    db_session.commit()
+    payload = {"from_approver_id": str(leaver.id), "to_approver_id": str(successor.id)}
+
+    refused = client.post("/admin/approvals/reassign", json=payload, headers=_auth_headers_for(leaver))
+    response = client.post("/admin/approvals/reassign", json=payload, headers=_auth_headers_for(admin))
+
+    assert refused.status_code == status.HTTP_403_FORBIDDEN
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"reassigned": 3}
+    db_session.expire_all()
+    assert {db_session.get(ApprovalStep, step.id).approver_id for step in pending} == {successor.id}
+    assert db_session.get(ApprovalStep, decided.id).approver_id == leaver.id
+    assert db_session.get(ApprovalStep, elsewhere.id).approver_id == leaver.id
+    reassigned_audit = db_session.scalars(
+        select(AuditLog.document_id).where(AuditLog.action == "step_reassigned")
+    ).all()
+    assert set(reassigned_audit) >= {step.document_id for step in pending}
+
+    step = pending[0]
+    approved = client.post(
+        f"/documents/{step.document_id}/steps/{step.id}/approve",
+        json={"approver_id": str(successor.id)},
+        headers=_auth_headers_for(successor),
+    )
+    assert approved.status_code == status.HTTP_200_OK
+
+
+def test_admins_grant_and_revoke_administrator_rights(client, db_session):
+    organization_id = _organization(db_session)
+    admin = _create_user(
+        db_session, email="grant-admin@example.com", organization_id=organization_id, is_admin=True
+    )
+    member = _create_user(db_session, email="grant-member@example.com", organization_id=organization_id)
+    outsider = _create_user(db_session, email="grant-outsider@example.com", organization_id=None)
+
+    refused = client.put(
+        f"/admin/users/{admin.id}/admin",
+        json={"is_admin": False},
+        headers=_auth_headers_for(member),
+    )
+    granted = client.put(
+        f"/admin/users/{member.id}/admin", json={"is_admin": True}, headers=_auth_headers_for(admin)
+    )
+    foreign = client.put(
+        f"/admin/users/{outsider.id}/admin", json={"is_admin": True}, headers=_auth_headers_for(admin)
+    )
+    own = client.put(
+        f"/admin/users/{admin.id}/admin", json={"is_admin": False}, headers=_auth_headers_for(admin)
+    )
+    revoked = client.put(
+        f"/admin/users/{admin.id}/admin", json={"is_admin": False}, headers=_auth_headers_for(member)
+    )
+
+    assert refused.status_code == status.HTTP_403_FORBIDDEN
+    assert granted.status_code == status.HTTP_200_OK
+    assert granted.json()["is_admin"] is True
+    assert foreign.status_code == status.HTTP_404_NOT_FOUND
+    assert own.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    assert revoked.status_code == status.HTTP_200_OK
+    db_session.expire_all()
+    assert db_session.get(User, admin.id).is_admin is False
+
+
+def test_dev_endpoint_cannot_create_administrators(client, db_session):
+    organization_id = _organization(db_session)
+
+    created = client.post(
+        "/dev/create-user",
+        params={
+            "email": "dev-admin@example.com",
+            "password": "P@ssw0rd!",
+            "is_admin": True,
+            "organization_id": str(organization_id),
+        },
+    )
+
+    user = db_session.get(User, uuid.UUID(created.json()["id"]))
+    assert user.is_admin is False
+    assert user.organization_id is None
+
+
+def test_cli_creates_organization_administrators(tmp_path, capsys):
+    url = f"sqlite:///{tmp_path / 'admins.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        organization_id = _organization(session)
+    arguments = ["first-admin@example.com", "--organization-id", str(organization_id), "--admin"]
+
+    created = create_user.main([*arguments, "--database-url", url], read_password=lambda prompt: "P@ssw0rd!")
+    duplicate = create_user.main([*arguments, "--database-url", url], read_password=lambda prompt: "P@ssw0rd!")
+
+    assert (created, duplicate) == (0, 1)
+    assert "already exists" in capsys.readouterr().err
+    with Session(engine) as session:
+        admin = session.scalars(select(User)).one()
+        assert admin.is_admin is True
+        assert admin.organization_id == organization_id
+    engine.dispose()
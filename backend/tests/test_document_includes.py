@@ -0,0 +1,147 @@
+from contextlib import contextmanager
+
+from fastapi import status
+from sqlalchemy import event
+
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.user import User
+
+
+def _create_user(session, *, email: str, password: str, is_active: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def _statements(engine):
+    executed: list[str] = []
+
+    def record(connection, cursor, statement, parameters, context, executemany) -> None:
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _document_with_steps(client, db_session, headers, user: User, *, steps: int) -> str:
+    response = client.post("/documents", json={"title": f"Chain of {steps}"}, headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    document_id = response.json()["id"]
+    for order in range(steps, 0, -1):
+        db_session.add(
+            ApprovalStep(
+                document_id=document_id,
+                approver_id=user.id,
+                step_order=order,
+                status=ApprovalStepStatus.PENDING,
+            )
+        )
+    db_session.commit()
+    return document_id
+
+
+def test_detail_embeds_steps_and_audit(client, db_session, engine):
+    user = _create_user(db_session, email="include-detail@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    small = _document_with_steps(client, db_session, headers, user, steps=1)
+    large = _document_with_steps(client, db_session, headers, user, steps=6)
+
+    with _statements(engine) as small_statements:
+        response = client.get(f"/documents/{small}?include=steps,audit", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    with _statements(engine) as large_statements:
+        response = client.get(f"/documents/{large}?include=steps,audit", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["title"] == "Chain of 6"
+    assert [step["step_order"] for step in body["steps"]] == [1, 2, 3, 4, 5, 6]
+    assert [entry["action"] for entry in body["audit"]] == ["document_created"]
+    assert len(large_statements) == len(small_statements)
+
+
+def test_fields_select_only_requested_columns(client, db_session, engine):
+    user = _create_user(db_session, email="include-fields@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    document_id = _document_with_steps(client, db_session, headers, user, steps=2)
+
+    with _statements(engine) as statements:
+        response = client.get(f"/documents/{document_id}?fields=title&include=steps", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert set(body) == {"id", "title", "steps"}
+    document_select = next(
+        statement for statement in statements if "FROM documents" in statement
+    )
+    assert "documents.title" in document_select
+    assert "documents.status" not in document_select
+    assert "documents.blob_sha256" not in document_select
+
+
+def test_listing_loads_relations_once_per_page(client, db_session, engine):
+    user = _create_user(db_session, email="include-list@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    _document_with_steps(client, db_session, headers, user, steps=1)
+
+    with _statements(engine) as few:
+        response = client.get("/documents?include=steps", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    for _ in range(4):
+        _document_with_steps(client, db_session, headers, user, steps=3)
+    with _statements(engine) as many:
+        response = client.get("/documents?include=steps&fields=title,status", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(many) == len(few)
+    assert all(set(item) == {"id", "title", "status", "steps"} for item in response.json())
+
+
+def test_plain_read_keeps_its_shape(client, db_session):
+    user = _create_user(db_session, email="include-plain@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    document_id = _document_with_steps(client, db_session, headers, user, steps=1)
+
+    response = client.get(f"/documents/{document_id}", headers=headers)
+
+    assert set(response.json()) == {"id", "title", "status", "created_at"}
+
+
+def test_unknown_include_is_rejected(client, db_session):
+    user = _create_user(db_session, email="include-bad@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+
+    response = client.get("/documents?include=owner", headers=headers)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "owner" in response.json()["detail"]
+
+
+def test_empty_fields_returns_every_field(client, db_session):
+    user = _create_user(db_session, email="include-empty@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    document_id = _document_with_steps(client, db_session, headers, user, steps=1)
+
+    listing = client.get("/documents?fields=", headers=headers)
+    detail = client.get(f"/documents/{document_id}?fields=%20,&include=", headers=headers)
+
+    assert listing.status_code == status.HTTP_200_OK
+    assert set(listing.json()[0]) == {"id", "title", "status", "created_at"}
+    assert detail.status_code == status.HTTP_200_OK
+    assert set(detail.json()) == {"id", "title", "status", "created_at"}
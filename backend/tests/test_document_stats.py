@@ -0,0 +1,112 @@
+import uuid
+
+from fastapi import status
+
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.models.approval_step import ApprovalStep
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.document_archive import ArchivedDocument
+from backend.src.models.organization import Organization
+from backend.src.models.user import User
+from backend.src.services import stats_service
+
+
+def _create_user(session, *, email: str, password: str, is_active: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_stats_track_creation_and_decisions(client, db_session):
+    user = _create_user(db_session, email="stats@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    before = client.get("/documents/stats", headers=headers).json()
+
+    created = client.post("/documents", json={"title": "Stats"}, headers=headers).json()
+    after_create = client.get("/documents/stats", headers=headers).json()
+    assert after_create["pending"] == before["pending"] + 1
+    assert after_create["total"] == before["total"] + 1
+
+    approver_id = uuid.uuid4()
+    step = ApprovalStep(
+        document_id=uuid.UUID(created["id"]),
+        approver_id=approver_id,
+        step_order=1,
+    )
+    db_session.add(step)
+    db_session.commit()
+    response = client.post(
+        f"/documents/{created['id']}/steps/{step.id}/reject",
+        json={"approver_id": str(approver_id)},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    after_reject = client.get("/documents/stats", headers=headers).json()
+    assert after_reject["pending"] == before["pending"]
+    assert after_reject["rejected"] == before["rejected"] + 1
+    assert after_reject["total"] == before["total"] + 1
+
+
+def test_rebuild_reconciles_rows_written_outside_the_service(db_session):
+    db_session.add(Document(title="Imported", status=DocumentStatus.APPROVED))
+    db_session.commit()
+
+    counts = stats_service.rebuild_counters(db_session)
+
+    assert stats_service.get_counts(db_session, organization_id=None) == counts[None]
+    # Archived documents still count; they only moved to cold storage.
+    total = db_session.query(Document).count() + db_session.query(ArchivedDocument).count()
+    assert sum(sum(per_status.values()) for per_status in counts.values()) == total
+
+
+def test_stats_are_per_organization(client, db_session):
+    organization = Organization(name="Stats Org")
+    db_session.add(organization)
+    db_session.commit()
+    member = _create_user(db_session, email="stats-member@example.com", password="P@ssw0rd!")
+    member.organization_id = organization.id
+    db_session.commit()
+    outsider = _create_user(db_session, email="stats-outsider@example.com", password="P@ssw0rd!")
+    outsider_before = client.get("/documents/stats", headers=_auth_headers_for(outsider)).json()
+
+    for title in ("First", "Second"):
+        client.post("/documents", json={"title": title}, headers=_auth_headers_for(member))
+
+    own = client.get("/documents/stats", headers=_auth_headers_for(member)).json()
+    assert own == {"pending": 2, "approved": 0, "rejected": 0, "total": 2}
+    assert client.get("/documents/stats", headers=_auth_headers_for(outsider)).json() == outsider_before
+    rebuilt = stats_service.rebuild_counters(db_session)
+    assert rebuilt[organization.id][DocumentStatus.PENDING] == 2
+    assert client.get("/documents/stats", headers=_auth_headers_for(member)).json() == own
+
+
+def test_first_increments_upsert_the_counter_row(db_session):
+    organization_id = uuid.uuid4()
+    stats_service.record_created(db_session, organization_id=organization_id)
+    stats_service.record_created(db_session, organization_id=organization_id)
+    # With more increments than shards, most land on a row that already exists.
+    for _ in range(stats_service.COUNTER_SHARDS * 2):
+        stats_service.record_transition(
+            db_session,
+            DocumentStatus.PENDING,
+            DocumentStatus.APPROVED,
+            organization_id=organization_id,
+        )
+        stats_service.record_created(db_session, organization_id=organization_id)
+    db_session.commit()
+
+    counts = stats_service.get_counts(db_session, organization_id=organization_id)
+    assert counts[DocumentStatus.PENDING] == 2
+    assert counts[DocumentStatus.APPROVED] == stats_service.COUNTER_SHARDS * 2
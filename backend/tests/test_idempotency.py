@@ -0,0 +1,107 @@
+import asyncio
+import uuid
+
+import httpx
+from fastapi import FastAPI, status
+from sqlalchemy import func, select
+
+from backend.src.core.idempotency import IdempotencyMiddleware
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.user import User
+
+
+def _create_user(session, *, email: str, password: str, is_active: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_retried_create_returns_first_response(client, db_session):
+    user = _create_user(db_session, email="idem-create@example.com", password="P@ssw0rd!")
+    headers = {**_auth_headers_for(user), "Idempotency-Key": "create-1"}
+
+    first = client.post("/documents", json={"title": "Idempotent Memo"}, headers=headers)
+    second = client.post("/documents", json={"title": "Idempotent Memo"}, headers=headers)
+
+    assert first.status_code == status.HTTP_201_CREATED
+    assert second.status_code == status.HTTP_201_CREATED
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    count = db_session.scalar(
+        select(func.count()).select_from(Document).where(Document.title == "Idempotent Memo")
+    )
+    assert count == 1
+
+    reused = client.post("/documents", json={"title": "Another Memo"}, headers=headers)
+    assert reused.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_retried_approve_does_not_conflict(client, db_session):
+    user = _create_user(db_session, email="idem-approve@example.com", password="P@ssw0rd!")
+    document = Document(title="Retry Contract", status=DocumentStatus.PENDING)
+    db_session.add(document)
+    db_session.flush()
+    approver_id = uuid.uuid4()
+    step = ApprovalStep(
+        document_id=document.id,
+        approver_id=approver_id,
+        step_order=1,
+        status=ApprovalStepStatus.PENDING,
+    )
+    db_session.add(step)
+    db_session.commit()
+    headers = {**_auth_headers_for(user), "Idempotency-Key": "approve-1"}
+    url = f"/documents/{document.id}/steps/{step.id}/approve"
+
+    first = client.post(url, json={"approver_id": str(approver_id)}, headers=headers)
+    retry = client.post(url, json={"approver_id": str(approver_id)}, headers=headers)
+    without_key = client.post(
+        url, json={"approver_id": str(approver_id)}, headers=_auth_headers_for(user)
+    )
+
+    assert first.status_code == status.HTTP_200_OK
+    assert retry.status_code == status.HTTP_200_OK
+    assert retry.json() == first.json()
+    assert without_key.status_code == status.HTTP_409_CONFLICT
+
+
+def test_concurrent_duplicates_are_coalesced(session_factory):
+    calls = 0
+    app = FastAPI()
+
+    @app.post("/slow")
+    async def slow() -> dict[str, int]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"call": calls}
+
+    app.add_middleware(IdempotencyMiddleware, session_factory=session_factory)
+
+    async def run() -> list[httpx.Response]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(
+                *(client.post("/slow", headers={"Idempotency-Key": "burst"}) for _ in range(5))
+            )
+
+    responses = asyncio.run(run())
+
+    assert calls == 1
+    assert [response.json() for response in responses] == [{"call": 1}] * 5
+    replayed = [response.headers.get("idempotent-replayed") for response in responses]
+    assert replayed.count("true") == 4
@@ -0,0 +1,190 @@
+import json
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.cli import import_data
+from backend.src.core.security import verify_password
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.base import Base
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.import_checkpoint import ImportCheckpoint
+from backend.src.models.organization import Organization
+from backend.src.models.user import User
+from backend.src.services import change_feed_service, import_service, search_service, stats_service
+from backend.src.services.import_service import ImportSource, ImportValidationError
+
+
+@pytest.fixture
+def target(tmp_path):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'import.db'}")
+    Base.metadata.create_all(engine)
+    search_service.ensure_search_index(engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+def _write_sources(tmp_path, organization_id: uuid.UUID, *, documents: int = 5) -> list[ImportSource]:
+    users = tmp_path / "users.csv"
+    users.write_text(
+        "id,email,password,is_active\n"
+        "u-1,Ada@Example.com,P@ssw0rd!,true\n"
+        "u-2,grace@example.com,S3cret!!,no\n"
+    )
+    documents_path = tmp_path / "documents.ndjson"
+    documents_path.write_text(
+        "".join(
+            json.dumps(
+                {
+                    "id": f"d-{number}",
+                    "title": f"Legacy contract {number}",
+                    "status": "approved" if number % 2 else "pending",
+                    "created_at": "2024-03-01T09:30:00Z",
+                    "organization_id": str(organization_id),
+                }
+            )
+            + "\n"
+            for number in range(documents)
+        )
+    )
+    steps = tmp_path / "steps.csv"
+    steps.write_text(
+        "document_id,approver_id,step_order,status\n"
+        "d-0,u-1,1,APPROVED\n"
+        "d-0,u-2,2,pending\n"
+    )
+    return [
+        ImportSource(kind="steps", path=str(steps)),
+        ImportSource(kind="documents", path=str(documents_path)),
+        ImportSource(kind="users", path=str(users)),
+    ]
+
+
+def _organization(session_factory) -> uuid.UUID:
+    with session_factory() as session:
+        organization = Organization(name="Imported Org")
+        session.add(organization)
+        session.commit()
+        return organization.id
+
+
+def test_import_writes_users_documents_and_steps(target, tmp_path):
+    organization_id = _organization(target)
+    sources = _write_sources(tmp_path, organization_id)
+
+    results = import_service.run_import(target, sources, batch_size=2, workers=2)
+
+    assert [(result.kind, result.written) for result in results] == [
+        ("users", 2),
+        ("documents", 5),
+        ("steps", 2),
+    ]
+    with target() as session:
+        ada = session.scalar(select(User).where(User.email == "ada@example.com"))
+        assert ada.id == uuid.uuid5(import_service.IMPORT_NAMESPACE, "users:u-1")
+        assert verify_password("P@ssw0rd!", ada.hashed_password)
+        grace = session.scalar(select(User).where(User.email == "grace@example.com"))
+        assert grace.is_active is False
+
+        first = session.get(Document, uuid.uuid5(import_service.IMPORT_NAMESPACE, "documents:d-0"))
+        assert first.status == DocumentStatus.PENDING
+        assert first.created_at.year == 2024
+        steps = session.scalars(select(ApprovalStep).order_by(ApprovalStep.step_order)).all()
+        assert [step.approver_id for step in steps] == [ada.id, grace.id]
+        assert [step.status for step in steps] == [ApprovalStepStatus.APPROVED, ApprovalStepStatus.PENDING]
+        # Steps inherit the tenant of their document.
+        assert {step.organization_id for step in steps} == {organization_id}
+
+        counts = stats_service.get_counts(session, organization_id=organization_id)
+        assert counts[DocumentStatus.APPROVED] == 2
+        assert counts[DocumentStatus.PENDING] == 3
+        indexed = session.execute(
+            text("SELECT count(*) FROM documents_fts WHERE documents_fts MATCH 'legacy'")
+        ).scalar()
+        assert indexed == 5
+
+        changes = change_feed_service.list_changes(session, organization_id=organization_id).changes
+        assert sorted((change.entity, change.op) for change in changes) == [
+            ("document", "created")
+        ] * 5 + [("step", "created")] * 2
+
+
+def test_invalid_references_write_nothing(target, tmp_path):
+    organization_id = _organization(target)
+    sources = _write_sources(tmp_path, organization_id)
+    (tmp_path / "steps.csv").write_text(
+        "document_id,approver_id,step_order\n"
+        "d-0,u-1,1\n"
+        "d-missing,u-9,0\n"
+    )
+
+    with pytest.raises(ImportValidationError) as raised:
+        import_service.run_import(target, sources, workers=1)
+
+    messages = "\n".join(raised.value.errors)
+    assert "steps.csv:3: step_order must be at least 1." in messages
+    with target() as session:
+        assert session.scalar(select(func.count()).select_from(User)) == 0
+        assert session.scalar(select(func.count()).select_from(Document)) == 0
+
+
+def test_collisions_with_existing_rows_write_nothing(target, tmp_path):
+    organization_id = _organization(target)
+    existing_document = uuid.uuid5(import_service.IMPORT_NAMESPACE, "documents:d-3")
+    with target() as session:
+        session.add(User(email="ADA@example.com", hashed_password="x", is_active=True))
+        session.add(Document(id=existing_document, title="Already here", status=DocumentStatus.PENDING))
+        session.commit()
+    sources = _write_sources(tmp_path, organization_id)
+
+    with pytest.raises(ImportValidationError) as raised:
+        import_service.run_import(target, sources, workers=1)
+
+    messages = "\n".join(raised.value.errors)
+    assert "users.csv:2: email ada@example.com already exists in the database." in messages
+    assert f"documents.ndjson:4: document id {existing_document} already exists" in messages
+    with target() as session:
+        assert session.scalar(select(func.count()).select_from(User)) == 1
+        assert session.scalar(select(func.count()).select_from(Document)) == 1
+        assert session.scalar(select(func.count()).select_from(ApprovalStep)) == 0
+
+
+def test_import_resumes_from_checkpoint(target, tmp_path):
+    organization_id = _organization(target)
+    sources = [
+        source
+        for source in _write_sources(tmp_path, organization_id, documents=7)
+        if source.kind == "documents"
+    ]
+
+    def fail_after_first_batch(kind: str, rows_done: int) -> None:
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        import_service.run_import(
+            target, sources, batch_size=3, workers=1, progress=fail_after_first_batch
+        )
+    with target() as session:
+        assert session.scalar(select(func.count()).select_from(Document)) == 3
+        assert session.scalar(select(ImportCheckpoint.rows_done)) == 3
+
+    results = import_service.run_import(target, sources, batch_size=3, workers=1)
+
+    assert results[0].resumed_from == 3
+    assert results[0].written == 4
+    with target() as session:
+        assert session.scalar(select(func.count()).select_from(Document)) == 7
+
+
+def test_cli_reports_validation_errors(tmp_path, capsys):
+    users = tmp_path / "users.ndjson"
+    users.write_text(json.dumps({"email": "not-an-email", "password": "x"}) + "\n")
+
+    exit_code = import_data.main(
+        ["--users", str(users), "--workers", "1", "--database-url", f"sqlite:///{tmp_path / 'cli.db'}"]
+    )
+
+    assert exit_code == 1
+    assert "invalid email" in capsys.readouterr().err
@@ -0,0 +1,127 @@
+import logging
+import uuid
+
+from sqlalchemy import select
+
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.audit_log import AuditLog
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.job import Job, JobStatus
+from backend.src.services import approval_service, job_service, notification_service
+
+
+def _create_document_with_steps(session, *, approver_ids: list[uuid.UUID]) -> tuple[Document, list[ApprovalStep]]:
+    document = Document(title="Vendor Contract", status=DocumentStatus.PENDING)
+    session.add(document)
+    session.flush()
+    steps = [
+        ApprovalStep(
+            document_id=document.id,
+            approver_id=approver_id,
+            step_order=index + 1,
+            status=ApprovalStepStatus.PENDING,
+        )
+        for index, approver_id in enumerate(approver_ids)
+    ]
+    session.add_all(steps)
+    session.commit()
+    return document, steps
+
+
+def test_enqueued_job_runs_registered_handler(db_session, session_factory):
+    calls: list[dict] = []
+
+    @job_service.register_handler("test.record")
+    def record(session, payload):
+        calls.append(payload)
+
+    job = job_service.enqueue(db_session, kind="test.record", payload={"value": 1})
+    db_session.commit()
+
+    summary = job_service.run_pending(session_factory)
+
+    assert summary.succeeded >= 1
+    assert calls == [{"value": 1}]
+    db_session.refresh(job)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.attempts == 1
+
+
+def test_failing_job_is_retried_with_backoff_then_failed(db_session, session_factory):
+    @job_service.register_handler("test.explode")
+    def explode(session, payload):
+        raise RuntimeError("boom")
+
+    job = job_service.enqueue(db_session, kind="test.explode", max_attempts=2)
+    db_session.commit()
+
+    first = job_service.run_pending(session_factory)
+    db_session.refresh(job)
+    assert first.retried == 1
+    assert job.status == JobStatus.PENDING
+    assert "boom" in job.last_error
+
+    # Pretend the backoff has elapsed.
+    job.run_at = job.created_at
+    db_session.commit()
+
+    second = job_service.run_pending(session_factory)
+    db_session.refresh(job)
+    assert second.failed == 1
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 2
+
+
+def test_approving_step_notifies_next_approver(db_session, session_factory):
+    first_approver, second_approver = uuid.uuid4(), uuid.uuid4()
+    document, steps = _create_document_with_steps(
+        db_session, approver_ids=[first_approver, second_approver]
+    )
+
+    approval_service.approve_step(
+        db_session,
+        document_id=document.id,
+        step_id=steps[0].id,
+        approver_id=first_approver,
+    )
+    kinds = set(
+        db_session.scalars(
+            select(Job.kind).where(Job.payload["step_id"].as_string() == str(steps[1].id))
+        )
+    )
+    assert kinds == {notification_service.NOTIFY_APPROVER, notification_service.ESCALATE_STEP}
+
+    job_service.run_pending(session_factory)
+
+    actions = list(
+        db_session.scalars(
+            select(AuditLog.action).where(AuditLog.document_id == document.id)
+        )
+    )
+    assert actions.count("approver_notified") == 1
+    assert "step_escalated" not in actions
+
+
+def test_poll_failures_are_logged_and_backed_off(session_factory, caplog, monkeypatch):
+    worker = job_service.JobWorker(session_factory, poll_interval=0.5)
+    waits: list[float] = []
+    calls = 0
+
+    def poll_once(worker_id):
+        nonlocal calls
+        calls += 1
+        if calls == 4:
+            worker._stop.set()
+            return 1
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(worker, "poll_once", poll_once)
+    monkeypatch.setattr(worker._stop, "wait", waits.append)
+    with caplog.at_level(logging.ERROR, logger=job_service.__name__):
+        worker._run("worker-test")
+
+    failures = [record for record in caplog.records if record.getMessage() == "job poll failed"]
+    assert len(failures) == 3
+    assert failures[0].exc_info[1].args == ("database unavailable",)
+    assert waits == [0.5, 1.0, 2.0]
+    assert worker._poll_delay(20) == job_service.POLL_BACKOFF_MAX_SECONDS
@@ -0,0 +1,346 @@
+import uuid
+
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, select
+
+from backend.src.cli import create_organization
+from backend.src.core.security import create_access_token, decode_access_token, get_password_hash
+from backend.src.db import session as session_module
+from backend.src.db.session import (
+    get_read_session,
+    get_session,
+    get_shared_read_session,
+    get_shared_session,
+    tenant_session_factories,
+)
+from backend.src.db.tenancy import (
+    InvalidPlacementError,
+    TenantBusyError,
+    TenantPlacement,
+    TenantRouter,
+    validate_schema_name,
+)
+from backend.src.main import app
+from backend.src.models.document import Document
+from backend.src.models.job import Job, JobStatus
+from backend.src.models.organization import Organization
+from backend.src.models.user import User
+from backend.src.services import job_service
+
+
+def _create_user(
+    session,
+    *,
+    email: str,
+    password: str,
+    is_active: bool = True,
+    is_admin: bool = False,
+    organization_id: uuid.UUID | None = None,
+) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+        is_admin=is_admin,
+        organization_id=organization_id,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    claims = {"sub": str(user.id), "email": user.email}
+    if user.organization_id is not None:
+        claims["org"] = str(user.organization_id)
+    token = create_access_token(claims)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_organization(session, **fields) -> Organization:
+    organization = Organization(name=f"org-{uuid.uuid4()}", **fields)
+    session.add(organization)
+    session.commit()
+    session.refresh(organization)
+    return organization
+
+
+@pytest.fixture
+def tenant_client(client):
+    """A client whose sessions all go through the real routing."""
+    for dependency in (get_session, get_read_session, get_shared_session, get_shared_read_session):
+        app.dependency_overrides.pop(dependency)
+    return client
+
+
+def test_shared_tenants_only_see_their_own_documents(tenant_client, db_session):
+    acme = _create_organization(db_session)
+    globex = _create_organization(db_session)
+    alice = _create_user(db_session, email="alice@acme.test", password="P@ssw0rd!", organization_id=acme.id)
+    bob = _create_user(db_session, email="bob@globex.test", password="P@ssw0rd!", organization_id=globex.id)
+
+    created = tenant_client.post(
+        "/documents", json={"title": "Acme quarterly plan"}, headers=_auth_headers_for(alice)
+    )
+    assert created.status_code == status.HTTP_201_CREATED
+    document_id = created.json()["id"]
+    stored = db_session.get(Document, uuid.UUID(document_id))
+    assert stored.organization_id == acme.id
+
+    bob_headers = _auth_headers_for(bob)
+    assert tenant_client.get("/documents", headers=bob_headers).json() == []
+    assert (
+        tenant_client.get(f"/documents/{document_id}", headers=bob_headers).status_code
+        == status.HTTP_404_NOT_FOUND
+    )
+    search = tenant_client.get("/documents/search", params={"q": "acme"}, headers=bob_headers)
+    assert search.json()["items"] == []
+
+    alice_headers = _auth_headers_for(alice)
+    assert [item["id"] for item in tenant_client.get("/documents", headers=alice_headers).json()] == [
+        document_id
+    ]
+    alice_search = tenant_client.get("/documents/search", params={"q": "acme"}, headers=alice_headers)
+    assert [item["id"] for item in alice_search.json()["items"]] == [document_id]
+
+
+def test_login_token_carries_organization(client, db_session):
+    organization = _create_organization(db_session)
+    _create_user(db_session, email="carol@initech.test", password="P@ssw0rd!", organization_id=organization.id)
+
+    response = client.post("/auth/login", json={"email": "carol@initech.test", "password": "P@ssw0rd!"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert decode_access_token(response.json()["access_token"])["org"] == str(organization.id)
+
+
+def test_dedicated_database_tenant(tenant_client, db_session, tmp_path):
+    tenant_url = f"sqlite+pysqlite:///{tmp_path / 'tenant.db'}"
+    organization = _create_organization(db_session, database_url=tenant_url)
+    user = _create_user(db_session, email="dave@umbrella.test", password="P@ssw0rd!", organization_id=organization.id)
+    headers = _auth_headers_for(user)
+
+    created = tenant_client.post("/documents", json={"title": "Dedicated memo"}, headers=headers)
+    assert created.status_code == status.HTTP_201_CREATED
+    document_id = uuid.UUID(created.json()["id"])
+
+    assert db_session.get(Document, document_id) is None
+    tenant_engine = create_engine(tenant_url)
+    with tenant_engine.connect() as connection:
+        titles = connection.execute(select(Document.title).where(Document.id == document_id)).scalars().all()
+    tenant_engine.dispose()
+    assert titles == ["Dedicated memo"]
+    fetched = tenant_client.get(f"/documents/{document_id}", headers=headers)
+    assert fetched.status_code == status.HTTP_200_OK
+
+
+def test_delegations_in_a_dedicated_database_resolve_shared_users(tenant_client, db_session, tmp_path):
+    organization = _create_organization(
+        db_session, database_url=f"sqlite+pysqlite:///{tmp_path / 'delegations.db'}"
+    )
+    owner, delegate = (
+        _create_user(db_session, email=email, password="P@ssw0rd!", organization_id=organization.id)
+        for email in ("owner@initech.test", "delegate@initech.test")
+    )
+    window = {"starts_at": "2020-01-01T00:00:00Z", "ends_at": "2999-01-01T00:00:00Z"}
+
+    delegated = tenant_client.post(
+        "/delegations",
+        json={"delegate_id": str(delegate.id), **window},
+        headers=_auth_headers_for(owner),
+    )
+
+    assert delegated.status_code == status.HTTP_201_CREATED
+    assert delegated.json()["delegator_id"] == str(owner.id)
+
+
+def test_tenant_connection_limit(tenant_client, db_session, monkeypatch):
+    organization = _create_organization(db_session, max_connections=1)
+    user = _create_user(db_session, email="erin@hooli.test", password="P@ssw0rd!", organization_id=organization.id)
+    router = session_module.tenant_router
+    monkeypatch.setattr(router, "acquire_timeout", 0.0)
+
+    placement = router.placement(organization.id)
+    router.acquire(placement)
+    try:
+        busy = tenant_client.get("/documents", headers=_auth_headers_for(user))
+    finally:
+        router.release(placement)
+    assert busy.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert busy.headers["retry-after"] == "1"
+
+    assert tenant_client.get("/documents", headers=_auth_headers_for(user)).status_code == status.HTTP_200_OK
+
+
+def test_router_limits_are_per_tenant():
+    placements = {
+        name: TenantPlacement(organization_id=uuid.uuid4(), database_url=None, schema_name=None, max_connections=2)
+        for name in ("noisy", "quiet")
+    }
+    router = TenantRouter(lambda organization_id: None, acquire_timeout=0.0)
+    router.acquire(placements["noisy"])
+    router.acquire(placements["noisy"])
+    with pytest.raises(TenantBusyError):
+        router.acquire(placements["noisy"])
+    router.acquire(placements["quiet"])
+
+
+def test_document_scoped_routes_hide_other_organizations(tenant_client, db_session):
+    acme = _create_organization(db_session)
+    globex = _create_organization(db_session)
+    alice = _create_user(
+        db_session, email="alice@acme.test", password="P@ssw0rd!", is_admin=True, organization_id=acme.id
+    )
+    bob = _create_user(db_session, email="bob@globex.test", password="P@ssw0rd!", organization_id=globex.id)
+    alice_headers = _auth_headers_for(alice)
+    bob_headers = _auth_headers_for(bob)
+
+    template = tenant_client.post(
+        "/workflows",
+        json={"name": "sign-off", "stages": [{"approvers": [str(alice.id)]}]},
+        headers=alice_headers,
+    ).json()
+    document_id = tenant_client.post(
+        "/documents", json={"title": "Acme secrets"}, headers=alice_headers
+    ).json()["id"]
+    base = f"/documents/{document_id}"
+    assert tenant_client.put(f"{base}/content", content=b"v1", headers=alice_headers).status_code == 200
+    assert tenant_client.post(f"{base}/revisions", content=b"v1", headers=alice_headers).status_code == 201
+
+    attempts = [
+        ("GET", f"{base}/content", None),
+        ("PUT", f"{base}/content", b"overwritten"),
+        ("GET", f"{base}/revisions", None),
+        ("POST", f"{base}/revisions", b"overwritten"),
+        ("GET", f"{base}/revisions/1", None),
+        ("GET", f"{base}/revisions/diff?since=1", None),
+        ("GET", f"{base}/audit", None),
+    ]
+    for method, url, body in attempts:
+        response = tenant_client.request(method, url, content=body, headers=bob_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND, (method, url)
+    started = tenant_client.post(
+        f"{base}/workflow", json={"template_id": template["id"]}, headers=bob_headers
+    )
+    assert started.status_code == status.HTTP_404_NOT_FOUND
+
+    assert tenant_client.post(
+        f"{base}/workflow", json={"template_id": template["id"]}, headers=alice_headers
+    ).status_code == status.HTTP_201_CREATED
+    step_id = tenant_client.get(f"{base}?include=steps", headers=alice_headers).json()["steps"][0]["id"]
+    decision = tenant_client.post(
+        f"{base}/steps/{step_id}/approve", json={"approver_id": str(alice.id)}, headers=bob_headers
+    )
+    assert decision.status_code == status.HTTP_404_NOT_FOUND
+
+    assert tenant_client.get(f"{base}/content", headers=alice_headers).content == b"v1"
+    window = {"start": "2000-01-01T00:00:00Z", "end": "2100-01-01T00:00:00Z"}
+    bob_audit = tenant_client.get("/audit", params=window, headers=bob_headers).json()
+    assert bob_audit["items"] == []
+    alice_audit = tenant_client.get("/audit", params=window, headers=alice_headers).json()
+    assert {item["document_id"] for item in alice_audit["items"]} == {document_id}
+
+
+def test_workflow_templates_belong_to_one_organization(client, db_session):
+    acme = _create_organization(db_session)
+    globex = _create_organization(db_session)
+    admin = _create_user(
+        db_session, email="admin@acme.test", password="P@ssw0rd!", is_admin=True, organization_id=acme.id
+    )
+    member = _create_user(db_session, email="member@acme.test", password="P@ssw0rd!", organization_id=acme.id)
+    outsider = _create_user(
+        db_session, email="admin@globex.test", password="P@ssw0rd!", is_admin=True, organization_id=globex.id
+    )
+
+    def create_template(user, approver):
+        return client.post(
+            "/workflows",
+            json={"name": "sign-off", "stages": [{"approvers": [str(approver.id)]}]},
+            headers=_auth_headers_for(user),
+        )
+
+    assert create_template(member, member).status_code == status.HTTP_403_FORBIDDEN
+    assert create_template(admin, outsider).status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    created = create_template(admin, member)
+    assert created.status_code == status.HTTP_201_CREATED
+    assert create_template(outsider, outsider).json()["version"] == 1
+
+    outsider_headers = _auth_headers_for(outsider)
+    foreign = client.post(
+        "/documents",
+        json={"title": "Globex memo", "workflow_template_id": created.json()["id"]},
+        headers=outsider_headers,
+    )
+    document_id = client.post("/documents", json={"title": "Globex plan"}, headers=outsider_headers).json()["id"]
+    started = client.post(
+        f"/documents/{document_id}/workflow",
+        json={"template_id": created.json()["id"]},
+        headers=outsider_headers,
+    )
+    assert foreign.status_code == status.HTTP_404_NOT_FOUND
+    assert started.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_worker_runs_jobs_queued_in_tenant_databases(tenant_client, db_session, session_factory, tmp_path):
+    tenant_url = f"sqlite+pysqlite:///{tmp_path / 'jobs.db'}"
+    organization = _create_organization(db_session, database_url=tenant_url)
+    calls: list[dict] = []
+
+    @job_service.register_handler("test.tenant_job")
+    def record(session, payload):
+        calls.append(payload)
+
+    prepared: list[str] = []
+    worker = job_service.JobWorker(
+        session_factory,
+        tenants=tenant_session_factories,
+        prepare=lambda session: prepared.append(str(session.get_bind().url)),
+    )
+    factory = next(
+        factory
+        for factory in tenant_session_factories()
+        if str(factory.kw["bind"].url) == tenant_url
+    )
+    with factory() as session:
+        job = job_service.enqueue(session, kind="test.tenant_job", payload={"org": str(organization.id)})
+        session.commit()
+        job_id = job.id
+
+    while worker.poll_once():
+        pass
+
+    assert calls == [{"org": str(organization.id)}]
+    assert tenant_url in prepared
+    with factory() as session:
+        assert session.get(Job, job_id).status == JobStatus.SUCCEEDED
+
+
+def test_organizations_are_created_by_operators_only(client, tmp_path, capsys):
+    assert client.post("/dev/create-organization", params={"name": "Open"}).status_code == (
+        status.HTTP_404_NOT_FOUND
+    )
+    url = f"sqlite:///{tmp_path / 'organizations.db'}"
+
+    with pytest.raises(SystemExit):
+        create_organization.main(["Injected", "--schema", 'x"; DROP TABLE users; --', "--database-url", url])
+    assert create_organization.main(["Acme", "--schema", "acme", "--database-url", url]) == 0
+
+    organization_id = uuid.UUID(capsys.readouterr().out.strip())
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        schemas = connection.execute(select(Organization.id, Organization.schema_name)).all()
+    engine.dispose()
+    assert schemas == [(organization_id, "acme")]
+
+
+@pytest.mark.parametrize("schema_name", ["acme", "_tenant_42"])
+def test_schema_names_are_plain_identifiers(schema_name):
+    assert validate_schema_name(schema_name) == schema_name
+
+
+@pytest.mark.parametrize("schema_name", ['a"b', "Acme", "1acme", "acme-corp", "", "a" * 64])
+def test_unsafe_schema_names_are_rejected(schema_name):
+    with pytest.raises(InvalidPlacementError):
+        validate_schema_name(schema_name)
@@ -0,0 +1,103 @@
+import uuid
+
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.db import session as session_module
+from backend.src.db.session import ReplicaRouter, WriteTracker, get_read_session, get_session
+from backend.src.main import app
+from backend.src.models.base import Base
+from backend.src.models.user import User
+
+
+def _create_user(session, *, email: str, password: str, is_active: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _memory_engine():
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def test_router_skips_lagging_replicas(monkeypatch):
+    healthy, lagging = _memory_engine(), _memory_engine()
+    lag = {healthy: 0.0, lagging: 30.0}
+    monkeypatch.setattr(ReplicaRouter, "_measure_lag", staticmethod(lambda engine: lag[engine]))
+    router = ReplicaRouter([healthy, lagging], max_lag=5.0)
+
+    assert {router.choose() for _ in range(4)} == {healthy}
+
+    lag[healthy] = 60.0
+    monkeypatch.setattr(session_module, "LAG_CHECK_INTERVAL", 0.0)
+    assert router.choose() is None
+    assert ReplicaRouter([], max_lag=5.0).choose() is None
+
+
+def test_write_tracker_window():
+    tracker = WriteTracker(window=60.0)
+    tracker.mark("sub:writer")
+    assert tracker.is_recent("sub:writer")
+    assert not tracker.is_recent("sub:reader")
+    assert not WriteTracker(window=0.0).is_recent("sub:writer")
+
+
+@pytest.fixture
+def replica_client(client, db_session, monkeypatch):
+    """A client whose read-only endpoints use an initially empty replica."""
+    replica = _memory_engine()
+    monkeypatch.setattr(session_module, "replica_router", ReplicaRouter([replica], max_lag=5.0))
+    monkeypatch.setattr(session_module, "write_tracker", WriteTracker(window=60.0))
+    app.dependency_overrides.pop(get_session)
+    app.dependency_overrides.pop(get_read_session)
+    yield client, replica
+    replica.dispose()
+
+
+def test_reads_use_replica_until_caller_writes(replica_client, db_session):
+    client, replica = replica_client
+    user = _create_user(db_session, email=f"replica-{uuid.uuid4()}@example.com", password="P@ssw0rd!")
+    with Session(replica) as replica_session:
+        replica_session.add(
+            User(id=user.id, email=user.email, hashed_password=user.hashed_password, is_active=True)
+        )
+        replica_session.commit()
+    headers = _auth_headers_for(user)
+
+    before = client.get("/documents", headers=headers)
+    assert before.status_code == status.HTTP_200_OK
+    assert before.json() == []
+
+    created = client.post("/documents", json={"title": "Replica Memo"}, headers=headers)
+    assert created.status_code == status.HTTP_201_CREATED
+    document_id = created.json()["id"]
+
+    # The writer reads its own write from the primary...
+    own_read = client.get(f"/documents/{document_id}", headers=headers)
+    assert own_read.status_code == status.HTTP_200_OK
+
+    # ...once the window has passed, reads go back to the (stale) replica.
+    session_module.write_tracker.window = 0.0
+    stale_read = client.get(f"/documents/{document_id}", headers=headers)
+    assert stale_read.status_code == status.HTTP_404_NOT_FOUND
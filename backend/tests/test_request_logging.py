@@ -0,0 +1,111 @@
+import io
+import json
+import logging
+
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from backend.src.core import logs
+from backend.src.core.security import get_password_hash
+from backend.src.models.user import User
+
+_service_logger = logging.getLogger("backend.src.services.example")
+
+
+def _create_user(session, *, email: str, password: str, is_active: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _capture(run) -> list[dict]:
+    stream = io.StringIO()
+    listener = logs.configure_logging(stream=stream)
+    try:
+        run()
+    finally:
+        logs.shutdown_logging(listener)
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def _sampled_app(sample_rate: float) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(logs.RequestLoggingMiddleware, sample_rate=sample_rate, slow_ms=10_000)
+
+    @app.get("/ok")
+    def ok() -> dict[str, str]:
+        _service_logger.info("working", extra={"item": 1})
+        return {"status": "ok"}
+
+    @app.get("/boom")
+    def boom() -> dict[str, str]:
+        _service_logger.info("about to fail")
+        raise RuntimeError("boom")
+
+    return app
+
+
+def test_unsampled_success_writes_nothing():
+    client = TestClient(_sampled_app(0.0))
+    responses = []
+
+    entries = _capture(lambda: responses.append(client.get("/ok")))
+
+    assert responses[0].status_code == status.HTTP_200_OK
+    assert len(responses[0].headers["x-request-id"]) == 16
+    assert entries == []
+
+
+def test_failed_request_flushes_held_records():
+    client = TestClient(_sampled_app(0.0), raise_server_exceptions=False)
+    responses = []
+
+    entries = _capture(
+        lambda: responses.append(client.get("/boom", headers={"X-Request-ID": "req-123"}))
+    )
+
+    assert responses[0].status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert [entry["message"] for entry in entries] == ["about to fail", "GET /boom 500"]
+    assert {entry["request_id"] for entry in entries} == {"req-123"}
+    access = entries[-1]
+    assert access["level"] == "ERROR"
+    assert access["status"] == 500
+    assert "RuntimeError: boom" in access["exception"]
+
+
+def test_sampled_request_includes_extra_fields():
+    client = TestClient(_sampled_app(1.0))
+
+    entries = _capture(lambda: client.get("/ok", headers={"X-Request-ID": "not valid!"}))
+
+    working, access = entries
+    assert working["item"] == 1
+    assert working["request_id"] == access["request_id"] != "not valid!"
+    assert access["path"] == "/ok"
+    assert access["duration_ms"] >= 0
+
+
+def test_failed_login_is_logged_with_request_id(client, db_session):
+    _create_user(db_session, email="log-login@example.com", password="P@ssw0rd!")
+    responses = []
+
+    entries = _capture(
+        lambda: responses.append(
+            client.post(
+                "/auth/login",
+                json={"email": "log-login@example.com", "password": "wrong"},
+            )
+        )
+    )
+
+    request_id = responses[0].headers["x-request-id"]
+    refused = [entry for entry in entries if entry["message"] == "login refused"]
+    assert refused and refused[0]["reason"] == "bad_password"
+    assert refused[0]["logger"] == "backend.src.services.auth_service"
+    assert refused[0]["request_id"] == request_id
@@ -0,0 +1,165 @@
+import os
+import uuid
+
+from fastapi import status
+
+from backend.src.core import delta
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.core.settings import load_settings
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.document_revision import DocumentRevision, RevisionStorage
+from backend.src.models.user import User
+from backend.src.services import document_service, revision_service
+
+
+def _create_user(session, *, email: str, password: str, is_active: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_delta_round_trip_reuses_unchanged_regions():
+    source = os.urandom(100_000)
+    target = source[:40_000] + b"inserted paragraph" + source[45_000:]
+
+    encoded = delta.encode(source, target)
+
+    assert delta.apply(source, encoded) == target
+    assert len(encoded) < 200
+
+
+def test_revisions_store_deltas_and_reconstruct(client, db_session):
+    user = _create_user(db_session, email="rev@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    document_id = client.post("/documents", json={"title": "Policy"}, headers=headers).json()["id"]
+    versions = [os.urandom(20_000)]
+    versions.append(versions[0][:5_000] + b"edit one" + versions[0][5_000:])
+    versions.append(versions[1] + b"appendix")
+
+    for content in versions:
+        response = client.post(f"/documents/{document_id}/revisions", content=content, headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    listing = client.get(f"/documents/{document_id}/revisions", headers=headers).json()
+    assert [item["storage"] for item in listing] == ["snapshot", "delta", "delta"]
+    assert listing[1]["stored_size"] < 1_000
+
+    revision_service.get_cache().clear()
+    second = client.get(f"/documents/{document_id}/revisions/2", headers=headers)
+    assert second.content == versions[1]
+
+    diff = client.get(
+        f"/documents/{document_id}/revisions/diff",
+        params={"since": 1},
+        headers=headers,
+    )
+    assert diff.headers["x-revision-to"] == "3"
+    assert delta.apply(versions[0], diff.content) == versions[2]
+
+
+def test_periodic_snapshots_bound_reconstruction(db_session, monkeypatch):
+    settings = revision_service.load_settings()
+    monkeypatch.setattr(settings, "revision_snapshot_interval", 2)
+    user = _create_user(db_session, email="rev@example.com", password="P@ssw0rd!")
+    document = document_service.create_document(db_session, title="Snapshots")
+    for index in range(5):
+        revision_service.create_revision(
+            db_session,
+            document_id=document.id,
+            content=b"revision %d" % index,
+            created_by=user.id,
+        )
+
+    storages = [
+        revision.storage
+        for revision in db_session.query(DocumentRevision)
+        .filter(DocumentRevision.document_id == document.id)
+        .order_by(DocumentRevision.number)
+    ]
+    assert storages == [
+        RevisionStorage.SNAPSHOT,
+        RevisionStorage.DELTA,
+        RevisionStorage.SNAPSHOT,
+        RevisionStorage.DELTA,
+        RevisionStorage.SNAPSHOT,
+    ]
+
+
+def test_resubmitting_rejected_document_reopens_approvals(client, db_session):
+    user = _create_user(db_session, email="rev@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    document_id = client.post("/documents", json={"title": "Proposal"}, headers=headers).json()["id"]
+    approver_id = uuid.uuid4()
+    step = ApprovalStep(document_id=uuid.UUID(document_id), approver_id=approver_id, step_order=1)
+    db_session.add(step)
+    db_session.commit()
+    client.post(f"/documents/{document_id}/revisions", content=b"v1", headers=headers)
+    rejected = client.post(
+        f"/documents/{document_id}/steps/{step.id}/reject",
+        json={"approver_id": str(approver_id)},
+        headers=headers,
+    )
+    assert rejected.json()["document"]["status"] == "REJECTED"
+
+    client.post(f"/documents/{document_id}/revisions", content=b"v2", headers=headers)
+
+    document = client.get(f"/documents/{document_id}", headers=headers).json()
+    assert document["status"] == "PENDING"
+    db_session.refresh(step)
+    assert step.status == ApprovalStepStatus.PENDING
+
+
+def test_revisions_over_the_upload_limit_are_refused(client, db_session, monkeypatch):
+    monkeypatch.setattr(load_settings(), "storage_max_upload_bytes", 10)
+    user = _create_user(db_session, email="rev-limit@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    document_id = client.post("/documents", json={"title": "Limits"}, headers=headers).json()["id"]
+
+    declared = client.post(f"/documents/{document_id}/revisions", content=b"x" * 11, headers=headers)
+    streamed = client.post(
+        f"/documents/{document_id}/revisions",
+        content=iter([b"x" * 6, b"x" * 6]),
+        headers=headers,
+    )
+    fits = client.post(f"/documents/{document_id}/revisions", content=b"x" * 10, headers=headers)
+
+    assert declared.status_code == status.HTTP_413_CONTENT_TOO_LARGE
+    assert streamed.status_code == status.HTTP_413_CONTENT_TOO_LARGE
+    assert fits.status_code == status.HTTP_201_CREATED
+
+
+def test_documents_under_review_cannot_be_revised_after_a_decision(client, db_session):
+    user = _create_user(db_session, email="rev-review@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    document_id = client.post("/documents", json={"title": "Contract"}, headers=headers).json()["id"]
+    first, second = (
+        ApprovalStep(document_id=uuid.UUID(document_id), approver_id=uuid.uuid4(), step_order=order)
+        for order in (1, 2)
+    )
+    db_session.add_all([first, second])
+    db_session.commit()
+    assert client.post(
+        f"/documents/{document_id}/revisions", content=b"v1", headers=headers
+    ).status_code == status.HTTP_201_CREATED
+
+    client.post(
+        f"/documents/{document_id}/steps/{first.id}/approve",
+        json={"approver_id": str(first.approver_id)},
+        headers=headers,
+    )
+    revised = client.post(f"/documents/{document_id}/revisions", content=b"v2", headers=headers)
+
+    assert revised.status_code == status.HTTP_409_CONFLICT
+    listing = client.get(f"/documents/{document_id}/revisions", headers=headers).json()
+    assert [item["number"] for item in listing] == [1]
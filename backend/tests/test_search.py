@@ -0,0 +1,92 @@
+from fastapi import status
+
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.models.user import User
+from backend.src.services import search_service
+
+
+def _create_user(session, *, email: str, password: str, is_active: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_documents(client, headers, titles: list[str]) -> None:
+    for title in titles:
+        response = client.post("/documents", json={"title": title}, headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED
+
+
+def test_search_ranks_and_paginates(client, db_session):
+    user = _create_user(db_session, email="search@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    _create_documents(
+        client,
+        headers,
+        [
+            "Zebrafish husbandry manual",
+            "Zebrafish zebrafish breeding zebrafish",
+            "Zebrafish export permit",
+            "Unrelated memo",
+        ],
+    )
+
+    first = client.get("/documents/search", params={"q": "zebrafish", "limit": 2}, headers=headers)
+    assert first.status_code == status.HTTP_200_OK
+    first_page = first.json()
+    assert len(first_page["items"]) == 2
+    assert first_page["items"][0]["title"] == "Zebrafish zebrafish breeding zebrafish"
+    assert first_page["next_cursor"]
+
+    second = client.get(
+        "/documents/search",
+        params={"q": "zebrafish", "limit": 2, "cursor": first_page["next_cursor"]},
+        headers=headers,
+    ).json()
+    titles = [item["title"] for item in first_page["items"] + second["items"]]
+    assert len(titles) == 3
+    assert len(set(titles)) == 3
+    assert second["next_cursor"] is None
+
+
+def test_search_matches_prefixes_of_every_term(client, db_session):
+    user = _create_user(db_session, email="search@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    _create_documents(client, headers, ["Okapi sighting report", "Okapi habitat"])
+
+    response = client.get("/documents/search", params={"q": "oka rep"}, headers=headers)
+
+    assert [item["title"] for item in response.json()["items"]] == ["Okapi sighting report"]
+
+
+def test_search_rejects_query_without_words(client, db_session):
+    user = _create_user(db_session, email="search@example.com", password="P@ssw0rd!")
+
+    response = client.get("/documents/search", params={"q": "***"}, headers=_auth_headers_for(user))
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_memory_index_matches_sqlite_results(client, db_session):
+    user = _create_user(db_session, email="search@example.com", password="P@ssw0rd!")
+    _create_documents(client, _auth_headers_for(user), ["Narwhal tusk survey", "Narwhal census"])
+    expected = search_service.search_documents(db_session, query="narwhal")
+
+    search_service.enable_memory_index(db_session)
+    try:
+        from_memory = search_service.search_documents(db_session, query="narwhal")
+    finally:
+        search_service.disable_memory_index()
+
+    assert {hit.document.id for hit in from_memory.hits} == {hit.document.id for hit in expected.hits}
@@ -0,0 +1,207 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.organization import Organization
+from backend.src.models.sla_rollup import ApprovalSlaRollup, SlaRollupWatermark
+from backend.src.models.user import User
+from backend.src.services import analytics_service
+
+_T0 = datetime(2025, 3, 3, 9, 0, tzinfo=timezone.utc)
+_LATER = _T0 + timedelta(days=30)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rollups(db_session):
+    # Tests backdate decisions, so each one starts the aggregator from scratch.
+    db_session.query(ApprovalSlaRollup).delete()
+    db_session.query(SlaRollupWatermark).delete()
+    db_session.commit()
+
+
+def _create_user(session, *, email: str, password: str, organization_id=None) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=True,
+        organization_id=organization_id,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _organization(session) -> uuid.UUID:
+    organization = Organization(name=f"SLA {uuid.uuid4().hex[:8]}")
+    session.add(organization)
+    session.commit()
+    return organization.id
+
+
+def _decided_chain(session, organization_id, approvers, minutes, *, created_at=_T0) -> None:
+    """One document whose steps are decided ``minutes`` after the previous decision."""
+    document = Document(
+        title="SLA Contract",
+        status=DocumentStatus.APPROVED,
+        organization_id=organization_id,
+    )
+    session.add(document)
+    session.flush()
+    decided = created_at
+    for order, (approver_id, wait) in enumerate(zip(approvers, minutes), start=1):
+        decided = decided + timedelta(minutes=wait)
+        session.add(
+            ApprovalStep(
+                document_id=document.id,
+                approver_id=approver_id,
+                step_order=order,
+                status=ApprovalStepStatus.APPROVED,
+                organization_id=organization_id,
+                created_at=created_at,
+                decided_at=decided,
+            )
+        )
+    session.commit()
+
+
+def _by_key(report) -> dict[str, analytics_service.SlaGroup]:
+    return {group.key: group for group in report.groups}
+
+
+def test_report_percentiles_per_approver_and_step(db_session):
+    organization_id = _organization(db_session)
+    first, second = uuid.uuid4(), uuid.uuid4()
+    for wait in range(1, 101):
+        _decided_chain(db_session, organization_id, [first, second], [wait, 60])
+
+    analytics_service.rollup_decided_steps(db_session, now=_LATER)
+    report = analytics_service.sla_report(
+        db_session,
+        organization_id=organization_id,
+        group_by="approver",
+        start=_T0,
+        end=_T0 + timedelta(days=1),
+    )
+
+    assert report.granularity == "hour"
+    groups = _by_key(report)
+    assert groups[str(first)].count == 100
+    assert groups[str(first)].mean_seconds == pytest.approx(50.5 * 60)
+    assert groups[str(first)].p50_seconds == pytest.approx(50 * 60, rel=0.2)
+    assert groups[str(first)].p90_seconds == pytest.approx(90 * 60, rel=0.2)
+    # The second step waits from the first decision, not from its creation.
+    assert groups[str(second)].p50_seconds == pytest.approx(3600, rel=0.2)
+
+    by_step = analytics_service.sla_report(
+        db_session,
+        organization_id=organization_id,
+        group_by="step_order",
+        start=_T0,
+        end=_T0 + timedelta(days=7),
+    )
+    assert by_step.granularity == "day"
+    assert [group.key for group in by_step.groups] == ["1", "2"]
+
+    by_day = analytics_service.sla_report(
+        db_session,
+        organization_id=organization_id,
+        group_by="day",
+        start=_T0,
+        end=_T0 + timedelta(days=7),
+    )
+    assert [(group.key, group.count) for group in by_day.groups] == [
+        ("2025-03-03T00:00:00+00:00", 200)
+    ]
+
+
+def test_rollup_is_incremental(db_session):
+    organization_id = _organization(db_session)
+    approver = uuid.uuid4()
+    _decided_chain(db_session, organization_id, [approver], [5])
+    analytics_service.rollup_decided_steps(db_session, now=_LATER)
+
+    assert analytics_service.rollup_decided_steps(db_session, now=_LATER) == 0
+
+    # Later than anything already folded in, as a real decision would be.
+    _decided_chain(db_session, organization_id, [approver], [15], created_at=_T0 + timedelta(hours=6))
+    assert analytics_service.rollup_decided_steps(db_session, now=_LATER) == 1
+    report = analytics_service.sla_report(
+        db_session,
+        organization_id=organization_id,
+        group_by="approver",
+        start=_T0,
+        end=_T0 + timedelta(hours=7),
+    )
+    assert _by_key(report)[str(approver)].count == 2
+
+
+def test_decisions_record_decided_at(client, db_session):
+    user = _create_user(db_session, email="sla-decide@example.com", password="P@ssw0rd!")
+    document = Document(title="Timed", status=DocumentStatus.PENDING)
+    db_session.add(document)
+    db_session.flush()
+    step = ApprovalStep(
+        document_id=document.id,
+        approver_id=uuid.uuid4(),
+        step_order=1,
+        status=ApprovalStepStatus.PENDING,
+    )
+    db_session.add(step)
+    db_session.commit()
+    assert step.created_at is not None and step.decided_at is None
+
+    response = client.post(
+        f"/documents/{document.id}/steps/{step.id}/approve",
+        json={"approver_id": str(step.approver_id)},
+        headers=_auth_headers_for(user),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    db_session.expire_all()
+    assert db_session.get(ApprovalStep, step.id).decided_at is not None
+
+
+def test_percentile_interpolates_within_bins():
+    bins = {analytics_service.bin_index(100.0): 10}
+    lower, upper = analytics_service.bin_bounds(analytics_service.bin_index(100.0))
+
+    assert lower <= 100.0 < upper
+    assert analytics_service.percentile(bins, 0.5) == pytest.approx((lower + upper) / 2)
+    assert analytics_service.percentile({}, 0.5) == 0.0
+
+
+def test_endpoint_reports_the_callers_organization(client, db_session):
+    organization_id = _organization(db_session)
+    user = _create_user(
+        db_session,
+        email="sla-endpoint@example.com",
+        password="P@ssw0rd!",
+        organization_id=organization_id,
+    )
+    _decided_chain(db_session, organization_id, [user.id], [30])
+    analytics_service.rollup_decided_steps(db_session, now=_LATER)
+    headers = _auth_headers_for(user)
+
+    response = client.get(
+        "/analytics/approvals/sla",
+        params={"group_by": "approver", "start": "2025-03-03T00:00:00Z", "end": "2025-03-04T00:00:00Z"},
+        headers=headers,
+    )
+    invalid = client.get("/analytics/approvals/sla?group_by=week", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    (group,) = response.json()["groups"]
+    assert group["key"] == str(user.id)
+    assert group["count"] == 1
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
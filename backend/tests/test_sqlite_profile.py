@@ -0,0 +1,223 @@
+import threading
+import uuid
+from functools import partial
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.db import sqlite_profile
+from backend.src.db.base import Base
+from backend.src.models.audit_log import AuditLog
+from backend.src.models.job import Job, JobStatus
+from backend.src.services import job_service
+
+
+@pytest.fixture
+def engines(tmp_path):
+    writer, reader = sqlite_profile.create_engines(
+        f"sqlite+pysqlite:///{tmp_path / 'docengine.db'}",
+        readers=4,
+        cache_size_kib=8 * 1024,
+        mmap_size_bytes=16 * 1024 * 1024,
+        writer_timeout=10,
+    )
+    Base.metadata.create_all(writer)
+    yield writer, reader
+    writer.dispose()
+    reader.dispose()
+
+
+def _audit(session, action: str = "sqlite_profile") -> None:
+    session.add(AuditLog(document_id=uuid.uuid4(), action=action, performed_by=uuid.uuid4()))
+
+
+def _audit_count(engine, action: str = "sqlite_profile") -> int:
+    with engine.connect() as connection:
+        return connection.scalar(
+            select(func.count()).select_from(AuditLog).where(AuditLog.action == action)
+        )
+
+
+def test_connections_get_the_tuned_pragmas(engines):
+    writer, reader = engines
+    with writer.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+        assert connection.exec_driver_sql("PRAGMA cache_size").scalar() == -8 * 1024
+        assert connection.exec_driver_sql("PRAGMA mmap_size").scalar() == 16 * 1024 * 1024
+    with reader.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA query_only").scalar() == 1
+        with pytest.raises(OperationalError):
+            connection.execute(text("DELETE FROM audit_logs"))
+
+
+def test_in_memory_databases_are_rejected():
+    with pytest.raises(ValueError):
+        sqlite_profile.create_engines(
+            "sqlite+pysqlite:///:memory:",
+            readers=1,
+            cache_size_kib=1024,
+            mmap_size_bytes=0,
+            writer_timeout=1,
+        )
+
+
+def test_concurrent_read_then_write_transactions_do_not_lock_out(engines):
+    writer, reader = engines
+    factory = sessionmaker(bind=writer, autoflush=False)
+    errors: list[Exception] = []
+
+    def write_many() -> None:
+        try:
+            for _ in range(25):
+                with factory() as session:
+                    # Reading first used to take a shared lock that could not
+                    # be upgraded while another connection held one too.
+                    session.scalar(select(func.count()).select_from(AuditLog))
+                    _audit(session)
+                    session.commit()
+        except Exception as error:  # noqa: BLE001 - collected for the assertion
+            errors.append(error)
+
+    threads = [threading.Thread(target=write_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert _audit_count(reader) == 200
+
+
+def test_group_commit_isolates_failed_units(engines):
+    writer, reader = engines
+    group_commit = sqlite_profile.GroupCommitWriter(writer, window=0.05, max_batch=100)
+    commits_before = sqlite_profile.group_commits.value()
+
+    def unit(session_factory, *, fail: bool = False) -> str:
+        with session_factory() as session:
+            _audit(session)
+            session.commit()
+        if fail:
+            raise RuntimeError("unit failed after committing its session")
+        return "ok"
+
+    futures = [group_commit.submit(partial(unit, fail=index == 3)) for index in range(20)]
+    try:
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result(timeout=10))
+            except RuntimeError:
+                outcomes.append("failed")
+    finally:
+        group_commit.stop()
+
+    assert outcomes.count("ok") == 19
+    assert outcomes[3] == "failed"
+    assert _audit_count(reader) == 19
+    assert sqlite_profile.group_commits.value() - commits_before < 20
+
+
+def test_jobs_run_through_the_group_commit_writer(engines):
+    writer, reader = engines
+    factory = sessionmaker(bind=writer, autoflush=False)
+    group_commit = sqlite_profile.GroupCommitWriter(writer, window=0.01, max_batch=10)
+
+    @job_service.register_handler("test.sqlite_audit")
+    def write_audit(session, payload):
+        _audit(session, action="sqlite_job")
+
+    @job_service.register_handler("test.sqlite_broken")
+    def broken(session, payload):
+        _audit(session, action="sqlite_job")
+        session.flush()
+        raise RuntimeError("boom")
+
+    with factory() as session:
+        job_service.enqueue(session, kind="test.sqlite_audit")
+        job_service.enqueue(session, kind="test.sqlite_broken")
+        session.commit()
+        claimed = job_service.claim_batch(session, worker_id="test", limit=10)
+
+    try:
+        outcomes = {
+            job.kind: group_commit.run(partial(job_service.run_job, job=job), timeout=10)
+            for job in claimed
+        }
+    finally:
+        group_commit.stop()
+
+    assert outcomes == {
+        "test.sqlite_audit": JobStatus.SUCCEEDED,
+        "test.sqlite_broken": JobStatus.PENDING,
+    }
+    assert _audit_count(reader, "sqlite_job") == 1
+    with sessionmaker(bind=reader)() as session:
+        failed = session.scalars(select(Job).where(Job.kind == "test.sqlite_broken")).one()
+        assert "boom" in failed.last_error
+
+
+def _profile_app(writer):
+    from fastapi import Depends, FastAPI
+
+    from backend.src.core.deadline import DeadlineMiddleware
+    from backend.src.core.idempotency import IdempotencyMiddleware
+
+    factory = sessionmaker(bind=writer, autoflush=False)
+
+    def get_writer_session():
+        session = factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+
+    @app.post("/entries", status_code=201)
+    def create_entry(session=Depends(get_writer_session)):
+        _audit(session, "idempotent_write")
+        session.commit()
+        # Like a refresh after commit: the session holds the writer again
+        # until the dependency closes it.
+        return {"count": session.scalar(select(func.count()).select_from(AuditLog))}
+
+    @app.post("/two-writers")
+    def two_writers(session=Depends(get_writer_session)):
+        session.scalar(select(func.count()).select_from(AuditLog))
+        with factory() as other:
+            other.scalar(select(func.count()).select_from(AuditLog))
+        return {}
+
+    app.add_middleware(DeadlineMiddleware, default_seconds=0.5)
+    app.add_middleware(IdempotencyMiddleware, session_factory=factory)
+    return app
+
+
+def test_idempotent_requests_do_not_wait_for_the_writer_they_hold(engines):
+    from fastapi.testclient import TestClient
+
+    writer, _ = engines
+    with TestClient(_profile_app(writer)) as client:
+        first = client.post("/entries", headers={"Idempotency-Key": "k1"})
+        retry = client.post("/entries", headers={"Idempotency-Key": "k1"})
+
+    assert first.status_code == 201
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert _audit_count(writer, "idempotent_write") == 1
+
+
+def test_writer_wait_is_bounded_by_the_deadline(engines):
+    from fastapi.testclient import TestClient
+
+    writer, _ = engines
+    with TestClient(_profile_app(writer)) as client:
+        response = client.post("/two-writers")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
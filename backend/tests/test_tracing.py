@@ -0,0 +1,158 @@
+import json
+import uuid
+
+from fastapi import status
+
+from backend.src.core import tracing
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.user import User
+
+_TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+_PARENT_ID = "00f067aa0ba902b7"
+
+
+class _MemoryExporter:
+    def __init__(self) -> None:
+        self.spans: list[dict] = []
+
+    def export(self, spans: list[dict]) -> None:
+        self.spans.extend(spans)
+
+    def shutdown(self) -> None:
+        return None
+
+
+def _create_user(session, *, email: str, password: str, is_active: bool = True) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _traced(run, *, sample_ratio: float) -> list[dict]:
+    exporter = _MemoryExporter()
+    processor = tracing.configure_tracing(exporter=exporter, sample_ratio=sample_ratio)
+    try:
+        run()
+    finally:
+        tracing.shutdown_tracing(processor)
+    return exporter.spans
+
+
+def _pending_step(db_session) -> tuple[Document, ApprovalStep]:
+    document = Document(title="Traced Contract", status=DocumentStatus.PENDING)
+    db_session.add(document)
+    db_session.flush()
+    step = ApprovalStep(
+        document_id=document.id,
+        approver_id=uuid.uuid4(),
+        step_order=1,
+        status=ApprovalStepStatus.PENDING,
+    )
+    db_session.add(step)
+    db_session.commit()
+    return document, step
+
+
+def test_approve_is_traced_from_router_to_sql(client, db_session):
+    user = _create_user(db_session, email="trace-approve@example.com", password="P@ssw0rd!")
+    document, step = _pending_step(db_session)
+    headers = {
+        **_auth_headers_for(user),
+        "traceparent": f"00-{_TRACE_ID}-{_PARENT_ID}-01",
+    }
+    responses = []
+
+    spans = _traced(
+        lambda: responses.append(
+            client.post(
+                f"/documents/{document.id}/steps/{step.id}/approve",
+                json={"approver_id": str(step.approver_id)},
+                headers=headers,
+            )
+        ),
+        sample_ratio=0.0,
+    )
+
+    assert responses[0].status_code == status.HTTP_200_OK
+    assert {span["trace_id"] for span in spans} == {_TRACE_ID}
+    by_name = {span["name"]: span for span in spans}
+    server = by_name["POST /documents/{document_id}/steps/{step_id}/approve"]
+    assert server["kind"] == "SERVER"
+    assert server["parent_span_id"] == _PARENT_ID
+    assert server["attributes"]["http.response.status_code"] == 200
+    handler = by_name["approvals.approve_step"]
+    assert handler["parent_span_id"] == server["span_id"]
+    assert by_name["security.decode_access_token"]
+    assert by_name["dependencies.get_current_user"]
+    decide = by_name["approval_service.decide_step"]
+    assert decide["parent_span_id"] == by_name["approval_service.approve_step"]["span_id"]
+    statements = [span for span in spans if span["kind"] == "CLIENT"]
+    assert any(
+        span["parent_span_id"] == decide["span_id"] and "approval_steps" in span["attributes"]["db.statement"]
+        for span in statements
+    )
+    assert by_name["session.commit"]["parent_span_id"] == decide["span_id"]
+
+
+def test_unsampled_requests_record_nothing(client):
+    spans = _traced(lambda: client.get("/health"), sample_ratio=0.0)
+    assert spans == []
+
+    spans = _traced(
+        lambda: client.get("/health", headers={"traceparent": f"00-{_TRACE_ID}-{_PARENT_ID}-00"}),
+        sample_ratio=1.0,
+    )
+    assert spans == []
+
+
+def test_login_traces_bcrypt(client, db_session):
+    _create_user(db_session, email="trace-login@example.com", password="P@ssw0rd!")
+
+    spans = _traced(
+        lambda: client.post(
+            "/auth/login",
+            json={"email": "trace-login@example.com", "password": "P@ssw0rd!"},
+        ),
+        sample_ratio=1.0,
+    )
+
+    names = {span["name"] for span in spans}
+    assert {"auth.login", "auth_service.authenticate_user", "security.verify_password"} <= names
+
+
+def test_parse_traceparent():
+    assert tracing.parse_traceparent(f"00-{_TRACE_ID}-{_PARENT_ID}-01") == (_TRACE_ID, _PARENT_ID, True)
+    assert tracing.parse_traceparent(f"00-{'0' * 32}-{_PARENT_ID}-01") is None
+    assert tracing.parse_traceparent("garbage") is None
+    assert tracing.parse_traceparent(None) is None
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    path = tmp_path / "spans" / "traces.jsonl"
+    processor = tracing.configure_tracing(
+        exporter=tracing.FileSpanExporter(str(path)),
+        sample_ratio=1.0,
+    )
+    try:
+        with tracing.span("outer"):
+            with tracing.span("inner"):
+                pass
+    finally:
+        tracing.shutdown_tracing(processor)
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["inner", "outer"]
+    assert spans[0]["parent_span_id"] == spans[1]["span_id"]
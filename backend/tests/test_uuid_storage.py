@@ -0,0 +1,32 @@
+import uuid
+
+from sqlalchemy import text
+
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.types import uuid7
+
+
+def test_sqlite_stores_ids_as_16_bytes(db_session):
+    document = Document(title="Compact keys", status=DocumentStatus.PENDING)
+    db_session.add(document)
+    db_session.commit()
+
+    stored = db_session.execute(
+        text("SELECT typeof(id), length(id) FROM documents WHERE title = 'Compact keys'")
+    ).one()
+
+    assert tuple(stored) == ("blob", 16)
+    db_session.expire_all()
+    loaded = db_session.get(Document, document.id)
+    assert isinstance(loaded.id, uuid.UUID)
+    assert loaded.title == "Compact keys"
+
+
+def test_uuid7_is_time_ordered():
+    values = [uuid7() for _ in range(5000)]
+
+    assert all(value.version == 7 for value in values)
+    assert all(value.variant == uuid.RFC_4122 for value in values)
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert [value.bytes for value in values] == sorted(value.bytes for value in values)
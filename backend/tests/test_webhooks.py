@@ -0,0 +1,361 @@
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from fastapi import status
+from sqlalchemy import delete, select, update
+
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.core.settings import load_settings
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.document import Document, DocumentStatus
+from backend.src.models.user import User
+from backend.src.models.webhook import WebhookDelivery, WebhookDeliveryStatus, WebhookSubscription
+from backend.src.services import webhook_service
+
+
+class _Receiver:
+    """Local HTTP/1.1 endpoint that records webhook POSTs."""
+
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+        self.statuses: list[int] = []
+        self.on_request = None
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                receiver.requests.append(
+                    {
+                        "headers": dict(self.headers),
+                        "body": body,
+                        "events": json.loads(body)["events"],
+                        "client_port": self.client_address[1],
+                    }
+                )
+                if receiver.on_request is not None:
+                    receiver.on_request()
+                code = receiver.statuses.pop(0) if receiver.statuses else 200
+                self.send_response(code)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args) -> None:
+                return None
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hooks"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def receiver(db_session, monkeypatch):
+    # The stub listens on loopback, which production settings refuse.
+    monkeypatch.setattr(webhook_service, "load_settings", lambda: _settings())
+    stub = _Receiver()
+    client = httpx.Client(timeout=2)
+    stub.client = client
+    yield stub
+    client.close()
+    stub.close()
+    db_session.execute(delete(WebhookDelivery))
+    db_session.execute(delete(WebhookSubscription))
+    db_session.commit()
+
+
+def _create_user(
+    session, *, email: str, password: str, is_active: bool = True, is_admin: bool = True
+) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+        is_admin=is_admin,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _pending_step(session) -> tuple[Document, ApprovalStep]:
+    document = Document(title="Webhook Contract", status=DocumentStatus.PENDING)
+    session.add(document)
+    session.flush()
+    step = ApprovalStep(
+        document_id=document.id,
+        approver_id=uuid.uuid4(),
+        step_order=1,
+        status=ApprovalStepStatus.PENDING,
+    )
+    session.add(step)
+    session.commit()
+    return document, step
+
+
+def _subscribe(client, headers, url: str, **options) -> dict:
+    response = client.post(
+        "/webhooks",
+        json={"event_type": "document.approved", "url": url, **options},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()
+
+
+def _approve(client, headers, document: Document, step: ApprovalStep) -> None:
+    response = client.post(
+        f"/documents/{document.id}/steps/{step.id}/approve",
+        json={"approver_id": str(step.approver_id)},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_finalized_document_is_delivered_signed(client, db_session, receiver):
+    user = _create_user(db_session, email="webhook-deliver@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    _subscribe(client, headers, receiver.url, secret="s" * 32)
+    document, step = _pending_step(db_session)
+
+    _approve(client, headers, document, step)
+
+    outbox = db_session.scalars(select(WebhookDelivery)).all()
+    assert [row.status for row in outbox] == [WebhookDeliveryStatus.PENDING]
+    assert receiver.requests == []
+
+    summary = webhook_service.deliver_due(db_session, client=receiver.client)
+
+    assert summary.delivered == 1
+    (request,) = receiver.requests
+    (event,) = request["events"]
+    assert event["type"] == "document.approved"
+    assert event["id"] == str(outbox[0].id)
+    assert event["data"]["document_id"] == str(document.id)
+    assert request["headers"][webhook_service.SIGNATURE_HEADER] == webhook_service.sign(
+        "s" * 32, request["body"]
+    )
+    db_session.expire_all()
+    assert db_session.get(WebhookDelivery, outbox[0].id).status == WebhookDeliveryStatus.DELIVERED
+
+
+def test_events_are_batched_over_one_kept_alive_connection(client, db_session, receiver):
+    user = _create_user(db_session, email="webhook-batch@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    _subscribe(client, headers, receiver.url, max_batch_size=2)
+    for _ in range(5):
+        _approve(client, headers, *_pending_step(db_session))
+
+    summary = webhook_service.deliver_due(db_session, client=receiver.client)
+
+    assert summary.delivered == 5
+    assert summary.requests == 3
+    assert [len(request["events"]) for request in receiver.requests] == [2, 2, 1]
+    assert len({request["client_port"] for request in receiver.requests}) == 1
+
+
+def test_failures_back_off_and_eventually_fail(client, db_session, receiver, monkeypatch):
+    monkeypatch.setattr(webhook_service, "load_settings", lambda: _settings(max_attempts=2))
+    user = _create_user(db_session, email="webhook-retry@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    _subscribe(client, headers, receiver.url)
+    _approve(client, headers, *_pending_step(db_session))
+    receiver.statuses = [500, 500]
+
+    first = webhook_service.deliver_due(db_session, client=receiver.client)
+
+    assert first.retried == 1
+    delivery = db_session.scalars(select(WebhookDelivery)).one()
+    assert delivery.attempts == 1
+    assert delivery.last_error == "HTTP 500"
+    assert webhook_service.deliver_due(db_session, client=receiver.client).requests == 0
+
+    _make_due(db_session)
+    second = webhook_service.deliver_due(db_session, client=receiver.client)
+
+    assert second.failed == 1
+    db_session.expire_all()
+    assert db_session.scalars(select(WebhookDelivery)).one().status == WebhookDeliveryStatus.FAILED
+
+
+def test_circuit_breaker_stops_requests_to_a_failing_endpoint(
+    client, db_session, receiver, monkeypatch
+):
+    monkeypatch.setattr(webhook_service, "load_settings", lambda: _settings(threshold=2))
+    user = _create_user(db_session, email="webhook-breaker@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    _subscribe(client, headers, receiver.url)
+    for _ in range(3):
+        _approve(client, headers, *_pending_step(db_session))
+    receiver.statuses = [503] * 10
+
+    summary = webhook_service.deliver_due(db_session, client=receiver.client)
+
+    assert summary.requests == 2
+    assert summary.retried == 2
+    assert summary.deferred == 1
+    assert webhook_service.breaker_for(receiver.url).state == "open"
+    deferred = db_session.scalars(
+        select(WebhookDelivery).where(WebhookDelivery.attempts == 0)
+    ).one()
+    assert deferred.status == WebhookDeliveryStatus.PENDING
+
+
+def test_claimed_deliveries_are_sent_outside_a_transaction_and_only_once(
+    client, db_session, session_factory, receiver
+):
+    user = _create_user(db_session, email="webhook-claim@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    _subscribe(client, headers, receiver.url)
+    _approve(client, headers, *_pending_step(db_session))
+    observed = {}
+
+    def concurrent_run() -> None:
+        observed["in_transaction"] = db_session.in_transaction()
+        with session_factory() as other:
+            observed["summary"] = webhook_service.deliver_due(other, client=receiver.client)
+
+    receiver.on_request = concurrent_run
+    summary = webhook_service.deliver_due(db_session, client=receiver.client)
+
+    assert summary.delivered == 1
+    assert observed["in_transaction"] is False
+    assert observed["summary"].requests == 0
+    assert len(receiver.requests) == 1
+    db_session.expire_all()
+    delivery = db_session.scalars(select(WebhookDelivery)).one()
+    assert delivery.status == WebhookDeliveryStatus.DELIVERED
+    assert delivery.attempts == 1
+
+
+def test_circuit_breaker_half_opens_after_cooldown():
+    breaker = webhook_service.CircuitBreaker(threshold=1, cooldown=0)
+    breaker.record_failure()
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_subscription_validation(client, db_session, receiver):
+    user = _create_user(db_session, email="webhook-invalid@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+
+    unknown = client.post(
+        "/webhooks",
+        json={"event_type": "document.deleted", "url": receiver.url},
+        headers=headers,
+    )
+    relative = client.post(
+        "/webhooks",
+        json={"event_type": "document.approved", "url": "/hooks"},
+        headers=headers,
+    )
+
+    assert unknown.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert relative.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    created = _subscribe(client, headers, receiver.url)
+    assert client.get("/webhooks", headers=headers).json()[0]["id"] == created["id"]
+    deleted = client.delete(f"/webhooks/{created['id']}", headers=headers)
+    assert deleted.status_code == status.HTTP_204_NO_CONTENT
+    assert client.get("/webhooks", headers=headers).json() == []
+
+
+def test_subscriptions_require_an_administrator(client, db_session, receiver):
+    admin = _create_user(db_session, email="webhook-owner@example.com", password="P@ssw0rd!")
+    user = _create_user(
+        db_session, email="webhook-member@example.com", password="P@ssw0rd!", is_admin=False
+    )
+    subscription = {"event_type": "document.approved", "url": receiver.url}
+    created = client.post("/webhooks", json=subscription, headers=_auth_headers_for(admin)).json()
+
+    response = client.post("/webhooks", json=subscription, headers=_auth_headers_for(user))
+    deleted = client.delete(f"/webhooks/{created['id']}", headers=_auth_headers_for(user))
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert deleted.status_code == status.HTTP_403_FORBIDDEN
+    assert [item["id"] for item in client.get("/webhooks", headers=_auth_headers_for(admin)).json()] == [
+        created["id"]
+    ]
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://127.0.0.1:8000/hooks",
+        "http://localhost/hooks",
+        "http://10.0.0.5/hooks",
+        "http://169.254.169.254/latest/meta-data",
+        "http://[::1]/hooks",
+        "http://[::ffff:192.168.0.1]/hooks",
+        "http://0.0.0.0/hooks",
+    ],
+)
+def test_private_destinations_are_refused(client, db_session, url):
+    email = f"webhook-{uuid.uuid4().hex[:8]}@example.com"
+    user = _create_user(db_session, email=email, password="P@ssw0rd!")
+
+    response = client.post(
+        "/webhooks",
+        json={"event_type": "document.approved", "url": url},
+        headers=_auth_headers_for(user),
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+    assert "private" in response.json()["detail"]
+
+
+def test_delivery_rechecks_the_destination(client, db_session, receiver, monkeypatch):
+    user = _create_user(db_session, email="webhook-recheck@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    _subscribe(client, headers, receiver.url)
+    _approve(client, headers, *_pending_step(db_session))
+    monkeypatch.setattr(webhook_service, "load_settings", lambda: _settings(allow_private=False))
+
+    summary = webhook_service.deliver_due(db_session, client=receiver.client)
+
+    assert summary.failed == 1
+    assert summary.requests == 0
+    assert receiver.requests == []
+    delivery = db_session.scalars(select(WebhookDelivery)).one()
+    assert delivery.status == WebhookDeliveryStatus.FAILED
+    assert "private" in delivery.last_error
+
+
+def _settings(*, max_attempts: int = 8, threshold: int = 5, allow_private: bool = True):
+    return load_settings().model_copy(
+        update={
+            "webhook_max_attempts": max_attempts,
+            "webhook_breaker_threshold": threshold,
+            "webhook_allow_private_destinations": allow_private,
+        }
+    )
+
+
+def _make_due(session) -> None:
+    session.execute(
+        update(WebhookDelivery).values(
+            next_attempt_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+        )
+    )
+    session.commit()
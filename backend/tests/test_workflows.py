@@ -0,0 +1,165 @@
+import uuid
+
+import pytest
+from fastapi import status
+from sqlalchemy import select
+
+from backend.src.core.security import create_access_token, get_password_hash
+from backend.src.models.approval_step import ApprovalStep, ApprovalStepStatus
+from backend.src.models.document import DocumentStatus
+from backend.src.models.user import User
+from backend.src.models.workflow_template import WorkflowTemplate
+from backend.src.services import workflow_service
+
+
+def _create_user(
+    session, *, email: str, password: str, is_active: bool = True, is_admin: bool = True
+) -> User:
+    user = User(
+        email=email,
+        hashed_password=get_password_hash(password),
+        is_active=is_active,
+        is_admin=is_admin,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def _auth_headers_for(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _approvers(session, count: int) -> list[str]:
+    return [
+        str(
+            _create_user(
+                session,
+                email=f"approver-{uuid.uuid4().hex[:8]}@example.com",
+                password="P@ssw0rd!",
+                is_admin=False,
+            ).id
+        )
+        for _ in range(count)
+    ]
+
+
+def _decide(client, headers, document_id, step, decision: str):
+    return client.post(
+        f"/documents/{document_id}/steps/{step['id']}/{decision}",
+        json={"approver_id": step["approver_id"]},
+        headers=headers,
+    )
+
+
+def test_compiled_transitions_for_parallel_and_quorum_stages():
+    approvers = [str(uuid.uuid4()) for _ in range(3)]
+    stages = workflow_service.compile_definition(
+        {
+            "stages": [
+                {"mode": "any", "approvers": approvers[:2]},
+                {"mode": "quorum", "quorum": 2, "approvers": approvers},
+            ]
+        }
+    )
+    workflow = workflow_service.CompiledWorkflow(
+        template_id=uuid.uuid4(), name="t", version=1, stages=stages
+    )
+
+    Transition = workflow_service.Transition
+    assert workflow.transition(1, approvals=0, rejections=0, approve=True) == Transition.ADVANCE
+    assert workflow.transition(1, approvals=0, rejections=0, approve=False) == Transition.STAY
+    assert workflow.transition(1, approvals=0, rejections=1, approve=False) == Transition.REJECT
+    assert workflow.transition(2, approvals=0, rejections=0, approve=True) == Transition.STAY
+    assert workflow.transition(2, approvals=1, rejections=0, approve=True) == Transition.COMPLETE
+    assert workflow.transition(2, approvals=0, rejections=1, approve=False) == Transition.REJECT
+
+
+def test_invalid_quorum_is_rejected(client, db_session):
+    user = _create_user(db_session, email="wf@example.com", password="P@ssw0rd!")
+
+    response = client.post(
+        "/workflows",
+        json={
+            "name": "broken",
+            "stages": [{"mode": "quorum", "quorum": 3, "approvers": [str(uuid.uuid4())]}],
+        },
+        headers=_auth_headers_for(user),
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_any_of_stage_then_all_of_stage(client, db_session):
+    user = _create_user(db_session, email="wf@example.com", password="P@ssw0rd!")
+    headers = _auth_headers_for(user)
+    first, second, third = _approvers(db_session, 3)
+
+    template = client.post(
+        "/workflows",
+        json={
+            "name": "review-then-signoff",
+            "stages": [
+                {"mode": "any", "approvers": [first, second]},
+                {"mode": "all", "approvers": [third]},
+            ],
+        },
+        headers=headers,
+    ).json()
+    document = client.post(
+        "/documents",
+        json={"title": "Budget", "workflow_template_id": template["id"]},
+        headers=headers,
+    ).json()
+    document_id = document["id"]
+
+    steps = {
+        str(step.approver_id): {"id": str(step.id), "approver_id": str(step.approver_id)}
+        for step in db_session.query(ApprovalStep).filter(
+            ApprovalStep.document_id == uuid.UUID(document_id)
+        )
+    }
+    assert len(steps) == 3
+
+    early = _decide(client, headers, document_id, steps[third], "approve")
+    assert early.status_code == status.HTTP_409_CONFLICT
+
+    response = _decide(client, headers, document_id, steps[second], "approve")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["document"]["status"] == DocumentStatus.PENDING.value
+
+    skipped = _decide(client, headers, document_id, steps[first], "approve")
+    assert skipped.status_code == status.HTTP_409_CONFLICT
+
+    final = _decide(client, headers, document_id, steps[third], "approve")
+    assert final.status_code == status.HTTP_200_OK
+    assert final.json()["step"]["status"] == ApprovalStepStatus.APPROVED.value
+    assert final.json()["document"]["status"] == DocumentStatus.APPROVED.value
+
+
+def test_concurrent_template_versions_are_retried_then_refused(db_session, monkeypatch):
+    definition = {"stages": [{"mode": "all", "approvers": _approvers(db_session, 1)}]}
+    name = f"versions-{uuid.uuid4().hex[:8]}"
+    for _ in range(2):
+        workflow_service.create_template(db_session, users=db_session, name=name, definition=definition)
+
+    # The first read misses the version a concurrent create just committed.
+    scalar = db_session.scalar
+    stale = iter([1])
+    monkeypatch.setattr(
+        db_session, "scalar", lambda *args, **kwargs: next(stale, None) or scalar(*args, **kwargs)
+    )
+    retried = workflow_service.create_template(
+        db_session, users=db_session, name=name, definition=definition
+    )
+    assert retried.version == 3
+
+    monkeypatch.setattr(db_session, "scalar", lambda *args, **kwargs: 1)
+    with pytest.raises(workflow_service.TemplateConflictError):
+        workflow_service.create_template(db_session, users=db_session, name=name, definition=definition)
+    versions = db_session.scalars(
+        select(WorkflowTemplate.version).where(WorkflowTemplate.name == name)
+    )
+    assert sorted(versions) == [1, 2, 3]